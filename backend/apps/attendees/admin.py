@@ -23,7 +23,7 @@ class AttendanceAdmin(admin.ModelAdmin):
         'elector__family_name',
         'committee__code'
     ]
-    readonly_fields = ['attended_at']
+    readonly_fields = ['attended_at', 'client_key']
     date_hierarchy = 'attended_at'
     
     def elector_koc_id(self, obj):
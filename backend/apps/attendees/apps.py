@@ -6,3 +6,6 @@ class AttendeesConfig(AppConfig):
     name = 'apps.attendees'
     verbose_name = 'Attendees Management'
 
+    def ready(self):
+        """Import signals when app is ready."""
+        import apps.attendees.signals  # noqa
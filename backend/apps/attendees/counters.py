@@ -0,0 +1,166 @@
+"""
+Incrementally maintained attendance statistics.
+
+``AttendanceStatistics.total_attended`` and ``hourly_breakdown`` are kept
+current as attendance is written: every create / delete of an ATTENDED
+record applies its delta with a single atomic ``UPDATE`` (``F()`` for the
+total, an in-database JSON increment for the hour bucket), so concurrent
+marks never serialize behind a read-modify-write and statistics reads are a
+primary-key fetch. ``total_electors`` is not maintained per write (elector
+saves and imports do not touch it): readers count it live and the
+reconciliation refreshes the stored copy.
+
+Writes that bypass model signals (``bulk_create``) call
+``apply_attendance_deltas`` themselves (and ``apply_rollup_deltas`` for the
+time-series rollup, see ``apps.attendees.rollup``). ``reconcile_statistics`` recounts
+everything set-wise and corrects drift; it is run periodically by the
+``reconcile_attendance_statistics`` command.
+"""
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Count, F, Func, JSONField
+from django.db.models.functions import ExtractHour, Now
+from django.utils import timezone
+
+from .models import Attendance, AttendanceStatistics
+
+logger = logging.getLogger(__name__)
+
+
+class JSONCounterIncrement(Func):
+    """
+    ``{key: int}`` JSON document with ``deltas`` added to its keys,
+    evaluated in the database in one expression.
+    """
+
+    output_field = JSONField()
+
+    def __init__(self, expression, deltas: Dict[str, int]):
+        super().__init__(expression)
+        self.deltas = sorted(deltas.items())
+
+    def as_sql(self, compiler, connection, **extra_context):
+        # SQLite / MySQL: json_set(doc, path, value, path, value, ...)
+        doc_sql, doc_params = compiler.compile(self.source_expressions[0])
+        parts, params = [], list(doc_params)
+        for key, delta in self.deltas:
+            path = f'$."{key}"'
+            parts.append(f'%s, COALESCE(json_extract({doc_sql}, %s), 0) + %s')
+            params.extend([path, *doc_params, path, delta])
+        return f"json_set({doc_sql}, {', '.join(parts)})", params
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        doc_sql, doc_params = compiler.compile(self.source_expressions[0])
+        parts, params = [], list(doc_params)
+        for key, delta in self.deltas:
+            parts.append(f'%s::text, COALESCE(({doc_sql} ->> %s::text)::int, 0) + %s::int')
+            params.extend([key, *doc_params, key, delta])
+        return f"({doc_sql} || jsonb_build_object({', '.join(parts)}))", params
+
+
+def hour_bucket(attended_at) -> str:
+    """Hour key of ``hourly_breakdown`` (local time, like ``ExtractHour``)."""
+    if timezone.is_aware(attended_at):
+        attended_at = timezone.localtime(attended_at)
+    return str(attended_at.hour)
+
+
+def attendance_deltas(
+    records: Iterable,
+    sign: int = 1,
+    deltas: Optional[Dict[int, Dict[str, int]]] = None,
+) -> Dict[int, Dict[str, int]]:
+    """
+    ``{committee_id: {hour: delta}}`` for the ATTENDED ``records``, added to
+    ``deltas`` when given.
+    """
+    deltas = defaultdict(lambda: defaultdict(int)) if deltas is None else deltas
+    for record in records:
+        if record.status == Attendance.Status.ATTENDED:
+            hours = deltas[record.committee_id]
+            bucket = hour_bucket(record.attended_at)
+            hours[bucket] = hours.get(bucket, 0) + sign
+    return deltas
+
+
+def apply_attendance_deltas(deltas: Dict[int, Dict[str, int]]):
+    """
+    Apply per-committee hour deltas, one ``UPDATE`` per committee.
+
+    Committees without a statistics row are skipped: the row is built from a
+    full count when first read (or by the reconciliation command).
+    """
+    for committee_id, hours in deltas.items():
+        hours = {hour: delta for hour, delta in hours.items() if delta}
+        if hours:
+            _increment(committee_id, hours)
+
+
+def _increment(committee_id: int, hours: Dict[str, int]) -> bool:
+    return bool(
+        AttendanceStatistics.objects.filter(pk=committee_id).update(
+            total_attended=F('total_attended') + sum(hours.values()),
+            hourly_breakdown=JSONCounterIncrement(F('hourly_breakdown'), hours),
+            last_updated=Now(),
+        )
+    )
+
+
+def reconcile_statistics(committee_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recount electors and attendance for the given committees (default: all
+    with a statistics row) in three grouped queries and fix any drift.
+
+    The statistics rows are locked while counting, so increments committed
+    concurrently are neither lost nor counted twice. Returns the number of
+    rows corrected.
+    """
+    with transaction.atomic():
+        stats_qs = AttendanceStatistics.objects.select_for_update()
+        if committee_ids is not None:
+            stats_qs = stats_qs.filter(pk__in=list(committee_ids))
+        stats_rows = {stats.pk: stats for stats in stats_qs}
+        if not stats_rows:
+            return 0
+
+        from apps.electors.models import Elector
+
+        electors = dict(
+            Elector.objects.filter(committee_id__in=list(stats_rows), is_active=True)
+            .values('committee_id')
+            .annotate(total=Count('koc_id'))
+            .values_list('committee_id', 'total')
+        )
+        hourly: Dict[int, Dict[str, int]] = defaultdict(dict)
+        for row in (
+            Attendance.objects.filter(committee_id__in=list(stats_rows), status=Attendance.Status.ATTENDED)
+            .annotate(hour=ExtractHour('attended_at'))
+            .values('committee_id', 'hour')
+            .annotate(count=Count('id'))
+            .order_by()
+        ):
+            hourly[row['committee_id']][str(row['hour'])] = row['count']
+
+        drifted = []
+        for committee_id, stats in stats_rows.items():
+            breakdown = hourly.get(committee_id, {})
+            expected = (electors.get(committee_id, 0), sum(breakdown.values()), breakdown)
+            live_breakdown = {hour: count for hour, count in stats.hourly_breakdown.items() if count}
+            if (stats.total_electors, stats.total_attended, live_breakdown) == expected:
+                continue
+            if stats.total_attended != expected[1]:
+                logger.warning(
+                    'Attendance statistics drift for committee %s: %s counted, %s stored',
+                    committee_id, expected[1], stats.total_attended,
+                )
+            stats.total_electors, stats.total_attended, stats.hourly_breakdown = expected
+            stats.last_updated = timezone.now()
+            drifted.append(stats)
+
+        AttendanceStatistics.objects.bulk_update(
+            drifted, ['total_electors', 'total_attended', 'hourly_breakdown', 'last_updated']
+        )
+    return len(drifted)
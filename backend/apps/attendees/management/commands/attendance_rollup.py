@@ -0,0 +1,56 @@
+"""
+Management command to maintain the attendance time-series rollup
+(see apps.attendees.rollup).
+
+Usage:
+    python manage.py attendance_rollup --compact                  # fold aged minute buckets into hours (cron)
+    python manage.py attendance_rollup --compact --older-than 6   # ... minute buckets older than 6 hours
+    python manage.py attendance_rollup --rebuild [--election 3]   # recompute from attendance records
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.attendees.rollup import compact_rollup, rebuild_rollup
+
+
+class Command(BaseCommand):
+    help = 'Compact or rebuild the attendance time-series rollup'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--compact',
+            action='store_true',
+            help='Fold minute buckets older than ATTENDANCE_ROLLUP_MINUTE_HOURS into hour buckets',
+        )
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            help='Compact minute buckets older than this many hours instead',
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recompute the rollup from the attendance records',
+        )
+        parser.add_argument(
+            '--election',
+            type=int,
+            help='Limit --rebuild to one election',
+        )
+
+    def handle(self, *args, **options):
+        if not options['compact'] and not options['rebuild']:
+            raise CommandError('Pass --compact and/or --rebuild')
+
+        if options['rebuild']:
+            written = rebuild_rollup(options['election'])
+            self.stdout.write(f'Rebuilt attendance rollup: {written} minute bucket(s)')
+
+        if options['compact']:
+            before = None
+            if options['older_than'] is not None:
+                before = timezone.now() - timedelta(hours=options['older_than'])
+            compacted = compact_rollup(before)
+            self.stdout.write(f'Compacted attendance rollup: {compacted} minute bucket(s) folded into hours')
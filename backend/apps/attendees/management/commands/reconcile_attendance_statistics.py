@@ -0,0 +1,53 @@
+"""
+Management command to reconcile incrementally maintained attendance
+statistics with a full recount (see apps.attendees.counters).
+
+Usage:
+    python manage.py reconcile_attendance_statistics            # once (cron)
+    python manage.py reconcile_attendance_statistics --loop     # every ATTENDANCE_STATISTICS_CACHE_MINUTES
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.attendees.counters import reconcile_statistics
+from apps.attendees.models import AttendanceStatistics
+from apps.elections.models import Committee
+
+
+class Command(BaseCommand):
+    help = 'Recount attendance statistics and correct counter drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, reconciling every ATTENDANCE_STATISTICS_CACHE_MINUTES',
+        )
+        parser.add_argument(
+            '--create-missing',
+            action='store_true',
+            help='Also create statistics rows for committees that have none',
+        )
+
+    def handle(self, *args, **options):
+        interval = getattr(settings, 'ATTENDANCE_STATISTICS_CACHE_MINUTES', 5) * 60
+        while True:
+            close_old_connections()
+            if options['create_missing']:
+                self._create_missing()
+            corrected = reconcile_statistics()
+            self.stdout.write(f'Reconciled attendance statistics: {corrected} row(s) corrected')
+            if not options['loop']:
+                break
+            time.sleep(interval)
+
+    def _create_missing(self):
+        existing = AttendanceStatistics.objects.values_list('committee_id', flat=True)
+        missing = Committee.objects.exclude(id__in=existing).values_list('id', flat=True)
+        AttendanceStatistics.objects.bulk_create(
+            [AttendanceStatistics(committee_id=committee_id) for committee_id in missing],
+            ignore_conflicts=True,
+        )
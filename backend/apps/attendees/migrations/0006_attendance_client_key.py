@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:42
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendees', '0005_remove_attendancestatistics_total_walk_ins'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='client_key',
+            field=models.CharField(blank=True, help_text='Client-generated idempotency key (offline sync)', max_length=64, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='attendance',
+            name='attended_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Timestamp when attendance was marked'),
+        ),
+    ]
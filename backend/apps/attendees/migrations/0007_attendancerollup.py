@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:54
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncMinute
+import django.db.models.deletion
+
+
+def populate_rollup(apps, schema_editor):
+    Attendance = apps.get_model('attendees', 'Attendance')
+    AttendanceRollup = apps.get_model('attendees', 'AttendanceRollup')
+    buckets = (
+        Attendance.objects.filter(status='ATTENDED')
+        .annotate(bucket_start=TruncMinute('attended_at'))
+        .values('committee__election_id', 'committee_id', 'bucket_start')
+        .annotate(attended=Count('id'))
+        .order_by()
+    )
+    AttendanceRollup.objects.bulk_create(
+        [
+            AttendanceRollup(
+                election_id=row['committee__election_id'],
+                committee_id=row['committee_id'],
+                resolution='MINUTE',
+                bucket_start=row['bucket_start'],
+                attended=row['attended'],
+            )
+            for row in buckets.iterator(chunk_size=2000)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0009_fix_committee_code_unique_and_gender_default'),
+        ('attendees', '0006_attendance_client_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.CharField(choices=[('MINUTE', 'Minute'), ('HOUR', 'Hour')], default='MINUTE', max_length=10)),
+                ('bucket_start', models.DateTimeField(help_text='Start of the bucket (local minute or hour)')),
+                ('attended', models.IntegerField(default=0, help_text='Attendance marked in this bucket')),
+                ('committee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_rollup', to='elections.committee')),
+                ('election', models.ForeignKey(help_text='Election of the committee (denormalized for range reads)', on_delete=django.db.models.deletion.CASCADE, related_name='attendance_rollup', to='elections.election')),
+            ],
+            options={
+                'verbose_name': 'Attendance Rollup',
+                'verbose_name_plural': 'Attendance Rollup',
+                'db_table': 'attendance_rollup',
+                'ordering': ['bucket_start'],
+                'indexes': [models.Index(fields=['election', 'bucket_start'], name='attendance__electio_a4bfb4_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='attendancerollup',
+            constraint=models.UniqueConstraint(fields=('committee', 'resolution', 'bucket_start'), name='unique_attendance_rollup_bucket'),
+        ),
+        migrations.RunPython(populate_rollup, migrations.RunPython.noop),
+    ]
@@ -5,6 +5,7 @@ import re
 from django.db import models
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from django.utils.html import strip_tags
 from django.utils.safestring import mark_safe
 
@@ -46,9 +47,9 @@ class Attendance(models.Model):
         help_text='User who marked this attendance'
     )
     
-    # When they attended
+    # When they attended (set by the client for marks replayed from offline queues)
     attended_at = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
         help_text='Timestamp when attendance was marked'
     )
     
@@ -73,6 +74,15 @@ class Attendance(models.Model):
         help_text='Device info (mobile/desktop, IP, location if available)'
     )
     
+    # Idempotency key generated by the client for offline replays
+    client_key = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        unique=True,
+        help_text='Client-generated idempotency key (offline sync)'
+    )
+    
     class Meta:
         db_table = 'attendance'
         verbose_name = 'Attendance'
@@ -138,6 +148,17 @@ class Attendance(models.Model):
                 if ua and len(ua) > 255:
                     self.device_info['user_agent'] = ua[:255]
     
+    STATISTICS_FIELDS = ('committee_id', 'status', 'attended_at')
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # What this row contributes to AttendanceStatistics, to diff on save
+        loaded = instance.__dict__
+        if all(field in loaded for field in cls.STATISTICS_FIELDS):
+            instance._counted_as = tuple(loaded[field] for field in cls.STATISTICS_FIELDS)
+        return instance
+    
     def save(self, *args, **kwargs):
         """Override save to validate before saving."""
         self.full_clean()
@@ -191,7 +212,21 @@ class AttendanceStatistics(models.Model):
         return round((self.total_attended / self.total_electors) * 100, 2)
     
     def update_statistics(self):
-        """Refresh statistics from database with optimized queries."""
+        """
+        Recount statistics from the database.
+        
+        Counters are normally maintained incrementally (see
+        apps.attendees.counters); this full recount builds a new row and
+        backs the manual refresh. The row is locked while counting so
+        concurrent increments are not lost.
+        """
+        from django.db import transaction
+        
+        with transaction.atomic():
+            AttendanceStatistics.objects.select_for_update().filter(pk=self.pk).exists()
+            self._recount()
+    
+    def _recount(self):
         from django.db.models import Count
         from django.db.models.functions import ExtractHour
         
@@ -221,3 +256,59 @@ class AttendanceStatistics(models.Model):
         
         self.save(update_fields=['total_electors', 'total_attended', 'hourly_breakdown', 'last_updated'])
 
+
+
+class AttendanceRollup(models.Model):
+    """
+    Attendance time series: ATTENDED marks per committee and time bucket.
+    
+    Maintained on insert (see apps.attendees.rollup) so turnout charts read a
+    few rows by range instead of grouping the attendance table. Buckets
+    start as minutes and are compacted into hours once they age out.
+    """
+    
+    class Resolution(models.TextChoices):
+        MINUTE = 'MINUTE', 'Minute'
+        HOUR = 'HOUR', 'Hour'
+    
+    election = models.ForeignKey(
+        'elections.Election',
+        on_delete=models.CASCADE,
+        related_name='attendance_rollup',
+        help_text='Election of the committee (denormalized for range reads)'
+    )
+    committee = models.ForeignKey(
+        'elections.Committee',
+        on_delete=models.CASCADE,
+        related_name='attendance_rollup'
+    )
+    resolution = models.CharField(
+        max_length=10,
+        choices=Resolution.choices,
+        default=Resolution.MINUTE
+    )
+    bucket_start = models.DateTimeField(
+        help_text='Start of the bucket (local minute or hour)'
+    )
+    attended = models.IntegerField(
+        default=0,
+        help_text='Attendance marked in this bucket'
+    )
+    
+    class Meta:
+        db_table = 'attendance_rollup'
+        verbose_name = 'Attendance Rollup'
+        verbose_name_plural = 'Attendance Rollup'
+        ordering = ['bucket_start']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['committee', 'resolution', 'bucket_start'],
+                name='unique_attendance_rollup_bucket'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['election', 'bucket_start']),
+        ]
+    
+    def __str__(self):
+        return f"{self.committee_id} {self.bucket_start:%Y-%m-%d %H:%M} ({self.resolution}): {self.attended}"
@@ -0,0 +1,221 @@
+"""
+Batched replay of attendance marks queued offline by committee tablets.
+
+A reconnecting tablet posts its whole queue at once. Marks are validated
+set-wise: existing idempotency keys, electors (with their committee) and
+prior attendance are each resolved with one query for the batch, the new
+rows are written with a single ``bulk_create`` (committee counters get one
+``UPDATE`` each) and one broadcast covers the batch. Replaying the same
+batch is safe: known ``client_key`` values are reported as duplicates with
+the stored attendance id, including keys a concurrent replay inserted
+first (the unique index drops our row; counters, rollup and broadcast only
+cover rows this sync inserted).
+"""
+import logging
+import uuid
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+
+from apps.electors.models import Elector
+from apps.utils.conditional import bump_tables
+
+from .counters import apply_attendance_deltas, attendance_deltas
+from .models import Attendance
+from .rollup import apply_rollup_deltas, rollup_deltas
+from .serializers import OfflineMarkSerializer
+
+logger = logging.getLogger(__name__)
+
+
+CREATED = 'created'
+DUPLICATE = 'duplicate'
+ALREADY_ATTENDED = 'already_attended'
+REJECTED = 'rejected'
+
+
+class OfflineAttendanceSync:
+    """
+    Validate and write one batch of offline marks for ``user``.
+
+    ``allowed_committees`` limits the committee codes the user may mark;
+    None means any committee (admins).
+    """
+
+    def __init__(self, user, allowed_committees: Optional[Iterable[str]] = None, device_info: Optional[Dict] = None):
+        self.user = user
+        self.allowed_committees = set(allowed_committees) if allowed_committees is not None else None
+        # Marks the rows this sync inserts
+        self.batch = uuid.uuid4().hex
+        self.device_info = dict(device_info or {}, offline_sync=True, sync_batch=self.batch)
+
+    def sync(self, marks: List[Dict]) -> Dict:
+        """
+        Returns ``{'results': [...], 'summary': {...}}`` with one result per
+        mark, in request order.
+        """
+        results: List[Dict] = [None] * len(marks)
+        valid: Dict[str, tuple] = {}  # client_key -> (position, validated data)
+
+        for position, mark in enumerate(marks):
+            serializer = OfflineMarkSerializer(data=mark)
+            if not serializer.is_valid():
+                results[position] = self._result(mark, REJECTED, errors=serializer.errors)
+                continue
+            data = serializer.validated_data
+            if data['client_key'] in valid:
+                results[position] = self._result(data, DUPLICATE, message='Repeated in this batch')
+                continue
+            valid[data['client_key']] = (position, data)
+
+        with transaction.atomic():
+            created = self._write(valid, results)
+
+        if created:
+            self._broadcast(created)
+
+        summary = Counter(result['status'] for result in results)
+        return {
+            'results': results,
+            'summary': {status: summary.get(status, 0) for status in (CREATED, DUPLICATE, ALREADY_ATTENDED, REJECTED)},
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _write(self, valid: Dict[str, tuple], results: List[Dict]) -> List[Attendance]:
+        if not valid:
+            return []
+
+        # Idempotent replays: keys already stored
+        stored = dict(
+            Attendance.objects.filter(client_key__in=list(valid)).values_list('client_key', 'id')
+        )
+        pending = {}
+        for client_key, (position, data) in valid.items():
+            if client_key in stored:
+                results[position] = self._result(data, DUPLICATE, attendance_id=stored[client_key])
+            else:
+                pending[client_key] = (position, data)
+
+        koc_ids = {data['koc_id'] for position, data in pending.values()}
+        electors = {
+            row['koc_id']: row
+            for row in Elector.objects.filter(koc_id__in=koc_ids, is_active=True).values(
+                'koc_id', 'committee_id', 'committee__code'
+            )
+        }
+        attended = set(
+            Attendance.objects.filter(
+                elector_id__in=list(electors), status=Attendance.Status.ATTENDED
+            ).values_list('elector_id', flat=True)
+        )
+
+        to_create: List[Attendance] = []
+        positions: Dict[str, int] = {}
+        for client_key, (position, data) in pending.items():
+            koc_id, committee_code = data['koc_id'], data['committee_code']
+            elector = electors.get(koc_id)
+            if elector is None:
+                message = f"Elector with KOC ID {koc_id} not found"
+            elif self.allowed_committees is not None and committee_code not in self.allowed_committees:
+                message = 'You are not authorized to mark attendance for this committee'
+            elif elector['committee__code'] != committee_code:
+                message = f"Elector {koc_id} is assigned to committee {elector['committee__code']}, not {committee_code}"
+            elif koc_id in attended:
+                results[position] = self._result(data, ALREADY_ATTENDED)
+                continue
+            else:
+                message = None
+            if message:
+                results[position] = self._result(data, REJECTED, message=message)
+                continue
+
+            attended.add(koc_id)  # a second mark for the same elector in this batch
+            attendance = Attendance(
+                elector_id=koc_id,
+                committee_id=elector['committee_id'],
+                marked_by=self.user,
+                notes=data.get('notes', ''),
+                device_info=self.device_info,
+                status=Attendance.Status.ATTENDED,
+                client_key=client_key,
+            )
+            if data.get('attended_at'):
+                attendance.attended_at = data['attended_at']
+            to_create.append(attendance)
+            positions[client_key] = position
+
+        if not to_create:
+            return []
+
+        # Concurrent replays of the same key are absorbed by the unique index;
+        # the batch token tells the rows inserted here from those that won
+        Attendance.objects.bulk_create(to_create, ignore_conflicts=True)
+        stored = {
+            client_key: (attendance_id, device_info)
+            for client_key, attendance_id, device_info in Attendance.objects.filter(
+                client_key__in=list(positions)
+            ).values_list('client_key', 'id', 'device_info')
+        }
+        created = []
+        for attendance in to_create:
+            attendance_id, device_info = stored[attendance.client_key]
+            data = {'client_key': attendance.client_key, 'koc_id': attendance.elector_id}
+            position = positions[attendance.client_key]
+            if (device_info or {}).get('sync_batch') != self.batch:
+                results[position] = self._result(data, DUPLICATE, attendance_id=attendance_id)
+                continue
+            attendance.id = attendance_id
+            created.append(attendance)
+            results[position] = self._result(data, CREATED, attendance_id=attendance_id)
+
+        if created:
+            # bulk_create skips signals: update the committee counters and rollup here
+            apply_attendance_deltas(attendance_deltas(created))
+            apply_rollup_deltas(rollup_deltas(created))
+            bump_tables(Attendance)
+        return created
+
+    @staticmethod
+    def _result(data, status: str, attendance_id: Optional[int] = None,
+                message: Optional[str] = None, errors: Optional[Dict] = None) -> Dict:
+        data = data if isinstance(data, dict) else {}
+        result = {
+            'client_key': data.get('client_key'),
+            'koc_id': data.get('koc_id'),
+            'status': status,
+        }
+        if attendance_id is not None:
+            result['attendance_id'] = attendance_id
+        if message:
+            result['message'] = message
+        if errors:
+            result['errors'] = errors
+        return result
+
+    @staticmethod
+    def _broadcast(created: List[Attendance]):
+        """One update and one cache invalidation for the whole batch."""
+        from apps.utils.signals import broadcast_update
+        from apps.utils.websocket_utils import invalidate_dashboard_cache
+
+        per_committee = Counter(attendance.committee_id for attendance in created)
+        payload = {
+            'count': len(created),
+            'attendance_ids': [attendance.id for attendance in created],
+            'committees': [
+                {'committee_id': committee_id, 'count': count}
+                for committee_id, count in sorted(per_committee.items())
+            ],
+        }
+
+        def send():
+            try:
+                broadcast_update('attendance_update', 'bulk_created', payload)
+                invalidate_dashboard_cache()
+            except Exception as e:
+                logger.error(f"Error broadcasting attendance sync: {e}", exc_info=True)
+
+        transaction.on_commit(send)
@@ -0,0 +1,195 @@
+"""
+Attendance time-series rollup.
+
+``AttendanceRollup`` holds ATTENDED marks per (election, committee, time
+bucket). Every create / delete of an attendance record adds its delta to the
+record's minute bucket with one ``UPDATE`` (the row is created on the first
+mark of that minute), so turnout charts read a short range of buckets
+instead of grouping the attendance table by hour on every refresh.
+
+Minute buckets older than ``ATTENDANCE_ROLLUP_MINUTE_HOURS`` are compacted
+into hour buckets by ``compact_rollup``. Readers sum both resolutions, so a
+late mark landing in an already compacted hour is counted either way until
+the next compaction folds it in. ``rebuild_rollup`` recomputes the table
+from the attendance records.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMinute
+from django.utils import timezone
+
+from .models import Attendance, AttendanceRollup
+
+MINUTE = AttendanceRollup.Resolution.MINUTE
+HOUR = AttendanceRollup.Resolution.HOUR
+
+# Rows per DELETE when dropping compacted minute buckets
+DELETE_BATCH_SIZE = 500
+
+
+def minute_bucket(attended_at: datetime) -> datetime:
+    """Start of the local minute containing ``attended_at``."""
+    if timezone.is_aware(attended_at):
+        attended_at = timezone.localtime(attended_at)
+    return attended_at.replace(second=0, microsecond=0)
+
+
+def hour_bucket_start(moment: datetime) -> datetime:
+    """Start of the local hour containing ``moment``."""
+    return minute_bucket(moment).replace(minute=0)
+
+
+def rollup_deltas(
+    records: Iterable,
+    sign: int = 1,
+    deltas: Optional[Dict[Tuple[int, datetime], int]] = None,
+) -> Dict[Tuple[int, datetime], int]:
+    """
+    ``{(committee_id, minute): delta}`` for the ATTENDED ``records``, added
+    to ``deltas`` when given.
+    """
+    deltas = defaultdict(int) if deltas is None else deltas
+    for record in records:
+        if record.status == Attendance.Status.ATTENDED:
+            key = (record.committee_id, minute_bucket(record.attended_at))
+            deltas[key] = deltas.get(key, 0) + sign
+    return deltas
+
+
+def apply_rollup_deltas(deltas: Dict[Tuple[int, datetime], int]):
+    """Add minute deltas to the rollup, creating buckets on first use."""
+    from apps.elections.models import Committee
+
+    missing = {}
+    for (committee_id, bucket), delta in deltas.items():
+        if not delta or _add(committee_id, MINUTE, bucket, delta):
+            continue
+        if delta < 0:
+            # The minute was compacted already: take it off its hour
+            _add(committee_id, HOUR, hour_bucket_start(bucket), delta)
+        else:
+            missing[(committee_id, bucket)] = delta
+
+    if missing:
+        elections = dict(
+            Committee.objects.filter(pk__in={committee_id for committee_id, _ in missing})
+            .values_list('id', 'election_id')
+        )
+        for (committee_id, bucket), delta in missing.items():
+            _create(elections[committee_id], committee_id, MINUTE, bucket, delta)
+
+
+def _add(committee_id: int, resolution: str, bucket_start: datetime, delta: int) -> bool:
+    return bool(
+        AttendanceRollup.objects.filter(
+            committee_id=committee_id, resolution=resolution, bucket_start=bucket_start
+        ).update(attended=F('attended') + delta)
+    )
+
+
+def _create(election_id: int, committee_id: int, resolution: str, bucket_start: datetime, delta: int):
+    try:
+        with transaction.atomic():
+            AttendanceRollup.objects.create(
+                election_id=election_id,
+                committee_id=committee_id,
+                resolution=resolution,
+                bucket_start=bucket_start,
+                attended=delta,
+            )
+    except IntegrityError:
+        # Created concurrently by another mark in the same bucket
+        _add(committee_id, resolution, bucket_start, delta)
+
+
+def compact_rollup(before: Optional[datetime] = None) -> int:
+    """
+    Fold minute buckets starting before ``before`` (default: now minus
+    ``ATTENDANCE_ROLLUP_MINUTE_HOURS``, rounded down to the hour) into hour
+    buckets. Returns the number of minute buckets compacted.
+    """
+    if before is None:
+        before = timezone.now() - timedelta(hours=settings.ATTENDANCE_ROLLUP_MINUTE_HOURS)
+    before = hour_bucket_start(before)
+
+    with transaction.atomic():
+        rows = list(
+            AttendanceRollup.objects.select_for_update()
+            .filter(resolution=MINUTE, bucket_start__lt=before)
+            .values_list('id', 'election_id', 'committee_id', 'bucket_start', 'attended')
+        )
+        if not rows:
+            return 0
+
+        hours: Dict[Tuple[int, int, datetime], int] = defaultdict(int)
+        for _, election_id, committee_id, bucket_start, attended in rows:
+            hours[(election_id, committee_id, hour_bucket_start(bucket_start))] += attended
+        for (election_id, committee_id, bucket_start), attended in hours.items():
+            if attended and not _add(committee_id, HOUR, bucket_start, attended):
+                _create(election_id, committee_id, HOUR, bucket_start, attended)
+
+        ids = [row[0] for row in rows]
+        for offset in range(0, len(ids), DELETE_BATCH_SIZE):
+            AttendanceRollup.objects.filter(id__in=ids[offset:offset + DELETE_BATCH_SIZE]).delete()
+    return len(rows)
+
+
+def rebuild_rollup(election_id: Optional[int] = None) -> int:
+    """
+    Recompute the minute buckets of ``election_id`` (default: all elections)
+    from the attendance records. Returns the number of buckets written.
+    """
+    attendance = Attendance.objects.filter(status=Attendance.Status.ATTENDED)
+    rollup = AttendanceRollup.objects.all()
+    if election_id is not None:
+        attendance = attendance.filter(committee__election_id=election_id)
+        rollup = rollup.filter(election_id=election_id)
+
+    buckets = (
+        attendance.annotate(bucket_start=TruncMinute('attended_at'))
+        .values('committee__election_id', 'committee_id', 'bucket_start')
+        .annotate(attended=Count('id'))
+        .order_by()
+    )
+    with transaction.atomic():
+        rollup.delete()
+        created = AttendanceRollup.objects.bulk_create(
+            [
+                AttendanceRollup(
+                    election_id=row['committee__election_id'],
+                    committee_id=row['committee_id'],
+                    resolution=MINUTE,
+                    bucket_start=row['bucket_start'],
+                    attended=row['attended'],
+                )
+                for row in buckets.iterator(chunk_size=2000)
+            ],
+            batch_size=1000,
+        )
+    return len(created)
+
+
+def rollup_series(election_id: int, start: datetime, end: datetime, interval_minutes: int = 60) -> Dict[datetime, int]:
+    """
+    Attendance of ``election_id`` in ``[start, end)`` summed per
+    ``interval_minutes`` (a divisor of 60), keyed by the local start of each
+    interval. Hour buckets count towards the interval their hour starts in.
+    """
+    rows = (
+        AttendanceRollup.objects.filter(
+            election_id=election_id, bucket_start__gte=start, bucket_start__lt=end
+        )
+        .values('bucket_start')
+        .annotate(attended=Sum('attended'))
+        .order_by()
+    )
+    series: Dict[datetime, int] = defaultdict(int)
+    for row in rows:
+        bucket = minute_bucket(row['bucket_start'])
+        series[bucket.replace(minute=bucket.minute - bucket.minute % interval_minutes)] += row['attended']
+    return series
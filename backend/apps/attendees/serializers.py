@@ -8,6 +8,22 @@ from django.utils.html import strip_tags
 from .models import Attendance, AttendanceStatistics
 
 
+IP_PATTERN = re.compile(
+    r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$|'
+    r'^(?:[0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}$'
+)
+
+
+def device_info_from_request(request):
+    """Validated client IP and sanitized user agent of a request."""
+    ip_address = request.META.get('REMOTE_ADDR') or request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')[0].strip()
+    user_agent = request.META.get('HTTP_USER_AGENT', '')
+    return {
+        'ip_address': ip_address if ip_address and IP_PATTERN.match(ip_address) else None,
+        'user_agent': strip_tags(user_agent)[:255] if user_agent else None,
+    }
+
+
 class ElectorAttendanceSerializer(serializers.Serializer):
     """
     Serializer for displaying elector information when searching.
@@ -35,14 +51,26 @@ class ElectorAttendanceSerializer(serializers.Serializer):
         """Get committee name."""
         return obj.committee.name if obj.committee else None
     
+    def _attended_at(self, obj):
+        """Latest attendance timestamp, one query per elector."""
+        if not hasattr(self, '_attended_at_cache'):
+            self._attended_at_cache = {}
+        if obj.koc_id not in self._attended_at_cache:
+            self._attended_at_cache[obj.koc_id] = (
+                Attendance.objects.filter(elector_id=obj.koc_id, status=Attendance.Status.ATTENDED)
+                .order_by('-attended_at')
+                .values_list('attended_at', flat=True)
+                .first()
+            )
+        return self._attended_at_cache[obj.koc_id]
+    
     def get_hasAttended(self, obj):
         """Check if elector has already attended."""
-        return obj.attendance_records.filter(status=Attendance.Status.ATTENDED).exists()
+        return self._attended_at(obj) is not None
     
     def get_attendedAt(self, obj):
         """Get attendance timestamp if attended."""
-        record = obj.attendance_records.filter(status=Attendance.Status.ATTENDED).order_by('-attended_at').first()
-        return record.attended_at if record else None
+        return self._attended_at(obj)
 
 
 class AttendanceSerializer(serializers.ModelSerializer):
@@ -158,20 +186,22 @@ class MarkAttendanceSerializer(serializers.Serializer):
         from apps.electors.models import Elector
         from .models import Attendance
         
-        try:
-            elector = Elector.objects.get(koc_id=value, is_active=True)
-            if Attendance.objects.filter(elector=elector, status=Attendance.Status.ATTENDED).exists():
-                last_attendance = Attendance.objects.filter(
-                    elector=elector,
-                    status=Attendance.Status.ATTENDED
-                ).order_by('-attended_at').first()
-                timestamp = last_attendance.attended_at.strftime('%H:%M:%S') if last_attendance else ''
-                raise serializers.ValidationError(
-                    f"Elector {value} has already attended at {timestamp}"
-                )
-            return value
-        except Elector.DoesNotExist:
+        # Always against the database: the snapshot may still list an
+        # elector deactivated since it was built
+        if not Elector.objects.filter(koc_id=value, is_active=True).exists():
             raise serializers.ValidationError(f"Elector with KOC ID {value} not found")
+        
+        last_attended_at = (
+            Attendance.objects.filter(elector_id=value, status=Attendance.Status.ATTENDED)
+            .order_by('-attended_at')
+            .values_list('attended_at', flat=True)
+            .first()
+        )
+        if last_attended_at is not None:
+            raise serializers.ValidationError(
+                f"Elector {value} has already attended at {last_attended_at.strftime('%H:%M:%S')}"
+            )
+        return value
     
     def validate_committee_code(self, value):
         """Validate committee exists."""
@@ -186,17 +216,18 @@ class MarkAttendanceSerializer(serializers.Serializer):
     def validate(self, attrs):
         """Cross-field validation."""
         from apps.electors.models import Elector
+        from apps.electors.snapshot import elector_snapshot
         from apps.elections.models import Committee
         from .models import Attendance
         
         koc_id = attrs['koc_id']
         committee_code = attrs['committee_code']
         
-        elector = Elector.objects.get(koc_id=koc_id)
+        elector = elector_snapshot.get(koc_id) or Elector.objects.select_related('committee').get(koc_id=koc_id)
         committee = Committee.objects.get(code=committee_code)
         
         # Check if elector is assigned to this committee
-        if elector.committee != committee:
+        if elector.committee_id != committee.id:
             raise serializers.ValidationError({
                 'committee_code': f"Elector {koc_id} is assigned to committee "
                                  f"{elector.committee.code}, not {committee_code}"
@@ -218,27 +249,7 @@ class MarkAttendanceSerializer(serializers.Serializer):
         
         # Get device info from request context with validation
         request = self.context.get('request')
-        device_info = {}
-        if request:
-            ip_address = request.META.get('REMOTE_ADDR') or request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')[0].strip()
-            user_agent = request.META.get('HTTP_USER_AGENT', '')
-            
-            # Validate IP address format
-            ip_pattern = re.compile(
-                r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$|'
-                r'^(?:[0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}$'
-            )
-            
-            if ip_address and ip_pattern.match(ip_address):
-                device_info['ip_address'] = ip_address
-            else:
-                device_info['ip_address'] = None
-            
-            # Sanitize and limit user agent
-            if user_agent:
-                device_info['user_agent'] = strip_tags(user_agent)[:255]
-            else:
-                device_info['user_agent'] = None
+        device_info = device_info_from_request(request) if request else {}
         
         # Create attendance
         attendance = Attendance.objects.create(
@@ -253,6 +264,45 @@ class MarkAttendanceSerializer(serializers.Serializer):
         return attendance
 
 
+class OfflineMarkSerializer(serializers.Serializer):
+    """
+    One attendance mark replayed from a tablet's offline queue.
+    ``client_key`` makes replays idempotent.
+    """
+    
+    client_key = serializers.CharField(max_length=64)
+    koc_id = serializers.CharField(max_length=20)
+    committee_code = serializers.CharField(max_length=20)
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+    attended_at = serializers.DateTimeField(
+        required=False,
+        help_text='When the mark was taken on the device (defaults to now)'
+    )
+    
+    def validate_notes(self, value):
+        """Sanitize notes to prevent XSS."""
+        return strip_tags(value)[:1000] if value else ''
+    
+    def validate_attended_at(self, value):
+        """Device clocks can run ahead; never record a future time."""
+        return min(value, timezone.now())
+
+
+class AttendanceSyncSerializer(serializers.Serializer):
+    """
+    Batch of offline marks. Items are validated one by one by the sync
+    service so a bad item does not reject the whole batch.
+    """
+    
+    MAX_MARKS = 500
+    
+    marks = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=MAX_MARKS
+    )
+
+
 class AttendanceStatisticsSerializer(serializers.ModelSerializer):
     """
     Serializer for attendance statistics.
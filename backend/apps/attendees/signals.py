@@ -0,0 +1,59 @@
+"""
+Signal handlers keeping AttendanceStatistics counters and the attendance
+rollup current.
+"""
+from collections import namedtuple
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .counters import apply_attendance_deltas, attendance_deltas
+from .models import Attendance
+from .rollup import apply_rollup_deltas, rollup_deltas
+
+CountedAs = namedtuple('CountedAs', Attendance.STATISTICS_FIELDS)
+
+
+@receiver(pre_save, sender=Attendance)
+def attendance_loading_counted(sender, instance, **kwargs):
+    """
+    A record saved without being loaded first (or with its counted fields
+    deferred): read what it counted as, so post_save can apply the
+    difference instead of recounting.
+    """
+    if kwargs.get('raw', False) or instance.pk is None or hasattr(instance, '_counted_as'):
+        return
+    instance._counted_as = (
+        Attendance.objects.filter(pk=instance.pk).values_list(*Attendance.STATISTICS_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=Attendance)
+def attendance_counted(sender, instance, created, **kwargs):
+    """Apply the record's change to the committee counters and the rollup."""
+    if kwargs.get('raw', False):
+        return
+
+    current = tuple(getattr(instance, field) for field in Attendance.STATISTICS_FIELDS)
+    previous = None if created else getattr(instance, '_counted_as', None)
+    instance._counted_as = current
+    if previous == current:
+        return
+
+    removed = [CountedAs(*previous)] if previous is not None else []
+    _apply(added=[instance], removed=removed)
+
+
+@receiver(post_delete, sender=Attendance)
+def attendance_uncounted(sender, instance, **kwargs):
+    _apply(removed=[instance])
+
+
+def _apply(added=(), removed=()):
+    deltas = attendance_deltas(added)
+    attendance_deltas(removed, sign=-1, deltas=deltas)
+    apply_attendance_deltas(deltas)
+
+    minutes = rollup_deltas(added)
+    rollup_deltas(removed, sign=-1, deltas=minutes)
+    apply_rollup_deltas(minutes)
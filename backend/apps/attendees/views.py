@@ -4,10 +4,9 @@ Views for attendance management.
 import csv
 import logging
 import re
-from datetime import datetime, timedelta
+from datetime import datetime
 from io import BytesIO
 
-from django.db import transaction
 from django.db.models import Q
 from django.http import FileResponse, HttpResponse
 from django.utils import timezone
@@ -19,17 +18,21 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from .models import Attendance, AttendanceStatistics
+from .offline_sync import OfflineAttendanceSync
 from .serializers import (
     AttendanceSerializer,
     AttendanceListSerializer,
+    AttendanceSyncSerializer,
     MarkAttendanceSerializer,
     ElectorAttendanceSerializer,
     AttendanceStatisticsSerializer,
+    device_info_from_request,
 )
 from apps.utils.permissions import IsAssignedToCommittee, IsAdminOrAbove
 from apps.utils.viewsets import StandardResponseMixin
 from apps.utils.responses import APIResponse
 from apps.electors.models import Elector
+from apps.electors.snapshot import elector_snapshot
 from apps.elections.models import Committee
 from apps.electors.serializers import ElectorSerializer
 
@@ -43,6 +46,7 @@ class AttendanceViewSet(StandardResponseMixin, viewsets.ModelViewSet):
     Endpoints:
     - GET    /api/attendance/                    - List attendance records
     - POST   /api/attendance/mark/               - Mark attendance (KOC ID)
+    - POST   /api/attendance/sync/               - Replay offline marks in bulk
     - GET    /api/attendance/{id}/               - Get attendance details
     - GET    /api/attendance/search-elector/     - Search elector by KOC ID
     - GET    /api/attendance/committee/{code}/   - Get committee attendance
@@ -67,6 +71,8 @@ class AttendanceViewSet(StandardResponseMixin, viewsets.ModelViewSet):
     search_fields = ['elector__koc_id', 'elector__name_first', 'elector__family_name']
     ordering_fields = ['attended_at']
     ordering = ['-attended_at']
+    # Keyset pagination (?cursor=) follows the attended_at index, id breaks ties
+    cursor_ordering = ('-attended_at', '-id')
     
     def _get_user_committees(self, user):
         """Get (and cache) user's assigned committees."""
@@ -179,6 +185,44 @@ class AttendanceViewSet(StandardResponseMixin, viewsets.ModelViewSet):
             message='Attendance marked successfully'
         )
     
+    @action(detail=False, methods=['post'], url_path='sync')
+    def sync(self, request):
+        """
+        Replay attendance marks queued offline, in one request.
+        
+        POST /api/attendance/sync/
+        Body: {
+            "marks": [
+                {
+                    "client_key": "3f2a...",          # idempotency key from the device
+                    "koc_id": "12345",
+                    "committee_code": "EK-II",
+                    "attended_at": "2025-11-20T08:15:00Z",  # optional
+                    "notes": "Optional notes"
+                }
+            ]
+        }
+        
+        Returns one result per mark: created, duplicate (key already synced),
+        already_attended or rejected (with a message).
+        """
+        serializer = AttendanceSyncSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        user = request.user
+        allowed_committees = None if user.is_admin_or_above() else self._get_user_committees(user)
+        result = OfflineAttendanceSync(
+            user,
+            allowed_committees=allowed_committees,
+            device_info=device_info_from_request(request),
+        ).sync(serializer.validated_data['marks'])
+        
+        summary = result['summary']
+        return APIResponse.success(
+            data=result,
+            message=f"Synced {summary['created']} mark(s), {summary['duplicate']} already synced"
+        )
+    
     @action(detail=False, methods=['get'], url_path='search-elector')
     def search_elector(self, request):
         """
@@ -197,39 +241,40 @@ class AttendanceViewSet(StandardResponseMixin, viewsets.ModelViewSet):
                 status_code=status.HTTP_400_BAD_REQUEST
             )
         
-        try:
-            # Search for elector
-            elector = Elector.objects.select_related('committee').prefetch_related('attendance_records').get(
-                koc_id=koc_id,
-                is_active=True
-            )
-            
-            # Check committee match if provided
-            if committee_code and elector.committee.code != committee_code:
+        # Voting-day fast path: memory-mapped snapshot, no elector query
+        elector = elector_snapshot.get(koc_id)
+        if elector is None:
+            try:
+                elector = Elector.objects.select_related('committee').get(
+                    koc_id=koc_id,
+                    is_active=True
+                )
+            except Elector.DoesNotExist:
                 return APIResponse.error(
-                    message=f"Elector {koc_id} is assigned to committee {elector.committee.code}, not {committee_code}",
-                    errors={
-                        'elector_committee': elector.committee.code,
-                        'requested_committee': committee_code
-                    },
-                    status_code=status.HTTP_400_BAD_REQUEST
+                    message=f"Elector with KOC ID {koc_id} not found",
+                    errors={'can_add': True},  # Flag that elector can be added
+                    status_code=status.HTTP_404_NOT_FOUND
                 )
-            
-            # Serialize elector data
-            serializer = ElectorAttendanceSerializer(elector)
-            
-            # Return elector data directly in 'data' field (following standards)
-            return APIResponse.success(
-                data=serializer.data,
-                message='Elector found'
-            )
         
-        except Elector.DoesNotExist:
+        # Check committee match if provided
+        if committee_code and elector.committee.code != committee_code:
             return APIResponse.error(
-                message=f"Elector with KOC ID {koc_id} not found",
-                errors={'can_add': True},  # Flag that elector can be added
-                status_code=status.HTTP_404_NOT_FOUND
+                message=f"Elector {koc_id} is assigned to committee {elector.committee.code}, not {committee_code}",
+                errors={
+                    'elector_committee': elector.committee.code,
+                    'requested_committee': committee_code
+                },
+                status_code=status.HTTP_400_BAD_REQUEST
             )
+        
+        # Serialize elector data
+        serializer = ElectorAttendanceSerializer(elector)
+        
+        # Return elector data directly in 'data' field (following standards)
+        return APIResponse.success(
+            data=serializer.data,
+            message='Elector found'
+        )
     
     @action(detail=False, methods=['get'], url_path='committee/(?P<committee_code>[^/.]+)')
     def committee_attendance(self, request, committee_code=None):
@@ -302,20 +347,18 @@ class AttendanceViewSet(StandardResponseMixin, viewsets.ModelViewSet):
                     status_code=status.HTTP_403_FORBIDDEN
                 )
             
-            # Get or create statistics with select_for_update to prevent race conditions
-            # Cache duration is configurable via settings (default: 5 minutes)
-            from django.conf import settings
-            cache_minutes = getattr(settings, 'ATTENDANCE_STATISTICS_CACHE_MINUTES', 5)
-            
-            with transaction.atomic():
-                stats, created = AttendanceStatistics.objects.select_for_update().get_or_create(
-                    committee=committee
-                )
-                
-                # Update if stale (configurable cache duration)
-                # Use select_for_update to prevent concurrent updates
-                if timezone.now() - stats.last_updated > timedelta(minutes=cache_minutes):
+            # Attendance counters are maintained incrementally on every mark
+            # (see apps.attendees.counters): a primary-key fetch is current.
+            # Elector writes and imports do not touch the row, so the elector
+            # total is counted live (committee/is_active index).
+            stats = AttendanceStatistics.objects.filter(pk=committee.pk).first()
+            if stats is None:
+                stats, created = AttendanceStatistics.objects.get_or_create(committee=committee)
+                if created:
                     stats.update_statistics()
+            else:
+                stats.total_electors = committee.electors.filter(is_active=True).count()
+            stats.committee = committee
             
             serializer = AttendanceStatisticsSerializer(stats)
             return APIResponse.success(data=serializer.data)
@@ -154,16 +154,18 @@ class Candidate(models.Model):
         """
         Get total votes received across all committees.
         
+        Read from the running election tally (apps.voting.tally).
+        
         Returns:
             int: Total verified votes
         """
-        from apps.voting.models import VoteCount
+        from apps.voting.models import VoteTally
         
-        return VoteCount.objects.filter(
+        return VoteTally.objects.filter(
             candidate=self,
-            is_verified=True
+            committee__isnull=True
         ).aggregate(
-            total=models.Sum('vote_count')
+            total=models.Sum('verified_votes')
         )['total'] or 0
     
     @property
@@ -174,14 +176,14 @@ class Candidate(models.Model):
         Returns:
             float: Percentage of votes received
         """
-        from apps.voting.models import VoteCount
+        from apps.voting.models import VoteTally
         
         # Get total valid votes in election
-        total_votes = VoteCount.objects.filter(
-            election=self.election,
-            is_verified=True
+        total_votes = VoteTally.objects.filter(
+            election_id=self.election_id,
+            committee__isnull=True
         ).aggregate(
-            total=models.Sum('vote_count')
+            total=models.Sum('verified_votes')
         )['total'] or 0
         
         if total_votes == 0:
@@ -38,6 +38,7 @@ class PartyViewSet(StandardResponseMixin, viewsets.ModelViewSet):
     """
     
     queryset = Party.objects.all()
+    conditional_models = (Party, Candidate)  # candidate_count
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
     
@@ -2,7 +2,10 @@
 Admin configuration for election management.
 """
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+
 from .models import Election, Committee
+from .utils.committee_metrics import attach_committee_metrics
 
 
 @admin.register(Election)
@@ -43,6 +46,14 @@ class ElectionAdmin(admin.ModelAdmin):
     )
 
 
+class CommitteeChangeList(ChangeList):
+    """Changelist loading the count columns of a page in one batch."""
+    
+    def get_results(self, request):
+        super().get_results(request)
+        self.result_list = attach_committee_metrics(self.result_list)
+
+
 @admin.register(Committee)
 class CommitteeAdmin(admin.ModelAdmin):
     """Admin for Committee model."""
@@ -87,6 +98,9 @@ class CommitteeAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_changelist(self, request, **kwargs):
+        return CommitteeChangeList
+    
     def attendance_percentage(self, obj):
         """Display attendance percentage."""
         return f"{obj.attendance_percentage}%"
@@ -0,0 +1,44 @@
+"""
+Management command to precompute election dashboards
+(see apps.elections.precompute).
+
+Usage:
+    python manage.py precompute_dashboards                  # rebuild every open election once
+    python manage.py precompute_dashboards --election 3     # rebuild one election
+    python manage.py precompute_dashboards --loop           # run the worker (DASHBOARD_PRECOMPUTE_RUNNER=external)
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.elections.models import Election
+from apps.elections.precompute import refresh_election, run_tick
+
+
+class Command(BaseCommand):
+    help = 'Precompute election dashboard payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--election', type=int, help='Only this election')
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, rebuilding changed elections every DASHBOARD_PRECOMPUTE_TICK_SECONDS',
+        )
+
+    def handle(self, *args, **options):
+        if options['loop']:
+            tick = getattr(settings, 'DASHBOARD_PRECOMPUTE_TICK_SECONDS', 5)
+            while True:
+                rebuilt = run_tick()
+                if rebuilt:
+                    self.stdout.write(f"Precomputed dashboards of election(s) {', '.join(map(str, rebuilt))}")
+                time.sleep(tick)
+
+        if options['election']:
+            election_ids = [options['election']]
+        else:
+            election_ids = Election.objects.exclude(status='CLOSED').values_list('id', flat=True)
+        rebuilt = [election_id for election_id in election_ids if refresh_election(election_id)]
+        self.stdout.write(f'Precomputed dashboards of {len(rebuilt)} election(s)')
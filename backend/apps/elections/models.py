@@ -188,17 +188,25 @@ class Committee(models.Model):
             ),
         ]
     
+    # Batch-loaded metrics (apps.elections.utils.committee_metrics); the
+    # count properties below query per instance when absent
+    _metrics = None
+    
     def __str__(self):
         return f"{self.code} - {self.name}"
     
     @property
     def elector_count(self):
         """Get total electors assigned to this committee."""
+        if self._metrics is not None:
+            return self._metrics['elector_count']
         return self.electors.filter(is_active=True).count()
     
     @property
     def attendance_count(self):
         """Get total attendance for this committee."""
+        if self._metrics is not None:
+            return self._metrics['attendance_count']
         return self.attendances.filter(status='ATTENDED').count()
     
     @property
@@ -213,6 +221,8 @@ class Committee(models.Model):
     @property
     def vote_count(self):
         """Get total votes cast for this committee."""
+        if self._metrics is not None:
+            return self._metrics['vote_count']
         from apps.voting.models import VoteCount
         return VoteCount.objects.filter(committee=self).aggregate(
             total=models.Sum('vote_count')
@@ -221,6 +231,8 @@ class Committee(models.Model):
     @property
     def guarantee_count(self):
         """Get total guarantees for this committee."""
+        if self._metrics is not None:
+            return self._metrics['guarantee_count']
         from apps.guarantees.models import Guarantee
         return Guarantee.objects.filter(
             elector__committee=self,
@@ -230,6 +242,8 @@ class Committee(models.Model):
     @property
     def guarantee_attendance_count(self):
         """Get total guarantee attendance for this committee."""
+        if self._metrics is not None:
+            return self._metrics['guarantee_attendance_count']
         from apps.guarantees.models import Guarantee
         from apps.attendees.models import Attendance
         # Get guarantees with attendance
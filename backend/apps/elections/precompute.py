@@ -0,0 +1,202 @@
+"""
+Precomputed election dashboards.
+
+The attendance, demographics and overview dashboards of an election are
+built off the request path and stored in the cache together with the time
+they were built (``as_of``). The dashboard endpoints read the stored
+payload (``get_precomputed``), so a request costs a cache read.
+
+The worker refreshes an election:
+
+- after writes: every write bumps a dashboard cache namespace
+  (``invalidate_dashboard_cache``). Each tick compares the namespaces'
+  version with the one the election was last built under.
+- on a schedule: every election that is not closed is rebuilt at least every
+  ``DASHBOARD_PRECOMPUTE_INTERVAL_SECONDS`` for its time-relative figures.
+
+``DASHBOARD_PRECOMPUTE_RUNNER`` selects what runs the worker:
+
+- ``'thread'`` (default): a daemon thread in each web process, started by
+  the WSGI/ASGI entry points
+- ``'external'``: a separate process runs the ticks
+  (``python manage.py precompute_dashboards --loop`` or the Celery beat task
+  ``apps.elections.tasks.precompute_dashboards``)
+- ``'off'``: no worker. The endpoints build payloads on demand through the
+  single-flight cache, which writes invalidate.
+
+A cache lock per election keeps several processes from building the same
+payloads at once.
+"""
+import logging
+import time
+from collections import namedtuple
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connections
+from django.utils import timezone
+
+from apps.utils.cache_namespaces import namespace_version
+from apps.utils.periodic import PeriodicWorker, start_periodic_worker
+from apps.utils.single_flight import LOCK_TIMEOUT, cached_compute
+from apps.utils.websocket_utils import dashboard_namespace, election_namespace
+
+from .utils.dashboard_queries import (
+    _build_dashboard_overview,
+    get_attendance_dashboard,
+    get_elector_demographics,
+)
+
+logger = logging.getLogger(__name__)
+
+PAYLOADS = ('attendance', 'demographics', 'overview')
+
+PrecomputedPayload = namedtuple('PrecomputedPayload', ['data', 'as_of'])
+
+def _runner() -> str:
+    return getattr(settings, 'DASHBOARD_PRECOMPUTE_RUNNER', 'thread')
+
+
+def _interval() -> int:
+    return getattr(settings, 'DASHBOARD_PRECOMPUTE_INTERVAL_SECONDS', 300)
+
+
+def _payload_key(name: str, election_id: int) -> str:
+    return f'dashboard:precomputed:{name}:election:{election_id}'
+
+
+def _state_key(election_id: int) -> str:
+    return f'dashboard:precomputed:state:election:{election_id}'
+
+
+def source_version(election_id: int) -> str:
+    """Version of the data the election's dashboards derive from; writes change it."""
+    return namespace_version([election_namespace(election_id), dashboard_namespace('admin')])
+
+
+def _entry_version(election_id: int, source: Optional[str] = None) -> str:
+    # With a worker, stored payloads stay valid until it replaces them;
+    # without one, writes must invalidate them
+    if _runner() == 'off':
+        return source if source is not None else source_version(election_id)
+    return ''
+
+
+def _compute(name: str, election_id: int):
+    if name == 'attendance':
+        data = get_attendance_dashboard(election_id)
+    elif name == 'demographics':
+        data = get_elector_demographics(election_id)
+    else:
+        data = _build_dashboard_overview(election_id)
+    return {'data': data, 'as_of': timezone.now()}
+
+
+def _store(name: str, election_id: int, payload: dict, version: str):
+    soft_ttl = _interval() * 2
+    cached_compute(_payload_key(name, election_id), lambda: payload, soft_ttl=soft_ttl, version=version, refresh=True)
+
+
+def get_precomputed(name: str, election_id: int, refresh: bool = False) -> PrecomputedPayload:
+    """
+    Stored ``name`` payload of the election with its ``as_of`` time.
+
+    A payload that has not been built yet is built here, once for all
+    concurrent callers; ``refresh`` rebuilds it inline. ``data`` is None when
+    the election does not exist.
+    """
+    if name not in PAYLOADS:
+        raise ValueError(f"Unknown dashboard payload '{name}'")
+    payload = cached_compute(
+        _payload_key(name, election_id),
+        lambda: _compute(name, election_id),
+        soft_ttl=_interval() * 2,
+        version=_entry_version(election_id),
+        refresh=refresh,
+    )
+    return PrecomputedPayload(payload['data'], payload['as_of'])
+
+
+def refresh_election(election_id: int) -> bool:
+    """
+    Build and store every dashboard payload of the election.
+
+    Returns False if the election does not exist.
+    """
+    # Read before building: a write landing during the build is picked up
+    # by the next tick
+    source = source_version(election_id)
+    as_of = timezone.now()
+    attendance = get_attendance_dashboard(election_id)
+    if attendance is None:
+        return False
+    demographics = get_elector_demographics(election_id)
+    payloads = {
+        'attendance': attendance,
+        'demographics': demographics,
+        'overview': _build_dashboard_overview(election_id, attendance, demographics),
+    }
+
+    version = _entry_version(election_id, source)
+    for name, data in payloads.items():
+        _store(name, election_id, {'data': data, 'as_of': as_of}, version)
+    cache.set(_state_key(election_id), {'source': source, 'built_at': time.time()}, _interval() * 8)
+    return True
+
+
+def _is_due(election_id: int, now: float) -> bool:
+    state = cache.get(_state_key(election_id))
+    if state is None or now - state['built_at'] >= _interval():
+        return True
+    return state['source'] != source_version(election_id)
+
+
+def _refresh_locked(election_id: int) -> bool:
+    lock_key = f'{_state_key(election_id)}:lock'
+    if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+        return False  # another process is building it
+    try:
+        return refresh_election(election_id)
+    except Exception:
+        logger.exception(f"Precomputing dashboards of election {election_id} failed")
+        return False
+    finally:
+        cache.delete(lock_key)
+
+
+def refresh_due(election_ids: Optional[Iterable[int]] = None) -> List[int]:
+    """
+    Rebuild the elections (default: those not closed) whose data changed or
+    whose payloads are older than the interval. Returns the rebuilt ids.
+    """
+    from .models import Election
+
+    if election_ids is None:
+        election_ids = Election.objects.exclude(status='CLOSED').values_list('id', flat=True)
+    now = time.time()
+    return [
+        election_id
+        for election_id in list(election_ids)
+        if _is_due(election_id, now) and _refresh_locked(election_id)
+    ]
+
+
+def run_tick() -> List[int]:
+    """One worker pass, with its own database connection."""
+    close_old_connections()
+    try:
+        return refresh_due()
+    except Exception:
+        logger.exception("Dashboard precompute tick failed")
+        return []
+    finally:
+        connections.close_all()
+
+
+def start_precompute_worker() -> Optional[PeriodicWorker]:
+    """Start this process's worker thread if the runner is ``'thread'``."""
+    if _runner() != 'thread':
+        return None
+    tick = getattr(settings, 'DASHBOARD_PRECOMPUTE_TICK_SECONDS', 5)
+    return start_periodic_worker('dashboard-precompute', tick, run_tick)
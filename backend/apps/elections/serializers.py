@@ -216,6 +216,20 @@ class HourlyAttendanceSerializer(serializers.Serializer):
     target = serializers.IntegerField()
 
 
+class TurnoutPointSerializer(serializers.Serializer):
+    time = serializers.CharField()
+    attendance = serializers.IntegerField()
+    cumulative = serializers.IntegerField()
+    turnout_percentage = serializers.FloatField()
+
+
+class TurnoutCurveSerializer(serializers.Serializer):
+    interval = serializers.IntegerField()
+    total_electors = serializers.IntegerField()
+    total_attendance = serializers.IntegerField()
+    points = TurnoutPointSerializer(many=True)
+
+
 class ElectorDemographicsSerializer(serializers.Serializer):
     by_gender = serializers.ListField(child=serializers.JSONField())
     by_area = serializers.ListField(child=serializers.JSONField())
@@ -0,0 +1,15 @@
+"""
+Celery tasks for the elections app.
+
+Only used when a Celery worker and beat run alongside the web processes
+(``DASHBOARD_PRECOMPUTE_RUNNER = 'external'``); see CELERY_BEAT_SCHEDULE.
+"""
+from celery import shared_task
+
+
+@shared_task(name='elections.precompute_dashboards', ignore_result=True)
+def precompute_dashboards():
+    """Rebuild the election dashboards that changed or are due (one tick)."""
+    from .precompute import run_tick
+
+    run_tick()
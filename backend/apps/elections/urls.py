@@ -12,6 +12,7 @@ from .views import (
     GuaranteesTrendView,
     GroupPerformanceView,
     HourlyAttendanceView,
+    TurnoutCurveView,
 )
 
 router = DefaultRouter()
@@ -42,6 +43,11 @@ urlpatterns = [
         HourlyAttendanceView.as_view(),
         name='hourly-attendance',
     ),
+    path(
+        '<int:election_id>/dashboard/attendance/turnout/',
+        TurnoutCurveView.as_view(),
+        name='turnout-curve',
+    ),
     path(
         '<int:election_id>/dashboard/electors/demographics/',
         ElectorDemographicsView.as_view(),
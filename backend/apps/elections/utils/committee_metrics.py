@@ -0,0 +1,119 @@
+"""
+Per-committee metrics in a constant number of queries.
+
+The ``Committee`` count properties run one query each, per committee.
+``get_committee_metrics`` computes the same figures for every committee in
+scope with one grouped query per metric, keyed by committee id.
+``attach_committee_metrics`` hands the results to loaded ``Committee``
+instances so their properties read them instead of querying.
+"""
+from typing import Dict, Iterable, Optional
+
+from django.db.models import Count, Exists, F, OuterRef, Sum
+
+
+METRIC_FIELDS = (
+    'elector_count',
+    'attendance_count',
+    'guarantee_count',
+    'guarantee_attendance_count',
+    'vote_count',
+)
+
+
+def _percentage(part, total):
+    return round((part / total * 100), 2) if total > 0 else 0
+
+
+def _grouped(queryset, key, value):
+    """``{key: value}`` for a queryset grouped by ``key``."""
+    return dict(queryset.values(key).annotate(value=value).order_by().values_list(key, 'value'))
+
+
+def get_committee_metrics(
+    election_id: Optional[int] = None,
+    committee_ids: Optional[Iterable[int]] = None,
+) -> Dict[int, Dict]:
+    """
+    Metrics of the committees of ``election_id`` and/or in ``committee_ids``
+    (default: all committees), keyed by committee id.
+
+    Each entry has the ``Committee`` property values (``elector_count``,
+    ``attendance_count``, ``guarantee_count``, ``guarantee_attendance_count``,
+    ``vote_count``) plus ``attendance_percentage`` and
+    ``guarantee_attendance_percentage``. Runs one query per metric whatever
+    the number of committees.
+    """
+    from apps.attendees.models import Attendance
+    from apps.electors.models import Elector
+    from apps.guarantees.models import Guarantee
+    from apps.voting.models import VoteCount
+    from ..models import Committee
+
+    if committee_ids is not None:
+        committee_ids = list(committee_ids)
+    if election_id is not None:
+        scope = Committee.objects.filter(election_id=election_id)
+        if committee_ids is not None:
+            scope = scope.filter(id__in=committee_ids)
+        committee_ids = list(scope.values_list('id', flat=True))
+    elif committee_ids is None:
+        committee_ids = list(Committee.objects.values_list('id', flat=True))
+    if not committee_ids:
+        return {}
+
+    electors = _grouped(
+        Elector.objects.filter(committee_id__in=committee_ids, is_active=True),
+        'committee_id', Count('koc_id'),
+    )
+    attendance = _grouped(
+        Attendance.objects.filter(committee_id__in=committee_ids, status=Attendance.Status.ATTENDED),
+        'committee_id', Count('id'),
+    )
+    guarantees = _grouped(
+        Guarantee.objects.filter(elector__committee_id__in=committee_ids, elector__is_active=True),
+        'elector__committee_id', Count('id'),
+    )
+    # Attendance at the committee by its own (active) electors holding a guarantee
+    guarantee_attendance = _grouped(
+        Attendance.objects.filter(
+            committee_id__in=committee_ids,
+            status=Attendance.Status.ATTENDED,
+            elector__committee_id=F('committee_id'),
+            elector__is_active=True,
+        ).filter(Exists(Guarantee.objects.filter(elector_id=OuterRef('elector_id')))),
+        'committee_id', Count('id'),
+    )
+    votes = _grouped(
+        VoteCount.objects.filter(committee_id__in=committee_ids),
+        'committee_id', Sum('vote_count'),
+    )
+
+    metrics = {}
+    for committee_id in committee_ids:
+        entry = {
+            'elector_count': electors.get(committee_id, 0),
+            'attendance_count': attendance.get(committee_id, 0),
+            'guarantee_count': guarantees.get(committee_id, 0),
+            'guarantee_attendance_count': guarantee_attendance.get(committee_id, 0),
+            'vote_count': votes.get(committee_id) or 0,
+        }
+        entry['attendance_percentage'] = _percentage(entry['attendance_count'], entry['elector_count'])
+        entry['guarantee_attendance_percentage'] = _percentage(
+            entry['guarantee_attendance_count'], entry['guarantee_count']
+        )
+        metrics[committee_id] = entry
+    return metrics
+
+
+def attach_committee_metrics(committees) -> list:
+    """
+    Load the metrics of ``committees`` in one batch and attach them, so the
+    ``Committee`` count properties read them. Returns the committees as a
+    list.
+    """
+    committees = list(committees)
+    metrics = get_committee_metrics(committee_ids=[committee.id for committee in committees])
+    for committee in committees:
+        committee._metrics = metrics.get(committee.id)
+    return committees
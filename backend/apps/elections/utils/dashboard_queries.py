@@ -10,6 +10,7 @@ from django.db.models import Count, Q, Max, Sum
 from django.db.models.functions import TruncDate, ExtractHour
 from django.utils import timezone
 
+from .committee_metrics import get_committee_metrics
 
 DEFAULT_DISTRIBUTION_LIMIT = 12
 MAX_DISTRIBUTION_SERIES = 8
@@ -677,10 +678,39 @@ def get_elector_distribution(election_id, primary, secondary=None, limit=None):
     }
 
 
+# Dashboard attendance window (local hours, end exclusive)
+ATTENDANCE_DAY_START_HOUR = 8
+ATTENDANCE_DAY_END_HOUR = 18
+TURNOUT_INTERVALS = (5, 10, 15, 30, 60)
+
+
+def _attendance_day(date):
+    """Parse a YYYY-MM-DD string (default: today) into the local day's bounds."""
+    target_date = None
+    if date:
+        try:
+            target_date = datetime.strptime(date, '%Y-%m-%d').date()
+        except ValueError:
+            pass
+    if target_date is None:
+        target_date = timezone.localdate()
+    day_start = timezone.make_aware(datetime.combine(target_date, datetime.min.time()))
+    return day_start, day_start + timedelta(days=1)
+
+
+def _election_elector_total(election_id):
+    from apps.electors.models import Elector
+
+    return Elector.objects.filter(committee__election_id=election_id, is_active=True).count()
+
+
 def get_hourly_attendance(election_id, date=None):
     """
     Get hourly attendance breakdown.
     
+    Attendance is read from the attendance rollup (a range read over the
+    day's time buckets) rather than grouping the attendance table.
+    
     Args:
         election_id: Election ID
         date: Date string (YYYY-MM-DD) or None for today
@@ -688,70 +718,43 @@ def get_hourly_attendance(election_id, date=None):
     Returns:
         List of hourly attendance data
     """
-    from apps.attendees.models import Attendance
-    from apps.elections.models import Committee
+    from apps.attendees.rollup import rollup_series
     
-    # Parse date
-    if date:
-        try:
-            target_date = datetime.strptime(date, '%Y-%m-%d').date()
-        except ValueError:
-            target_date = datetime.now().date()
-    else:
-        target_date = datetime.now().date()
-    
-    # Get committees for this election
-    committees = Committee.objects.filter(election_id=election_id)
-    
-    # Get attendance for the date
-    attendance_qs = Attendance.objects.filter(
-        committee__in=committees,
-        attended_at__date=target_date
-    ).annotate(
-        hour=ExtractHour('attended_at')
-    )
+    day_start, day_end = _attendance_day(date)
+    hours = range(ATTENDANCE_DAY_START_HOUR, ATTENDANCE_DAY_END_HOUR)
+    hour_map = {hour: {'attendance': 0, 'votes': 0} for hour in hours}
     
-    # Group by hour and count
-    hourly_data = attendance_qs.values('hour').annotate(
-        attendance_count=Count('id')
-    ).order_by('hour')
+    # Fill attendance data
+    for bucket, attended in rollup_series(election_id, day_start, day_end).items():
+        if bucket.hour in hour_map:
+            hour_map[bucket.hour]['attendance'] += attended
     
-    # Get vote counts per hour (if voting model exists)
+    # Get vote counts per hour (one entry per candidate and committee: small table)
     try:
         from apps.voting.models import VoteCount
-        votes_qs = VoteCount.objects.filter(
-            committee__in=committees,
-            created_at__date=target_date
+        hourly_votes = VoteCount.objects.filter(
+            committee__election_id=election_id,
+            created_at__gte=day_start,
+            created_at__lt=day_end
         ).annotate(
             hour=ExtractHour('created_at')
-        )
-        
-        hourly_votes = votes_qs.values('hour').annotate(
+        ).values('hour').annotate(
             vote_count=Count('id')
         ).order_by('hour')
+        
+        for item in hourly_votes:
+            if item['hour'] in hour_map:
+                hour_map[item['hour']]['votes'] = item['vote_count']
     except (ImportError, AttributeError):
-        hourly_votes = []
-    
-    # Create hour map (08:00 to 17:00)
-    hour_map = {hour: {'attendance': 0, 'votes': 0} for hour in range(8, 18)}
-    
-    # Fill attendance data
-    for item in hourly_data:
-        if 8 <= item['hour'] <= 17:
-            hour_map[item['hour']]['attendance'] = item['attendance_count']
-    
-    # Fill vote data
-    for item in hourly_votes:
-        if 8 <= item['hour'] <= 17:
-            hour_map[item['hour']]['votes'] = item['vote_count']
+        pass
     
     # Calculate target
-    total_electors = sum(c.electors.filter(is_active=True).count() for c in committees)
-    target_per_hour = round(total_electors / 10) if total_electors > 0 else 0  # 10 hours
+    total_electors = _election_elector_total(election_id)
+    target_per_hour = round(total_electors / len(hours)) if total_electors > 0 else 0
     
     # Format result
     result = []
-    for hour in range(8, 18):
+    for hour in hours:
         result.append({
             'hour': f"{hour:02d}:00",
             'attendance': hour_map[hour]['attendance'],
@@ -762,33 +765,125 @@ def get_hourly_attendance(election_id, date=None):
     return result
 
 
+def get_turnout_curve(election_id, date=None, interval=15):
+    """
+    Get the cumulative turnout curve for one day.
+    
+    Args:
+        election_id: Election ID
+        date: Date string (YYYY-MM-DD) or None for today
+        interval: Bucket size in minutes (one of TURNOUT_INTERVALS)
+    
+    Returns:
+        Dictionary with the curve points and the elector total
+    
+    Raises:
+        ValueError: If the interval is not supported
+    """
+    from apps.attendees.rollup import rollup_series
+    
+    try:
+        interval = int(interval)
+    except (TypeError, ValueError):
+        interval = None
+    if interval not in TURNOUT_INTERVALS:
+        raise ValueError(
+            f"Invalid interval. Choose from: {', '.join(str(value) for value in TURNOUT_INTERVALS)}"
+        )
+    
+    day_start, day_end = _attendance_day(date)
+    window_start = day_start.replace(hour=ATTENDANCE_DAY_START_HOUR)
+    window_end = day_start.replace(hour=ATTENDANCE_DAY_END_HOUR)
+    series = rollup_series(election_id, day_start, day_end, interval)
+    total_electors = _election_elector_total(election_id)
+    
+    # Marks before the window open the curve
+    cumulative = sum(attended for bucket, attended in series.items() if bucket < window_start)
+    points = []
+    bucket = window_start
+    while bucket < window_end:
+        attended = series.get(bucket, 0)
+        cumulative += attended
+        points.append({
+            'time': timezone.localtime(bucket).strftime('%H:%M'),
+            'attendance': attended,
+            'cumulative': cumulative,
+            'turnout_percentage': round((cumulative / total_electors * 100), 2) if total_electors > 0 else 0,
+        })
+        bucket += timedelta(minutes=interval)
+    
+    return {
+        'interval': interval,
+        'total_electors': total_electors,
+        'total_attendance': sum(series.values()),
+        'points': points,
+    }
+
+
+def _dimension_breakdown(electors, field):
+    """
+    One grouped pass over ``electors`` by ``field``: totals, gender split and
+    attended electors per value (blank values skipped).
+    """
+    rows = electors.exclude(**{f'{field}__isnull': True}).exclude(**{field: ''}).values(field).annotate(
+        total_electors=Count('koc_id'),
+        male=Count('koc_id', filter=Q(gender='MALE')),
+        female=Count('koc_id', filter=Q(gender='FEMALE')),
+        attended=Count('koc_id', filter=Q(has_attended=True))
+    ).order_by(field)
+    
+    return [
+        {
+            'code': row[field][:10].upper(),  # Use first 10 chars as code
+            'name': row[field],
+            'total_electors': row['total_electors'],
+            'attended': row['attended'],
+            'attendance_percentage': round((row['attended'] / row['total_electors'] * 100), 1) if row['total_electors'] > 0 else 0,
+            'male': row['male'],
+            'female': row['female']
+        }
+        for row in rows
+    ]
+
+
 def get_elector_demographics(election_id):
     """
     Get demographic breakdown of electors.
     
+    Each dimension (area, department, team, family) is one grouped query
+    with attendance joined in as a per-elector EXISTS, so the query count
+    does not depend on how many distinct values a dimension has.
+    
     Args:
         election_id: Election ID
     
     Returns:
         Dict with comprehensive demographic data
     """
+    from django.db.models import Exists, OuterRef
+    
     from apps.electors.models import Elector
-    from apps.elections.models import Committee
     from apps.attendees.models import Attendance
     
-    # Get committees for this election
-    committees = Committee.objects.filter(election_id=election_id)
-    
-    # Get all active electors
+    # Get all active electors of this election, flagged when they attended
     electors = Elector.objects.filter(
-        committee__in=committees,
+        committee__election_id=election_id,
         is_active=True
+    ).annotate(
+        has_attended=Exists(
+            Attendance.objects.filter(elector_id=OuterRef('koc_id'), status=Attendance.Status.ATTENDED)
+        )
     )
     
     # Overall counts
-    total = electors.count()
-    male_count = electors.filter(gender='MALE').count()
-    female_count = electors.filter(gender='FEMALE').count()
+    totals = electors.aggregate(
+        total=Count('koc_id'),
+        male=Count('koc_id', filter=Q(gender='MALE')),
+        female=Count('koc_id', filter=Q(gender='FEMALE'))
+    )
+    total = totals['total']
+    male_count = totals['male']
+    female_count = totals['female']
     
     male_percentage = round((male_count / total * 100), 1) if total > 0 else 0
     female_percentage = round((female_count / total * 100), 1) if total > 0 else 0
@@ -807,94 +902,6 @@ def get_elector_demographics(election_id):
         }
     ]
     
-    # By Area (using elector's area field)
-    by_area = []
-    area_data = electors.exclude(area__isnull=True).exclude(area='').values('area').annotate(
-        total_electors=Count('koc_id'),
-        male=Count('koc_id', filter=Q(gender='MALE')),
-        female=Count('koc_id', filter=Q(gender='FEMALE'))
-    ).order_by('area')
-    
-    for area_item in area_data:
-        area_name = area_item['area']
-        area_electors = electors.filter(area=area_name)
-        
-        # Get attendance for this area
-        area_attendance = Attendance.objects.filter(
-            elector__in=area_electors,
-            elector__is_active=True
-        ).values('elector').distinct().count()
-        
-        attendance_percentage = round((area_attendance / area_item['total_electors'] * 100), 1) if area_item['total_electors'] > 0 else 0
-        
-        by_area.append({
-            'code': area_name[:10].upper(),  # Use first 10 chars as code
-            'name': area_name,
-            'total_electors': area_item['total_electors'],
-            'attended': area_attendance,
-            'attendance_percentage': attendance_percentage,
-            'male': area_item['male'],
-            'female': area_item['female']
-        })
-    
-    # By Department
-    by_department = []
-    department_data = electors.exclude(department__isnull=True).exclude(department='').values('department').annotate(
-        total_electors=Count('koc_id'),
-        male=Count('koc_id', filter=Q(gender='MALE')),
-        female=Count('koc_id', filter=Q(gender='FEMALE'))
-    ).order_by('department')
-
-    for department_item in department_data:
-        department_name = department_item['department']
-        department_electors = electors.filter(department=department_name)
-
-        department_attendance = Attendance.objects.filter(
-            elector__in=department_electors,
-            elector__is_active=True
-        ).values('elector').distinct().count()
-
-        attendance_percentage = round((department_attendance / department_item['total_electors'] * 100), 1) if department_item['total_electors'] > 0 else 0
-
-        by_department.append({
-            'code': department_name[:10].upper(),
-            'name': department_name,
-            'total_electors': department_item['total_electors'],
-            'attended': department_attendance,
-            'attendance_percentage': attendance_percentage,
-            'male': department_item['male'],
-            'female': department_item['female']
-        })
-
-    # By Team (using elector's team field)
-    by_team = []
-    team_data = electors.exclude(team__isnull=True).exclude(team='').values('team').annotate(
-        total_electors=Count('koc_id'),
-        male=Count('koc_id', filter=Q(gender='MALE')),
-        female=Count('koc_id', filter=Q(gender='FEMALE'))
-    ).order_by('team')
-
-    for team_item in team_data:
-        team_name = team_item['team']
-        team_electors = electors.filter(team=team_name)
-
-        team_attendance = Attendance.objects.filter(
-            elector__in=team_electors,
-            elector__is_active=True
-        ).values('elector').distinct().count()
-
-        attendance_percentage = round((team_attendance / team_item['total_electors'] * 100), 1) if team_item['total_electors'] > 0 else 0
-
-        by_team.append({
-            'code': team_name[:10].upper(),
-            'name': team_name,
-            'total_electors': team_item['total_electors'],
-            'attended': team_attendance,
-            'attendance_percentage': attendance_percentage,
-            'male': team_item['male'],
-            'female': team_item['female']
-        })
-    
     # By family (all families ordered by count)
     by_family = electors.values('family_name').annotate(
         count=Count('koc_id'),
@@ -914,9 +921,9 @@ def get_elector_demographics(election_id):
     
     return {
         'by_gender': by_gender,
-        'by_area': by_area,
-        'by_department': by_department,
-        'by_team': by_team,
+        'by_area': _dimension_breakdown(electors, 'area'),
+        'by_department': _dimension_breakdown(electors, 'department'),
+        'by_team': _dimension_breakdown(electors, 'team'),
         'by_family': by_family_list
     }
 
@@ -943,9 +950,8 @@ def get_attendance_dashboard(election_id):
         return None
     
     # Get all committees for this election
-    committees = Committee.objects.filter(election=election).prefetch_related(
-        'electors', 'attendances'
-    )
+    committees = list(Committee.objects.filter(election=election).values('id', 'code', 'name', 'gender'))
+    committee_metrics = get_committee_metrics(committee_ids=[committee['id'] for committee in committees])
     
     # Overall metrics
     total_electors = Elector.objects.filter(
@@ -969,25 +975,15 @@ def get_attendance_dashboard(election_id):
     # Committee breakdown
     committee_data = []
     for committee in committees:
-        committee_electors = committee.elector_count
-        committee_elector_attendance = committee.attendance_count
-        committee_guarantees = committee.guarantee_count
-        committee_guarantee_attendance = committee.guarantee_attendance_count
-        
-        elector_attendance_pct = round((committee_elector_attendance / committee_electors * 100), 2) if committee_electors > 0 else 0
-        guarantee_attendance_pct = round((committee_guarantee_attendance / committee_guarantees * 100), 2) if committee_guarantees > 0 else 0
-        
+        metrics = committee_metrics[committee['id']]
         committee_data.append({
-            'id': committee.id,
-            'code': committee.code,
-            'name': committee.name,
-            'gender': committee.gender,
-            'elector_count': committee_electors,
-            'elector_attendance_count': committee_elector_attendance,
-            'elector_attendance_percentage': elector_attendance_pct,
-            'guarantee_count': committee_guarantees,
-            'guarantee_attendance_count': committee_guarantee_attendance,
-            'guarantee_attendance_percentage': guarantee_attendance_pct,
+            **committee,
+            'elector_count': metrics['elector_count'],
+            'elector_attendance_count': metrics['attendance_count'],
+            'elector_attendance_percentage': metrics['attendance_percentage'],
+            'guarantee_count': metrics['guarantee_count'],
+            'guarantee_attendance_count': metrics['guarantee_attendance_count'],
+            'guarantee_attendance_percentage': metrics['guarantee_attendance_percentage'],
         })
     
     # Guarantees breakdown by user and group
@@ -1088,21 +1084,37 @@ def get_attendance_dashboard(election_id):
     }
 
 
-def get_dashboard_overview(election_id):
+def get_dashboard_overview(election_id, refresh=False):
     """
     Return a consolidated dashboard snapshot (attendance + demographics).
 
+    Served from the precomputed store (apps.elections.precompute); see
+    ``get_precomputed`` for the time the snapshot was built.
+
     Args:
         election_id: Election identifier
+        refresh: Rebuild the snapshot instead of using the stored one
 
     Returns:
         tuple[dict, dict] | None: (overview_payload, aggregate_totals) or None if election missing
     """
-    attendance_data = get_attendance_dashboard(election_id)
+    from ..precompute import get_precomputed
+
+    return get_precomputed('overview', election_id, refresh=refresh).data
+
+
+def _build_dashboard_overview(election_id, attendance_data=None, demographics_data=None):
+    """
+    Build the overview; reuses ``attendance_data`` / ``demographics_data``
+    when the caller already computed them.
+    """
+    if attendance_data is None:
+        attendance_data = get_attendance_dashboard(election_id)
     if attendance_data is None:
         return None
 
-    demographics_data = get_elector_demographics(election_id)
+    if demographics_data is None:
+        demographics_data = get_elector_demographics(election_id)
 
     overview = {
         'summary': attendance_data['summary'],
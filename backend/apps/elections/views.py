@@ -22,12 +22,14 @@ from .serializers import (
     GuaranteeTrendSerializer,
     GroupPerformanceSerializer,
     HourlyAttendanceSerializer,
+    TurnoutCurveSerializer,
     ElectorDemographicsSerializer,
     ElectorDistributionSerializer,
     GuaranteeDistributionSerializer,
     AttendanceDashboardSerializer,
     DashboardOverviewSerializer,
 )
+from apps.utils.conditional import request_etag, set_validators, tables_version
 from apps.utils.viewsets import StandardResponseMixin
 from apps.utils.responses import APIResponse
 from apps.utils.permissions import IsAdminOrAbove
@@ -36,17 +38,23 @@ from .utils.dashboard_queries import (
     get_group_performance,
     get_guarantee_distribution,
     get_hourly_attendance,
-    get_elector_demographics,
+    get_turnout_curve,
     get_elector_distribution,
-    get_attendance_dashboard,
-    get_dashboard_overview,
 )
+from .precompute import get_precomputed
+
+
+def _refresh_requested(request):
+    """``?refresh=1`` rebuilds a precomputed dashboard instead of serving it."""
+    return request.query_params.get('refresh') in {'1', 'true', 'True'}
 
 
 class ElectionViewSet(StandardResponseMixin, viewsets.ModelViewSet):
     """Election management viewset."""
 
     queryset = Election.objects.all()
+    # Tables the election payload reads (conditional GET): committee_count, members, created_by
+    conditional_models = (Election, Committee, 'account.CustomUser')
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status']
@@ -65,9 +73,19 @@ class ElectionViewSet(StandardResponseMixin, viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
+    # Tables the current election payload reads (conditional GET)
+    CURRENT_ELECTION_MODELS = (
+        Election, Committee, 'electors.Elector', 'candidates.Party', 'candidates.Candidate', 'account.CustomUser',
+    )
+
     @action(detail=False, methods=['get'])
     def current(self, request):
         """Return the current active election with related data."""
+        etag = request_etag(request, tables_version(self.CURRENT_ELECTION_MODELS))
+        cached = APIResponse.not_modified(request, etag)
+        if cached is not None:
+            return cached
+
         try:
             election = Election.objects.filter(status__in=['SETUP', 'ACTIVE']).order_by('-created_at').first()
             if not election:
@@ -100,7 +118,8 @@ class ElectionViewSet(StandardResponseMixin, viewsets.ModelViewSet):
                     'candidates': candidates_data,
                     'members': users_data
                 },
-                message='Current election data retrieved successfully'
+                message='Current election data retrieved successfully',
+                etag=etag
             )
         except Exception as exc:  # pragma: no cover - defensive
             import logging
@@ -248,6 +267,12 @@ class CommitteeViewSet(StandardResponseMixin, viewsets.ModelViewSet):
     """Committee management viewset."""
 
     queryset = Committee.objects.select_related('election').all()
+    # Tables the committee payload reads (conditional GET): election name,
+    # assigned users and the elector/attendance/vote count fields
+    conditional_models = (
+        Committee, Election, 'account.CustomUser',
+        'electors.Elector', 'attendees.Attendance', 'guarantees.Guarantee', 'voting.VoteCount',
+    )
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['election', 'gender']
@@ -426,15 +451,48 @@ class HourlyAttendanceView(APIView):
         })
 
 
+class TurnoutCurveView(APIView):
+    """GET /api/elections/{election_id}/dashboard/attendance/turnout"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, election_id):
+        get_object_or_404(Election, id=election_id)
+        date_str = request.query_params.get('date')
+        interval = request.query_params.get('interval', 15)
+
+        try:
+            data = get_turnout_curve(election_id, date_str, interval)
+        except ValueError as exc:
+            return Response(
+                {'status': 'error', 'message': str(exc)},
+                status=http_status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = TurnoutCurveSerializer(data)
+        return Response({
+            'status': 'success',
+            'data': serializer.data,
+            'meta': {
+                'election_id': election_id,
+                'date': date_str or datetime.now().date().isoformat(),
+                'interval': data['interval']
+            }
+        })
+
+
 class ElectorDemographicsView(APIView):
     """GET /api/elections/{election_id}/dashboard/electors/demographics"""
     permission_classes = [IsAuthenticated]
 
     def get(self, request, election_id):
         get_object_or_404(Election, id=election_id)
-        data = get_elector_demographics(election_id)
+        data, as_of = get_precomputed('demographics', election_id, refresh=_refresh_requested(request))
+        etag = request_etag(request, as_of.timestamp())
+        cached = APIResponse.not_modified(request, etag, as_of)
+        if cached is not None:
+            return cached
         serializer = ElectorDemographicsSerializer(data)
-        return Response({
+        return set_validators(Response({
             'status': 'success',
             'data': serializer.data,
             'meta': {
@@ -443,9 +501,10 @@ class ElectorDemographicsView(APIView):
                 'total_teams': len(data['by_team']),
                 'total_departments': len(data.get('by_department', [])),
                 'total_families': len(data['by_family']),
-                'last_updated': datetime.now().isoformat()
+                'as_of': as_of.isoformat(),
+                'last_updated': as_of.isoformat()
             }
-        })
+        }), etag, as_of)
 
 
 class ElectorDistributionView(APIView):
@@ -486,20 +545,25 @@ class AttendanceDashboardView(APIView):
 
     def get(self, request, election_id):
         get_object_or_404(Election, id=election_id)
-        data = get_attendance_dashboard(election_id)
+        data, as_of = get_precomputed('attendance', election_id, refresh=_refresh_requested(request))
+        etag = request_etag(request, as_of.timestamp())
+        cached = APIResponse.not_modified(request, etag, as_of)
+        if cached is not None:
+            return cached
         if data is None:
             return Response({'status': 'error', 'message': 'Election not found'}, status=http_status.HTTP_404_NOT_FOUND)
 
         serializer = AttendanceDashboardSerializer(data)
-        return Response({
+        return set_validators(Response({
             'status': 'success',
             'data': serializer.data,
             'meta': {
                 'election_id': election_id,
                 'total_committees': len(data['committees']),
-                'last_updated': datetime.now().isoformat()
+                'as_of': as_of.isoformat(),
+                'last_updated': as_of.isoformat()
             }
-        })
+        }), etag, as_of)
 
 
 class DashboardOverviewView(APIView):
@@ -509,7 +573,11 @@ class DashboardOverviewView(APIView):
 
     def get(self, request, election_id):
         get_object_or_404(Election, id=election_id)
-        result = get_dashboard_overview(election_id)
+        result, as_of = get_precomputed('overview', election_id, refresh=_refresh_requested(request))
+        etag = request_etag(request, as_of.timestamp())
+        cached = APIResponse.not_modified(request, etag, as_of)
+        if cached is not None:
+            return cached
         if result is None:
             return Response(
                 {'status': 'error', 'message': 'Election not found'},
@@ -518,12 +586,13 @@ class DashboardOverviewView(APIView):
 
         overview, totals = result
         serializer = DashboardOverviewSerializer(overview)
-        return Response({
+        return set_validators(Response({
             'status': 'success',
             'data': serializer.data,
             'meta': {
                 'election_id': election_id,
                 'totals': totals,
-                'generated_at': datetime.now().isoformat()
+                'as_of': as_of.isoformat(),
+                'generated_at': as_of.isoformat()
             }
-        })
\ No newline at end of file
+        }), etag, as_of)
\ No newline at end of file
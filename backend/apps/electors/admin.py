@@ -2,7 +2,7 @@
 Admin configuration for elector management.
 """
 from django.contrib import admin
-from .models import Elector
+from .models import Elector, ElectorImportJob
 
 
 @admin.register(Elector)
@@ -86,3 +86,13 @@ class ElectorAdmin(admin.ModelAdmin):
         return obj.full_name
     full_name.short_description = 'Full Name'
 
+
+
+@admin.register(ElectorImportJob)
+class ElectorImportJobAdmin(admin.ModelAdmin):
+    """Admin for background elector imports."""
+    
+    list_display = ['id', 'original_filename', 'status', 'update_existing', 'created_by', 'created_at']
+    list_filter = ['status', 'update_existing', 'created_at']
+    search_fields = ['original_filename', 'created_by__email']
+    readonly_fields = ['progress', 'result', 'errors', 'started_at', 'finished_at', 'created_at', 'updated_at']
@@ -6,3 +6,6 @@ class ElectorsConfig(AppConfig):
     name = 'apps.electors'
     verbose_name = 'Elector Management'
 
+    def ready(self):
+        """Import signals when app is ready."""
+        import apps.electors.signals  # noqa
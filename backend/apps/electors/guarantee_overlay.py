@@ -0,0 +1,69 @@
+"""
+Batch guarantee overlay for elector listings.
+
+Elector rows shown in lists carry the guarantee fields of the elector
+(status, group, confirmation, mobile). ``load_guarantee_overlay`` loads them
+for a whole page of electors in one query; ``GuaranteeOverlayListSerializer``
+does that before a ``many=True`` serializer renders its rows, so each row is
+served from the map instead of running its own query.
+"""
+from typing import Dict, Iterable, Optional
+
+from django.db import models
+from rest_framework import serializers
+
+
+GUARANTEE_OVERLAY_FIELDS = (
+    'id',
+    'elector_id',
+    'guarantee_status',
+    'confirmation_status',
+    'group_id',
+    'group__name',
+    'group__color',
+    'mobile',
+)
+
+
+def load_guarantee_overlay(koc_ids: Iterable[str], user=None) -> Dict[str, Dict]:
+    """
+    Map ``koc_id`` to its guarantee values for the given electors.
+
+    With an authenticated ``user`` only that user's guarantees are used;
+    otherwise the newest guarantee of the elector. Electors without a
+    guarantee are absent from the map.
+    """
+    from apps.guarantees.models import Guarantee
+
+    koc_ids = list(dict.fromkeys(koc_ids))
+    if not koc_ids:
+        return {}
+
+    queryset = Guarantee.objects.filter(elector_id__in=koc_ids)
+    if user is not None and user.is_authenticated:
+        queryset = queryset.filter(user=user)
+
+    overlay: Dict[str, Dict] = {}
+    for row in queryset.order_by('-created_at', '-id').values(*GUARANTEE_OVERLAY_FIELDS):
+        overlay.setdefault(row['elector_id'], row)
+    return overlay
+
+
+def guarantee_status_of(overlay: Dict[str, Dict], koc_id: str) -> Optional[str]:
+    """Guarantee status of ``koc_id`` in ``overlay``, or None."""
+    row = overlay.get(koc_id)
+    return row['guarantee_status'] if row else None
+
+
+class GuaranteeOverlayListSerializer(serializers.ListSerializer):
+    """
+    List serializer that loads the guarantee overlay for all rows up front.
+
+    The child serializer must implement ``prefetch_guarantees(instances)``.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        instances = list(iterable)
+        self.child.prefetch_guarantees(instances)
+        return super().to_representation(instances)
@@ -3,9 +3,11 @@ CSV import service for electors.
 """
 import csv
 import io
-from typing import Dict, List, Tuple
+from itertools import islice
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from django.db import transaction
 from .models import Elector
+from .sync import CHANGED, INSERTED, UNCHANGED, ElectorSync
 from apps.elections.models import Committee
 
 
@@ -13,111 +15,161 @@ class ElectorImportService:
     """
     Service for importing electors from CSV file.
     Handles validation, parsing, and batch creation.
+
+    Rows are streamed from the file and processed in chunks of
+    ``CHUNK_SIZE``: committees are resolved once up front and each chunk is
+    diffed and written by ``ElectorSync`` (one ``IN`` query, bulk writes of
+    new and changed rows only) in its own transaction. Memory use does not
+    grow with the size of the file.
     """
-    
+
+    CHUNK_SIZE = 2000
+
+    # Error / warning messages kept in the result (counts are always exact)
+    MAX_MESSAGES = 1000
+
     def __init__(self):
         self.errors = []
         self.warnings = []
         self.created_count = 0
         self.updated_count = 0
+        self.unchanged_count = 0
         self.skipped_count = 0
-    
+        self._committees: Optional[Dict[str, Optional[Committee]]] = None
+        self._dropped_messages = 0
+
+    def iter_rows(self, source: Union[bytes, BinaryIO]) -> Iterator[Dict]:
+        """
+        Stream CSV rows as dictionaries.
+
+        Args:
+            source: CSV content as bytes, or a binary file object
+                (e.g. an uploaded file) that is read incrementally
+
+        Yields:
+            Dictionaries with elector data
+        """
+        stream = io.BytesIO(source) if isinstance(source, bytes) else source
+        # Unwrap Django File / UploadedFile proxies down to the raw binary stream
+        while hasattr(stream, 'file'):
+            stream = stream.file
+        # utf-8-sig also accepts plain UTF-8 and strips a leading BOM
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        try:
+            yield from csv.DictReader(text)
+        finally:
+            # Leave the caller's file open
+            text.detach()
+
     def parse_csv(self, file_content: bytes) -> List[Dict]:
         """
         Parse CSV file content into list of dictionaries.
-        
+
         Args:
             file_content: CSV file content as bytes
-        
+
         Returns:
             List of dictionaries with elector data
         """
-        # Decode bytes to string
-        try:
-            content = file_content.decode('utf-8')
-        except UnicodeDecodeError:
-            content = file_content.decode('utf-8-sig')  # Try with BOM
-        
-        # Parse CSV
-        reader = csv.DictReader(io.StringIO(content))
-        return list(reader)
-    
+        return list(self.iter_rows(file_content))
+
+    def load_committees(self) -> Dict[str, Optional[Committee]]:
+        """
+        Resolve every committee code in one query.
+
+        Codes are only unique per election; a code used by several
+        elections maps to None and is reported as ambiguous.
+        """
+        committees: Dict[str, Optional[Committee]] = {}
+        for committee in Committee.objects.only('id', 'code', 'gender'):
+            committees[committee.code] = None if committee.code in committees else committee
+        self._committees = committees
+        return committees
+
     def validate_row(self, row: Dict, row_number: int) -> Tuple[bool, Dict, List[str]]:
         """
         Validate a single row from CSV.
-        
+
         Args:
             row: Dictionary with elector data
             row_number: Row number for error reporting
-        
+
         Returns:
             Tuple of (is_valid, cleaned_data, errors)
         """
         errors = []
         cleaned_data = {}
-        
+
         # Required: KOC ID
-        koc_id = row.get('KOC', '').strip()
+        koc_id = (row.get('KOC') or '').strip()
         if not koc_id:
             errors.append(f"Row {row_number}: KOC ID is required")
             return False, cleaned_data, errors
-        
+
         cleaned_data['koc_id'] = koc_id
-        
+
         # Required: Name
-        name = row.get('Name', '').strip()
+        name = (row.get('Name') or '').strip()
         if not name:
             errors.append(f"Row {row_number}: Name is required")
             return False, cleaned_data, errors
-        
+
         # Parse name into 7 components
         name_parts = Elector.parse_full_name(name)
         cleaned_data.update(name_parts)
-        
+
         # Optional fields with exact CSV column names
-        cleaned_data['designation'] = row.get('Desgnation', '').strip()  # Note: Typo in CSV
-        cleaned_data['section'] = row.get('Section', '').strip()
-        cleaned_data['location'] = row.get('Location', '').strip()
-        cleaned_data['extension'] = row.get('Ext.', '').strip()
-        cleaned_data['mobile'] = row.get('Mobile', '').strip()
-        cleaned_data['area'] = row.get('Area', '').strip()
-        cleaned_data['department'] = row.get('Department', row.get('Team', '')).strip()
-        cleaned_data['team'] = row.get('Team', row.get('sub_team', '')).strip()
-        committee_code = row.get('Code', '').strip()
-        
-        # Determine gender from committee code (if not explicitly provided)
-        # You can implement logic based on committee naming or provide it separately
-        # For now, we'll need to get it from somewhere or default
-        cleaned_data['gender'] = 'MALE'  # Default, should be determined properly
-        
+        cleaned_data['designation'] = (row.get('Desgnation') or '').strip()  # Note: Typo in CSV
+        cleaned_data['section'] = (row.get('Section') or '').strip()
+        cleaned_data['extension'] = (row.get('Ext.') or '').strip()
+        cleaned_data['mobile'] = (row.get('Mobile') or '').strip()
+        cleaned_data['area'] = (row.get('Area') or '').strip()
+        cleaned_data['department'] = (row.get('Department', row.get('Team')) or '').strip()
+        cleaned_data['team'] = (row.get('Team', row.get('sub_team')) or '').strip()
+        committee_code = (row.get('Code') or '').strip()
+
         # Committee assignment
-        if committee_code:
-            try:
-                committee = Committee.objects.get(code=committee_code)
-                cleaned_data['committee'] = committee
-                # Override gender based on committee
-                cleaned_data['gender'] = committee.gender
-            except Committee.DoesNotExist:
-                errors.append(
-                    f"Row {row_number}: Committee '{committee_code}' not found. "
-                    "Please create committee first."
-                )
-                return False, cleaned_data, errors
-        else:
+        if not committee_code:
             errors.append(f"Row {row_number}: Committee code is required")
             return False, cleaned_data, errors
-        
+
+        if self._committees is None:
+            self.load_committees()
+        if committee_code not in self._committees:
+            errors.append(
+                f"Row {row_number}: Committee '{committee_code}' not found. "
+                "Please create committee first."
+            )
+            return False, cleaned_data, errors
+        committee = self._committees[committee_code]
+        if committee is None:
+            errors.append(
+                f"Row {row_number}: Committee code '{committee_code}' is used by "
+                "more than one election."
+            )
+            return False, cleaned_data, errors
+
+        cleaned_data['committee'] = committee
+        # Gender follows the committee
+        cleaned_data['gender'] = committee.gender
+
         return True, cleaned_data, errors
-    
-    @transaction.atomic
-    def import_electors(self, file_content: bytes, update_existing: bool = False) -> Dict:
+
+    def import_electors(
+        self,
+        source: Union[bytes, BinaryIO],
+        update_existing: bool = False,
+        on_progress: Optional[Callable[[Dict], None]] = None,
+    ) -> Dict:
         """
         Import electors from CSV file.
-        
+
         Args:
-            file_content: CSV file content as bytes
+            source: CSV content as bytes, or a binary file object
             update_existing: If True, update existing electors; if False, skip them
-        
+            on_progress: Optional callback receiving the running counts
+                after each committed chunk
+
         Returns:
             Dictionary with import results
         """
@@ -126,86 +178,106 @@ class ElectorImportService:
         self.created_count = 0
         self.updated_count = 0
         self.skipped_count = 0
-        
+        self.unchanged_count = 0
+        self._dropped_messages = 0
+        self._sync = ElectorSync(update_existing=update_existing)
+        self.load_committees()
+
+        total_rows = 0
+        rows = enumerate(self.iter_rows(source), start=2)  # Start at 2 (row 1 is header)
         try:
-            rows = self.parse_csv(file_content)
-        except Exception as e:
+            while True:
+                chunk = list(islice(rows, self.CHUNK_SIZE))
+                if not chunk:
+                    break
+                total_rows += len(chunk)
+                self._import_chunk(chunk, update_existing)
+                if on_progress:
+                    on_progress(self.progress(total_rows))
+        except (csv.Error, UnicodeDecodeError) as e:
+            self._sync.finish()
             return {
                 'success': False,
                 'error': f'Failed to parse CSV file: {str(e)}',
-                'results': {}
+                'results': self._results(total_rows),
             }
-        
-        if not rows:
+
+        if not total_rows:
             return {
                 'success': False,
                 'error': 'CSV file is empty or invalid',
                 'results': {}
             }
-        
-        # Process each row
-        electors_to_create = []
-        electors_to_update = []
-        
-        for idx, row in enumerate(rows, start=2):  # Start at 2 (row 1 is header)
+
+        self._sync.finish()
+
+        # Prepare result
+        total_processed = self.created_count + self.updated_count + self.unchanged_count + self.skipped_count
+        return {
+            'success': len(self.errors) == 0 and total_processed > 0,
+            **self._results(total_rows),
+        }
+
+    @transaction.atomic
+    def _import_chunk(self, chunk: List[Tuple[int, Dict]], update_existing: bool):
+        """Validate one chunk of rows and write it with bulk queries."""
+        valid: Dict[str, Tuple[int, Dict]] = {}
+        for idx, row in chunk:
             is_valid, cleaned_data, row_errors = self.validate_row(row, idx)
-            
             if not is_valid:
-                self.errors.extend(row_errors)
+                self._add_message(self.errors, *row_errors)
                 self.skipped_count += 1
                 continue
-            
+
             koc_id = cleaned_data['koc_id']
-            
-            # Check if elector exists
-            try:
-                elector = Elector.objects.get(koc_id=koc_id)
-                
-                if update_existing:
-                    # Update existing elector
-                    for key, value in cleaned_data.items():
-                        setattr(elector, key, value)
-                    electors_to_update.append(elector)
-                else:
-                    self.skipped_count += 1
-                    self.warnings.append(
-                        f"Row {idx}: Elector {koc_id} already exists (skipped)"
-                    )
-            
-            except Elector.DoesNotExist:
-                # Create new elector
-                elector = Elector(**cleaned_data)
-                electors_to_create.append(elector)
-        
-        # Bulk create new electors
-        if electors_to_create:
-            Elector.objects.bulk_create(electors_to_create, ignore_conflicts=True)
-            self.created_count = len(electors_to_create)
-        
-        # Bulk update existing electors
-        if electors_to_update:
-            Elector.objects.bulk_update(
-                electors_to_update,
-                fields=[
-                    'name_first', 'name_second', 'name_third', 'name_fourth',
-                    'name_fifth', 'name_sixth', 'sub_family_name', 'family_name',
-                    'designation', 'section', 'location', 'extension',
-                    'mobile', 'area', 'department', 'team', 'committee', 'gender'
-                ]
-            )
-            self.updated_count = len(electors_to_update)
-        
-        # Prepare result
-        total_processed = self.created_count + self.updated_count + self.skipped_count
-        success = len(self.errors) == 0 and total_processed > 0
-        
+            if koc_id in valid:
+                self.skipped_count += 1
+                self._add_message(self.warnings, f"Row {idx}: Duplicate KOC ID {koc_id} in file (skipped)")
+                continue
+            valid[koc_id] = (idx, cleaned_data)
+
+        if not valid:
+            return
+
+        outcomes = self._sync.sync_chunk({koc_id: data for koc_id, (idx, data) in valid.items()})
+        for koc_id, outcome in outcomes.items():
+            if outcome == INSERTED:
+                self.created_count += 1
+            elif outcome == CHANGED:
+                self.updated_count += 1
+            elif outcome == UNCHANGED:
+                self.unchanged_count += 1
+            else:
+                self.skipped_count += 1
+                self._add_message(self.warnings, f"Row {valid[koc_id][0]}: Elector {koc_id} already exists (skipped)")
+
+    def progress(self, processed_rows: int) -> Dict:
+        """Running counts, as reported to ``on_progress``."""
         return {
-            'success': success,
-            'total_rows': len(rows),
+            'processed_rows': processed_rows,
+            'created': self.created_count,
+            'updated': self.updated_count,
+            'unchanged': self.unchanged_count,
+            'skipped': self.skipped_count,
+        }
+
+    def _add_message(self, messages: List[str], *new_messages: str):
+        for message in new_messages:
+            if len(messages) < self.MAX_MESSAGES:
+                messages.append(message)
+            else:
+                self._dropped_messages += 1
+
+    def _results(self, total_rows: int) -> Dict:
+        results = {
+            'total_rows': total_rows,
             'created': self.created_count,
             'updated': self.updated_count,
+            'unchanged': self.unchanged_count,
             'skipped': self.skipped_count,
             'errors': self.errors,
             'warnings': self.warnings,
         }
-
+        if self._dropped_messages:
+            results['truncated_messages'] = self._dropped_messages
+        return results
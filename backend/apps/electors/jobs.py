@@ -0,0 +1,137 @@
+"""
+Background elector import jobs.
+
+``ElectorImportJob`` rows are created by the upload endpoint and handed to
+the background runner once the upload is committed. The worker streams the
+stored CSV through ``ElectorImportService`` and broadcasts progress after
+every chunk as ``import_progress`` events on the ``election_updates`` group.
+
+The runner threads die with their process, so ``recover_import_jobs`` (a
+periodic worker in each web process) re-queues jobs still QUEUED after
+``STALE_AFTER`` and fails RUNNING jobs whose progress stopped that long ago.
+"""
+import logging
+from datetime import timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.utils import timezone
+
+from apps.utils.background import run_in_background
+from apps.utils.periodic import PeriodicWorker, start_periodic_worker
+from apps.utils.websocket_utils import broadcast_to_group
+
+from .import_service import ElectorImportService
+from .models import ElectorImportJob
+
+logger = logging.getLogger(__name__)
+
+# Queued jobs not started and running jobs without progress for this long
+# are taken to be orphaned by a process restart
+STALE_AFTER = timedelta(minutes=10)
+
+
+def enqueue_import_job(job: ElectorImportJob):
+    """Start ``job`` on the background runner after the current transaction commits."""
+    job_id = job.pk
+    transaction.on_commit(lambda: run_in_background(run_import_job, job_id))
+
+
+def broadcast_job(job: ElectorImportJob, action: str):
+    """Push the job's status and running counts to connected clients."""
+    data: Dict = {
+        'job_id': job.pk,
+        'status': job.status,
+        'progress': job.progress,
+    }
+    if job.status in (ElectorImportJob.Status.COMPLETED, ElectorImportJob.Status.FAILED):
+        data['success'] = job.status == ElectorImportJob.Status.COMPLETED and job.result.get('success', False)
+        data['error_count'] = len(job.result.get('errors', []))
+    broadcast_to_group('election_updates', 'import_progress', {'data': data}, action)
+
+
+def run_import_job(job_id: int):
+    """Execute a queued import job. Safe to call more than once per job."""
+    now = timezone.now()
+    claimed = ElectorImportJob.objects.filter(pk=job_id, status=ElectorImportJob.Status.QUEUED).update(
+        status=ElectorImportJob.Status.RUNNING, started_at=now, updated_at=now
+    )
+    if not claimed:
+        logger.info(f"Elector import job {job_id} is not queued; skipping")
+        return
+    job = ElectorImportJob.objects.get(pk=job_id)
+    broadcast_job(job, 'started')
+
+    def on_progress(progress: Dict):
+        job.update_progress(progress)
+        broadcast_job(job, 'progress')
+
+    service = ElectorImportService()
+    try:
+        with job.file.open('rb') as csv_file:
+            results = service.import_electors(csv_file, job.update_existing, on_progress=on_progress)
+    except Exception as e:
+        logger.error(f"Elector import job {job_id} failed: {e}", exc_info=True)
+        job.mark_failed({'message': str(e)})
+        broadcast_job(job, 'failed')
+        return
+
+    if 'error' in results:
+        job.mark_failed({'message': results['error']}, result=results.get('results') or {})
+        broadcast_job(job, 'failed')
+        return
+
+    job.mark_complete(results)
+    broadcast_job(job, 'completed')
+
+
+def recover_import_jobs() -> Dict[str, int]:
+    """
+    Re-queue jobs left QUEUED and fail jobs left RUNNING by a dead process.
+    Returns the counts of both.
+    """
+    cutoff = timezone.now() - STALE_AFTER
+    Status = ElectorImportJob.Status
+
+    failed = 0
+    for job in ElectorImportJob.objects.filter(status=Status.RUNNING, updated_at__lt=cutoff):
+        now = timezone.now()
+        errors = (job.errors or []) + [{'message': 'Import interrupted; the worker running it stopped'}]
+        # Guarded on updated_at so a job that reported progress meanwhile is left alone
+        if ElectorImportJob.objects.filter(pk=job.pk, status=Status.RUNNING, updated_at=job.updated_at).update(
+            status=Status.FAILED, errors=errors, finished_at=now, updated_at=now
+        ):
+            job.refresh_from_db()
+            broadcast_job(job, 'failed')
+            failed += 1
+
+    requeued = 0
+    for job_id in ElectorImportJob.objects.filter(status=Status.QUEUED, created_at__lt=cutoff).values_list('pk', flat=True):
+        # The claim in run_import_job keeps a job that is still waiting from running twice
+        run_in_background(run_import_job, job_id)
+        requeued += 1
+
+    if failed or requeued:
+        logger.warning(f"Recovered elector import jobs: {requeued} re-queued, {failed} failed")
+    return {'requeued': requeued, 'failed': failed}
+
+
+def run_recovery_tick() -> Dict[str, int]:
+    """One recovery pass, with its own database connection."""
+    close_old_connections()
+    try:
+        return recover_import_jobs()
+    except Exception:
+        logger.exception("Elector import job recovery failed")
+        return {'requeued': 0, 'failed': 0}
+    finally:
+        connections.close_all()
+
+
+def start_import_recovery_worker() -> Optional[PeriodicWorker]:
+    """Start this process's recovery thread when jobs run on in-process threads."""
+    if getattr(settings, 'BACKGROUND_TASK_RUNNER', 'thread') != 'thread':
+        return None
+    tick = getattr(settings, 'ELECTOR_IMPORT_RECOVERY_TICK_SECONDS', 60)
+    return start_periodic_worker('elector-import-recovery', tick, run_recovery_tick)
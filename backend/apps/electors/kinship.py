@@ -0,0 +1,289 @@
+"""
+Materialized kinship graph for electors.
+
+Family relations are inferred from name-part equality (Arabic names carry
+the father's and grandfather's names). Instead of running four queries
+every time a profile is opened, the inferred edges are stored in
+``ElectorRelation`` and read back with a single indexed query.
+
+The inference rules live in ``RULES`` and are shared by:
+  * ``rebuild_relations`` - bulk rebuild from an in-memory pass over all
+    electors (used by the ``rebuild_kinship`` management command)
+  * ``refresh_relations`` - incremental refresh after an elector changes
+
+``relatives_of`` is the read side used by the relatives endpoints.
+"""
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from .models import Elector, ElectorRelation
+
+logger = logging.getLogger(__name__)
+
+
+KINSHIP_FIELDS = (
+    'koc_id',
+    'name_first',
+    'name_second',
+    'name_third',
+    'name_fourth',
+    'name_fifth',
+    'family_name',
+)
+
+# Above this many changed electors a full rebuild is cheaper than per-row refreshes
+FULL_REBUILD_THRESHOLD = 500
+
+
+class Rule:
+    """
+    One relationship rule.
+
+    ``criteria(x)`` returns the name-part equalities a relative of ``x`` must
+    satisfy (or None when ``x`` lacks the parts needed); ``exclude(x)``
+    optionally returns equalities that disqualify a candidate.
+    """
+
+    def __init__(
+        self,
+        relationship: str,
+        criteria: Callable[[Dict], Optional[Dict]],
+        exclude: Callable[[Dict], Optional[Dict]] = lambda x: None,
+        limit: Optional[int] = None,
+    ):
+        self.relationship = relationship
+        self.criteria = criteria
+        self.exclude = exclude
+        self.limit = limit
+
+
+def _brothers(x):
+    if not (x['name_second'] and x['name_third']):
+        return None
+    criteria = {'name_second': x['name_second'], 'name_third': x['name_third']}
+    if x['name_fourth']:
+        criteria['name_fourth'] = x['name_fourth']
+    else:
+        criteria['family_name'] = x['family_name']
+    return criteria
+
+
+def _fathers(x):
+    if not (x['name_second'] and x['name_third'] and x['family_name']):
+        return None
+    return {
+        'name_first': x['name_second'],
+        'name_second': x['name_third'],
+        'family_name': x['family_name'],
+    }
+
+
+def _sons(x):
+    if not (x['name_first'] and x['name_second'] and x['family_name']):
+        return None
+    return {
+        'name_second': x['name_first'],
+        'name_third': x['name_second'],
+        'family_name': x['family_name'],
+    }
+
+
+def _cousins(x):
+    if not (x['name_third'] and x['name_fourth']):
+        return None
+    criteria = {'name_third': x['name_third'], 'name_fourth': x['name_fourth']}
+    if x['name_fifth']:
+        criteria['name_fifth'] = x['name_fifth']
+    else:
+        criteria['family_name'] = x['family_name']
+    return criteria
+
+
+def _not_brothers(x):
+    # Same 2nd name means they are brothers, not cousins
+    return {'name_second': x['name_second']} if x['name_second'] else None
+
+
+RULES = (
+    Rule(ElectorRelation.BROTHER, _brothers, limit=10),
+    Rule(ElectorRelation.FATHER, _fathers),
+    Rule(ElectorRelation.SON, _sons),
+    Rule(ElectorRelation.COUSIN, _cousins, exclude=_not_brothers, limit=10),
+)
+
+
+RELATIONSHIP_ORDER = {rule.relationship: position for position, rule in enumerate(RULES)}
+
+
+def _sort_key(row: Dict) -> Tuple[str, str, str]:
+    # Mirrors Elector.Meta.ordering so capped rules keep the same relatives
+    return (row['name_first'], row['family_name'], row['koc_id'])
+
+
+def _matches(row: Dict, equalities: Optional[Dict]) -> bool:
+    return bool(equalities) and all(row[f] == v for f, v in equalities.items())
+
+
+# ----------------------------------------------------------------------
+# Bulk rebuild
+# ----------------------------------------------------------------------
+class _GroupIndex:
+    """Lazily built ``{field-set: {values: [rows]}}`` maps over all electors."""
+
+    def __init__(self, rows: List[Dict]):
+        self.rows = rows
+        self.maps: Dict[Tuple[str, ...], Dict[Tuple, List[Dict]]] = {}
+
+    def lookup(self, criteria: Dict) -> List[Dict]:
+        fields = tuple(sorted(criteria))
+        groups = self.maps.get(fields)
+        if groups is None:
+            groups = defaultdict(list)
+            for row in self.rows:
+                groups[tuple(row[f] for f in fields)].append(row)
+            self.maps[fields] = groups
+        return groups.get(tuple(criteria[f] for f in fields), [])
+
+
+def _edges_for(x: Dict, candidates_for: Callable[[Rule, Dict, Dict], Iterable[Dict]]) -> List[ElectorRelation]:
+    edges = []
+    for rule in RULES:
+        criteria = rule.criteria(x)
+        if not criteria:
+            continue
+        exclusion = rule.exclude(x)
+        count = 0
+        for row in candidates_for(rule, criteria, x):
+            if row['koc_id'] == x['koc_id'] or _matches(row, exclusion):
+                continue
+            edges.append(ElectorRelation(
+                elector_id=x['koc_id'],
+                relative_id=row['koc_id'],
+                relationship=rule.relationship,
+            ))
+            count += 1
+            if rule.limit and count >= rule.limit:
+                break
+    return edges
+
+
+def rebuild_relations(batch_size: int = 5000) -> int:
+    """
+    Recompute every kinship edge in one pass over the electors table.
+
+    Returns the number of edges written.
+    """
+    rows = sorted(
+        Elector.objects.values(*KINSHIP_FIELDS).iterator(chunk_size=5000),
+        key=_sort_key,
+    )
+    for row in rows:
+        for field in KINSHIP_FIELDS:
+            row[field] = row[field] or ''
+
+    index = _GroupIndex(rows)
+    total = 0
+    with transaction.atomic():
+        ElectorRelation.objects.all().delete()
+        batch: List[ElectorRelation] = []
+        for row in rows:
+            batch.extend(_edges_for(row, lambda rule, criteria, x: index.lookup(criteria)))
+            if len(batch) >= batch_size:
+                ElectorRelation.objects.bulk_create(batch, batch_size=batch_size)
+                total += len(batch)
+                batch = []
+        if batch:
+            ElectorRelation.objects.bulk_create(batch, batch_size=batch_size)
+            total += len(batch)
+
+    logger.info('Rebuilt kinship graph: %s edges for %s electors', total, len(rows))
+    return total
+
+
+# ----------------------------------------------------------------------
+# Incremental refresh
+# ----------------------------------------------------------------------
+def _db_candidates(rule: Rule, criteria: Dict, x: Dict) -> Iterable[Dict]:
+    queryset = Elector.objects.filter(**criteria).exclude(koc_id=x['koc_id'])
+    exclusion = rule.exclude(x)
+    if exclusion:
+        queryset = queryset.exclude(**exclusion)
+    queryset = queryset.values(*KINSHIP_FIELDS).order_by('name_first', 'family_name', 'koc_id')
+    if rule.limit:
+        queryset = queryset[:rule.limit]
+    return ({f: r[f] or '' for f in KINSHIP_FIELDS} for r in queryset)
+
+
+def _replace_outgoing(koc_ids: Set[str]) -> Set[str]:
+    """Recompute outgoing edges for ``koc_ids``; return the new relative ids."""
+    rows = {
+        r['koc_id']: {f: r[f] or '' for f in KINSHIP_FIELDS}
+        for r in Elector.objects.filter(koc_id__in=koc_ids).values(*KINSHIP_FIELDS)
+    }
+    edges: List[ElectorRelation] = []
+    for row in rows.values():
+        edges.extend(_edges_for(row, _db_candidates))
+
+    ElectorRelation.objects.filter(elector_id__in=koc_ids).delete()
+    ElectorRelation.objects.bulk_create(edges)
+    return {edge.relative_id for edge in edges}
+
+
+@transaction.atomic
+def refresh_relations(koc_ids: Iterable[str]):
+    """
+    Refresh the kinship edges touching the given electors.
+
+    Outgoing edges of each elector are recomputed, then those of every
+    elector that pointed at it before or is related to it now, since
+    relationships are (almost) symmetric.
+    """
+    koc_ids = set(koc_ids)
+    if not koc_ids:
+        return
+    if len(koc_ids) > FULL_REBUILD_THRESHOLD:
+        rebuild_relations()
+        return
+
+    previous_sources = set(
+        ElectorRelation.objects.filter(relative_id__in=koc_ids).values_list('elector_id', flat=True)
+    )
+    new_relatives = _replace_outgoing(koc_ids)
+    neighbours = (previous_sources | new_relatives) - koc_ids
+    if neighbours:
+        _replace_outgoing(neighbours)
+
+
+# ----------------------------------------------------------------------
+# Read side
+# ----------------------------------------------------------------------
+def relatives_of(elector) -> List[ElectorRelation]:
+    """
+    Kinship edges of ``elector`` in one query, with the relative's committee
+    and guarantee status (``guarantee_status`` attribute) loaded.
+
+    Ordered brothers, fathers, sons, cousins; by name within each group.
+    """
+    from apps.guarantees.models import Guarantee
+
+    guarantee_status = Guarantee.objects.filter(
+        elector_id=OuterRef('relative_id'),
+    ).values('guarantee_status')[:1]
+    relations = (
+        ElectorRelation.objects.filter(elector=elector)
+        .select_related('relative__committee')
+        .annotate(guarantee_status=Subquery(guarantee_status))
+    )
+    return sorted(
+        relations,
+        key=lambda rel: (
+            RELATIONSHIP_ORDER[rel.relationship],
+            rel.relative.name_first or '',
+            rel.relative.family_name or '',
+            rel.relative_id,
+        ),
+    )
@@ -0,0 +1,42 @@
+"""
+Management command to build the memory-mapped elector snapshot used by
+attendance lookups (see apps.electors.snapshot).
+
+Run before election day and whenever the snapshot file is missing; after
+that, elector changes rebuild it automatically.
+
+Usage:
+    python manage.py build_elector_snapshot [--path /var/lib/election/electors.snap]
+"""
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.electors.snapshot import build_snapshot, elector_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Build the memory-mapped elector snapshot for voting-day lookups'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            type=str,
+            default=None,
+            help='Output file (default: ELECTOR_SNAPSHOT_PATH setting)',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path'] or elector_snapshot.path
+        if not path:
+            raise CommandError('Set ELECTOR_SNAPSHOT_PATH or pass --path')
+
+        started = time.monotonic()
+        count = build_snapshot(path)
+        elapsed = time.monotonic() - started
+
+        size_kb = os.path.getsize(path) / 1024
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Wrote {count} elector(s) to {path} ({size_kb:.0f} KB) in {elapsed:.1f}s'
+        ))
@@ -1,8 +1,11 @@
 """
 Management command to import electors from CSV file.
 
+Rows are diffed in bulk against each elector's content hash; only new and
+changed rows are written.
+
 Usage:
-    python manage.py import_electors <csv_file_path> [--update]
+    python manage.py import_electors <csv_file_path> [--update] [--deactivate-missing]
     
 Example:
     python manage.py import_electors backend/files/electors.csv
@@ -10,8 +13,8 @@ Example:
 """
 import csv
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
 from apps.electors.models import Elector
+from apps.electors.sync import ElectorSync
 from apps.elections.models import Committee, Election
 
 
@@ -29,6 +32,11 @@ class Command(BaseCommand):
             action='store_true',
             help='Update existing electors instead of skipping them',
         )
+        parser.add_argument(
+            '--deactivate-missing',
+            action='store_true',
+            help='Treat the file as the full roster: deactivate electors not in it',
+        )
         parser.add_argument(
             '--election-id',
             type=int,
@@ -38,6 +46,7 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         csv_file_path = options['csv_file']
         update_existing = options['update']
+        deactivate_missing = options['deactivate_missing']
         election_id = options.get('election_id')
         
         # Get or create election
@@ -64,11 +73,21 @@ class Command(BaseCommand):
         # Statistics
         stats = {
             'total': 0,
-            'created': 0,
-            'updated': 0,
-            'skipped': 0,
             'errors': []
         }
+        self.committees = {}
+        
+        sync = ElectorSync(update_existing=update_existing)
+        
+        def rows(reader):
+            for row_num, row in enumerate(reader, start=2):  # Start at 2 (row 1 is header)
+                stats['total'] += 1
+                try:
+                    yield self._process_row(row)
+                except Exception as e:
+                    error_msg = f"Row {row_num}: {str(e)}"
+                    stats['errors'].append(error_msg)
+                    self.stdout.write(self.style.ERROR(f'ERROR: {error_msg}'))
         
         self.stdout.write(self.style.NOTICE(f'Reading CSV file: {csv_file_path}\n'))
         
@@ -87,35 +106,40 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.SUCCESS('CSV file validated\n'))
                 self.stdout.write(self.style.NOTICE('Starting import...\n'))
                 
-                rows = list(reader)
-                stats['total'] = len(rows)
-                
-                with transaction.atomic():
-                    for row_num, row in enumerate(rows, start=2):  # Start at 2 (row 1 is header)
-                        try:
-                            result = self._process_row(row, row_num, update_existing)
-                            if result == 'created':
-                                stats['created'] += 1
-                            elif result == 'updated':
-                                stats['updated'] += 1
-                            elif result == 'skipped':
-                                stats['skipped'] += 1
-                                
-                        except Exception as e:
-                            error_msg = f"Row {row_num}: {str(e)}"
-                            stats['errors'].append(error_msg)
-                            self.stdout.write(self.style.ERROR(f'ERROR: {error_msg}'))
+                stats.update(sync.run(rows(reader), deactivate_missing=deactivate_missing))
                 
         except FileNotFoundError:
             raise CommandError(f'File not found: {csv_file_path}')
+        except CommandError:
+            raise
         except Exception as e:
             raise CommandError(f'Error reading CSV file: {str(e)}')
         
         # Print summary
-        self._print_summary(stats)
+        self._print_summary(stats, deactivate_missing)
     
-    def _process_row(self, row, row_num, update_existing):
-        """Process a single CSV row"""
+    def _get_committee(self, gender):
+        """Default committee per gender, resolved once per run."""
+        if gender not in self.committees:
+            # You may need to adjust this logic based on your committee structure
+            committee_code = f'DEFAULT_{gender}'
+            committee, created = Committee.objects.get_or_create(
+                code=committee_code,
+                defaults={
+                    'election': self.election,
+                    'name': f'Default Committee ({gender})',
+                    'gender': gender,
+                }
+            )
+            if created:
+                self.stdout.write(
+                    self.style.WARNING(f'  INFO: Created committee: {committee_code}')
+                )
+            self.committees[gender] = committee
+        return self.committees[gender]
+    
+    def _process_row(self, row):
+        """Turn a CSV row into elector field values"""
         
         # Extract and validate KOC ID
         koc_id = row.get('internal_reference', '').strip()
@@ -143,92 +167,30 @@ class Command(BaseCommand):
         # Extract team and group
         team_name = row.get('team_name', '').strip()
         group_name = row.get('group_name', '').strip()
-        team_icon = row.get('team_icon', '').strip()
-        
-        # Get or create a default committee based on gender
-        # You may need to adjust this logic based on your committee structure
-        committee_code = f'DEFAULT_{gender}'
-        committee, created = Committee.objects.get_or_create(
-            code=committee_code,
-            defaults={
-                'election': self.election,
-                'name': f'Default Committee ({gender})',
-                'gender': gender,
-            }
-        )
-        
-        if created:
-            self.stdout.write(
-                self.style.WARNING(f'  INFO: Created committee: {committee_code}')
-            )
         
-        # Check if elector exists
-        try:
-            elector = Elector.objects.get(koc_id=koc_id)
-            
-            if update_existing:
-                # Update existing elector
-                for key, value in name_parts.items():
-                    setattr(elector, key, value)
-                elector.department = team_name
-                elector.team = group_name
-                elector.area = group_name
-                elector.gender = gender
-                elector.committee = committee
-                elector.save()
-                
-                try:
-                    self.stdout.write(
-                        self.style.WARNING(f'  Updated: {koc_id} - {fullname}')
-                    )
-                except UnicodeEncodeError:
-                    self.stdout.write(
-                        self.style.WARNING(f'  Updated: {koc_id}')
-                    )
-                return 'updated'
-            else:
-                try:
-                    self.stdout.write(
-                        self.style.WARNING(f'  Skipped (exists): {koc_id}')
-                    )
-                except UnicodeEncodeError:
-                    self.stdout.write(
-                        self.style.WARNING(f'  Skipped: {koc_id}')
-                    )
-                return 'skipped'
-                
-        except Elector.DoesNotExist:
-            # Create new elector
-            elector = Elector.objects.create(
-                koc_id=koc_id,
-                committee=committee,
-                gender=gender,
-                department=team_name,
-                team=group_name,
-                area=group_name,
-                **name_parts
-            )
-            
-            try:
-                self.stdout.write(
-                    self.style.SUCCESS(f'  Created: {koc_id} - {fullname}')
-                )
-            except UnicodeEncodeError:
-                self.stdout.write(
-                    self.style.SUCCESS(f'  Created: {koc_id}')
-                )
-            return 'created'
+        return {
+            'koc_id': koc_id,
+            'committee': self._get_committee(gender),
+            'gender': gender,
+            'department': team_name,
+            'team': group_name,
+            'area': group_name,
+            **name_parts,
+        }
     
-    def _print_summary(self, stats):
+    def _print_summary(self, stats, deactivate_missing=False):
         """Print import summary"""
         self.stdout.write('\n' + '='*60)
         self.stdout.write(self.style.NOTICE('\nIMPORT SUMMARY\n'))
         self.stdout.write('='*60 + '\n')
         
         self.stdout.write(f"Total rows processed: {stats['total']}")
-        self.stdout.write(self.style.SUCCESS(f"Created: {stats['created']}"))
-        self.stdout.write(self.style.WARNING(f"Updated: {stats['updated']}"))
+        self.stdout.write(self.style.SUCCESS(f"Inserted: {stats['inserted']}"))
+        self.stdout.write(self.style.WARNING(f"Changed: {stats['changed']}"))
+        self.stdout.write(f"Unchanged: {stats['unchanged']}")
         self.stdout.write(self.style.WARNING(f"Skipped: {stats['skipped']}"))
+        if deactivate_missing:
+            self.stdout.write(self.style.WARNING(f"Deactivated: {stats['deactivated']}"))
         
         if stats['errors']:
             self.stdout.write(self.style.ERROR(f"\nErrors: {len(stats['errors'])}"))
@@ -241,7 +203,7 @@ class Command(BaseCommand):
         
         self.stdout.write('\n' + '='*60 + '\n')
         
-        if stats['created'] > 0 or stats['updated'] > 0:
+        if stats['inserted'] > 0 or stats['changed'] > 0 or stats['deactivated'] > 0:
             self.stdout.write(self.style.SUCCESS('\nImport completed successfully!\n'))
         elif stats['errors']:
             self.stdout.write(self.style.ERROR('\nImport completed with errors.\n'))
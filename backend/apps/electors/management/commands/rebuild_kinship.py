@@ -0,0 +1,39 @@
+"""
+Management command to rebuild the materialized elector kinship graph.
+
+Run once after deploying the ``elector_relations`` table and after any bulk
+change to elector names made outside the import service.
+
+Usage:
+    python manage.py rebuild_kinship [--batch-size 5000]
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.electors.kinship import rebuild_relations
+from apps.electors.models import Elector
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the elector kinship graph (brothers, fathers, sons, cousins)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of relations inserted per query (default: 5000)',
+        )
+
+    def handle(self, *args, **options):
+        total_electors = Elector.objects.count()
+        self.stdout.write(f'Rebuilding kinship graph for {total_electors} elector(s)...')
+
+        started = time.monotonic()
+        edges = rebuild_relations(batch_size=options['batch_size'])
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Stored {edges} relation(s) in {elapsed:.1f}s'
+        ))
@@ -0,0 +1,91 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:03
+
+from django.db import migrations, models
+
+from apps.electors.normalization import SEARCH_KEY_FIELDS, search_keys
+
+
+NAME_FIELDS = (
+    'name_first', 'name_second', 'name_third', 'name_fourth',
+    'name_fifth', 'name_sixth', 'sub_family_name', 'family_name',
+)
+
+
+def populate_search_keys(apps, schema_editor):
+    Elector = apps.get_model('electors', 'Elector')
+    batch = []
+    for elector in Elector.objects.only('koc_id', *NAME_FIELDS).iterator(chunk_size=2000):
+        keys = search_keys({field: getattr(elector, field) for field in NAME_FIELDS})
+        for field, value in keys.items():
+            setattr(elector, field, value)
+        batch.append(elector)
+        if len(batch) >= 2000:
+            Elector.objects.bulk_update(batch, SEARCH_KEY_FIELDS)
+            batch = []
+    if batch:
+        Elector.objects.bulk_update(batch, SEARCH_KEY_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('electors', '0009_elector_electors_committee_active_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='elector',
+            name='normalized_family',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Normalized family name', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='elector',
+            name='normalized_first',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Normalized first name', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='elector',
+            name='normalized_name',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Normalized full name (all 8 parts)', max_length=450),
+        ),
+        migrations.AddField(
+            model_name='elector',
+            name='normalized_sub_family',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Normalized sub-family name', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='elector',
+            name='phonetic_family',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Phonetic key of family name', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='elector',
+            name='phonetic_first',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Phonetic key of first name', max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='elector',
+            index=models.Index(fields=['normalized_first', 'normalized_family'], name='electors_norm_first_fam_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='elector',
+            index=models.Index(fields=['normalized_family', 'normalized_first'], name='electors_norm_fam_first_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='elector',
+            index=models.Index(fields=['normalized_sub_family'], name='electors_norm_sub_fam_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='elector',
+            index=models.Index(fields=['normalized_name'], name='electors_norm_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='elector',
+            index=models.Index(fields=['phonetic_first', 'phonetic_family'], name='electors_phon_first_fam_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='elector',
+            index=models.Index(fields=['phonetic_family'], name='electors_phon_family_idx'),
+        ),
+        migrations.RunPython(populate_search_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('electors', '0010_elector_search_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ElectorRelation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('relationship', models.CharField(choices=[('BROTHER', 'Brother'), ('FATHER', 'Father'), ('SON', 'Son'), ('COUSIN', 'Cousin')], help_text='How the relative is related to the elector', max_length=10)),
+                ('elector', models.ForeignKey(help_text='Elector whose relative this is', on_delete=django.db.models.deletion.CASCADE, related_name='relations', to='electors.elector')),
+                ('relative', models.ForeignKey(help_text='Related elector', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='electors.elector')),
+            ],
+            options={
+                'verbose_name': 'Elector Relation',
+                'verbose_name_plural': 'Elector Relations',
+                'db_table': 'elector_relations',
+                'indexes': [models.Index(fields=['elector', 'relationship'], name='elector_rel_elector_idx'), models.Index(fields=['relative'], name='elector_rel_relative_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='electorrelation',
+            constraint=models.UniqueConstraint(fields=('elector', 'relative', 'relationship'), name='unique_elector_relation'),
+        ),
+    ]
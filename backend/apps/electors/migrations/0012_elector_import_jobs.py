@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:18
+
+import apps.electors.models
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('electors', '0011_elector_relations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ElectorImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(help_text='Uploaded CSV file', upload_to='imports/electors/%Y/%m/')),
+                ('original_filename', models.CharField(blank=True, help_text='Name of the uploaded file', max_length=255)),
+                ('update_existing', models.BooleanField(default=False, help_text='Update electors that already exist instead of skipping them')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('progress', models.JSONField(blank=True, default=apps.electors.models.default_import_progress)),
+                ('result', models.JSONField(blank=True, default=dict, help_text='Final import summary (counts, row errors and warnings)')),
+                ('errors', models.JSONField(blank=True, default=list, help_text='Job-level failures')),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, help_text='User who uploaded the file', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='elector_import_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Elector Import Job',
+                'verbose_name_plural': 'Elector Import Jobs',
+                'db_table': 'elector_import_jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:21
+
+import hashlib
+
+from django.db import migrations, models
+
+
+# Frozen copy of Elector.CONTENT_HASH_FIELDS at the time of this migration
+CONTENT_HASH_FIELDS = (
+    'name_first', 'name_second', 'name_third', 'name_fourth',
+    'name_fifth', 'name_sixth', 'sub_family_name', 'family_name',
+    'designation', 'section', 'extension', 'mobile', 'area',
+    'department', 'team', 'committee_id', 'gender',
+)
+
+
+def populate_content_hash(apps, schema_editor):
+    Elector = apps.get_model('electors', 'Elector')
+    batch = []
+    for elector in Elector.objects.only('koc_id', *CONTENT_HASH_FIELDS).iterator(chunk_size=2000):
+        payload = '\x1f'.join(
+            '' if getattr(elector, field) is None else str(getattr(elector, field))
+            for field in CONTENT_HASH_FIELDS
+        )
+        elector.content_hash = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+        batch.append(elector)
+        if len(batch) >= 2000:
+            Elector.objects.bulk_update(batch, ['content_hash'])
+            batch = []
+    if batch:
+        Elector.objects.bulk_update(batch, ['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('electors', '0012_elector_import_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='elector',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, help_text='SHA-1 of the roster columns, used to skip unchanged rows on sync', max_length=40),
+        ),
+        migrations.RunPython(populate_content_hash, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,14 @@
 """
 Elector models for managing voter database.
 """
+import hashlib
+
 from django.db import models
+from django.utils import timezone
 from django.contrib.postgres.search import SearchVectorField
 
+from .normalization import SEARCH_KEY_FIELDS, search_keys
+
 
 class Elector(models.Model):
     """
@@ -16,6 +21,30 @@ class Elector(models.Model):
         ('FEMALE', 'Female'),
     ]
     
+    NAME_FIELDS = (
+        'name_first',
+        'name_second',
+        'name_third',
+        'name_fourth',
+        'name_fifth',
+        'name_sixth',
+        'sub_family_name',
+        'family_name',
+    )
+    
+    # Roster columns covered by ``content_hash`` (attnames)
+    CONTENT_HASH_FIELDS = NAME_FIELDS + (
+        'designation',
+        'section',
+        'extension',
+        'mobile',
+        'area',
+        'department',
+        'team',
+        'committee_id',
+        'gender',
+    )
+    
     # Primary Key
     koc_id = models.CharField(
         max_length=20,
@@ -63,6 +92,59 @@ class Elector(models.Model):
         help_text='Family name (surname)'
     )
     
+    # Search keys (derived from the name parts, see normalization.py)
+    normalized_first = models.CharField(
+        max_length=50,
+        blank=True,
+        default='',
+        editable=False,
+        help_text='Normalized first name'
+    )
+    normalized_sub_family = models.CharField(
+        max_length=50,
+        blank=True,
+        default='',
+        editable=False,
+        help_text='Normalized sub-family name'
+    )
+    normalized_family = models.CharField(
+        max_length=50,
+        blank=True,
+        default='',
+        editable=False,
+        help_text='Normalized family name'
+    )
+    normalized_name = models.CharField(
+        max_length=450,
+        blank=True,
+        default='',
+        editable=False,
+        help_text='Normalized full name (all 8 parts)'
+    )
+    phonetic_first = models.CharField(
+        max_length=50,
+        blank=True,
+        default='',
+        editable=False,
+        help_text='Phonetic key of first name'
+    )
+    phonetic_family = models.CharField(
+        max_length=50,
+        blank=True,
+        default='',
+        editable=False,
+        help_text='Phonetic key of family name'
+    )
+    
+    # Change detection for roster syncs
+    content_hash = models.CharField(
+        max_length=40,
+        blank=True,
+        default='',
+        editable=False,
+        help_text='SHA-1 of the roster columns, used to skip unchanged rows on sync'
+    )
+    
     # Work Information
     designation = models.CharField(
         max_length=100,
@@ -168,11 +250,81 @@ class Elector(models.Model):
             models.Index(fields=['team', 'is_active'], name='electors_team_active_idx'),
             models.Index(fields=['section', 'is_active'], name='electors_section_active_idx'),
             models.Index(fields=['is_active', 'is_approved'], name='electors_active_approved_idx'),
+            # Normalized / phonetic name lookups
+            models.Index(fields=['normalized_first', 'normalized_family'], name='electors_norm_first_fam_idx'),
+            models.Index(fields=['normalized_family', 'normalized_first'], name='electors_norm_fam_first_idx'),
+            models.Index(fields=['normalized_sub_family'], name='electors_norm_sub_fam_idx'),
+            models.Index(fields=['normalized_name'], name='electors_norm_name_idx'),
+            models.Index(fields=['phonetic_first', 'phonetic_family'], name='electors_phon_first_fam_idx'),
+            models.Index(fields=['phonetic_family'], name='electors_phon_family_idx'),
         ]
     
     def __str__(self):
         return f"{self.koc_id} - {self.full_name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_name_parts = instance._name_parts()
+        return instance
+    
+    def _name_parts(self):
+        """
+        Name parts present on the instance. Reads ``__dict__`` so deferred
+        fields are left out instead of being loaded.
+        """
+        return {field: self.__dict__[field] for field in self.NAME_FIELDS if field in self.__dict__}
+    
+    def name_parts_changed(self):
+        """
+        True if any name part differs from what was loaded (or the row is
+        new). A part that was deferred at load time counts as changed once
+        it is set.
+        """
+        loaded = getattr(self, '_loaded_name_parts', None)
+        if loaded is None:
+            return True
+        return any(
+            field not in loaded or loaded[field] != value
+            for field, value in self._name_parts().items()
+        )
+    
+    def save(self, *args, **kwargs):
+        """Keep the search keys and content hash in sync with the roster columns."""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.refresh_search_keys()
+            self.refresh_content_hash()
+        else:
+            update_fields = set(update_fields)
+            if update_fields & set(self.NAME_FIELDS):
+                self.refresh_search_keys()
+                update_fields |= set(SEARCH_KEY_FIELDS)
+            if update_fields & (set(self.CONTENT_HASH_FIELDS) | {'committee'}):
+                self.refresh_content_hash()
+                update_fields.add('content_hash')
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+        self._saved_name_changes = self.name_parts_changed()
+        self._loaded_name_parts = self._name_parts()
+    
+    def refresh_search_keys(self):
+        """Recompute search key columns from the current name parts."""
+        parts = {field: getattr(self, field) for field in self.NAME_FIELDS}
+        for field, value in search_keys(parts).items():
+            setattr(self, field, value)
+    
+    def compute_content_hash(self) -> str:
+        """SHA-1 over ``CONTENT_HASH_FIELDS``; equal hashes mean nothing to sync."""
+        payload = '\x1f'.join(
+            '' if getattr(self, field) is None else str(getattr(self, field))
+            for field in self.CONTENT_HASH_FIELDS
+        )
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    
+    def refresh_content_hash(self):
+        self.content_hash = self.compute_content_hash()
+    
     @property
     def full_name(self):
         """
@@ -190,6 +342,11 @@ class Elector(models.Model):
         ]
         return ' '.join([p for p in parts if p]).strip()
     
+    @property
+    def location(self):
+        """Where the elector votes: their committee's location."""
+        return self.committee.location if self.committee_id else None
+    
     @staticmethod
     def parse_full_name(full_name):
         """
@@ -205,8 +362,16 @@ class Elector(models.Model):
             full_name (str): Full name string
         
         Returns:
-            dict: Dictionary with 8 name components
+            dict: Dictionary with 8 name components plus their
+            normalized/phonetic search keys
         """
+        name_dict = Elector._split_full_name(full_name)
+        name_dict.update(search_keys(name_dict))
+        return name_dict
+    
+    @staticmethod
+    def _split_full_name(full_name):
+        """Split a full name into the 8 raw name components."""
         if not full_name:
             return {
                 'name_first': '',
@@ -274,3 +439,162 @@ class Elector(models.Model):
     def has_attended(self):
         """Check if elector has attended."""
         return self.attendance_records.filter(status='ATTENDED').exists()
+
+
+class ElectorRelation(models.Model):
+    """
+    Materialized family relation between two electors.
+
+    Inferred from name-part equality (see ``kinship.RULES``); rebuilt by the
+    ``rebuild_kinship`` command and refreshed when an elector changes.
+    """
+    
+    BROTHER = 'BROTHER'
+    FATHER = 'FATHER'
+    SON = 'SON'
+    COUSIN = 'COUSIN'
+    
+    RELATIONSHIP_CHOICES = [
+        (BROTHER, 'Brother'),
+        (FATHER, 'Father'),
+        (SON, 'Son'),
+        (COUSIN, 'Cousin'),
+    ]
+    
+    elector = models.ForeignKey(
+        Elector,
+        on_delete=models.CASCADE,
+        related_name='relations',
+        help_text='Elector whose relative this is'
+    )
+    relative = models.ForeignKey(
+        Elector,
+        on_delete=models.CASCADE,
+        related_name='+',
+        help_text='Related elector'
+    )
+    relationship = models.CharField(
+        max_length=10,
+        choices=RELATIONSHIP_CHOICES,
+        help_text='How the relative is related to the elector'
+    )
+    
+    class Meta:
+        db_table = 'elector_relations'
+        verbose_name = 'Elector Relation'
+        verbose_name_plural = 'Elector Relations'
+        indexes = [
+            models.Index(fields=['elector', 'relationship'], name='elector_rel_elector_idx'),
+            models.Index(fields=['relative'], name='elector_rel_relative_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['elector', 'relative', 'relationship'],
+                name='unique_elector_relation'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.relative_id} is {self.relationship} of {self.elector_id}"
+
+
+def default_import_progress():
+    return {
+        'processed_rows': 0,
+        'created': 0,
+        'updated': 0,
+        'unchanged': 0,
+        'skipped': 0,
+    }
+
+
+class ElectorImportJob(models.Model):
+    """
+    Background elector CSV import.
+
+    The upload is stored with the job and processed by a worker
+    (see ``jobs.run_import_job``), which records progress per chunk.
+    """
+    
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        COMPLETED = 'completed', 'Completed'
+        FAILED = 'failed', 'Failed'
+    
+    file = models.FileField(
+        upload_to='imports/electors/%Y/%m/',
+        help_text='Uploaded CSV file'
+    )
+    original_filename = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text='Name of the uploaded file'
+    )
+    update_existing = models.BooleanField(
+        default=False,
+        help_text='Update electors that already exist instead of skipping them'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.QUEUED
+    )
+    progress = models.JSONField(default=default_import_progress, blank=True)
+    result = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='Final import summary (counts, row errors and warnings)'
+    )
+    errors = models.JSONField(
+        default=list,
+        blank=True,
+        help_text='Job-level failures'
+    )
+    created_by = models.ForeignKey(
+        'account.CustomUser',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='elector_import_jobs',
+        help_text='User who uploaded the file'
+    )
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'elector_import_jobs'
+        verbose_name = 'Elector Import Job'
+        verbose_name_plural = 'Elector Import Jobs'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"Import {self.pk} ({self.status})"
+    
+    def mark_running(self):
+        self.status = self.Status.RUNNING
+        if not self.started_at:
+            self.started_at = timezone.now()
+        self.save(update_fields=['status', 'started_at', 'updated_at'])
+    
+    def update_progress(self, progress: dict):
+        self.progress = progress
+        self.save(update_fields=['progress', 'updated_at'])
+    
+    def mark_complete(self, result: dict):
+        self.result = result
+        self.status = self.Status.COMPLETED
+        self.finished_at = timezone.now()
+        self.save(update_fields=['result', 'status', 'finished_at', 'updated_at'])
+    
+    def mark_failed(self, error_payload: dict, result: dict = None):
+        errors = self.errors or []
+        errors.append(error_payload)
+        self.errors = errors
+        if result is not None:
+            self.result = result
+        self.status = self.Status.FAILED
+        self.finished_at = timezone.now()
+        self.save(update_fields=['errors', 'result', 'status', 'finished_at', 'updated_at'])
@@ -0,0 +1,173 @@
+"""
+Arabic-aware name normalization and phonetic keys for elector search.
+
+Raw names are stored as entered, so spelling variants of the same name
+(alef with/without hamza, taa marbuta vs haa, alef maqsura vs yaa,
+diacritics, tatweel) never compare equal. The helpers here fold those
+variants into a single normalized form, and derive a coarse phonetic key
+that also groups letters which are commonly confused when names are typed
+by ear (e.g. ص/س, ظ/ض/ذ/ز, ق/ك).
+
+Both forms are stored in shadow columns on ``Elector`` and looked up with
+equality / prefix queries instead of ``icontains`` scans.
+"""
+import re
+from typing import Dict
+
+from django.db.models import Q
+
+
+# Harakat, shadda, sukun, superscript alef and Quranic marks
+_DIACRITICS_RE = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed]')
+_TATWEEL = '\u0640'
+_WHITESPACE_RE = re.compile(r'\s+')
+
+_CHAR_MAP = str.maketrans({
+    'أ': 'ا',
+    'إ': 'ا',
+    'آ': 'ا',
+    'ٱ': 'ا',
+    'ؤ': 'و',
+    'ئ': 'ي',
+    'ى': 'ي',
+    'ة': 'ه',
+    'ک': 'ك',
+    'ی': 'ي',
+    'ھ': 'ه',
+})
+
+# Letters folded together for the phonetic key (after normalization)
+_PHONETIC_MAP = str.maketrans({
+    'ص': 'س',
+    'ث': 'س',
+    'ش': 'س',
+    'ذ': 'ز',
+    'ظ': 'ز',
+    'ض': 'ز',
+    'ط': 'ت',
+    'ح': 'ه',
+    'خ': 'ه',
+    'ق': 'ك',
+    'غ': 'ع',
+    'ء': 'ع',
+    # Latin transliterations
+    'c': 'k',
+    'q': 'k',
+    'z': 's',
+    'v': 'f',
+    'p': 'b',
+    'j': 'g',
+})
+
+# Dropped after the first letter of a token (long vowels / weak letters)
+_PHONETIC_VOWELS = set('اويعaeiouyhw')
+
+_ARTICLE = 'ال'
+
+
+def normalize_name(value: str) -> str:
+    """
+    Fold Arabic spelling variants, strip diacritics and tatweel,
+    lowercase Latin text and collapse whitespace.
+    """
+    if not value:
+        return ''
+    value = _DIACRITICS_RE.sub('', value).replace(_TATWEEL, '')
+    value = value.translate(_CHAR_MAP).lower()
+    return _WHITESPACE_RE.sub(' ', value).strip()
+
+
+def _phonetic_token(token: str) -> str:
+    if token.startswith(_ARTICLE) and len(token) > 4:
+        token = token[len(_ARTICLE):]
+    token = token.translate(_PHONETIC_MAP)
+    if not token:
+        return ''
+
+    key = [token[0]]
+    for char in token[1:]:
+        if char in _PHONETIC_VOWELS or char == '-' or char == key[-1]:
+            continue
+        key.append(char)
+    return ''.join(key)
+
+
+def phonetic_key(value: str) -> str:
+    """Phonetic key of a (possibly multi-word) name, one key per word."""
+    tokens = normalize_name(value).split(' ')
+    return ' '.join(k for k in (_phonetic_token(t) for t in tokens) if k)
+
+
+def search_keys(parts: Dict[str, str]) -> Dict[str, str]:
+    """
+    Build the shadow search columns for a dict of ``Elector`` name parts
+    (as returned by ``Elector.parse_full_name``).
+    """
+    ordered = [
+        parts.get('name_first', ''),
+        parts.get('name_second', ''),
+        parts.get('name_third', ''),
+        parts.get('name_fourth', ''),
+        parts.get('name_fifth', ''),
+        parts.get('name_sixth', ''),
+        parts.get('sub_family_name', ''),
+        parts.get('family_name', ''),
+    ]
+    return {
+        'normalized_first': normalize_name(parts.get('name_first', '')),
+        'normalized_sub_family': normalize_name(parts.get('sub_family_name', '')),
+        'normalized_family': normalize_name(parts.get('family_name', '')),
+        'normalized_name': normalize_name(' '.join(p for p in ordered if p)),
+        'phonetic_first': phonetic_key(parts.get('name_first', '')),
+        'phonetic_family': phonetic_key(parts.get('family_name', '')),
+    }
+
+
+SEARCH_KEY_FIELDS = (
+    'normalized_first',
+    'normalized_sub_family',
+    'normalized_family',
+    'normalized_name',
+    'phonetic_first',
+    'phonetic_family',
+)
+
+
+def phonetic_lookup_q(query: str) -> Q:
+    """
+    Equality lookup on the phonetic key columns. One word matches a first
+    or family name; several words match first word + last word.
+    """
+    keys = [_phonetic_token(w) for w in normalize_name(query).split(' ') if w]
+    keys = [k for k in keys if k]
+    if not keys:
+        return Q(pk__in=[])
+    if len(keys) == 1:
+        return Q(phonetic_first=keys[0]) | Q(phonetic_family=keys[0])
+    return Q(phonetic_first=keys[0], phonetic_family=keys[-1])
+
+
+def name_lookup_q(query: str, phonetic: bool = True) -> Q:
+    """
+    Indexed name lookup for a user-typed query.
+
+    A single word is matched as a prefix of the first, sub-family or family
+    name; several words are matched as a prefix of the full normalized name.
+    With ``phonetic`` the phonetic key lookup is ORed in.
+    """
+    normalized = normalize_name(query)
+    if not normalized:
+        return Q(pk__in=[])
+
+    if ' ' not in normalized:
+        q = (
+            Q(normalized_first__startswith=normalized)
+            | Q(normalized_family__startswith=normalized)
+            | Q(normalized_sub_family__startswith=normalized)
+        )
+    else:
+        q = Q(normalized_name__startswith=normalized)
+
+    if phonetic:
+        q |= phonetic_lookup_q(normalized)
+    return q
@@ -0,0 +1,300 @@
+"""
+In-memory n-gram index over elector name parts.
+
+Resolves ``icontains``-style name searches without scanning the electors
+table. Posting lists map every 1/2/3-gram of each normalized name part to
+the set of ``koc_id`` values containing it; candidates from the posting
+lists are verified against the stored parts, so results match a substring
+search over the eight name parts with Arabic spelling variants folded.
+
+The index lives in process memory and every worker process holds its own
+copy: the normalized name parts plus one posting entry per distinct
+1/2/3-gram of each part. That is roughly 4 KB per active elector (measured
+on synthetic six-part names), i.e. several hundred MB per worker process at
+100k electors; size worker counts accordingly.
+
+Copies are kept current through two shared records in the default cache:
+
+- a change log: committed ``Elector`` saves and deletes append the koc_id
+  under the next sequence number (``record_change``). Before a search each
+  process re-reads the electors logged since the sequence it has applied,
+  in one query, and patches its copy.
+- a generation (cache namespace ``elector_index``) that bulk writers bump
+  (``invalidate``: imports, sync, deactivation). A process whose copy was
+  built from an older generation rebuilds it; so does one that finds log
+  entries missing (evicted or expired) or too far behind.
+
+Both live in the default cache, so with several worker processes it must
+be a shared backend (``CACHE_BACKEND=redis``); see the ``utils.W001``
+system check.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.core.cache import cache
+
+from apps.utils.cache_namespaces import bump, get_generations
+
+from .normalization import normalize_name
+
+logger = logging.getLogger(__name__)
+
+
+NAME_FIELDS = (
+    'name_first',
+    'name_second',
+    'name_third',
+    'name_fourth',
+    'name_fifth',
+    'name_sixth',
+    'sub_family_name',
+    'family_name',
+)
+
+# Longest gram stored; queries shorter than this hit a posting list directly.
+MAX_GRAM = 3
+
+# Shared change feed (see module docstring)
+GENERATION_NAMESPACE = 'elector_index'
+CHANGE_SEQ_KEY = 'elector_index:seq'
+CHANGE_KEY = 'elector_index:change:{}'
+CHANGE_TTL = 24 * 60 * 60
+# A copy further behind than this rebuilds instead of replaying the log
+MAX_CATCH_UP = 5000
+
+
+def _grams(value: str, size: int) -> Set[str]:
+    """Return the distinct substrings of ``value`` of length ``size``."""
+    if len(value) < size:
+        return set()
+    return {value[i:i + size] for i in range(len(value) - size + 1)}
+
+
+def _all_grams(value: str) -> Set[str]:
+    grams: Set[str] = set()
+    for size in range(1, MAX_GRAM + 1):
+        grams |= _grams(value, size)
+    return grams
+
+
+class ElectorNameIndex:
+    """
+    Inverted n-gram index of active electors keyed by ``koc_id``.
+
+    Also keeps each elector's sort key (``name_first``, ``family_name``,
+    ``koc_id``) so that matches can be ordered and paginated without a
+    database round-trip.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Set[str]] = {}
+        self._names: Dict[str, Tuple[str, ...]] = {}
+        self._sort_keys: Dict[str, Tuple[str, str, str]] = {}
+        self._built = False
+        self._generation = None
+        self._seq = None
+
+    # ------------------------------------------------------------------
+    # Build / maintenance
+    # ------------------------------------------------------------------
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def build(self):
+        """Rebuild the whole index from the database."""
+        from .models import Elector
+
+        # Read first: changes logged during the scan are replayed afterwards
+        generation, seq = self._shared_state()
+        rows = (
+            Elector.objects.filter(is_active=True)
+            .values_list('koc_id', *NAME_FIELDS)
+            .iterator(chunk_size=5000)
+        )
+        postings: Dict[str, Set[str]] = {}
+        names: Dict[str, Tuple[str, ...]] = {}
+        sort_keys: Dict[str, Tuple[str, str, str]] = {}
+
+        for row in rows:
+            koc_id, parts = row[0], tuple(normalize_name(p) for p in row[1:])
+            names[koc_id] = parts
+            sort_keys[koc_id] = (row[1] or '', row[-1] or '', koc_id)
+            for gram in self._grams_for(parts):
+                postings.setdefault(gram, set()).add(koc_id)
+
+        with self._lock:
+            self._postings = postings
+            self._names = names
+            self._sort_keys = sort_keys
+            self._built = True
+            self._generation = generation
+            self._seq = seq
+
+        logger.info('Elector name index built with %s electors', len(names))
+
+    def ensure_built(self):
+        """
+        Build on first use or after a bulk invalidation; otherwise apply the
+        changes logged since this copy was last brought up to date.
+        """
+        generation, seq = self._shared_state()
+        if self._built and self._generation == generation and self._seq == seq:
+            return
+        with self._lock:
+            if not self._built or self._generation != generation:
+                self.build()
+            elif self._seq != seq:
+                self._catch_up(seq)
+
+    def record_change(self, koc_id: str):
+        """
+        Log a committed save or delete of one elector for every process's
+        copy (this one included) to pick up before its next search.
+        """
+        try:
+            seq = cache.incr(CHANGE_SEQ_KEY)
+        except ValueError:
+            # Never read or evicted: copies built since hold the old sequence
+            # and find the entries in between missing, so they rebuild
+            cache.add(CHANGE_SEQ_KEY, _seed(), None)
+            seq = cache.incr(CHANGE_SEQ_KEY)
+        cache.set(CHANGE_KEY.format(seq), koc_id, CHANGE_TTL)
+
+    def clear(self):
+        """Drop this process's copy; the next search rebuilds it."""
+        with self._lock:
+            self._postings = {}
+            self._names = {}
+            self._sort_keys = {}
+            self._built = False
+            self._generation = None
+            self._seq = None
+
+    def invalidate(self):
+        """
+        Make every process rebuild its copy before its next search.
+
+        Used after bulk writes (imports, ``bulk_create``/``bulk_update``)
+        that bypass model signals.
+        """
+        bump(GENERATION_NAMESPACE)
+        with self._lock:
+            self._built = False
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+    def search(self, query: str) -> List[str]:
+        """
+        Return ``koc_id`` values whose name parts contain ``query``
+        (compared in normalized form, see ``normalization.normalize_name``),
+        ordered by ``name_first, family_name, koc_id``.
+        """
+        needle = normalize_name(query)
+        if not needle:
+            return []
+
+        self.ensure_built()
+        with self._lock:
+            candidates = self._candidates(needle)
+            if len(needle) > MAX_GRAM:
+                candidates = {
+                    koc_id for koc_id in candidates
+                    if any(needle in part for part in self._names.get(koc_id, ()))
+                }
+            sort_keys = self._sort_keys
+            return sorted(candidates, key=lambda koc_id: sort_keys[koc_id])
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _grams_for(parts: Iterable[str]) -> Set[str]:
+        grams: Set[str] = set()
+        for part in parts:
+            if part:
+                grams |= _all_grams(part)
+        return grams
+
+    def _candidates(self, needle: str) -> Set[str]:
+        if len(needle) <= MAX_GRAM:
+            return set(self._postings.get(needle, ()))
+
+        # Intersect the rarest posting lists first to keep the working set small
+        lists = sorted(
+            (self._postings.get(gram, set()) for gram in _grams(needle, MAX_GRAM)),
+            key=len,
+        )
+        if not lists or not lists[0]:
+            return set()
+        result = set(lists[0])
+        for posting in lists[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+
+    def _discard(self, koc_id: str):
+        parts = self._names.pop(koc_id, None)
+        self._sort_keys.pop(koc_id, None)
+        if parts is None:
+            return
+        for gram in self._grams_for(parts):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(koc_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def _catch_up(self, seq: int):
+        """Apply the logged changes after ``self._seq`` up to ``seq``."""
+        from .models import Elector
+
+        start = self._seq
+        if start is None or not 0 < seq - start <= MAX_CATCH_UP:
+            self.build()
+            return
+        keys = [CHANGE_KEY.format(n) for n in range(start + 1, seq + 1)]
+        logged = cache.get_many(keys)
+        if len(logged) != len(keys):
+            # Evicted, expired or not yet written: the log cannot be replayed
+            self.build()
+            return
+
+        koc_ids = set(logged.values())
+        rows = Elector.objects.filter(koc_id__in=koc_ids, is_active=True).values_list('koc_id', *NAME_FIELDS)
+        for koc_id in koc_ids:
+            self._discard(koc_id)
+        for row in rows:
+            koc_id, parts = row[0], tuple(normalize_name(p) for p in row[1:])
+            self._names[koc_id] = parts
+            self._sort_keys[koc_id] = (row[1] or '', row[-1] or '', koc_id)
+            for gram in self._grams_for(parts):
+                self._postings.setdefault(gram, set()).add(koc_id)
+        self._seq = seq
+
+    @staticmethod
+    def _shared_state() -> Tuple[int, int]:
+        """Current (generation, change sequence) of the shared feed."""
+        generation = get_generations([GENERATION_NAMESPACE])[GENERATION_NAMESPACE]
+        seq: Optional[int] = cache.get(CHANGE_SEQ_KEY)
+        if seq is None:
+            cache.add(CHANGE_SEQ_KEY, _seed(), None)
+            seq = cache.get(CHANGE_SEQ_KEY)
+        return generation, seq
+
+
+def _seed() -> int:
+    # Like the namespace counters: a re-seeded sequence jumps past any
+    # sequence a copy may hold, so that copy rebuilds rather than replays
+    return int(time.time() * 1000)
+
+
+name_index = ElectorNameIndex()
@@ -2,7 +2,8 @@
 Serializers for elector management.
 """
 from rest_framework import serializers
-from .models import Elector
+from .guarantee_overlay import GuaranteeOverlayListSerializer, load_guarantee_overlay
+from .models import Elector, ElectorImportJob
 
 
 class ElectorSerializer(serializers.ModelSerializer):
@@ -75,44 +76,33 @@ class ElectorListSerializer(serializers.ModelSerializer):
     guaranteeConfirmationStatus = serializers.SerializerMethodField()
     guaranteeMobile = serializers.SerializerMethodField()
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._guarantee_cache = {}
+    
     def get_gender(self, obj):
         """
         Return human-readable gender value.
         """
         return obj.get_gender_display()
     
-    def _get_first_guarantee(self, obj):
-        from apps.guarantees.models import Guarantee
+    def _guarantee_user(self):
         request = self.context.get('request')
-        user = getattr(request, 'user', None)
-
-        if not hasattr(self, '_guarantee_cache'):
-            self._guarantee_cache = {}
-
-        cache_key = (obj.pk, user.pk if user and user.is_authenticated else None)
-
-        if cache_key not in self._guarantee_cache:
-            qs = Guarantee.objects.filter(elector=obj)
-            if user and user.is_authenticated:
-                qs = qs.filter(user=user)
-
-            guarantee = (
-                qs.select_related('group', 'elector')
-                .values(
-                    'id',
-                    'guarantee_status',
-                    'confirmation_status',
-                    'group_id',
-                    'group__name',
-                    'group__color',
-                    'mobile',
-                )
-                .first()
-            )
+        return getattr(request, 'user', None)
 
-            self._guarantee_cache[cache_key] = guarantee
+    def prefetch_guarantees(self, electors):
+        """
+        Load the guarantee fields of ``electors`` in one query.
+        Called by the list serializer before rendering a page.
+        """
+        koc_ids = [elector.pk for elector in electors]
+        overlay = load_guarantee_overlay(koc_ids, user=self._guarantee_user())
+        self._guarantee_cache.update({koc_id: overlay.get(koc_id) for koc_id in koc_ids})
 
-        return self._guarantee_cache[cache_key]
+    def _get_first_guarantee(self, obj):
+        if obj.pk not in self._guarantee_cache:
+            self.prefetch_guarantees([obj])
+        return self._guarantee_cache[obj.pk]
 
     def get_isGuarantee(self, obj):
         """
@@ -188,6 +178,7 @@ class ElectorListSerializer(serializers.ModelSerializer):
             'guaranteeConfirmationStatus',
             'guaranteeMobile',
         ]
+        list_serializer_class = GuaranteeOverlayListSerializer
 
 
 class ElectorCreateSerializer(serializers.ModelSerializer):
@@ -307,3 +298,30 @@ class ElectorSearchSerializer(serializers.Serializer):
         allow_blank=True
     )
 
+
+
+class ElectorImportJobSerializer(serializers.ModelSerializer):
+    """
+    Background import job status.
+    """
+    
+    created_by_email = serializers.EmailField(source='created_by.email', read_only=True)
+    
+    class Meta:
+        model = ElectorImportJob
+        fields = [
+            'id',
+            'original_filename',
+            'update_existing',
+            'status',
+            'progress',
+            'result',
+            'errors',
+            'created_by',
+            'created_by_email',
+            'started_at',
+            'finished_at',
+            'created_at',
+            'updated_at',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,73 @@
+"""
+Signal handlers keeping elector-derived structures current.
+"""
+import threading
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.utils.transactions import on_commit_once
+
+from .search_index import name_index
+from .snapshot import schedule_rebuild as schedule_snapshot_rebuild
+
+_pending = threading.local()
+
+
+def _flush_kinship_refresh():
+    koc_ids, _pending.kinship_ids = getattr(_pending, 'kinship_ids', None), None
+    if koc_ids:
+        from .kinship import refresh_relations
+
+        refresh_relations(koc_ids)
+
+
+def _queue_kinship_refresh(koc_id):
+    """
+    Collect the electors changed in the current transaction and refresh their
+    kinship edges in one go on commit, so row-by-row imports inside a single
+    ``atomic`` block fall through to one batched (or full) refresh.
+
+    Ids left over from a rolled-back transaction are refreshed with the next
+    batch, which only recomputes their edges from the current rows.
+    """
+    pending = getattr(_pending, 'kinship_ids', None)
+    if pending is None:
+        pending = _pending.kinship_ids = set()
+    pending.add(koc_id)
+    # Outside a transaction this flushes right away
+    on_commit_once(_flush_kinship_refresh)
+
+
+@receiver(post_save, sender='electors.Elector')
+def elector_saved(sender, instance, created, **kwargs):
+    """Re-index the elector's name parts once the write is committed."""
+    if kwargs.get('raw', False):
+        return
+    koc_id = instance.koc_id
+    transaction.on_commit(lambda: name_index.record_change(koc_id))
+    schedule_snapshot_rebuild()
+
+    # Kinship edges only depend on the name parts
+    if created or getattr(instance, '_saved_name_changes', True):
+        _queue_kinship_refresh(instance.koc_id)
+
+
+@receiver(post_delete, sender='electors.Elector')
+def elector_deleted(sender, instance, **kwargs):
+    """
+    Drop the elector from the name index once the delete is committed.
+    Its kinship edges are removed by the ON DELETE CASCADE.
+    """
+    koc_id = instance.koc_id
+    transaction.on_commit(lambda: name_index.record_change(koc_id))
+    schedule_snapshot_rebuild()
+
+
+@receiver(post_save, sender='elections.Committee')
+def committee_saved(sender, instance, created, **kwargs):
+    """The elector snapshot carries committee codes and names."""
+    if kwargs.get('raw', False) or created:
+        return
+    schedule_snapshot_rebuild()
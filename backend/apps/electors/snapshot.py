@@ -0,0 +1,333 @@
+"""
+Memory-mapped, read-only elector snapshot for election-day lookups.
+
+On election day attendance search and marking look electors up by
+``koc_id`` at a high rate while the roster itself hardly changes.
+``build_snapshot`` writes the active electors (koc_id, name parts, section,
+mobile, gender and committee with its location) to a compact binary file. Every worker process
+memory-maps it, so a lookup is a hash probe with no database round-trip and
+the pages are shared between workers through the OS page cache.
+
+File layout (little-endian)::
+
+    header    magic, record count, slot count, built-at timestamp
+    slots     uint32 per slot: record number + 1, 0 when empty
+              (open addressing on crc32(koc_id), linear probing)
+    records   (uint32 offset, uint16 length) per elector into the blob
+    blob      UTF-8 field values joined by U+001F
+
+The file is written next to its final path and moved into place with
+``os.replace``, so readers see either the old or the new snapshot, never a
+partial one. Readers pick up a new file by its inode / mtime, checked at most
+once per ``CHECK_INTERVAL`` seconds. Elector changes schedule a rebuild after
+commit (``schedule_rebuild``); until it lands lookups can be a few seconds
+stale, and electors missing from the snapshot fall back to the database.
+
+Disabled unless ``ELECTOR_SNAPSHOT_PATH`` is set.
+"""
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from collections import namedtuple
+from typing import Dict, Optional
+
+from django.conf import settings
+
+from apps.utils.transactions import on_commit_once
+
+logger = logging.getLogger(__name__)
+
+
+MAGIC = b'ELSNAP02'
+HEADER = struct.Struct('<8sIIQ')
+SLOT = struct.Struct('<I')
+RECORD = struct.Struct('<IH')
+SEPARATOR = '\x1f'
+
+# Stored values, in order (``committee__*`` become ``committee_*`` attributes)
+SNAPSHOT_FIELDS = (
+    'koc_id',
+    'name_first',
+    'name_second',
+    'name_third',
+    'name_fourth',
+    'name_fifth',
+    'name_sixth',
+    'sub_family_name',
+    'family_name',
+    'section',
+    'mobile',
+    'gender',
+    'committee_id',
+    'committee__code',
+    'committee__name',
+    'committee__location',
+)
+ATTRIBUTES = tuple(field.replace('__', '_') for field in SNAPSHOT_FIELDS)
+
+# Seconds between checks for a newer snapshot file
+CHECK_INTERVAL = 1.0
+
+
+def _slot_of(koc_id: bytes, mask: int) -> int:
+    return zlib.crc32(koc_id) & mask
+
+
+SnapshotCommittee = namedtuple('SnapshotCommittee', ('id', 'code', 'name', 'location'))
+
+
+class SnapshotElector:
+    """
+    Read-only elector values from the snapshot. Mirrors the ``Elector``
+    attributes used by lookups (``committee`` is a ``SnapshotCommittee``).
+    """
+
+    __slots__ = ATTRIBUTES
+
+    def __init__(self, values):
+        for attribute, value in zip(ATTRIBUTES, values):
+            setattr(self, attribute, value)
+        self.committee_id = int(self.committee_id) if self.committee_id else None
+
+    @property
+    def full_name(self) -> str:
+        """Same composition as ``Elector.full_name``."""
+        parts = (
+            self.name_first,
+            self.name_second,
+            self.name_third,
+            self.name_fourth,
+            self.name_fifth,
+            self.name_sixth,
+        )
+        return ' '.join(p for p in parts if p).strip()
+
+    @property
+    def committee(self) -> Optional[SnapshotCommittee]:
+        if self.committee_id is None:
+            return None
+        return SnapshotCommittee(self.committee_id, self.committee_code, self.committee_name, self.committee_location)
+
+    @property
+    def location(self) -> Optional[str]:
+        """Same as ``Elector.location``."""
+        return self.committee_location if self.committee_id is not None else None
+
+    def __repr__(self):
+        return f'<SnapshotElector {self.koc_id}>'
+
+
+class _Mapping:
+    """One opened snapshot file."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as handle:
+            stat = os.fstat(handle.fileno())
+            self.identity = (stat.st_ino, stat.st_mtime_ns)
+            self.buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.slots, self.built_at = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not an elector snapshot')
+        self.mask = self.slots - 1
+        self.slots_offset = HEADER.size
+        self.records_offset = self.slots_offset + self.slots * SLOT.size
+        self.blob_offset = self.records_offset + self.count * RECORD.size
+
+    def get(self, koc_id: str) -> Optional[SnapshotElector]:
+        key = koc_id.encode('utf-8')
+        slot = _slot_of(key, self.mask)
+        buffer = self.buffer
+        while True:
+            (number,) = SLOT.unpack_from(buffer, self.slots_offset + slot * SLOT.size)
+            if not number:
+                return None
+            offset, length = RECORD.unpack_from(buffer, self.records_offset + (number - 1) * RECORD.size)
+            start = self.blob_offset + offset
+            values = buffer[start:start + length].decode('utf-8').split(SEPARATOR)
+            if values[0] == koc_id:
+                return SnapshotElector(values)
+            slot = (slot + 1) & self.mask
+
+
+class ElectorSnapshot:
+    """
+    Process-wide reader of the snapshot file.
+
+    ``get`` returns a ``SnapshotElector`` or None (not in the snapshot, or no
+    snapshot configured); callers fall back to the database on None.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._mapping: Optional[_Mapping] = None
+        self._checked_at = 0.0
+        self._rejected = None
+
+    @property
+    def path(self) -> str:
+        return getattr(settings, 'ELECTOR_SNAPSHOT_PATH', '') or ''
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def get(self, koc_id: str) -> Optional[SnapshotElector]:
+        if not koc_id:
+            return None
+        mapping = self._current()
+        return mapping.get(koc_id) if mapping is not None else None
+
+    def reset(self):
+        """Forget the mapped file; the next lookup opens it again."""
+        with self._lock:
+            self._mapping = None
+            self._checked_at = 0.0
+            self._rejected = None
+
+    def _current(self) -> Optional[_Mapping]:
+        path = self.path
+        if not path:
+            return None
+        now = time.monotonic()
+        if now - self._checked_at < CHECK_INTERVAL:
+            return self._mapping
+        with self._lock:
+            if now - self._checked_at < CHECK_INTERVAL:
+                return self._mapping
+            self._checked_at = now
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                self._mapping = None
+                return None
+            identity = (stat.st_ino, stat.st_mtime_ns)
+            if identity == self._rejected:
+                return None
+            rejected = False
+            if self._mapping is None or self._mapping.identity != identity:
+                try:
+                    # The previous mapping is left to the GC: other threads may still read it
+                    self._mapping = _Mapping(path)
+                except (OSError, ValueError):
+                    logger.exception('Could not open elector snapshot %s', path)
+                    self._mapping = None
+                    self._rejected, rejected = identity, True
+            mapping = self._mapping
+        if rejected:
+            # Written by an older format (or damaged): replace it
+            from apps.utils.background import run_in_background
+
+            run_in_background(_rebuild)
+        return mapping
+
+
+elector_snapshot = ElectorSnapshot()
+
+
+# ----------------------------------------------------------------------
+# Build
+# ----------------------------------------------------------------------
+def build_snapshot(path: Optional[str] = None) -> int:
+    """
+    Write the active electors to the snapshot file and swap it in atomically.
+
+    Returns the number of electors written.
+    """
+    from .models import Elector
+
+    path = path or elector_snapshot.path
+    if not path:
+        raise ValueError('ELECTOR_SNAPSHOT_PATH is not set')
+
+    rows = Elector.objects.filter(is_active=True).order_by().values_list(*SNAPSHOT_FIELDS)
+    keys = []
+    records = bytearray()
+    blob = bytearray()
+    for row in rows.iterator(chunk_size=5000):
+        data = SEPARATOR.join('' if value is None else str(value).replace(SEPARATOR, ' ') for value in row)
+        encoded = data.encode('utf-8')
+        records += RECORD.pack(len(blob), len(encoded))
+        blob += encoded
+        keys.append(row[0].encode('utf-8'))
+
+    # Power of two with a load factor of at most one half
+    slots = 1
+    while slots < len(keys) * 2:
+        slots *= 2
+    mask = slots - 1
+    table = [0] * slots
+    for number, key in enumerate(keys, start=1):
+        slot = _slot_of(key, mask)
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = number
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix='.elector_snapshot.')
+    try:
+        with os.fdopen(descriptor, 'wb') as handle:
+            handle.write(HEADER.pack(MAGIC, len(keys), slots, int(time.time())))
+            handle.write(struct.pack(f'<{slots}I', *table))
+            handle.write(records)
+            handle.write(blob)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+    logger.info('Wrote elector snapshot %s: %s electors', path, len(keys))
+    return len(keys)
+
+
+# ----------------------------------------------------------------------
+# Rebuild on change
+# ----------------------------------------------------------------------
+_rebuild_lock = threading.Lock()
+_rebuild_state: Dict[str, bool] = {'running': False, 'requested': False}
+
+
+def _rebuild():
+    """Rebuild until no further change was requested meanwhile."""
+    with _rebuild_lock:
+        if _rebuild_state['running']:
+            _rebuild_state['requested'] = True
+            return
+        _rebuild_state['running'] = True
+    try:
+        while True:
+            with _rebuild_lock:
+                _rebuild_state['requested'] = False
+            build_snapshot()
+            elector_snapshot.reset()
+            with _rebuild_lock:
+                if not _rebuild_state['requested']:
+                    break
+    finally:
+        with _rebuild_lock:
+            _rebuild_state['running'] = False
+
+
+def _rebuild_after_commit():
+    from apps.utils.background import run_in_background
+
+    run_in_background(_rebuild)
+
+
+def schedule_rebuild():
+    """
+    Rebuild the snapshot in the background once the current transaction
+    commits (once per transaction). Changes arriving while a rebuild runs are
+    folded into one more pass. No-op unless a snapshot is configured.
+    """
+    if not elector_snapshot.enabled:
+        return
+    on_commit_once(_rebuild_after_commit)
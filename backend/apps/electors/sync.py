@@ -0,0 +1,304 @@
+"""
+Set-based, change-hash driven elector roster sync.
+
+Incoming rows are compared with the stored ``Elector.content_hash`` one
+chunk at a time (one ``IN`` query per chunk). Only new rows are inserted and
+only rows whose hash changed are written, with ``bulk_create`` /
+``bulk_update``; unchanged rows are not touched at all, so ``updated_at``,
+indexes and signals stay quiet when the roster did not change.
+
+Used by the CSV import service and the ``import_electors`` /
+``update_electors_from_csv`` management commands.
+"""
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.utils.conditional import bump_tables
+
+from .kinship import FULL_REBUILD_THRESHOLD, rebuild_relations, refresh_relations
+from .models import Elector
+from .normalization import SEARCH_KEY_FIELDS
+from .search_index import name_index
+from .snapshot import schedule_rebuild as schedule_snapshot_rebuild
+
+
+INSERTED = 'inserted'
+CHANGED = 'changed'
+UNCHANGED = 'unchanged'
+SKIPPED = 'skipped'
+NOT_FOUND = 'not_found'
+
+
+def _field_name(attname: str) -> str:
+    return attname[:-3] if attname == 'committee_id' else attname
+
+
+class BulkWriteTracker:
+    """
+    Maintenance for bulk writes that bypass model signals: invalidates the
+    name index, rebuilds the elector snapshot and refreshes kinship edges of
+    the touched electors (or rebuilds the whole graph once too many changed)
+    after commit.
+    """
+
+    def __init__(self):
+        self.changed_ids: Set[str] = set()
+        self.rebuild_kinship = False
+        self.index_dirty = False
+
+    def add(self, koc_ids: Iterable[str]):
+        """Record electors whose name parts may have changed."""
+        koc_ids = list(koc_ids)
+        if not koc_ids:
+            return
+        self.index_dirty = True
+        # Past the threshold a full rebuild runs, so stop collecting ids
+        if self.rebuild_kinship:
+            return
+        self.changed_ids.update(koc_ids)
+        if len(self.changed_ids) > FULL_REBUILD_THRESHOLD:
+            self.rebuild_kinship = True
+            self.changed_ids = set()
+
+    def flush(self):
+        if self.index_dirty:
+            transaction.on_commit(name_index.invalidate)
+            schedule_snapshot_rebuild()
+        if self.rebuild_kinship:
+            transaction.on_commit(rebuild_relations)
+        elif self.changed_ids:
+            changed_ids = self.changed_ids
+            transaction.on_commit(lambda: refresh_relations(changed_ids))
+        self.changed_ids = set()
+        self.rebuild_kinship = False
+        self.index_dirty = False
+
+
+class ElectorSync:
+    """
+    Diff-and-write engine for elector rows.
+
+    Rows are dicts of model attnames (``committee`` may be given as a
+    ``Committee`` instance) keyed by ``koc_id``. Fields left out of a row are
+    kept as stored, so partial rows only override what they carry.
+    """
+
+    CHUNK_SIZE = 2000
+    BATCH_SIZE = 500
+
+    UPDATE_FIELDS = [
+        *(_field_name(f) for f in Elector.CONTENT_HASH_FIELDS),
+        'is_active',
+        *SEARCH_KEY_FIELDS,
+        'content_hash',
+        'updated_at',
+    ]
+
+    def __init__(
+        self,
+        create_missing: bool = True,
+        update_existing: bool = True,
+        dry_run: bool = False,
+        change_log_limit: int = 0,
+    ):
+        self.create_missing = create_missing
+        self.update_existing = update_existing
+        self.dry_run = dry_run
+        self.change_log_limit = change_log_limit
+        self.stats = {
+            INSERTED: 0,
+            CHANGED: 0,
+            UNCHANGED: 0,
+            SKIPPED: 0,
+            NOT_FOUND: 0,
+            'deactivated': 0,
+        }
+        # First ``change_log_limit`` changes as (koc_id, [(field, old, new)])
+        self.change_log: List[Tuple[str, List[Tuple[str, object, object]]]] = []
+        # First ``change_log_limit`` koc_ids missing from the database
+        self.not_found_ids: List[str] = []
+        self.tracker = BulkWriteTracker()
+
+    # ------------------------------------------------------------------
+    # Entry points
+    # ------------------------------------------------------------------
+    def run(self, rows: Iterable[Dict], deactivate_missing: bool = False) -> Dict:
+        """
+        Sync a stream of rows chunk by chunk, each chunk in its own transaction.
+
+        With ``deactivate_missing`` the rows are the full roster: electors
+        not present are deactivated and present ones are (re)activated.
+        """
+        seen: Set[str] = set()
+        rows = iter(rows)
+        while True:
+            chunk: Dict[str, Dict] = {}
+            for row in islice(rows, self.CHUNK_SIZE):
+                values = dict(row)
+                koc_id = values.pop('koc_id')
+                if deactivate_missing:
+                    values['is_active'] = True
+                    seen.add(koc_id)
+                # Last occurrence of a koc_id in the chunk wins
+                chunk[koc_id] = values
+            if not chunk:
+                break
+            with transaction.atomic():
+                self.sync_chunk(chunk)
+
+        if deactivate_missing:
+            self.deactivate_missing(seen)
+        self.finish()
+        return self.stats
+
+    def sync_chunk(self, rows: Dict[str, Dict]) -> Dict[str, str]:
+        """
+        Diff one chunk against the database and write the difference.
+
+        Returns the outcome per koc_id (``inserted``, ``changed``,
+        ``unchanged``, ``skipped`` or ``not_found``). A new row that another
+        writer inserted first is diffed again against the stored row.
+        """
+        load_fields = {_field_name(f) for f in Elector.CONTENT_HASH_FIELDS}
+        existing = {
+            elector.koc_id: elector
+            for elector in Elector.objects.filter(koc_id__in=list(rows)).only(
+                'koc_id', 'is_active', 'content_hash', *load_fields
+            )
+        }
+
+        now = timezone.now()
+        outcomes: Dict[str, str] = {}
+        to_create: List[Elector] = []
+        to_update: List[Elector] = []
+        for koc_id, values in rows.items():
+            values = self._clean(values)
+            elector = existing.get(koc_id)
+            if elector is None:
+                if not self.create_missing:
+                    outcomes[koc_id] = NOT_FOUND
+                    if len(self.not_found_ids) < self.change_log_limit:
+                        self.not_found_ids.append(koc_id)
+                    continue
+                elector = Elector(koc_id=koc_id, **values)
+                elector.refresh_search_keys()
+                elector.refresh_content_hash()
+                to_create.append(elector)
+                outcomes[koc_id] = INSERTED
+                continue
+
+            if not self.update_existing:
+                outcomes[koc_id] = SKIPPED
+                continue
+
+            changes = self._apply(elector, values)
+            if changes is None:
+                outcomes[koc_id] = UNCHANGED
+                continue
+            elector.refresh_search_keys()
+            elector.refresh_content_hash()
+            elector.updated_at = now
+            to_update.append(elector)
+            outcomes[koc_id] = CHANGED
+            if changes:
+                self.change_log.append((koc_id, changes))
+
+        conflicts: Dict[str, Dict] = {}
+        if not self.dry_run:
+            inserted: Set[str] = set()
+            if to_create:
+                Elector.objects.bulk_create(to_create, batch_size=self.BATCH_SIZE, ignore_conflicts=True)
+                inserted = self._inserted(to_create)
+                conflicts = {e.koc_id: rows[e.koc_id] for e in to_create if e.koc_id not in inserted}
+            if to_update:
+                Elector.objects.bulk_update(to_update, fields=self.UPDATE_FIELDS, batch_size=self.BATCH_SIZE)
+            if inserted or to_update:
+                bump_tables(Elector)
+            self.tracker.add([*inserted, *(e.koc_id for e in to_update)])
+
+        for koc_id in conflicts:
+            del outcomes[koc_id]
+        for outcome in outcomes.values():
+            self.stats[outcome] += 1
+        if conflicts:
+            # Inserted by someone else since the read: diff against their row
+            outcomes.update(self.sync_chunk(conflicts))
+        return outcomes
+
+    def deactivate_missing(self, seen: Set[str]) -> int:
+        """Deactivate active electors whose koc_id is not in ``seen``."""
+        missing = [
+            koc_id
+            for koc_id in Elector.objects.filter(is_active=True).values_list('koc_id', flat=True).iterator(chunk_size=5000)
+            if koc_id not in seen
+        ]
+        if missing and not self.dry_run:
+            now = timezone.now()
+            for start in range(0, len(missing), self.BATCH_SIZE):
+                Elector.objects.filter(koc_id__in=missing[start:start + self.BATCH_SIZE]).update(
+                    is_active=False, updated_at=now
+                )
+            bump_tables(Elector)
+            # Inactive electors drop out of the name index
+            self.tracker.index_dirty = True
+        self.stats['deactivated'] += len(missing)
+        return len(missing)
+
+    def finish(self):
+        """Schedule index / kinship maintenance for everything written so far."""
+        self.tracker.flush()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _inserted(created: List[Elector]) -> Set[str]:
+        """
+        koc_ids of ``created`` that ``bulk_create(ignore_conflicts=True)``
+        actually wrote: a row that lost to a concurrent insert carries that
+        writer's ``created_at``, not the one stamped on our instance.
+        """
+        stamped = {elector.koc_id: elector.created_at for elector in created}
+        return {
+            koc_id
+            for koc_id, created_at in Elector.objects.filter(koc_id__in=list(stamped)).values_list('koc_id', 'created_at')
+            if created_at == stamped[koc_id]
+        }
+
+    @staticmethod
+    def _clean(values: Dict) -> Dict:
+        cleaned = {}
+        for field, value in values.items():
+            if field in SEARCH_KEY_FIELDS or field in ('koc_id', 'content_hash'):
+                continue  # key / derived
+            if field == 'committee':
+                field, value = 'committee_id', value.pk if value is not None else None
+            cleaned[field] = value
+        return cleaned
+
+    def _apply(self, elector: Elector, values: Dict) -> Optional[List[Tuple[str, object, object]]]:
+        """
+        Apply ``values`` to ``elector``; return None if nothing changed,
+        else the changed fields (only collected while the change log has room).
+
+        Hashed columns are compared through ``content_hash`` (recomputed for
+        rows stored before the hash existed); other columns directly.
+        """
+        old_hash = elector.content_hash or elector.compute_content_hash()
+        log = len(self.change_log) < self.change_log_limit
+        changes = []
+        unhashed_changed = False
+        for field, value in values.items():
+            old_value = getattr(elector, field)
+            if field not in Elector.CONTENT_HASH_FIELDS and old_value != value:
+                unhashed_changed = True
+            if log and old_value != value:
+                changes.append((field, old_value, value))
+            setattr(elector, field, value)
+
+        if not unhashed_changed and elector.compute_content_hash() == old_hash:
+            return None
+        return changes
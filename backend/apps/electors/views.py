@@ -4,8 +4,7 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict, List
 
-from django.db import transaction
-from django.db.models import Count, Q
+from django.db.models import Count
 from django.http import HttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status, viewsets
@@ -13,14 +12,20 @@ from rest_framework.decorators import action
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 
+from apps.utils.conditional import bump_tables
 from apps.utils.permissions import IsAdminOrAbove
 from apps.utils.responses import APIResponse
 from apps.utils.viewsets import StandardResponseMixin
 
-from .import_service import ElectorImportService
-from .models import Elector
+from .guarantee_overlay import guarantee_status_of, load_guarantee_overlay
+from .jobs import enqueue_import_job
+from .kinship import relatives_of
+from .models import Elector, ElectorImportJob
+from .normalization import name_lookup_q, normalize_name, phonetic_lookup_q
+from .search_index import name_index
 from .serializers import (
     ElectorCreateSerializer,
+    ElectorImportJobSerializer,
     ElectorListSerializer,
     ElectorSearchSerializer,
     ElectorSerializer,
@@ -42,6 +47,11 @@ class ElectorViewSet(StandardResponseMixin, viewsets.ModelViewSet):
     """
 
     queryset = Elector.objects.all()
+    # Tables the retrieve payload reads (conditional GET): committee,
+    # created_by, has_attended and guarantees
+    conditional_models = (
+        Elector, 'elections.Committee', 'account.CustomUser', 'attendees.Attendance', 'guarantees.Guarantee',
+    )
     permission_classes = [IsAuthenticated]
     lookup_field = "koc_id"
 
@@ -77,6 +87,8 @@ class ElectorViewSet(StandardResponseMixin, viewsets.ModelViewSet):
     ]
     ordering_fields = ["koc_id", "name_first", "family_name", "created_at"]
     ordering = ["name_first", "family_name"]
+    # Keyset pagination (?cursor=) follows the name index, koc_id breaks ties
+    cursor_ordering = ("name_first", "family_name", "koc_id")
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -125,10 +137,11 @@ class ElectorViewSet(StandardResponseMixin, viewsets.ModelViewSet):
 
         meta = {"includes": include_params}
         if page is not None:
+            paginated_response = self.get_paginated_response(serializer.data)
             meta["pagination"] = {
-                "count": self.paginator.page.paginator.count,
-                "next": self.paginator.get_next_link(),
-                "previous": self.paginator.get_previous_link(),
+                "count": paginated_response.data.get("count"),
+                "next": paginated_response.data.get("next"),
+                "previous": paginated_response.data.get("previous"),
             }
         return APIResponse.success(data=data, meta=meta)
 
@@ -136,19 +149,15 @@ class ElectorViewSet(StandardResponseMixin, viewsets.ModelViewSet):
     # Relationship helpers
     # ------------------------------------------------------------------
     @staticmethod
-    def _serialize_person(elector: Elector, guarantee_status: str = None) -> Dict[str, Any]:
+    def _serialize_person(elector: Elector, guarantee_status: str | None) -> Dict[str, Any]:
         """
         Serialize elector person data.
         
         Args:
             elector: Elector instance (should have committee prefetched via select_related)
-            guarantee_status: Optional pre-fetched guarantee status to avoid N+1 query
+            guarantee_status: Guarantee status from the batch overlay
+                (see load_guarantee_overlay), None when not guaranteed
         """
-        # Only query guarantee if not provided (backward compatibility)
-        if guarantee_status is None:
-            from apps.guarantees.models import Guarantee
-            guarantee_status = Guarantee.objects.filter(elector=elector).values_list("guarantee_status", flat=True).first()
-        
         return {
             "kocId": elector.koc_id,
             "fullName": elector.full_name,
@@ -163,63 +172,16 @@ class ElectorViewSet(StandardResponseMixin, viewsets.ModelViewSet):
 
     def _build_family_relations(self, elector: Elector) -> List[Dict[str, Any]]:
         """
-        Build family relations with optimized queries.
-        Uses select_related to prevent N+1 queries when accessing committee.
-        Prefetches guarantees to avoid N+1 queries in _serialize_person.
+        Build family relations from the materialized kinship graph.
+        One query: relatives, their committees and guarantee statuses.
         """
-        from apps.guarantees.models import Guarantee
-        
-        relations: List[Dict[str, Any]] = []
-        all_related_electors = []
-
-        if elector.name_second and elector.name_third:
-            brothers_q = Q(name_second=elector.name_second, name_third=elector.name_third)
-            brothers_q &= Q(name_fourth=elector.name_fourth) if elector.name_fourth else Q(family_name=elector.family_name)
-            brothers = list(Elector.objects.select_related('committee').filter(brothers_q).exclude(koc_id=elector.koc_id)[:10])
-            all_related_electors.extend([(e, "BROTHER") for e in brothers])
-
-        if elector.name_second and elector.name_third and elector.family_name:
-            fathers = list(Elector.objects.select_related('committee').filter(
-                name_first=elector.name_second,
-                name_second=elector.name_third,
-                family_name=elector.family_name,
-            ).exclude(koc_id=elector.koc_id))
-            all_related_electors.extend([(e, "FATHER") for e in fathers])
-
-        if elector.name_first and elector.name_second and elector.family_name:
-            sons = list(Elector.objects.select_related('committee').filter(
-                name_second=elector.name_first,
-                name_third=elector.name_second,
-                family_name=elector.family_name,
-            ).exclude(koc_id=elector.koc_id))
-            all_related_electors.extend([(e, "SON") for e in sons])
-
-        if elector.name_third and elector.name_fourth:
-            cousins_q = Q(name_third=elector.name_third, name_fourth=elector.name_fourth)
-            cousins_q &= Q(name_fifth=elector.name_fifth) if elector.name_fifth else Q(family_name=elector.family_name)
-            cousins_qs = Elector.objects.select_related('committee').filter(cousins_q).exclude(koc_id=elector.koc_id)
-            if elector.name_second:
-                cousins_qs = cousins_qs.exclude(name_second=elector.name_second)
-            cousins = list(cousins_qs[:10])
-            all_related_electors.extend([(e, "COUSIN") for e in cousins])
-
-        # Prefetch guarantees for all related electors in a single query
-        if all_related_electors:
-            related_elector_ids = [e.koc_id for e, _ in all_related_electors]
-            guarantees_map = {
-                g.elector_id: g.guarantee_status
-                for g in Guarantee.objects.filter(elector_id__in=related_elector_ids).only('elector_id', 'guarantee_status')
+        return [
+            {
+                **self._serialize_person(rel.relative, guarantee_status=rel.guarantee_status),
+                "relationship": rel.relationship,
             }
-            
-            # Build relations with prefetched guarantee data
-            for related_elector, relationship in all_related_electors:
-                guarantee_status = guarantees_map.get(related_elector.koc_id)
-                relations.append({
-                    **self._serialize_person(related_elector, guarantee_status=guarantee_status),
-                    "relationship": relationship
-                })
-
-        return relations
+            for rel in relatives_of(elector)
+        ]
 
     @staticmethod
     def _paginate_queryset(queryset, request, prefix: str):
@@ -227,8 +189,6 @@ class ElectorViewSet(StandardResponseMixin, viewsets.ModelViewSet):
         Paginate queryset and serialize results.
         Optimized: Prefetches guarantees to avoid N+1 queries.
         """
-        from apps.guarantees.models import Guarantee
-        
         try:
             page = int(request.query_params.get(f"{prefix}_page", 1))
         except (TypeError, ValueError):
@@ -245,24 +205,13 @@ class ElectorViewSet(StandardResponseMixin, viewsets.ModelViewSet):
         start = (page - 1) * page_size
         end = start + page_size
         
-        # Get paginated electors
+        # Get paginated electors, guarantees for the whole page in one query
         electors = list(queryset.order_by("koc_id")[start:end])
-        
-        # Prefetch guarantees for all electors in a single query
-        if electors:
-            elector_ids = [e.koc_id for e in electors]
-            guarantees_map = {
-                g.elector_id: g.guarantee_status
-                for g in Guarantee.objects.filter(elector_id__in=elector_ids).only('elector_id', 'guarantee_status')
-            }
-            
-            # Serialize with prefetched guarantee data
-            results = [
-                ElectorViewSet._serialize_person(e, guarantee_status=guarantees_map.get(e.koc_id))
-                for e in electors
-            ]
-        else:
-            results = []
+        overlay = load_guarantee_overlay(e.koc_id for e in electors)
+        results = [
+            ElectorViewSet._serialize_person(e, guarantee_status_of(overlay, e.koc_id))
+            for e in electors
+        ]
 
         return {
             "results": results,
@@ -321,25 +270,30 @@ class ElectorViewSet(StandardResponseMixin, viewsets.ModelViewSet):
     def get_work_colleagues(self, request, koc_id=None):
         elector = self.get_object()
 
-        def serialize_with_area(e):
-            data = self._serialize_person(e)
-            data["area"] = e.area
-            return data
+        def colleagues(**filters):
+            if not all(filters.values()):
+                return []
+            qs = Elector.objects.select_related('committee').filter(is_active=True, **filters).exclude(koc_id=elector.koc_id)
+            return list(qs[:100])  # Add limit to prevent memory issues
 
-        same_area = []
-        if elector.area:
-            qs = Elector.objects.select_related('committee').filter(area=elector.area, is_active=True).exclude(koc_id=elector.koc_id)
-            same_area = [serialize_with_area(e) for e in qs[:100]]  # Add limit to prevent memory issues
+        same_area = colleagues(area=elector.area)
+        same_department = colleagues(department=elector.department)
+        same_team = colleagues(team=elector.team)
 
-        same_department = []
-        if elector.department:
-            qs = Elector.objects.select_related('committee').filter(department=elector.department, is_active=True).exclude(koc_id=elector.koc_id)
-            same_department = [serialize_with_area(e) for e in qs[:100]]  # Add limit to prevent memory issues
+        # Guarantee statuses of all colleagues in one query
+        overlay = load_guarantee_overlay(e.koc_id for e in same_area + same_department + same_team)
 
-        same_team = []
-        if elector.team:
-            qs = Elector.objects.select_related('committee').filter(team=elector.team, is_active=True).exclude(koc_id=elector.koc_id)
-            same_team = [serialize_with_area(e) for e in qs[:100]]  # Add limit to prevent memory issues
+        def serialize_with_area(electors):
+            results = []
+            for e in electors:
+                data = self._serialize_person(e, guarantee_status_of(overlay, e.koc_id))
+                data["area"] = e.area
+                results.append(data)
+            return results
+
+        same_area = serialize_with_area(same_area)
+        same_department = serialize_with_area(same_department)
+        same_team = serialize_with_area(same_team)
 
         return APIResponse.success(
             data={"same_area": same_area, "same_department": same_department, "same_team": same_team},
@@ -362,6 +316,7 @@ class ElectorViewSet(StandardResponseMixin, viewsets.ModelViewSet):
         if not koc_ids:
             return APIResponse.error(message="koc_ids required", status_code=status.HTTP_400_BAD_REQUEST)
         updated = Elector.objects.filter(koc_id__in=koc_ids).update(is_approved=True)
+        bump_tables(Elector)
         return APIResponse.success(data={"approved_count": updated}, message=f"{updated} approved")
 
     @action(detail=False, methods=["get"])
@@ -372,29 +327,48 @@ class ElectorViewSet(StandardResponseMixin, viewsets.ModelViewSet):
             return self.get_paginated_response(ElectorListSerializer(page, many=True).data)
         return APIResponse.success(data=ElectorListSerializer(queryset, many=True).data)
 
+    # Name-index hits above this size are narrowed in the DB instead of via IN (...)
+    NAME_INDEX_MAX_IN = 2000
+
+    def _search_response(self, page, rows):
+        serializer = ElectorSerializer(page if page is not None else rows, many=True)
+        meta = None
+        if page is not None:
+            paginated_response = self.get_paginated_response(serializer.data)
+            meta = {
+                "pagination": {
+                    "count": paginated_response.data.get("count"),
+                    "next": paginated_response.data.get("next"),
+                    "previous": paginated_response.data.get("previous"),
+                }
+            }
+        return APIResponse.success(data=serializer.data, meta=meta)
+
     @action(detail=False, methods=["get"])
     def search(self, request):
+        """
+        Search electors.
+
+        Name lookups are resolved from the in-memory n-gram index
+        (``search_index.name_index``) over normalized name parts. When the name
+        is the only criterion the matching koc_ids are paginated in memory and
+        only the requested page is fetched from the database. Names with no
+        normalized match fall back to the phonetic key columns.
+        """
         queryset = self.get_queryset()
         params = request.query_params
+        narrowed = False
 
         if params.get("koc_id"):
             queryset = queryset.filter(koc_id__icontains=params["koc_id"])
+            narrowed = True
 
-        if params.get("name"):
-            name_query = params["name"]
-            queryset = queryset.filter(
-                Q(name_first__icontains=name_query)
-                | Q(name_second__icontains=name_query)
-                | Q(name_third__icontains=name_query)
-                | Q(name_fourth__icontains=name_query)
-                | Q(name_fifth__icontains=name_query)
-                | Q(name_sixth__icontains=name_query)
-                | Q(sub_family_name__icontains=name_query)
-                | Q(family_name__icontains=name_query)
-            )
+        family_name = normalize_name(params.get("family_name", ""))
+        if family_name:
+            queryset = queryset.filter(normalized_family__startswith=family_name)
+            narrowed = True
 
         optional_filters = [
-            "family_name",
             "designation",
             "section",
             "location",
@@ -407,28 +381,39 @@ class ElectorViewSet(StandardResponseMixin, viewsets.ModelViewSet):
             value = params.get(field)
             if value:
                 queryset = queryset.filter(**{f"{field}__icontains": value})
+                narrowed = True
 
         committee_value = params.get("committee")
         if committee_value:
             queryset = queryset.filter(committee__code__icontains=committee_value)
+            narrowed = True
 
         gender_value = params.get("gender")
         if gender_value:
             queryset = queryset.filter(gender=gender_value)
+            narrowed = True
+
+        name_query = params.get("name")
+        if name_query:
+            matched_ids = name_index.search(name_query)
+            if not matched_ids:
+                # No spelling-variant match: try the phonetic keys (indexed equality)
+                queryset = queryset.filter(phonetic_lookup_q(name_query))
+            elif not narrowed:
+                page_ids = self.paginate_queryset(matched_ids)
+                wanted = page_ids if page_ids is not None else matched_ids
+                rows = queryset.in_bulk(wanted)
+                electors = [rows[koc_id] for koc_id in wanted if koc_id in rows]
+                return self._search_response(electors if page_ids is not None else None, electors)
+
+            elif len(matched_ids) <= self.NAME_INDEX_MAX_IN:
+                queryset = queryset.filter(koc_id__in=matched_ids)
+            else:
+                # Too many ids for an IN list: indexed prefix lookup on the name keys
+                queryset = queryset.filter(name_lookup_q(name_query, phonetic=False))
 
         page = self.paginate_queryset(queryset)
-        serializer = ElectorSerializer(page if page is not None else queryset, many=True)
-        meta = None
-        if page is not None:
-            paginated_response = self.get_paginated_response(serializer.data)
-            meta = {
-                "pagination": {
-                    "count": paginated_response.data.get("count"),
-                    "next": paginated_response.data.get("next"),
-                    "previous": paginated_response.data.get("previous"),
-                }
-            }
-        return APIResponse.success(data=serializer.data, meta=meta)
+        return self._search_response(page, queryset)
 
     @action(
         detail=False,
@@ -436,8 +421,8 @@ class ElectorViewSet(StandardResponseMixin, viewsets.ModelViewSet):
         permission_classes=[IsAuthenticated, IsAdminOrAbove],
         parser_classes=[MultiPartParser, FormParser],
     )
-    @transaction.atomic
     def import_csv(self, request):
+        """Queue a CSV import; progress is reported via the job and WebSocket events."""
         csv_file = request.FILES.get("file")
         if not csv_file:
             return APIResponse.error(message="No file provided. Please upload a CSV file.", status_code=status.HTTP_400_BAD_REQUEST)
@@ -445,19 +430,34 @@ class ElectorViewSet(StandardResponseMixin, viewsets.ModelViewSet):
             return APIResponse.error(message="Invalid file type. Please upload a CSV file.", status_code=status.HTTP_400_BAD_REQUEST)
 
         update_existing = request.data.get("update_existing", "false").lower() == "true"
-        file_content = csv_file.read()
 
-        import_service = ElectorImportService()
-        results = import_service.import_electors(file_content, update_existing)
+        job = ElectorImportJob.objects.create(
+            file=csv_file,
+            original_filename=csv_file.name,
+            update_existing=update_existing,
+            created_by=request.user,
+        )
+        enqueue_import_job(job)
 
-        if results.get("success"):
-            return APIResponse.success(data={"results": results}, message="Import completed successfully")
-        return APIResponse.error(
-            message="Import completed with errors",
-            errors={"results": results},
-            status_code=status.HTTP_400_BAD_REQUEST,
+        return APIResponse.success(
+            data=ElectorImportJobSerializer(job).data,
+            message="Import queued",
+            status_code=status.HTTP_202_ACCEPTED,
         )
 
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=r"import_jobs/(?P<job_id>\d+)",
+        permission_classes=[IsAuthenticated, IsAdminOrAbove],
+    )
+    def import_job(self, request, job_id=None):
+        """Status, progress and result of a background import."""
+        job = ElectorImportJob.objects.filter(pk=job_id).first()
+        if job is None:
+            return APIResponse.error(message="Import job not found", status_code=status.HTTP_404_NOT_FOUND)
+        return APIResponse.success(data=ElectorImportJobSerializer(job).data)
+
     @action(detail=False, methods=["get"])
     def filter_options(self, request):
         areas = (
@@ -30,7 +30,9 @@ from .serializers import (
     GuaranteeBulkConfirmSerializer,
 )
 from apps.utils.permissions import IsSupervisorOrAbove, IsAdminOrAbove
+from apps.utils.conditional import bump_tables
 from apps.utils.viewsets import StandardResponseMixin
+from apps.utils.websocket_utils import invalidate_dashboard_cache
 
 
 logger = logging.getLogger(__name__)
@@ -51,6 +53,7 @@ class GuaranteeGroupViewSet(StandardResponseMixin, viewsets.ModelViewSet):
     
     serializer_class = GuaranteeGroupSerializer
     permission_classes = [IsAuthenticated]
+    conditional_models = (GuaranteeGroup, Guarantee)  # guarantee_count
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['order', 'name', 'created_at']
     ordering = ['order', 'name']
@@ -120,6 +123,11 @@ class GuaranteeViewSet(StandardResponseMixin, viewsets.ModelViewSet):
     """
     
     permission_classes = [IsAuthenticated]
+    # Tables the guarantee payload reads (conditional GET): group, elector and
+    # its committee, recent notes and their authors
+    conditional_models = (
+        Guarantee, GuaranteeGroup, GuaranteeNote, 'electors.Elector', 'elections.Committee', 'account.CustomUser',
+    )
     
     # Filtering & Search
     filter_backends = [
@@ -138,6 +146,8 @@ class GuaranteeViewSet(StandardResponseMixin, viewsets.ModelViewSet):
     ]
     ordering_fields = ['created_at', 'guarantee_status', 'elector__name_first']
     ordering = ['-created_at']
+    # Keyset pagination (?cursor=) follows the created_at index, id breaks ties
+    cursor_ordering = ('-created_at', '-id')
     
     def get_serializer_class(self):
         """Use appropriate serializer based on action."""
@@ -172,6 +182,7 @@ class GuaranteeViewSet(StandardResponseMixin, viewsets.ModelViewSet):
         List guarantees with statistics and groups in one request.
         
         GET /api/guarantees/?page=1&page_size=10
+        GET /api/guarantees/?cursor=&page_size=10   (keyset; count only with &count=exact)
         
         Returns:
         {
@@ -190,18 +201,28 @@ class GuaranteeViewSet(StandardResponseMixin, viewsets.ModelViewSet):
         """
         from apps.utils.responses import APIResponse
         
+        from apps.utils.pagination import paginate_keyset
+        
         # Get filtered and paginated guarantees
         queryset = self.filter_queryset(self.get_queryset())
         
-        # Get pagination params
-        page_num = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('page_size', 10))
-        
-        # Apply pagination
-        start = (page_num - 1) * page_size
-        end = start + page_size
-        guarantees_list = queryset[start:end]
-        total_count = queryset.count()
+        if 'cursor' in request.query_params:
+            # Keyset page: cost independent of depth, no full count unless asked
+            guarantees_list, pagination = paginate_keyset(request, queryset, self.cursor_ordering)
+        else:
+            # Get pagination params
+            page_num = int(request.query_params.get('page', 1))
+            page_size = int(request.query_params.get('page_size', 10))
+            
+            # Apply pagination
+            start = (page_num - 1) * page_size
+            end = start + page_size
+            guarantees_list = queryset[start:end]
+            pagination = {
+                'count': queryset.count(),
+                'page': page_num,
+                'page_size': page_size
+            }
         
         # Serialize guarantees
         guarantees_serializer = GuaranteeListSerializer(guarantees_list, many=True)
@@ -283,11 +304,7 @@ class GuaranteeViewSet(StandardResponseMixin, viewsets.ModelViewSet):
                 'groups': groups_serializer.data
             },
             meta={
-                'pagination': {
-                    'count': total_count,
-                    'page': page_num,
-                    'page_size': page_size
-                }
+                'pagination': pagination
             },
             message='Guarantees retrieved successfully'
         )
@@ -309,17 +326,14 @@ class GuaranteeViewSet(StandardResponseMixin, viewsets.ModelViewSet):
         """
         Get family relations of the elector.
         
-        Brothers: Share same 2nd, 3rd, 4th names (or family_name if 4th not available)
-        Fathers: name_first matches person's 2nd or 3rd name, AND same family_name
-        Sons: name_second matches person's name_first, AND same family_name
-        Cousins: Share same 3rd, 4th, 5th names (if available, or family_name)
+        Read from the materialized kinship graph (see apps.electors.kinship
+        for the brother / father / son / cousin rules).
         """
         from apps.utils.responses import APIResponse
-        from apps.electors.models import Elector
-        from django.db.models import Q
+        from apps.electors.kinship import relatives_of
+        from apps.electors.models import ElectorRelation
         
         guarantee = self.get_object()
-        elector = guarantee.elector
         
         def serialize_elector(e):
             return {
@@ -330,87 +344,21 @@ class GuaranteeViewSet(StandardResponseMixin, viewsets.ModelViewSet):
                 'committee': e.committee.name if e.committee else None
             }
         
-        # ===== BROTHERS =====
-        # Same 2nd, 3rd, 4th names (OR family_name if 4th not available)
-        # Optimized: Uses select_related to prevent N+1 queries
-        brothers = []
-        if elector.name_second and elector.name_third:
-            brothers_q = Q(
-                name_second=elector.name_second,
-                name_third=elector.name_third
-            )
-            
-            # If 4th name exists, match it; otherwise match family_name
-            if elector.name_fourth:
-                brothers_q &= Q(name_fourth=elector.name_fourth)
-            else:
-                brothers_q &= Q(family_name=elector.family_name)
-            
-            brothers_qs = Elector.objects.select_related('committee').filter(brothers_q).exclude(
-                koc_id=elector.koc_id
-            )[:10]
-            
-            brothers = [serialize_elector(e) for e in brothers_qs]
-        
-        # ===== FATHERS =====
-        # People whose name_first matches current person's name_second
-        # AND whose name_second matches current person's name_third
-        # AND must have the SAME family_name
-        fathers = []
-        if elector.name_second and elector.name_third and elector.family_name:
-            fathers_qs = Elector.objects.select_related('committee').filter(
-                name_first=elector.name_second,      # Father's given name = person's 2nd name
-                name_second=elector.name_third,      # Grandfather's name = person's 3rd name
-                family_name=elector.family_name      # ✅ MUST have same family name
-            ).exclude(koc_id=elector.koc_id)[:10]
-            
-            fathers = [serialize_elector(e) for e in fathers_qs]
-        
-        # ===== SONS =====
-        # People whose name_second matches current person's name_first
-        # AND must have the SAME family_name
-        sons = []
-        if elector.name_first and elector.family_name:
-            sons_qs = Elector.objects.select_related('committee').filter(
-                name_second=elector.name_first,
-                family_name=elector.family_name  # ✅ MUST have same family name
-            ).exclude(koc_id=elector.koc_id)[:10]
-            
-            sons = [serialize_elector(e) for e in sons_qs]
-        
-        # ===== COUSINS =====
-        # Same 3rd, 4th, 5th names (if available, or family_name)
-        cousins = []
-        if elector.name_third and elector.name_fourth:
-            cousins_q = Q(
-                name_third=elector.name_third,
-                name_fourth=elector.name_fourth
-            )
-            
-            # If 5th name exists, match it; otherwise match family_name
-            if elector.name_fifth:
-                cousins_q &= Q(name_fifth=elector.name_fifth)
-            else:
-                cousins_q &= Q(family_name=elector.family_name)
-            
-            cousins_qs = Elector.objects.select_related('committee').filter(cousins_q).exclude(
-                koc_id=elector.koc_id
-            )
-            
-            # Exclude brothers (same 2nd name means they're brothers, not cousins)
-            if elector.name_second:
-                cousins_qs = cousins_qs.exclude(name_second=elector.name_second)
-            
-            cousins_qs = cousins_qs[:10]
-            
-            cousins = [serialize_elector(e) for e in cousins_qs]
+        groups = {
+            ElectorRelation.BROTHER: [],
+            ElectorRelation.FATHER: [],
+            ElectorRelation.SON: [],
+            ElectorRelation.COUSIN: [],
+        }
+        for rel in relatives_of(guarantee.elector):
+            groups[rel.relationship].append(serialize_elector(rel.relative))
         
         return APIResponse.success(
             data={
-                'brothers': brothers,
-                'fathers': fathers,
-                'sons': sons,
-                'cousins': cousins
+                'brothers': groups[ElectorRelation.BROTHER],
+                'fathers': groups[ElectorRelation.FATHER],
+                'sons': groups[ElectorRelation.SON],
+                'cousins': groups[ElectorRelation.COUSIN]
             },
             message='Relatives retrieved successfully'
         )
@@ -620,6 +568,12 @@ class GuaranteeViewSet(StandardResponseMixin, viewsets.ModelViewSet):
                 update_fields.append('group')
             updated_count = guarantees.count()
         
+        if update_fields:
+            # QuerySet.update() sends no post_save, so the signal handlers
+            # that normally invalidate these never run
+            bump_tables(Guarantee)
+            invalidate_dashboard_cache(user_id=request.user.pk)
+        
         from apps.utils.responses import APIResponse
         return APIResponse.success(
             data={
@@ -863,6 +817,7 @@ class GuaranteeViewSet(StandardResponseMixin, viewsets.ModelViewSet):
         GET /api/guarantees/search-elector/?query=john
         """
         from apps.electors.models import Elector
+        from apps.electors.normalization import name_lookup_q
         from apps.electors.serializers import ElectorListSerializer
         
         from apps.utils.responses import APIResponse
@@ -880,18 +835,19 @@ class GuaranteeViewSet(StandardResponseMixin, viewsets.ModelViewSet):
         # Get electors already in user's guarantees
         existing_elector_ids = self.get_queryset().values_list('elector_id', flat=True)
         
-        # Search electors not in user's list
+        # Search electors not in user's list.
+        # Every branch is a prefix or equality lookup on an indexed column:
+        # names use the normalized/phonetic key columns so spelling variants
+        # match; KOC IDs, mobiles and sections match by prefix.
         electors = Elector.objects.filter(
             is_active=True
         ).exclude(
             koc_id__in=existing_elector_ids
         ).filter(
-            Q(koc_id__icontains=query) |
-            Q(name_first__icontains=query) |
-            Q(family_name__icontains=query) |
-            Q(sub_family_name__icontains=query) |
-            Q(mobile__icontains=query) |
-            Q(section__icontains=query)
+            Q(koc_id__startswith=query) |
+            name_lookup_q(query) |
+            Q(mobile__startswith=query) |
+            Q(section__startswith=query)
         ).select_related('committee')[:20]
         
         serializer = ElectorListSerializer(electors, many=True)
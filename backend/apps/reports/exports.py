@@ -0,0 +1,313 @@
+"""
+Background report exports.
+
+``request_export`` records a PENDING ``GeneratedReport`` and hands it to the
+background runner (apps.utils.background) once the request's transaction
+commits, so the web worker only pays for one insert. The worker builds the
+report data, writes the artifact to ``GeneratedReport.file`` row by row
+through a temporary file (CSV, EXCEL, JSON or PDF) and marks the report
+COMPLETED or FAILED.
+
+Artifacts are reused: an export with the same report type, format and
+parameters (``params_hash``) whose data has not changed since
+(``source_version``, the version counters of the tables reports read) returns
+the existing report, finished or still in progress, instead of queueing
+another one. A report still queued or rendering after ``RENDER_TIMEOUT``
+(its worker died with the process) is marked FAILED instead of reused.
+"""
+import csv
+import hashlib
+import io
+import json
+import logging
+import tempfile
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.utils.background import run_in_background
+from apps.utils.conditional import tables_version
+
+from .models import GeneratedReport
+
+logger = logging.getLogger(__name__)
+
+# Report type -> ReportsViewSet method building its data
+REPORT_BUILDERS = {
+    "GUARANTEE_COVERAGE": "_build_coverage",
+    "GUARANTEE_ACCURACY": "_build_accuracy",
+    "COMMITTEE_PERFORMANCE": "_build_committee_performance",
+}
+
+EXTENSIONS = {"CSV": "csv", "EXCEL": "xlsx", "JSON": "json", "PDF": "pdf"}
+
+CONTENT_TYPES = {
+    "CSV": "text/csv",
+    "EXCEL": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "JSON": "application/json",
+    "PDF": "application/pdf",
+}
+
+ARTIFACT_LIFETIME = timedelta(days=7)
+
+# Tables the report builders read; a write to any of them invalidates artifacts
+REPORT_SOURCE_MODELS = (
+    "electors.Elector",
+    "elections.Election",
+    "elections.Committee",
+    "guarantees.Guarantee",
+    "attendees.Attendance",
+    "account.CustomUser",
+)
+
+# Statuses of a report that an identical export can share
+REUSABLE_STATUSES = ("PENDING", "GENERATING", "COMPLETED")
+
+# Renders run on in-process threads, so a restart mid-render leaves the
+# report PENDING or GENERATING for good; past this age it counts as FAILED
+RENDER_TIMEOUT = timedelta(minutes=15)
+
+Table = Tuple[str, List[str], Iterable[list]]
+
+
+def parameters_hash(report_type: str, export_format: str, parameters: Dict) -> str:
+    """Stable hash of what an export renders."""
+    payload = json.dumps(
+        {"report_type": report_type, "format": export_format, "parameters": parameters},
+        sort_keys=True,
+        cls=DjangoJSONEncoder,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def source_version() -> str:
+    """
+    Version of the data reports are built from. Every committed write to
+    one of the tables changes it, including writers that never touch the
+    reports cache (bulk imports and syncs call ``bump_tables``).
+    """
+    return tables_version(REPORT_SOURCE_MODELS)
+
+
+def request_export(report_type: str, export_format: str, parameters: Dict, user) -> Tuple[GeneratedReport, bool]:
+    """
+    The report rendering ``report_type`` as ``export_format``: a reusable
+    existing one, or a new one queued for the worker.
+
+    Returns ``(report, reused)``.
+    """
+    params_hash = parameters_hash(report_type, export_format, parameters)
+    version = source_version()
+    fail_stalled_reports(params_hash)
+    existing = (
+        GeneratedReport.objects.filter(
+            params_hash=params_hash,
+            source_version=version,
+            status__in=REUSABLE_STATUSES,
+            expires_at__gt=timezone.now(),
+        )
+        .order_by("-created_at")
+        .first()
+    )
+    if existing is not None and (existing.status != "COMPLETED" or existing.file):
+        return existing, True
+
+    report = GeneratedReport.objects.create(
+        title=f"{report_type.replace('_', ' ').title()} Report",
+        report_type=report_type,
+        format=export_format,
+        status="PENDING",
+        parameters=parameters,
+        params_hash=params_hash,
+        source_version=version,
+        generated_by=user,
+        expires_at=timezone.now() + ARTIFACT_LIFETIME,
+    )
+    enqueue_report(report)
+    return report, False
+
+
+def fail_stalled_reports(params_hash: Optional[str] = None) -> int:
+    """
+    Mark reports queued or claimed longer than ``RENDER_TIMEOUT`` ago (all,
+    or those of ``params_hash``) FAILED so identical exports stop reusing
+    them. Returns the number marked.
+    """
+    cutoff = timezone.now() - RENDER_TIMEOUT
+    stalled = GeneratedReport.objects.filter(
+        Q(status="PENDING", created_at__lt=cutoff)
+        | Q(status="GENERATING", claimed_at__lt=cutoff)
+        | Q(status="GENERATING", claimed_at__isnull=True, created_at__lt=cutoff)
+    )
+    if params_hash is not None:
+        stalled = stalled.filter(params_hash=params_hash)
+    return stalled.update(status="FAILED", error_message="Rendering did not finish in time")
+
+
+def enqueue_report(report: GeneratedReport):
+    """Start rendering ``report`` on the background runner after the current transaction commits."""
+    report_id = report.pk
+    transaction.on_commit(lambda: run_in_background(render_report, report_id))
+
+
+def build_report(report_type: str) -> Dict:
+    from .views.reports import ReportsViewSet
+
+    return getattr(ReportsViewSet(), REPORT_BUILDERS[report_type])()
+
+
+def render_report(report_id: int):
+    """Render a queued report to its file. Safe to call more than once per report."""
+    claimed = GeneratedReport.objects.filter(pk=report_id, status="PENDING").update(
+        status="GENERATING", claimed_at=timezone.now()
+    )
+    if not claimed:
+        logger.info(f"Report {report_id} is not pending; skipping")
+        return
+    report = GeneratedReport.objects.get(pk=report_id)
+
+    try:
+        # Read before building: a write landing during the build makes the
+        # next identical export render again
+        version = source_version()
+        data = build_report(report.report_type)
+        with tempfile.TemporaryFile() as handle:
+            RENDERERS[report.format](data, handle)
+            handle.seek(0)
+            report.file.save(_filename(report), File(handle), save=False)
+    except Exception as e:
+        logger.error(f"Rendering report {report_id} failed: {e}", exc_info=True)
+        report.status = "FAILED"
+        report.error_message = str(e)
+        report.save(update_fields=["status", "error_message"])
+        return
+
+    report.status = "COMPLETED"
+    report.source_version = version
+    report.generated_at = timezone.now()
+    report.expires_at = report.generated_at + ARTIFACT_LIFETIME
+    report.save(update_fields=["file", "status", "source_version", "generated_at", "expires_at"])
+
+
+def _filename(report: GeneratedReport) -> str:
+    return f"{report.report_type.lower()}-{report.pk}.{EXTENSIONS[report.format]}"
+
+
+# ----------------------------------------------------------------------
+# Tabulation
+
+
+def _flatten(value, prefix: str = "") -> Dict:
+    """Nested dicts as one level of dotted keys; lists become JSON text."""
+    if isinstance(value, dict):
+        flat = {}
+        for key, item in value.items():
+            flat.update(_flatten(item, f"{prefix}{key}."))
+        return flat
+    if isinstance(value, list):
+        value = json.dumps(value, cls=DjangoJSONEncoder)
+    return {prefix[:-1]: value}
+
+
+def report_tables(data: Dict) -> List[Table]:
+    """
+    The report as ``(name, columns, rows)`` tables: a list of records becomes
+    a table of its own, everything else goes to a ``summary`` field/value table.
+    """
+    summary: List[list] = []
+    tables: List[Table] = []
+    for name, value in data.items():
+        if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+            records = [_flatten(item) for item in value]
+            columns = list(dict.fromkeys(key for record in records for key in record))
+            tables.append((name, columns, ([record.get(column) for column in columns] for record in records)))
+        else:
+            summary.extend([key, item] for key, item in _flatten(value, f"{name}.").items())
+    return [("summary", ["field", "value"], summary)] + tables
+
+
+# ----------------------------------------------------------------------
+# Renderers: each writes ``data`` to the binary file ``handle``
+
+
+def render_csv(data: Dict, handle):
+    """Tables one after another, each headed by its name and separated by a blank row."""
+    text = io.TextIOWrapper(handle, encoding="utf-8-sig", newline="")
+    writer = csv.writer(text)
+    for index, (name, columns, rows) in enumerate(report_tables(data)):
+        if index:
+            writer.writerow([])
+        writer.writerow([name])
+        writer.writerow(columns)
+        writer.writerows(rows)
+    text.flush()
+    text.detach()
+
+
+def render_excel(data: Dict, handle):
+    """One worksheet per table, written in openpyxl's streaming mode."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for name, columns, rows in report_tables(data):
+        sheet = workbook.create_sheet(title=name[:31])
+        sheet.append(columns)
+        for row in rows:
+            sheet.append(row)
+    workbook.save(handle)
+
+
+def render_json(data: Dict, handle):
+    for chunk in DjangoJSONEncoder().iterencode(data):
+        handle.write(chunk.encode())
+
+
+def render_pdf(data: Dict, handle):
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table as PDFTable, TableStyle
+
+    styles = getSampleStyleSheet()
+    story = []
+    for name, columns, rows in report_tables(data):
+        story.append(Paragraph(name.replace("_", " ").title(), styles["Heading2"]))
+        cells = [columns] + [["" if value is None else str(value) for value in row] for row in rows]
+        table = PDFTable(cells, repeatRows=1)
+        table.setStyle(TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+            ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+            ("FONTSIZE", (0, 0), (-1, -1), 7),
+        ]))
+        story.extend([table, Spacer(1, 12)])
+    SimpleDocTemplate(handle, pagesize=landscape(A4)).build(story)
+
+
+RENDERERS = {
+    "CSV": render_csv,
+    "EXCEL": render_excel,
+    "JSON": render_json,
+    "PDF": render_pdf,
+}
+
+
+def export_payload(report: GeneratedReport, reused: Optional[bool] = None) -> Dict:
+    """Status of an export as returned by the export endpoints."""
+    payload = {
+        "report_id": report.id,
+        "title": report.title,
+        "format": report.format,
+        "status": report.status,
+        "error_message": report.error_message,
+        "generated_at": report.generated_at,
+        "status_url": f"/api/reports/exports/{report.id}/",
+        "download_url": f"/api/reports/download/{report.id}/" if report.status == "COMPLETED" else None,
+    }
+    if reused is not None:
+        payload["reused"] = reused
+    return payload
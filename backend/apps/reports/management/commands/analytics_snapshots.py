@@ -0,0 +1,46 @@
+"""
+Management command to take scheduled analytics snapshots
+(see apps.reports.snapshots).
+
+Usage:
+    python manage.py analytics_snapshots               # take due snapshots and apply retention once
+    python manage.py analytics_snapshots --loop        # run the scheduler (ANALYTICS_SNAPSHOT_RUNNER=external)
+    python manage.py analytics_snapshots --downsample  # only downsample old hourly snapshots
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.reports.snapshots import capture_due, downsample_hourly, run_tick
+
+
+class Command(BaseCommand):
+    help = 'Take due hourly/daily/weekly analytics snapshots and downsample old hourly ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, checking every ANALYTICS_SNAPSHOT_TICK_SECONDS',
+        )
+        parser.add_argument(
+            '--downsample',
+            action='store_true',
+            help='Only fold hourly snapshots older than ANALYTICS_HOURLY_RETENTION_DAYS into daily ones',
+        )
+
+    def handle(self, *args, **options):
+        if options['loop']:
+            tick = getattr(settings, 'ANALYTICS_SNAPSHOT_TICK_SECONDS', 60)
+            while True:
+                taken = run_tick()
+                if taken:
+                    self.stdout.write(f"Took {', '.join(taken)} snapshot(s)")
+                time.sleep(tick)
+
+        if not options['downsample']:
+            taken = capture_due()
+            self.stdout.write(f"Took {len(taken)} snapshot(s): {', '.join(taken) or 'none due'}")
+        removed = downsample_hourly()
+        self.stdout.write(f'Downsampled {removed} hourly snapshot(s)')
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0002_analyticssnapshot_analytics_s_snapsho_dda57e_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generatedreport',
+            name='params_hash',
+            field=models.CharField(blank=True, db_index=True, help_text='Hash of report type, format and parameters (artifact reuse)', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='generatedreport',
+            name='source_version',
+            field=models.CharField(blank=True, help_text='Version of the report data the artifact was rendered from', max_length=100),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:10
+
+from datetime import datetime, time
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def populate_period_start(apps, schema_editor):
+    AnalyticsSnapshot = apps.get_model('reports', 'AnalyticsSnapshot')
+    snapshots = list(AnalyticsSnapshot.objects.only('id', 'snapshot_date'))
+    for snapshot in snapshots:
+        snapshot.period_start = timezone.make_aware(datetime.combine(snapshot.snapshot_date, time.min))
+    AnalyticsSnapshot.objects.bulk_update(snapshots, ['period_start'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0003_generatedreport_artifacts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analyticssnapshot',
+            name='period_start',
+            field=models.DateTimeField(null=True, help_text='Start of the period the snapshot covers'),
+        ),
+        migrations.RunPython(populate_period_start, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='analyticssnapshot',
+            name='period_start',
+            field=models.DateTimeField(help_text='Start of the period the snapshot covers'),
+        ),
+        migrations.AlterField(
+            model_name='analyticssnapshot',
+            name='snapshot_type',
+            field=models.CharField(choices=[('HOURLY', 'Hourly Snapshot'), ('DAILY', 'Daily Snapshot'), ('WEEKLY', 'Weekly Snapshot'), ('MONTHLY', 'Monthly Snapshot'), ('ON_DEMAND', 'On-Demand Snapshot')], help_text='Type of snapshot', max_length=20),
+        ),
+        migrations.AlterUniqueTogether(
+            name='analyticssnapshot',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='analyticssnapshot',
+            constraint=models.UniqueConstraint(fields=('snapshot_type', 'period_start'), name='unique_analytics_snapshot_period'),
+        ),
+    ]
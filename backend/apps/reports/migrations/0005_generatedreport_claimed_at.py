@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0004_analyticssnapshot_period_start'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generatedreport',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, help_text='When a worker started rendering the report', null=True),
+        ),
+    ]
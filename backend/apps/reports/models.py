@@ -135,6 +135,19 @@ class GeneratedReport(models.Model):
         help_text='Parameters used to generate report'
     )
     
+    params_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        db_index=True,
+        help_text='Hash of report type, format and parameters (artifact reuse)'
+    )
+    
+    source_version = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text='Version of the report data the artifact was rendered from'
+    )
+    
     data = models.JSONField(
         default=dict,
         help_text='Report data (for JSON format)'
@@ -160,6 +173,12 @@ class GeneratedReport(models.Model):
         help_text='User who generated this report'
     )
     
+    claimed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='When a worker started rendering the report'
+    )
+    
     generated_at = models.DateTimeField(
         null=True,
         blank=True,
@@ -300,9 +319,15 @@ class AnalyticsSnapshot(models.Model):
     """
     Periodic snapshots of key metrics.
     Used for historical trending and comparisons.
+    
+    One snapshot per type and period (``period_start``: the local hour, day,
+    week or month it covers). Hourly, daily and weekly snapshots are taken
+    by the scheduler in apps.reports.snapshots, which also downsamples old
+    hourly snapshots into daily ones.
     """
     
     SNAPSHOT_TYPE_CHOICES = [
+        ('HOURLY', 'Hourly Snapshot'),
         ('DAILY', 'Daily Snapshot'),
         ('WEEKLY', 'Weekly Snapshot'),
         ('MONTHLY', 'Monthly Snapshot'),
@@ -319,6 +344,10 @@ class AnalyticsSnapshot(models.Model):
         help_text='Date of snapshot'
     )
     
+    period_start = models.DateTimeField(
+        help_text='Start of the period the snapshot covers'
+    )
+    
     metrics = models.JSONField(
         default=dict,
         help_text='Snapshot metrics as JSON'
@@ -336,7 +365,12 @@ class AnalyticsSnapshot(models.Model):
         ordering = ['-snapshot_date']
         verbose_name = 'Analytics Snapshot'
         verbose_name_plural = 'Analytics Snapshots'
-        unique_together = ['snapshot_type', 'snapshot_date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['snapshot_type', 'period_start'],
+                name='unique_analytics_snapshot_period'
+            ),
+        ]
         indexes = [
             models.Index(fields=['snapshot_type', '-snapshot_date']),
         ]
@@ -344,67 +378,86 @@ class AnalyticsSnapshot(models.Model):
     def __str__(self):
         return f"{self.get_snapshot_type_display()} - {self.snapshot_date}"
     
+    def save(self, *args, **kwargs):
+        if self.period_start is None:
+            from .snapshots import day_start
+            
+            self.period_start = day_start(self.snapshot_date)
+        super().save(*args, **kwargs)
+    
     @staticmethod
-    def create_snapshot(snapshot_type='DAILY'):
+    def collect_metrics():
         """
-        Create a new analytics snapshot with current metrics.
+        Current metrics, with one aggregate query per table.
         """
         from apps.guarantees.models import Guarantee
         from apps.electors.models import Elector
         from apps.attendees.models import Attendance
         from apps.account.models import CustomUser
         
-        today = timezone.now().date()
+        today = timezone.localdate()
+        
+        users = CustomUser.objects.aggregate(
+            total=models.Count('id', filter=models.Q(is_active=True)),
+            active_today=models.Count('id', filter=models.Q(last_login__date=today)),
+        )
+        # Guarantee metrics (current schema uses guarantee_status + confirmation_status)
+        guarantees = Guarantee.objects.aggregate(
+            total=models.Count('id'),
+            pending=models.Count('id', filter=models.Q(guarantee_status='PENDING')),
+            pending_confirmation=models.Count('id', filter=models.Q(confirmation_status='PENDING')),
+            confirmed=models.Count('id', filter=models.Q(confirmation_status='CONFIRMED')),
+            not_available=models.Count('id', filter=models.Q(confirmation_status='NOT_AVAILABLE')),
+            electors=models.Count('elector', distinct=True),
+        )
+        total_electors = Elector.objects.filter(is_active=True).count()
+        total_attendance = Attendance.objects.count()
         
         metrics = {
             # User metrics
-            'total_users': CustomUser.objects.filter(is_active=True).count(),
-            'active_users_today': CustomUser.objects.filter(
-                last_login__date=today
-            ).count(),
+            'total_users': users['total'],
+            'active_users_today': users['active_today'],
             
             # Elector metrics
-            'total_electors': Elector.objects.filter(is_active=True).count(),
+            'total_electors': total_electors,
             
-            # Guarantee metrics (current schema uses guarantee_status + confirmation_status)
-            'total_guarantees': Guarantee.objects.count(),
-            'pending_guarantees': Guarantee.objects.filter(guarantee_status='PENDING').count(),
+            # Guarantee metrics
+            'total_guarantees': guarantees['total'],
+            'pending_guarantees': guarantees['pending'],
             # legacy field names kept for backward compatibility
-            'medium_guarantees': Guarantee.objects.filter(confirmation_status='PENDING').count(),
-            'high_guarantees': Guarantee.objects.filter(confirmation_status='CONFIRMED').count(),
-            'not_available_guarantees': Guarantee.objects.filter(confirmation_status='NOT_AVAILABLE').count(),
+            'medium_guarantees': guarantees['pending_confirmation'],
+            'high_guarantees': guarantees['confirmed'],
+            'not_available_guarantees': guarantees['not_available'],
             
             # Attendance metrics
-            'total_attendance': Attendance.objects.count(),
+            'total_attendance': total_attendance,
             
             # Percentages
-            'elector_coverage': 0,  # Calculated below
-            'attendance_rate': 0,   # Calculated below
+            'elector_coverage': 0,
+            'attendance_rate': 0,
         }
         
-        # Calculate coverage percentage
-        total_electors = metrics['total_electors']
         if total_electors > 0:
-            # Count unique electors with guarantees
-            unique_electors_with_guarantees = Guarantee.objects.values(
-                'elector'
-            ).distinct().count()
-            metrics['elector_coverage'] = round(
-                (unique_electors_with_guarantees / total_electors) * 100,
-                2
-            )
-            
-            # Calculate attendance rate
-            metrics['attendance_rate'] = round(
-                (metrics['total_attendance'] / total_electors) * 100,
-                2
-            )
+            metrics['elector_coverage'] = round((guarantees['electors'] / total_electors) * 100, 2)
+            metrics['attendance_rate'] = round((total_attendance / total_electors) * 100, 2)
+        
+        return metrics
+    
+    @staticmethod
+    def create_snapshot(snapshot_type='DAILY'):
+        """
+        Create (or refresh) the snapshot of the current period with current metrics.
+        """
+        from .snapshots import period_start
         
-        # Create or update snapshot
+        start = period_start(snapshot_type, timezone.now())
         snapshot, _created = AnalyticsSnapshot.objects.update_or_create(
             snapshot_type=snapshot_type,
-            snapshot_date=today,
-            defaults={'metrics': metrics}
+            period_start=start,
+            defaults={
+                'snapshot_date': start.date(),
+                'metrics': AnalyticsSnapshot.collect_metrics(),
+            }
         )
         
         return snapshot
@@ -255,7 +255,7 @@ class ExportRequestSerializer(serializers.Serializer):
     )
     
     format = serializers.ChoiceField(
-        choices=['CSV', 'EXCEL', 'PDF'],
+        choices=['CSV', 'EXCEL', 'JSON', 'PDF'],
         required=True
     )
     
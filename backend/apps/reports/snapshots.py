@@ -0,0 +1,150 @@
+"""
+Scheduled analytics snapshots.
+
+The scheduler takes an hourly, a daily and a weekly ``AnalyticsSnapshot``
+for every period as it starts: each tick looks up which of the current
+periods already have a snapshot (one query) and, if any is missing,
+collects the metrics once for all of them. Several processes may run the
+scheduler; the unique (type, period) constraint keeps one snapshot per
+period.
+
+Retention: hourly snapshots older than ``ANALYTICS_HOURLY_RETENTION_DAYS``
+are downsampled into daily ones. Metrics are point-in-time values, so a
+day keeps the last hourly snapshot taken in it (unless it has a daily
+snapshot already) and its hourly rows are deleted.
+
+``ANALYTICS_SNAPSHOT_RUNNER`` selects what runs the ticks:
+
+- ``'thread'`` (default): a daemon thread in each web process, started by
+  the WSGI/ASGI entry points
+- ``'external'``: ``python manage.py analytics_snapshots --loop`` or the
+  Celery beat task ``apps.reports.tasks.capture_analytics_snapshots``
+- ``'off'``: snapshots are only taken on demand
+"""
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.utils import timezone
+
+from apps.utils.conditional import bump_tables
+from apps.utils.periodic import PeriodicWorker, start_periodic_worker
+
+from .models import AnalyticsSnapshot
+
+logger = logging.getLogger(__name__)
+
+SCHEDULED_TYPES = ('HOURLY', 'DAILY', 'WEEKLY')
+
+
+def day_start(day: date) -> datetime:
+    """Aware start of the local ``day``."""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def period_start(snapshot_type: str, moment: datetime) -> datetime:
+    """Start of the local period of ``snapshot_type`` containing ``moment``."""
+    local = timezone.localtime(moment)
+    if snapshot_type == 'HOURLY':
+        return local.replace(minute=0, second=0, microsecond=0)
+    day = local.date()
+    if snapshot_type == 'WEEKLY':
+        day -= timedelta(days=day.weekday())
+    elif snapshot_type == 'MONTHLY':
+        day = day.replace(day=1)
+    return day_start(day)
+
+
+def capture_due(now: Optional[datetime] = None) -> List[str]:
+    """
+    Take the snapshots of the current hour, day and week that do not exist
+    yet. Returns their types.
+    """
+    now = now or timezone.now()
+    starts: Dict[str, datetime] = {snapshot_type: period_start(snapshot_type, now) for snapshot_type in SCHEDULED_TYPES}
+    taken = set(
+        AnalyticsSnapshot.objects.filter(
+            snapshot_type__in=SCHEDULED_TYPES,
+            period_start__in=set(starts.values()),
+        ).values_list('snapshot_type', 'period_start')
+    )
+    due = [snapshot_type for snapshot_type, start in starts.items() if (snapshot_type, start) not in taken]
+    if not due:
+        return []
+
+    metrics = AnalyticsSnapshot.collect_metrics()
+    AnalyticsSnapshot.objects.bulk_create(
+        [
+            AnalyticsSnapshot(
+                snapshot_type=snapshot_type,
+                period_start=starts[snapshot_type],
+                snapshot_date=timezone.localtime(starts[snapshot_type]).date(),
+                metrics=metrics,
+            )
+            for snapshot_type in due
+        ],
+        ignore_conflicts=True,
+    )
+    bump_tables(AnalyticsSnapshot)
+    return due
+
+
+def downsample_hourly(now: Optional[datetime] = None) -> int:
+    """
+    Fold hourly snapshots of days older than the retention into daily
+    snapshots. Returns the number of hourly snapshots removed.
+    """
+    now = now or timezone.now()
+    retention = getattr(settings, 'ANALYTICS_HOURLY_RETENTION_DAYS', 7)
+    cutoff = period_start('DAILY', now - timedelta(days=retention))
+
+    hourly = AnalyticsSnapshot.objects.filter(snapshot_type='HOURLY', period_start__lt=cutoff)
+    with transaction.atomic():
+        closing: Dict[date, AnalyticsSnapshot] = {}
+        ids = []
+        for snapshot in hourly.order_by('period_start').only('id', 'period_start', 'metrics'):
+            closing[timezone.localtime(snapshot.period_start).date()] = snapshot
+            ids.append(snapshot.id)
+        if not ids:
+            return 0
+
+        AnalyticsSnapshot.objects.bulk_create(
+            [
+                AnalyticsSnapshot(
+                    snapshot_type='DAILY',
+                    period_start=day_start(day),
+                    snapshot_date=day,
+                    metrics=snapshot.metrics,
+                    notes='Downsampled from hourly snapshots',
+                )
+                for day, snapshot in closing.items()
+            ],
+            ignore_conflicts=True,
+        )
+        AnalyticsSnapshot.objects.filter(id__in=ids).delete()
+    bump_tables(AnalyticsSnapshot)
+    return len(ids)
+
+
+def run_tick() -> List[str]:
+    """One scheduler pass, with its own database connection."""
+    close_old_connections()
+    try:
+        taken = capture_due()
+        downsample_hourly()
+        return taken
+    except Exception:
+        logger.exception("Analytics snapshot tick failed")
+        return []
+    finally:
+        connections.close_all()
+
+
+def start_snapshot_scheduler() -> Optional[PeriodicWorker]:
+    """Start this process's scheduler thread if the runner is ``'thread'``."""
+    if getattr(settings, 'ANALYTICS_SNAPSHOT_RUNNER', 'thread') != 'thread':
+        return None
+    tick = getattr(settings, 'ANALYTICS_SNAPSHOT_TICK_SECONDS', 60)
+    return start_periodic_worker('analytics-snapshots', tick, run_tick)
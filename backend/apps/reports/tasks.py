@@ -0,0 +1,15 @@
+"""
+Celery tasks for the reports app.
+
+Only used when a Celery worker and beat run alongside the web processes
+(``ANALYTICS_SNAPSHOT_RUNNER = 'external'``); see CELERY_BEAT_SCHEDULE.
+"""
+from celery import shared_task
+
+
+@shared_task(name='reports.capture_analytics_snapshots', ignore_result=True)
+def capture_analytics_snapshots():
+    """Take the due analytics snapshots and apply retention (one tick)."""
+    from .snapshots import run_tick
+
+    run_tick()
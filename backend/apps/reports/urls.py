@@ -20,6 +20,8 @@ urlpatterns = [
     path('accuracy/', ReportsViewSet.as_view({'get': 'accuracy'}), name='report-accuracy'),
     path('committee-performance/', ReportsViewSet.as_view({'get': 'committee_performance'}), name='report-committee'),
     path('export/', ReportsViewSet.as_view({'post': 'export'}), name='report-export'),
+    path('exports/<int:pk>/', ReportsViewSet.as_view({'get': 'export_status'}), name='report-export-status'),
+    path('download/<int:pk>/', ReportsViewSet.as_view({'get': 'download'}), name='report-download'),
     
     # Analytics
     path('analytics/trends/', AnalyticsViewSet.as_view({'get': 'trends'}), name='analytics-trends'),
@@ -7,10 +7,12 @@ from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 
+from apps.utils.conditional import request_etag, tables_version
 from apps.utils.permissions import IsAdminOrAbove
 from apps.utils.responses import APIResponse
 
 from ..models import AnalyticsSnapshot
+from ..snapshots import period_start
 from ..serializers import AnalyticsSnapshotSerializer
 
 
@@ -19,24 +21,50 @@ class AnalyticsViewSet(viewsets.ViewSet):
 
     permission_classes = [IsAuthenticated]
 
+    # Trend resolution -> snapshot type
+    RESOLUTIONS = {"hourly": "HOURLY", "daily": "DAILY", "weekly": "WEEKLY"}
+    # Series name -> metric
+    SERIES = {"guarantees": "total_guarantees", "attendance": "total_attendance", "coverage": "elector_coverage"}
+
     @action(detail=False, methods=["get"])
     def trends(self, request):
-        """Return analytics trend data."""
+        """
+        Return analytics trend data.
+
+        ``days`` (default 30) sets the range, ``resolution`` (hourly, daily or
+        weekly; hourly by default for up to two days, daily otherwise) the
+        snapshots it is read from. Only the charted metrics are read, in
+        period order.
+        """
         days = int(request.query_params.get("days", 30))
-        start_date = timezone.now().date() - timedelta(days=days)
+        resolution = request.query_params.get("resolution") or ("hourly" if days <= 2 else "daily")
+        snapshot_type = self.RESOLUTIONS.get(resolution)
+        if snapshot_type is None:
+            return APIResponse.error(
+                f"Unknown resolution '{resolution}'", status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        etag = request_etag(request, tables_version([AnalyticsSnapshot]))
+        cached = APIResponse.not_modified(request, etag)
+        if cached is not None:
+            return cached
 
-        snapshots = AnalyticsSnapshot.objects.filter(
-            snapshot_date__gte=start_date
-        ).order_by("snapshot_date")
+        start = period_start(snapshot_type, timezone.now() - timedelta(days=days))
+        rows = (
+            AnalyticsSnapshot.objects.filter(snapshot_type=snapshot_type, period_start__gte=start)
+            .order_by("period_start")
+            .values_list("period_start", *[f"metrics__{metric}" for metric in self.SERIES.values()])
+        )
 
-        trend_data = {
-            "dates": [str(snapshot.snapshot_date) for snapshot in snapshots],
-            "guarantees": [snapshot.metrics.get("total_guarantees", 0) for snapshot in snapshots],
-            "attendance": [snapshot.metrics.get("total_attendance", 0) for snapshot in snapshots],
-            "coverage": [snapshot.metrics.get("elector_coverage", 0) for snapshot in snapshots],
-        }
+        trend_data = {"resolution": resolution, "dates": []}
+        trend_data.update({name: [] for name in self.SERIES})
+        for started, *values in rows:
+            started = timezone.localtime(started)
+            trend_data["dates"].append(started.isoformat() if snapshot_type == "HOURLY" else str(started.date()))
+            for name, value in zip(self.SERIES, values):
+                trend_data[name].append(value if value is not None else 0)
 
-        return APIResponse.success(data=trend_data)
+        return APIResponse.success(data=trend_data, etag=etag)
 
     @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated, IsAdminOrAbove])
     def create_snapshot(self, request):
@@ -5,6 +5,7 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 
 from apps.elections.models import Committee
+from apps.elections.utils.committee_metrics import get_committee_metrics
 from apps.guarantees.models import Guarantee
 from apps.utils.responses import APIResponse
 
@@ -52,11 +53,12 @@ class ChartViewSet(viewsets.ViewSet):
     @action(detail=False, methods=["get"])
     def committee_comparison(self, request):
         """Bar chart data for committee comparison."""
-        committees = Committee.objects.all().order_by("code")[:100]
+        committees = list(Committee.objects.order_by("code").values_list("id", "code")[:100])
+        metrics = get_committee_metrics(committee_ids=[committee_id for committee_id, _ in committees])
 
-        labels = [committee.code for committee in committees]
-        electors = [committee.elector_count for committee in committees]
-        attendance = [committee.attendance_count for committee in committees]
+        labels = [code for _, code in committees]
+        electors = [metrics[committee_id]["elector_count"] for committee_id, _ in committees]
+        attendance = [metrics[committee_id]["attendance_count"] for committee_id, _ in committees]
 
         data = {
             "chart_type": "BAR",
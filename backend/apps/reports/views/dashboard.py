@@ -3,7 +3,6 @@
 from urllib.parse import urlencode
 from datetime import timedelta
 
-from django.core.cache import cache
 from django.db.models import Count, Q
 from django.utils import timezone
 from rest_framework import status, viewsets
@@ -15,8 +14,13 @@ from apps.attendees.models import Attendance
 from apps.elections.models import Committee
 from apps.electors.models import Elector
 from apps.guarantees.models import Guarantee
+from apps.utils.aggregates import count_subquery
+from apps.utils.cache_namespaces import namespace_version
+from apps.utils.conditional import request_etag
 from apps.utils.permissions import IsAdminOrAbove, IsSupervisorOrAbove
 from apps.utils.responses import APIResponse
+from apps.utils.single_flight import cached_compute
+from apps.utils.websocket_utils import dashboard_namespace, user_namespace
 
 from ..models import CampaignFinanceSnapshot
 from ..serializers import (
@@ -28,16 +32,12 @@ from ..serializers import (
 
 
 def committee_overview_queryset(limit: int = 100, order_by: str = "code"):
-    """Optimized queryset for committee summaries with precomputed counts."""
+    """Committees with their active elector and attendance counts, each counted in its own subquery."""
     queryset = (
         Committee.objects.select_related("election")
         .annotate(
-            total_electors=Count(
-                "electors",
-                filter=Q(electors__is_active=True),
-                distinct=True,
-            ),
-            total_attendance=Count("attendances", distinct=True),
+            total_electors=count_subquery(Elector.objects.filter(is_active=True), "committee"),
+            total_attendance=count_subquery(Attendance.objects.all(), "committee"),
         )
         .order_by(order_by)
     )
@@ -50,10 +50,12 @@ class DashboardViewSet(viewsets.ViewSet):
     """Dashboard endpoints for different user roles."""
 
     permission_classes = [IsAuthenticated]
+    # Writes invalidate cached payloads through their cache namespaces
+    # (invalidate_dashboard_cache), so these only bound time-relative figures
     CACHE_TIMEOUTS = {
-        "personal": 300,  # 5 minutes
-        "supervisor": 300,  # 5 minutes
-        "admin": 120,  # 2 minutes
+        "personal": 1800,  # 30 minutes
+        "supervisor": 1800,  # 30 minutes
+        "admin": 600,  # 10 minutes
     }
 
     def _should_refresh_cache(self, request):
@@ -61,17 +63,45 @@ class DashboardViewSet(viewsets.ViewSet):
         return refresh_value in {"1", "true", "True"}
 
     def _build_cache_key(self, prefix, request, include_user=False):
+        """Stable cache key and the namespaces its payload derives from."""
         components = [f"dashboard:{prefix}"]
         if include_user:
             components.append(f"user:{request.user.pk}")
         if request.query_params:
             query_items = []
             for key in sorted(request.query_params.keys()):
+                if key == "refresh":
+                    continue
                 for value in request.query_params.getlist(key):
                     query_items.append((key, value))
             if query_items:
                 components.append(urlencode(query_items))
-        return ":".join(components)
+        namespaces = [dashboard_namespace(prefix)]
+        if include_user:
+            namespaces.append(user_namespace(request.user.pk))
+        return ":".join(components), namespaces
+
+    def _cached_response(self, prefix, request, build, include_user=False):
+        """
+        Serve ``build(request)`` through the single-flight cache: one caller
+        recomputes an expired or invalidated payload while the others get
+        the previous one. A client that already holds the cached payload
+        gets a 304.
+        """
+        cache_key, namespaces = self._build_cache_key(prefix, request, include_user=include_user)
+        version = namespace_version(namespaces)
+        entry = cached_compute(
+            cache_key,
+            lambda: {"data": build(request), "as_of": timezone.now()},
+            soft_ttl=self.CACHE_TIMEOUTS[prefix],
+            version=version,
+            refresh=self._should_refresh_cache(request),
+        )
+        etag = request_etag(request, version, entry["as_of"].timestamp())
+        cached = APIResponse.not_modified(request, etag, entry["as_of"])
+        if cached is not None:
+            return cached
+        return APIResponse.success(data=entry["data"], etag=etag, last_modified=entry["as_of"])
 
     @action(detail=False, methods=["get"])
     def personal(self, request):
@@ -80,13 +110,41 @@ class DashboardViewSet(viewsets.ViewSet):
 
         GET /api/reports/dashboard/personal/
         """
-        cache_key = self._build_cache_key("personal", request, include_user=True)
-        bypass_cache = self._should_refresh_cache(request)
-        if not bypass_cache:
-            cached_payload = cache.get(cache_key)
-            if cached_payload is not None:
-                return APIResponse.success(data=cached_payload)
+        return self._cached_response("personal", request, self._build_personal, include_user=True)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[IsAuthenticated, IsSupervisorOrAbove],
+    )
+    def supervisor(self, request):
+        """
+        Supervisor dashboard for team monitoring.
+
+        GET /api/reports/dashboard/supervisor/
+        """
+        if not request.user.is_supervisor_or_above():
+            return APIResponse.error("Permission denied", status_code=status.HTTP_403_FORBIDDEN)
+
+        return self._cached_response("supervisor", request, self._build_supervisor, include_user=True)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[IsAuthenticated, IsAdminOrAbove],
+    )
+    def admin(self, request):
+        """
+        Admin dashboard with complete overview.
+
+        GET /api/reports/dashboard/admin/
+        """
+        if not request.user.is_admin_or_above():
+            return APIResponse.error("Permission denied", status_code=status.HTTP_403_FORBIDDEN)
+
+        return self._cached_response("admin", request, self._build_admin, include_user=False)
 
+    def _build_personal(self, request):
         guarantees = Guarantee.objects.filter(user=request.user)
 
         stats = guarantees.aggregate(
@@ -130,31 +188,9 @@ class DashboardViewSet(viewsets.ViewSet):
         }
 
         serializer = PersonalDashboardSerializer(data)
-        response_data = serializer.data
-        cache.set(cache_key, response_data, self.CACHE_TIMEOUTS["personal"])
-        return APIResponse.success(data=response_data)
-
-    @action(
-        detail=False,
-        methods=["get"],
-        permission_classes=[IsAuthenticated, IsSupervisorOrAbove],
-    )
-    def supervisor(self, request):
-        """
-        Supervisor dashboard for team monitoring.
-
-        GET /api/reports/dashboard/supervisor/
-        """
-        if not request.user.is_supervisor_or_above():
-            return APIResponse.error("Permission denied", status_code=status.HTTP_403_FORBIDDEN)
-
-        cache_key = self._build_cache_key("supervisor", request, include_user=True)
-        bypass_cache = self._should_refresh_cache(request)
-        if not bypass_cache:
-            cached_payload = cache.get(cache_key)
-            if cached_payload is not None:
-                return APIResponse.success(data=cached_payload)
+        return serializer.data
 
+    def _build_supervisor(self, request):
         if request.user.role == "SUPERVISOR":
             team_members = request.user.supervised_users.filter(is_active=True)
         else:
@@ -240,31 +276,9 @@ class DashboardViewSet(viewsets.ViewSet):
         }
 
         serializer = SupervisorDashboardSerializer(payload)
-        response_data = serializer.data
-        cache.set(cache_key, response_data, self.CACHE_TIMEOUTS["supervisor"])
-        return APIResponse.success(data=response_data)
-
-    @action(
-        detail=False,
-        methods=["get"],
-        permission_classes=[IsAuthenticated, IsAdminOrAbove],
-    )
-    def admin(self, request):
-        """
-        Admin dashboard with complete overview.
-
-        GET /api/reports/dashboard/admin/
-        """
-        if not request.user.is_admin_or_above():
-            return APIResponse.error("Permission denied", status_code=status.HTTP_403_FORBIDDEN)
-
-        cache_key = self._build_cache_key("admin", request, include_user=False)
-        bypass_cache = self._should_refresh_cache(request)
-        if not bypass_cache:
-            cached_payload = cache.get(cache_key)
-            if cached_payload is not None:
-                return APIResponse.success(data=cached_payload)
+        return serializer.data
 
+    def _build_admin(self, request):
         total_users = CustomUser.objects.filter(is_active=True).count()
         total_electors = Elector.objects.filter(is_active=True).count()
         total_attendance = Attendance.objects.count()
@@ -407,7 +421,4 @@ class DashboardViewSet(viewsets.ViewSet):
         payload["system_overview"] = payload["overview"]
 
         serializer = AdminDashboardSerializer(payload)
-        response_data = serializer.data
-        cache.set(cache_key, response_data, self.CACHE_TIMEOUTS["admin"])
-        return APIResponse.success(data=response_data)
-
+        return serializer.data
@@ -1,8 +1,9 @@
 """Analytical report viewsets."""
 
-from datetime import timedelta
+import os
 
 from django.db.models import Count, Exists, OuterRef, Q
+from django.http import FileResponse
 from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
@@ -13,9 +14,15 @@ from apps.attendees.models import Attendance
 from apps.elections.models import Committee
 from apps.electors.models import Elector
 from apps.guarantees.models import Guarantee
+from apps.utils.aggregates import count_subquery
+from apps.utils.cache_namespaces import namespace_version
+from apps.utils.conditional import request_etag
 from apps.utils.permissions import IsAdminOrAbove
 from apps.utils.responses import APIResponse
+from apps.utils.single_flight import cached_compute
+from apps.utils.websocket_utils import REPORTS_NAMESPACE
 
+from ..exports import CONTENT_TYPES, REPORT_BUILDERS, export_payload, request_export
 from ..models import CampaignFinanceSnapshot, GeneratedReport
 from ..serializers import (
     AccuracyReportSerializer,
@@ -30,6 +37,23 @@ class ReportsViewSet(viewsets.ViewSet):
     """Report generation endpoints."""
 
     permission_classes = [IsAuthenticated]
+    # Reports are served through the single-flight cache and invalidated by
+    # writes (invalidate_dashboard_cache); see apps.utils.single_flight
+    CACHE_TIMEOUT = 300  # 5 minutes
+
+    def _cached_response(self, name, request, build):
+        version = namespace_version([REPORTS_NAMESPACE])
+        entry = cached_compute(
+            f"reports:{name}",
+            lambda: {"data": build(), "as_of": timezone.now()},
+            soft_ttl=self.CACHE_TIMEOUT,
+            version=version,
+        )
+        etag = request_etag(request, version, entry["as_of"].timestamp())
+        cached = APIResponse.not_modified(request, etag, entry["as_of"])
+        if cached is not None:
+            return cached
+        return APIResponse.success(data=entry["data"], etag=etag, last_modified=entry["as_of"])
 
     @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated, IsAdminOrAbove])
     def coverage(self, request):
@@ -37,6 +61,150 @@ class ReportsViewSet(viewsets.ViewSet):
         if not request.user.is_admin_or_above():
             return APIResponse.error("Permission denied", status_code=status.HTTP_403_FORBIDDEN)
 
+        return self._cached_response("coverage", request, self._build_coverage)
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated, IsAdminOrAbove])
+    def accuracy(self, request):
+        """Generate guarantee accuracy report (guarantees vs attendance)."""
+        if not request.user.is_admin_or_above():
+            return APIResponse.error("Permission denied", status_code=status.HTTP_403_FORBIDDEN)
+
+        return self._cached_response("accuracy", request, self._build_accuracy)
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated, IsAdminOrAbove])
+    def committee_performance(self, request):
+        """Generate committee performance report."""
+        if not request.user.is_admin_or_above():
+            return APIResponse.error("Permission denied", status_code=status.HTTP_403_FORBIDDEN)
+
+        return self._cached_response("committee_performance", request, self._build_committee_performance)
+
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated, IsAdminOrAbove])
+    def export(self, request):
+        """
+        Queue a report export; a worker renders the file (see apps.reports.exports).
+
+        Returns 202 with the queued report, or 200 with an identical report
+        whose data has not changed since.
+        """
+        if not request.user.is_admin_or_above():
+            return APIResponse.error("Permission denied", status_code=status.HTTP_403_FORBIDDEN)
+
+        serializer = ExportRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        report_type = serializer.validated_data["report_type"]
+        export_format = serializer.validated_data["format"]
+
+        type_mapping = {
+            "COVERAGE": "GUARANTEE_COVERAGE",
+            "ACCURACY": "GUARANTEE_ACCURACY",
+            "COMMITTEE_PERFORMANCE": "COMMITTEE_PERFORMANCE",
+            "GUARANTEE_COVERAGE": "GUARANTEE_COVERAGE",
+            "GUARANTEE_ACCURACY": "GUARANTEE_ACCURACY",
+        }
+        normalized_type = type_mapping.get(report_type.upper())
+        if normalized_type not in REPORT_BUILDERS:
+            return APIResponse.error(
+                message="Unsupported report type",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        report, reused = request_export(
+            normalized_type,
+            export_format,
+            serializer.validated_data.get("parameters", {}),
+            request.user,
+        )
+
+        if reused and report.status == "COMPLETED":
+            return APIResponse.success(
+                data=export_payload(report, reused=True),
+                message=f"Report already generated in {export_format} format",
+            )
+        return APIResponse.success(
+            data=export_payload(report, reused=reused),
+            message=f"Report queued for {export_format} export",
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+
+    @action(detail=True, methods=["get"], permission_classes=[IsAuthenticated, IsAdminOrAbove])
+    def export_status(self, request, pk=None):
+        """Status of a report export."""
+        report = GeneratedReport.objects.filter(pk=pk).first()
+        if report is None:
+            return APIResponse.error("Report not found", status_code=status.HTTP_404_NOT_FOUND)
+        return APIResponse.success(data=export_payload(report))
+
+    @action(detail=True, methods=["get"], permission_classes=[IsAuthenticated, IsAdminOrAbove])
+    def download(self, request, pk=None):
+        """Stream a rendered report file."""
+        report = GeneratedReport.objects.filter(pk=pk).first()
+        if report is None:
+            return APIResponse.error("Report not found", status_code=status.HTTP_404_NOT_FOUND)
+        if report.status != "COMPLETED" or not report.file:
+            return APIResponse.error(
+                "Report is not ready",
+                errors={"status": report.status},
+                status_code=status.HTTP_409_CONFLICT,
+            )
+        return FileResponse(
+            report.file.open("rb"),
+            as_attachment=True,
+            filename=os.path.basename(report.file.name),
+            content_type=CONTENT_TYPES.get(report.format),
+        )
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated, IsAdminOrAbove])
+    def campaign_performance(self, request):
+        """Return campaign budget and resource readiness metrics."""
+        if not request.user.is_admin_or_above():
+            return APIResponse.error("Permission denied", status_code=status.HTTP_403_FORBIDDEN)
+
+        latest_snapshot = CampaignFinanceSnapshot.objects.order_by("-period_end", "-created_at").first()
+        finance_data = (
+            CampaignFinanceSnapshotSerializer(latest_snapshot).data
+            if latest_snapshot
+            else {
+                "total_budget": 0,
+                "committed_budget": 0,
+                "spent_budget": 0,
+                "available_budget": 0,
+                "burn_rate": 0,
+            }
+        )
+
+        total_users = CustomUser.objects.filter(is_active=True).count()
+        supervisors = CustomUser.objects.filter(is_active=True, role="SUPERVISOR").count()
+        admins = CustomUser.objects.filter(is_active=True, role__in=["ADMIN", "SUPER_ADMIN"]).count()
+        field_agents = max(total_users - supervisors - admins, 0)
+        active_today = CustomUser.objects.filter(
+            is_active=True, last_login__date=timezone.now().date()
+        ).count()
+
+        guarantee_count = Guarantee.objects.count()
+        attendance_today = Attendance.objects.filter(attended_at__date=timezone.now().date()).count()
+
+        payload = {
+            "budget": finance_data,
+            "resources": {
+                "total_users": total_users,
+                "admins": admins,
+                "supervisors": supervisors,
+                "field_agents": field_agents,
+                "active_today": active_today,
+                "active_ratio": round((active_today / total_users * 100) if total_users else 0, 1),
+            },
+            "forecast": {
+                "daily_burn_rate": finance_data.get("burn_rate") or 0,
+                "guarantees_total": guarantee_count,
+                "attendance_today": attendance_today,
+            },
+        }
+
+        return APIResponse.success(data=payload)
+
+    def _build_coverage(self):
         total_electors = Elector.objects.filter(is_active=True).count()
         electors_with_guarantees = Guarantee.objects.values("elector").distinct().count()
         electors_without = total_electors - electors_with_guarantees
@@ -45,14 +213,12 @@ class ReportsViewSet(viewsets.ViewSet):
             (electors_with_guarantees / total_electors * 100) if total_electors > 0 else 0, 1
         )
 
+        active_electors = Elector.objects.filter(is_active=True)
+        guaranteed = Exists(Guarantee.objects.filter(elector=OuterRef("pk")))
         committee_stats = (
             Committee.objects.annotate(
-                total_electors=Count("electors", filter=Q(electors__is_active=True)),
-                covered_electors=Count(
-                    "electors",
-                    filter=Q(electors__is_active=True, electors__guarantees__isnull=False),
-                    distinct=True,
-                ),
+                total_electors=count_subquery(active_electors, "committee"),
+                covered_electors=count_subquery(active_electors.filter(guaranteed), "committee"),
             )
             .values("code", "name", "total_electors", "covered_electors")
             .order_by("code")
@@ -76,11 +242,11 @@ class ReportsViewSet(viewsets.ViewSet):
             )
 
         by_section = list(
-            Elector.objects.filter(is_active=True)
+            active_electors.alias(guaranteed=guaranteed)
             .values("section")
             .annotate(
                 total=Count("koc_id"),
-                covered=Count("koc_id", filter=Q(guarantees__isnull=False), distinct=True),
+                covered=Count("koc_id", filter=Q(guaranteed=True)),
             )
             .order_by("-total")[:10]
         )
@@ -184,14 +350,9 @@ class ReportsViewSet(viewsets.ViewSet):
         }
 
         serializer = CoverageReportSerializer(data)
-        return APIResponse.success(data=serializer.data)
-
-    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated, IsAdminOrAbove])
-    def accuracy(self, request):
-        """Generate guarantee accuracy report (guarantees vs attendance)."""
-        if not request.user.is_admin_or_above():
-            return APIResponse.error("Permission denied", status_code=status.HTTP_403_FORBIDDEN)
+        return serializer.data
 
+    def _build_accuracy(self):
         total_guarantees = Guarantee.objects.count()
         confirmed = Guarantee.objects.filter(confirmation_status="CONFIRMED").count()
         pending_confirmations = Guarantee.objects.filter(confirmation_status="PENDING").count()
@@ -244,44 +405,39 @@ class ReportsViewSet(viewsets.ViewSet):
         }
 
         serializer = AccuracyReportSerializer(payload)
-        return APIResponse.success(data=serializer.data)
-
-    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated, IsAdminOrAbove])
-    def committee_performance(self, request):
-        """Generate committee performance report."""
-        if not request.user.is_admin_or_above():
-            return APIResponse.error("Permission denied", status_code=status.HTTP_403_FORBIDDEN)
+        return serializer.data
 
-        committees = (
+    def _build_committee_performance(self):
+        # Electors and attendances are counted in subqueries and guarantees
+        # in one grouped pass, instead of joining all three per committee
+        committees = list(
             Committee.objects.select_related("election")
             .annotate(
-                total_electors=Count("electors", filter=Q(electors__is_active=True), distinct=True),
-                total_attendance=Count("attendances", distinct=True),
-                total_guarantees=Count("electors__guarantees", distinct=True),
-                pending_guarantees=Count(
-                    "electors__guarantees",
-                    filter=Q(electors__guarantees__guarantee_status="PENDING"),
-                    distinct=True,
-                ),
-                confirmed_guarantees=Count(
-                    "electors__guarantees",
-                    filter=Q(electors__guarantees__confirmation_status="CONFIRMED"),
-                    distinct=True,
-                ),
-                not_available_guarantees=Count(
-                    "electors__guarantees",
-                    filter=Q(electors__guarantees__confirmation_status="NOT_AVAILABLE"),
-                    distinct=True,
-                ),
+                total_electors=count_subquery(Elector.objects.filter(is_active=True), "committee"),
+                total_attendance=count_subquery(Attendance.objects.all(), "committee"),
             )
             .order_by("code")[:100]
         )
+        guarantee_counts = {
+            row["elector__committee_id"]: row
+            for row in Guarantee.objects.filter(elector__committee_id__in=[committee.id for committee in committees])
+            .values("elector__committee_id")
+            .annotate(
+                total=Count("id"),
+                pending=Count("id", filter=Q(guarantee_status="PENDING")),
+                confirmed=Count("id", filter=Q(confirmation_status="CONFIRMED")),
+                not_available=Count("id", filter=Q(confirmation_status="NOT_AVAILABLE")),
+            )
+            .order_by()
+        }
+        no_guarantees = {"total": 0, "pending": 0, "confirmed": 0, "not_available": 0}
 
         committee_stats = []
         for committee in committees:
             total_electors = committee.total_electors
             total_attendance = committee.total_attendance
-            total_guarantees = committee.total_guarantees
+            guarantees = guarantee_counts.get(committee.id, no_guarantees)
+            total_guarantees = guarantees["total"]
             attendance_rate = round(
                 (total_attendance / total_electors * 100) if total_electors else 0,
                 1,
@@ -297,9 +453,9 @@ class ReportsViewSet(viewsets.ViewSet):
                     "total_attendance": total_attendance,
                     "attendance_rate": attendance_rate,
                     "total_guarantees": total_guarantees,
-                    "pending": committee.pending_guarantees,
-                    "confirmed": committee.confirmed_guarantees,
-                    "not_available": committee.not_available_guarantees,
+                    "pending": guarantees["pending"],
+                    "confirmed": guarantees["confirmed"],
+                    "not_available": guarantees["not_available"],
                     "coverage": coverage,
                 }
             )
@@ -332,114 +488,4 @@ class ReportsViewSet(viewsets.ViewSet):
         }
 
         serializer = CommitteePerformanceSerializer(data)
-        return APIResponse.success(data=serializer.data)
-
-    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated, IsAdminOrAbove])
-    def export(self, request):
-        """Export report data."""
-        if not request.user.is_admin_or_above():
-            return APIResponse.error("Permission denied", status_code=status.HTTP_403_FORBIDDEN)
-
-        serializer = ExportRequestSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        report_type = serializer.validated_data["report_type"]
-        export_format = serializer.validated_data["format"]
-
-        normalized_type = report_type.upper()
-        type_mapping = {
-            "COVERAGE": "GUARANTEE_COVERAGE",
-            "ACCURACY": "GUARANTEE_ACCURACY",
-            "COMMITTEE_PERFORMANCE": "COMMITTEE_PERFORMANCE",
-            "GUARANTEE_COVERAGE": "GUARANTEE_COVERAGE",
-            "GUARANTEE_ACCURACY": "GUARANTEE_ACCURACY",
-        }
-        normalized_type = type_mapping.get(normalized_type)
-
-        if normalized_type == "GUARANTEE_COVERAGE":
-            response = self.coverage(request)
-            report_data = response.data.get("data", response.data)
-        elif normalized_type == "GUARANTEE_ACCURACY":
-            response = self.accuracy(request)
-            report_data = response.data.get("data", response.data)
-        elif normalized_type == "COMMITTEE_PERFORMANCE":
-            response = self.committee_performance(request)
-            report_data = response.data.get("data", response.data)
-        else:
-            return APIResponse.error(
-                message="Unsupported report type",
-                status_code=status.HTTP_400_BAD_REQUEST,
-            )
-
-        generated_report = GeneratedReport.objects.create(
-            title=f"{(normalized_type or report_type).replace('_', ' ').title()} Report",
-            report_type=normalized_type or report_type,
-            format=export_format,
-            status="COMPLETED",
-            parameters=serializer.validated_data.get("parameters", {}),
-            data=report_data,
-            generated_by=request.user,
-            generated_at=timezone.now(),
-            expires_at=timezone.now() + timedelta(days=7),
-        )
-
-        return APIResponse.success(
-            data={
-                "report_id": generated_report.id,
-                "title": generated_report.title,
-                "format": export_format,
-                "status": "COMPLETED",
-                "download_url": f"/api/reports/download/{generated_report.id}/",
-            },
-            message=f"Report generated successfully in {export_format} format",
-        )
-
-    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated, IsAdminOrAbove])
-    def campaign_performance(self, request):
-        """Return campaign budget and resource readiness metrics."""
-        if not request.user.is_admin_or_above():
-            return APIResponse.error("Permission denied", status_code=status.HTTP_403_FORBIDDEN)
-
-        latest_snapshot = CampaignFinanceSnapshot.objects.order_by("-period_end", "-created_at").first()
-        finance_data = (
-            CampaignFinanceSnapshotSerializer(latest_snapshot).data
-            if latest_snapshot
-            else {
-                "total_budget": 0,
-                "committed_budget": 0,
-                "spent_budget": 0,
-                "available_budget": 0,
-                "burn_rate": 0,
-            }
-        )
-
-        total_users = CustomUser.objects.filter(is_active=True).count()
-        supervisors = CustomUser.objects.filter(is_active=True, role="SUPERVISOR").count()
-        admins = CustomUser.objects.filter(is_active=True, role__in=["ADMIN", "SUPER_ADMIN"]).count()
-        field_agents = max(total_users - supervisors - admins, 0)
-        active_today = CustomUser.objects.filter(
-            is_active=True, last_login__date=timezone.now().date()
-        ).count()
-
-        guarantee_count = Guarantee.objects.count()
-        attendance_today = Attendance.objects.filter(attended_at__date=timezone.now().date()).count()
-
-        payload = {
-            "budget": finance_data,
-            "resources": {
-                "total_users": total_users,
-                "admins": admins,
-                "supervisors": supervisors,
-                "field_agents": field_agents,
-                "active_today": active_today,
-                "active_ratio": round((active_today / total_users * 100) if total_users else 0, 1),
-            },
-            "forecast": {
-                "daily_burn_rate": finance_data.get("burn_rate") or 0,
-                "guarantees_total": guarantee_count,
-                "attendance_today": attendance_today,
-            },
-        }
-
-        return APIResponse.success(data=payload)
-
+        return serializer.data
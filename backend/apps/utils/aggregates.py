@@ -0,0 +1,29 @@
+"""
+Related-row counts as correlated subqueries.
+
+Annotating ``Count`` over several reverse relations at once joins them all
+into one row set (committee x electors x attendances x guarantees), which
+``distinct=True`` then has to collapse. ``count_subquery`` counts each
+relation in a subquery of its own, so every count reads only its own rows
+and needs no DISTINCT.
+"""
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(queryset, outer_field: str, outer_ref: str = 'pk'):
+    """
+    Number of rows of ``queryset`` whose ``outer_field`` matches the outer
+    row's ``outer_ref`` (0 when there are none).
+
+    ``Committee.objects.annotate(total_attendance=count_subquery(
+    Attendance.objects.all(), 'committee'))``
+    """
+    counts = (
+        queryset.filter(**{outer_field: OuterRef(outer_ref)})
+        .order_by()
+        .values(outer_field)
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
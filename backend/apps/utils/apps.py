@@ -9,4 +9,6 @@ class UtilsConfig(AppConfig):
     def ready(self):
         """Import signals when app is ready."""
         import apps.utils.signals  # noqa
+        import apps.utils.conditional  # noqa  (table version counters)
+        import apps.utils.checks  # noqa
 
@@ -0,0 +1,63 @@
+"""
+Minimal background task runner.
+
+Runs callables off the request thread without requiring an external broker.
+The runner is chosen with the ``BACKGROUND_TASK_RUNNER`` setting:
+
+- ``'thread'`` (default): a shared in-process thread pool
+- ``'sync'``: run inline in the calling thread (tests, management commands)
+"""
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'BACKGROUND_TASK_WORKERS', 2),
+                    thread_name_prefix='background-task',
+                )
+    return _executor
+
+
+def _run(func: Callable, *args, **kwargs):
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        logger.exception(f"Background task {getattr(func, '__name__', func)} failed")
+        raise
+    finally:
+        # Worker threads own their connections; don't leak them between tasks
+        connections.close_all()
+
+
+def run_in_background(func: Callable, *args, **kwargs) -> Optional[Future]:
+    """
+    Schedule ``func(*args, **kwargs)`` on the configured runner.
+
+    Returns the ``Future`` for the thread runner, None when run inline.
+    Tasks should record their own outcome (e.g. on a job row); exceptions
+    are logged, not propagated to the caller.
+    """
+    runner = getattr(settings, 'BACKGROUND_TASK_RUNNER', 'thread')
+    if runner == 'sync':
+        try:
+            func(*args, **kwargs)
+        except Exception:
+            logger.exception(f"Background task {getattr(func, '__name__', func)} failed")
+        return None
+    return _get_executor().submit(_run, func, *args, **kwargs)
@@ -0,0 +1,70 @@
+"""
+Generation-counter cache namespaces.
+
+A namespace (``dashboard:admin``, ``user:5``, ``election:3``) owns a
+generation counter kept in the cache. Keys derived from namespaces embed
+their current generations, so bumping a counter makes every derived key
+unreachable at once; the orphaned entries simply expire. This needs only
+``get_many`` / ``add`` / ``incr``, which every Django cache backend
+(LocMemCache included) provides, instead of pattern deletion.
+
+Counters start from the current time in milliseconds rather than 1: if a
+counter is evicted, its replacement is still newer than any generation
+already embedded in a cached key, so an eviction can never resurrect stale
+entries.
+"""
+import time
+from typing import Dict, Iterable
+
+from django.core.cache import cache
+
+GENERATION_PREFIX = 'nsgen:'
+
+
+def namespace(*parts) -> str:
+    """Namespace name from its parts, e.g. ``namespace('user', 5)``."""
+    return ':'.join(str(part) for part in parts)
+
+
+def _seed() -> int:
+    return int(time.time() * 1000)
+
+
+def get_generations(namespaces: Iterable[str]) -> Dict[str, int]:
+    """Current generation of each namespace (one ``get_many`` when warm)."""
+    keys = {name: GENERATION_PREFIX + name for name in namespaces}
+    stored = cache.get_many(list(keys.values()))
+    generations = {}
+    for name, key in keys.items():
+        value = stored.get(key)
+        if value is None:
+            seed = _seed()
+            value = seed if cache.add(key, seed, None) else (cache.get(key) or seed)
+        generations[name] = value
+    return generations
+
+
+def bump(*namespaces: str):
+    """Start a new generation of each namespace, invalidating derived keys."""
+    for name in namespaces:
+        key = GENERATION_PREFIX + name
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Never read (or evicted): nothing derived from it can be live
+            if not cache.add(key, _seed(), None):
+                cache.incr(key)
+
+
+def namespace_version(namespaces: Iterable[str]) -> str:
+    """Combined current generation of ``namespaces``; changes when any is bumped."""
+    generations = get_generations(namespaces)
+    return '.'.join(f'{generations[name]}' for name in sorted(generations))
+
+
+def versioned_key(base: str, namespaces: Iterable[str]) -> str:
+    """
+    ``base`` qualified by the current generations of ``namespaces``; the key
+    changes whenever any of them is bumped.
+    """
+    return f'{base}:g{namespace_version(namespaces)}'
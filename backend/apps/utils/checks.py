@@ -0,0 +1,32 @@
+"""
+System checks for deployment settings.
+"""
+from django.conf import settings
+from django.core.checks import Warning, register
+
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Cache namespaces and table versions (apps.utils.cache_namespaces,
+    apps.utils.conditional) invalidate other processes' caches and the
+    elector name index only through a cache all processes share.
+    """
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if backend not in LOCAL_CACHE_BACKENDS:
+        return []
+    return [
+        Warning(
+            'The default cache is local to each process.',
+            hint=(
+                'Writes handled by one worker process will not invalidate cached payloads, '
+                'ETags or the elector name index of the others. Set CACHE_BACKEND=redis.'
+            ),
+            id='utils.W001',
+        )
+    ]
@@ -0,0 +1,118 @@
+"""
+Conditional GET (ETag / Last-Modified).
+
+Responses carry validators that are computed without building the payload.
+A request whose ``If-None-Match`` / ``If-Modified-Since`` still matches
+gets an empty 304, which skips both serialization and transfer.
+
+Validators come from:
+
+- table version counters: every save or delete of a project model, and
+  every m2m change, bumps the ``table:<app_label>.<model>`` cache namespace
+  (apps.utils.cache_namespaces) when the transaction commits. Code that
+  writes with ``bulk_create``, ``bulk_update`` or ``QuerySet.update`` calls
+  ``bump_tables`` itself.
+- the ``as_of`` time of cached payloads (dashboards, reports).
+
+ETags are weak: each response body differs in ``meta.timestamp`` and
+``meta.request_id``, but the data does not.
+"""
+import hashlib
+import logging
+from datetime import datetime
+from typing import Iterable, Optional
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .cache_namespaces import bump, namespace, namespace_version
+
+logger = logging.getLogger(__name__)
+
+
+def table_namespace(model) -> str:
+    """Version-counter namespace of ``model``'s table (a model or ``'app_label.Model'``)."""
+    if isinstance(model, str):
+        model = apps.get_model(model)
+    return namespace('table', model._meta.label_lower)
+
+
+def bump_tables(*models):
+    """
+    Start a new version of each model's table once the current transaction
+    commits (immediately outside one). Bumping earlier would let a reader
+    pair the new version with the not yet committed data.
+    """
+    namespaces = [table_namespace(model) for model in models]
+
+    def apply():
+        try:
+            bump(*namespaces)
+        except Exception as e:
+            logger.error(f"Error bumping table versions: {e}", exc_info=True)
+
+    transaction.on_commit(apply)
+
+
+def tables_version(models: Iterable) -> str:
+    """Combined version of the models' tables; any write to one changes it."""
+    return namespace_version({table_namespace(model) for model in models})
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag from ``parts``."""
+    digest = hashlib.md5(':'.join(str(part) for part in parts).encode(), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"'
+
+
+def request_etag(request, *parts) -> str:
+    """Weak ETag for ``request``'s URL and user plus ``parts``."""
+    return make_etag(request.get_full_path(), getattr(request.user, 'pk', None), *parts)
+
+
+def set_validators(response, etag: Optional[str] = None, last_modified: Optional[datetime] = None):
+    """Add validators to ``response``; clients keep it but revalidate every time."""
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def not_modified(request, etag: Optional[str] = None, last_modified: Optional[datetime] = None):
+    """
+    The 304 (or 412) response when the request's conditional headers match
+    the validators, otherwise None.
+    """
+    if request.method not in ('GET', 'HEAD') or not (etag or last_modified):
+        return None
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def _is_project_model(model) -> bool:
+    return model.__module__.startswith('apps.')
+
+
+@receiver(post_save, dispatch_uid='conditional_table_saved')
+@receiver(post_delete, dispatch_uid='conditional_table_deleted')
+def table_written(sender, **kwargs):
+    if _is_project_model(sender):
+        bump_tables(sender)
+
+
+@receiver(m2m_changed, dispatch_uid='conditional_table_m2m_changed')
+def table_m2m_changed(sender, instance, action, model, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_tables(*{type(instance), model, sender})
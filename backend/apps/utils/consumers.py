@@ -194,6 +194,18 @@ class ElectionUpdatesConsumer(AsyncWebsocketConsumer):
         except Exception as e:
             logger.error(f"Error sending dashboard_update to {self.user}: {e}", exc_info=True)
     
+    async def import_progress(self, event):
+        """Send background import job progress to WebSocket."""
+        try:
+            await self.send(text_data=json.dumps({
+                'type': 'import_progress',
+                'action': event.get('action'),  # 'started', 'progress', 'completed', 'failed'
+                'data': event.get('data'),
+                'timestamp': event.get('timestamp'),
+            }))
+        except Exception as e:
+            logger.error(f"Error sending import_progress to {self.user}: {e}", exc_info=True)
+    
     @database_sync_to_async
     def validate_token(self, token):
         """Validate JWT token and return payload."""
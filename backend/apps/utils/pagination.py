@@ -0,0 +1,225 @@
+"""
+Pagination classes.
+
+``StandardPagination`` keeps the page-number behaviour (``?page=N``) and adds
+a keyset (cursor) mode for views that declare ``cursor_ordering``. Keyset
+pages are fetched with ``WHERE a >= x AND (a > x OR (a = x AND b > y) ...)``
+for the last row ``(x, y, ...)``: the leading ``a >= x`` bound is an index
+range on the first ordering column, so page 2000 costs the same as page 1,
+and the total count is only computed when asked for. (A row-value
+comparison ``(a, b) > (x, y)`` would not allow mixed directions.)
+
+Cursor mode::
+
+    GET /api/electors/?cursor=              first page
+    GET /api/electors/?cursor=<token>       page after / before a token
+    &page_size=100                          optional, capped at max_page_size
+    &count=exact | estimate                 optional total count
+"""
+import base64
+import json
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from django.db import connections
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """
+    Planner row estimate on PostgreSQL (no scan), exact ``COUNT(*)`` elsewhere.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def _encode_value(value: Any) -> Any:
+    # Full-precision ISO strings; Django parses them back in lookups
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+class KeysetPaginator:
+    """
+    Keyset pagination over a fixed ordering.
+
+    ``ordering`` lists model fields (``-`` for descending); the combination
+    must be unique, so end it with the primary key. Ordering fields must be
+    non-nullable.
+    """
+
+    def __init__(self, ordering: Sequence[str], page_size: int):
+        self.ordering = list(ordering)
+        self.page_size = page_size
+        self.fields = [f.lstrip('-') for f in self.ordering]
+        self.descending = [f.startswith('-') for f in self.ordering]
+
+    # ------------------------------------------------------------------
+    # Tokens
+    # ------------------------------------------------------------------
+    def encode_cursor(self, row: Any, reverse: bool) -> str:
+        payload = {
+            'v': [_encode_value(getattr(row, field)) for field in self.fields],
+            'r': reverse,
+        }
+        raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, token: str) -> Tuple[List[Any], bool]:
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            values, reverse = payload['v'], bool(payload.get('r', False))
+        except (ValueError, KeyError, TypeError):
+            raise NotFound('Invalid cursor')
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise NotFound('Invalid cursor')
+        return values, reverse
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+    def _after(self, values: List[Any], reverse: bool) -> Q:
+        """
+        Rows strictly after ``values`` in the (possibly reversed) ordering:
+        the OR expansion over the ordering columns, ANDed with an inclusive
+        bound on the first column so the database can seek its index.
+        """
+        condition = Q()
+        equal = Q()
+        for field, descending, value in zip(self.fields, self.descending, values):
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+        lookup = 'lte' if self.descending[0] != reverse else 'gte'
+        return Q(**{f'{self.fields[0]}__{lookup}': values[0]}) & condition
+
+    def _order_by(self, reverse: bool) -> List[str]:
+        if not reverse:
+            return self.ordering
+        return [f[1:] if f.startswith('-') else f'-{f}' for f in self.ordering]
+
+    def paginate(self, queryset: QuerySet, token: Optional[str]) -> Tuple[List[Any], Optional[str], Optional[str]]:
+        """
+        Return ``(rows, next_cursor, previous_cursor)`` for the page after
+        (or, for a reverse token, before) ``token``; an empty token is the first page.
+        """
+        reverse = False
+        if token:
+            values, reverse = self.decode_cursor(token)
+            queryset = queryset.filter(self._after(values, reverse))
+
+        rows = list(queryset.order_by(*self._order_by(reverse))[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        if not rows:
+            return rows, None, None
+        if reverse:
+            next_cursor = self.encode_cursor(rows[-1], reverse=False)
+            previous_cursor = self.encode_cursor(rows[0], reverse=True) if has_more else None
+        else:
+            next_cursor = self.encode_cursor(rows[-1], reverse=False) if has_more else None
+            previous_cursor = self.encode_cursor(rows[0], reverse=True) if token else None
+        return rows, next_cursor, previous_cursor
+
+
+class StandardPagination(PageNumberPagination):
+    """
+    Page-number pagination, plus keyset pagination when the view sets
+    ``cursor_ordering`` and the request carries a ``cursor`` parameter.
+    """
+
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    cursor_page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        ordering = getattr(view, 'cursor_ordering', None)
+        if (
+            ordering
+            and self.cursor_query_param in request.query_params
+            and isinstance(queryset, QuerySet)
+        ):
+            return self._paginate_keyset(queryset, request, ordering)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is None:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('count', self.keyset['count']),
+            ('next', self.keyset['next']),
+            ('previous', self.keyset['previous']),
+            ('results', data),
+        ]))
+
+    # ------------------------------------------------------------------
+    # Keyset mode
+    # ------------------------------------------------------------------
+    def _paginate_keyset(self, queryset: QuerySet, request, ordering: Sequence[str]) -> List[Any]:
+        self.request = request
+        page_size = self._cursor_page_size(request)
+        token = request.query_params.get(self.cursor_query_param) or None
+
+        paginator = KeysetPaginator(ordering, page_size)
+        rows, next_cursor, previous_cursor = paginator.paginate(queryset, token)
+
+        count_mode = request.query_params.get(self.count_query_param)
+        count = None
+        if count_mode == 'exact':
+            count = queryset.count()
+        elif count_mode == 'estimate':
+            count = estimate_count(queryset)
+
+        self.keyset = {
+            'page_size': page_size,
+            'count': count,
+            'next': self._cursor_link(next_cursor),
+            'previous': self._cursor_link(previous_cursor),
+        }
+        return rows
+
+    def _cursor_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.cursor_page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def _cursor_link(self, cursor: Optional[str]) -> Optional[str]:
+        if cursor is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+
+def paginate_keyset(request, queryset: QuerySet, ordering: Sequence[str], default_page_size: int = 10) -> Tuple[List[Any], Dict]:
+    """
+    Keyset-paginate ``queryset`` outside the DRF pagination hooks (for views
+    that assemble their own response). Returns ``(rows, pagination_meta)``.
+    """
+    paginator = StandardPagination()
+    paginator.page_size = default_page_size
+    rows = paginator._paginate_keyset(queryset, request, ordering)
+    return rows, paginator.keyset
@@ -0,0 +1,42 @@
+"""
+In-process periodic workers.
+
+A ``PeriodicWorker`` is a daemon thread calling a function every ``tick``
+seconds. Web processes start their workers from the WSGI/ASGI entry points
+through ``start_periodic_worker``, which starts each named worker at most
+once per process. The function owns its error handling and database
+connections (see ``apps.elections.precompute.run_tick``).
+"""
+import threading
+from typing import Callable, Dict
+
+_workers: Dict[str, 'PeriodicWorker'] = {}
+_workers_lock = threading.Lock()
+
+
+class PeriodicWorker(threading.Thread):
+    """Daemon thread running ``func()`` every ``tick`` seconds."""
+
+    def __init__(self, name: str, tick: float, func: Callable[[], object]):
+        super().__init__(name=name, daemon=True)
+        self.tick = tick
+        self.func = func
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.is_set():
+            self.func()
+            self._stopped.wait(self.tick)
+
+    def stop(self):
+        self._stopped.set()
+
+
+def start_periodic_worker(name: str, tick: float, func: Callable[[], object]) -> PeriodicWorker:
+    """Start this process's ``name`` worker unless it is already running."""
+    with _workers_lock:
+        worker = _workers.get(name)
+        if worker is None or not worker.is_alive():
+            worker = _workers[name] = PeriodicWorker(name, tick, func)
+            worker.start()
+    return worker
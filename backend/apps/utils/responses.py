@@ -31,11 +31,15 @@ This provides:
 """
 
 import uuid
+from datetime import datetime
 from rest_framework.response import Response
 from rest_framework import status
 from typing import Any, Dict, Optional, List
+from django.http import HttpResponse
 from django.utils import timezone
 
+from .conditional import not_modified, set_validators
+
 
 def generate_request_id():
     """Generate unique request ID for tracking."""
@@ -88,7 +92,9 @@ class APIResponse:
         data: Any = None,
         message: Optional[str] = None,
         meta: Optional[Dict] = None,
-        status_code: int = status.HTTP_200_OK
+        status_code: int = status.HTTP_200_OK,
+        etag: Optional[str] = None,
+        last_modified: Optional[datetime] = None
     ) -> Response:
         """
         Success response with consistent wrapper.
@@ -98,6 +104,8 @@ class APIResponse:
             message: Optional success message for user feedback
             meta: Optional metadata (pagination, caching, timestamps, etc.)
             status_code: HTTP status code (default: 200)
+            etag: Optional ETag validator (see apps.utils.conditional)
+            last_modified: Optional Last-Modified validator
             
         Returns:
             Response with format: {status, data, message?, meta}
@@ -121,8 +129,38 @@ class APIResponse:
             response_data["message"] = message
             
         response_data["meta"] = response_meta
+        
+        response = Response(response_data, status=status_code)
+        if etag or last_modified:
+            set_validators(response, etag, last_modified)
+        return response
+    
+    @staticmethod
+    def not_modified(
+        request,
+        etag: Optional[str] = None,
+        last_modified: Optional[datetime] = None
+    ) -> Optional[HttpResponse]:
+        """
+        304 response when the client's copy is still current.
+        
+        Check before building the payload and pass the same validators to
+        success():
+        
+            cached = APIResponse.not_modified(request, etag)
+            if cached is not None:
+                return cached
+            return APIResponse.success(data=..., etag=etag)
+        
+        Args:
+            request: The request carrying If-None-Match / If-Modified-Since
+            etag: Current ETag of the resource
+            last_modified: Current modification time of the resource
             
-        return Response(response_data, status=status_code)
+        Returns:
+            304 response, or None if the payload must be sent
+        """
+        return not_modified(request, etag, last_modified)
     
     @staticmethod
     def created(
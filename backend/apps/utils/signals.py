@@ -64,7 +64,7 @@ def guarantee_saved(sender, instance, created, **kwargs):
         )
         
         # Invalidate dashboard cache
-        invalidate_dashboard_cache()
+        invalidate_dashboard_cache(user_id=instance.user_id)
         
     except Exception as e:
         logger.error(f"Error broadcasting guarantee update: {e}", exc_info=True)
@@ -85,7 +85,7 @@ def guarantee_deleted(sender, instance, **kwargs):
         )
         
         # Invalidate dashboard cache
-        invalidate_dashboard_cache()
+        invalidate_dashboard_cache(user_id=getattr(instance, 'user_id', None))
         
     except Exception as e:
         logger.error(f"Error broadcasting guarantee delete: {e}", exc_info=True)
@@ -112,7 +112,7 @@ def attendance_saved(sender, instance, created, **kwargs):
         )
         
         # Invalidate dashboard cache
-        invalidate_dashboard_cache()
+        invalidate_dashboard_cache(election_id=instance.committee.election_id)
         
     except Exception as e:
         logger.error(f"Error broadcasting attendance update: {e}", exc_info=True)
@@ -128,6 +128,7 @@ def vote_count_saved(sender, instance, created, **kwargs):
             return
         
         from apps.voting.serializers import VoteCountSerializer
+        from apps.voting.tally import candidate_tally
         serializer = VoteCountSerializer(instance)
         action = 'created' if created else 'updated'
         
@@ -135,17 +136,25 @@ def vote_count_saved(sender, instance, created, **kwargs):
         if hasattr(instance, 'committee_entry') and instance.committee_entry:
             committee_id = instance.committee_entry.committee_id
         
+        # Running totals, already updated by apps.voting.signals
+        tally = candidate_tally(instance.election_id, instance.candidate_id)
+        
         broadcast_update(
             'voting_update',
             action,
             {
                 'vote_count': serializer.data,
                 'committee_id': committee_id,
+                'tally': {
+                    'candidate_id': instance.candidate_id,
+                    'votes': tally['votes'],
+                    'verified_votes': tally['verified_votes'],
+                },
             }
         )
         
         # Invalidate dashboard cache
-        invalidate_dashboard_cache()
+        invalidate_dashboard_cache(election_id=instance.election_id)
         
     except Exception as e:
         logger.error(f"Error broadcasting vote count update: {e}", exc_info=True)
@@ -174,7 +183,7 @@ def election_results_saved(sender, instance, created, **kwargs):
         )
         
         # Invalidate dashboard cache
-        invalidate_dashboard_cache()
+        invalidate_dashboard_cache(election_id=getattr(instance, 'election_id', None))
         
     except Exception as e:
         logger.error(f"Error broadcasting election results update: {e}", exc_info=True)
@@ -0,0 +1,110 @@
+"""
+Single-flight cache with stale-while-revalidate.
+
+``cached_compute`` keeps one entry per key holding the value, the
+namespace version it was computed under and a soft expiry. The entry itself
+lives in the cache for the hard TTL.
+
+- Fresh entry: returned as is.
+- Soft-expired entry: returned immediately; one caller (the one that wins
+  the recompute lock) refreshes it in the background.
+- Entry of an older version (invalidated by a write): the lock winner
+  recomputes inline so it sees its own write; everyone else gets the
+  previous value meanwhile instead of recomputing too.
+- No entry: the lock winner computes; the others wait for it (up to
+  ``LOCK_WAIT`` seconds) rather than stampeding the database.
+
+The lock is a ``cache.add`` key, so this works on any shared backend (and
+per process on LocMemCache).
+"""
+import logging
+import time
+import uuid
+from typing import Any, Callable, Optional
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds a recompute may hold the lock before another caller may take over
+LOCK_TIMEOUT = 60
+# Seconds a caller without a value waits for the lock holder's result
+LOCK_WAIT = 5.0
+POLL_INTERVAL = 0.05
+
+
+def cached_compute(
+    key: str,
+    compute: Callable[[], Any],
+    soft_ttl: int,
+    hard_ttl: Optional[int] = None,
+    version: str = '',
+    refresh: bool = False,
+) -> Any:
+    """
+    Value of ``key``, recomputed by ``compute()`` at most once at a time.
+
+    Args:
+        key: Stable cache key (without the version)
+        compute: Builds the value; it must be picklable
+        soft_ttl: Seconds the value is served without a refresh
+        hard_ttl: Seconds a stale value may still be served (default 4x soft)
+        version: Namespace version (see apps.utils.cache_namespaces); an
+            entry computed under another version is stale
+        refresh: Recompute inline regardless of the cached entry
+    """
+    hard_ttl = hard_ttl or soft_ttl * 4
+    if refresh:
+        return _store(key, compute(), soft_ttl, hard_ttl, version)
+
+    entry = cache.get(key)
+    if entry is not None and entry['version'] == version and time.time() < entry['fresh_until']:
+        return entry['value']
+
+    lock_key = f'{key}:lock'
+    token = uuid.uuid4().hex
+    if cache.add(lock_key, token, LOCK_TIMEOUT):
+        if entry is not None and entry['version'] == version:
+            # Same data, just old: serve it and refresh off the request
+            from apps.utils.background import run_in_background
+
+            run_in_background(_refresh, key, compute, soft_ttl, hard_ttl, version, token)
+            return entry['value']
+        try:
+            return _store(key, compute(), soft_ttl, hard_ttl, version)
+        finally:
+            _release(lock_key, token)
+
+    if entry is not None:
+        # Someone else is recomputing
+        return entry['value']
+
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry['value']
+    logger.warning(f"Timed out waiting for {key} to be computed; computing it here")
+    return _store(key, compute(), soft_ttl, hard_ttl, version)
+
+
+def _store(key: str, value: Any, soft_ttl: int, hard_ttl: int, version: str) -> Any:
+    cache.set(
+        key,
+        {'value': value, 'version': version, 'fresh_until': time.time() + soft_ttl},
+        hard_ttl,
+    )
+    return value
+
+
+def _refresh(key: str, compute: Callable[[], Any], soft_ttl: int, hard_ttl: int, version: str, token: str):
+    try:
+        _store(key, compute(), soft_ttl, hard_ttl, version)
+    finally:
+        _release(f'{key}:lock', token)
+
+
+def _release(lock_key: str, token: str):
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
@@ -0,0 +1,38 @@
+"""
+Unit tests for generation-counter cache namespaces.
+"""
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.utils.cache_namespaces import GENERATION_PREFIX, bump, get_generations, namespace, versioned_key
+
+
+class TestCacheNamespaces(TestCase):
+    """Test namespace generations and derived keys."""
+    
+    def setUp(self):
+        cache.clear()
+    
+    def test_namespace_name(self):
+        self.assertEqual(namespace('user', 5), 'user:5')
+    
+    def test_key_stable_until_bumped(self):
+        key = versioned_key('dashboard:personal', ['dashboard:personal', 'user:1'])
+        self.assertEqual(key, versioned_key('dashboard:personal', ['dashboard:personal', 'user:1']))
+        
+        bump('user:1')
+        self.assertNotEqual(key, versioned_key('dashboard:personal', ['dashboard:personal', 'user:1']))
+    
+    def test_bump_only_affects_its_namespace(self):
+        other = versioned_key('dashboard:personal', ['dashboard:personal', 'user:2'])
+        bump('user:1')
+        self.assertEqual(other, versioned_key('dashboard:personal', ['dashboard:personal', 'user:2']))
+    
+    def test_evicted_counter_never_reuses_generation(self):
+        before = get_generations(['election:1'])['election:1']
+        cache.delete(GENERATION_PREFIX + 'election:1')
+        after = get_generations(['election:1'])['election:1']
+        self.assertGreaterEqual(after, before)
+        
+        bump('election:2')  # never read: starts a fresh counter
+        self.assertIsNotNone(cache.get(GENERATION_PREFIX + 'election:2'))
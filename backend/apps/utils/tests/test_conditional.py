@@ -0,0 +1,66 @@
+"""
+Unit tests for conditional GET validators.
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from apps.elections.models import Election
+from apps.utils.conditional import bump_tables, make_etag, not_modified, tables_version
+
+
+class TestTablesVersion(TestCase):
+    """Test table version counters."""
+    
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create(email='admin@example.com')
+    
+    def test_write_bumps_model_table_on_commit(self):
+        version = tables_version([Election])
+        with self.captureOnCommitCallbacks(execute=True):
+            Election.objects.create(name='Test Election', created_by=self.user)
+        self.assertNotEqual(tables_version([Election]), version)
+    
+    def test_uncommitted_write_keeps_version(self):
+        version = tables_version([Election])
+        with self.captureOnCommitCallbacks(execute=False):
+            Election.objects.create(name='Test Election', created_by=self.user)
+        self.assertEqual(tables_version([Election]), version)
+    
+    def test_bump_tables_accepts_labels(self):
+        version = tables_version(['elections.Election'])
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_tables('elections.Election')
+        self.assertNotEqual(tables_version([Election]), version)
+
+
+class TestNotModified(TestCase):
+    """Test matching of If-None-Match / If-Modified-Since."""
+    
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.etag = make_etag('payload', 1)
+    
+    def test_matching_etag(self):
+        request = self.factory.get('/', HTTP_IF_NONE_MATCH=self.etag)
+        response = not_modified(request, self.etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], self.etag)
+    
+    def test_changed_etag(self):
+        request = self.factory.get('/', HTTP_IF_NONE_MATCH=make_etag('payload', 0))
+        self.assertIsNone(not_modified(request, self.etag))
+    
+    def test_if_modified_since(self):
+        as_of = timezone.now() - timedelta(minutes=5)
+        request = self.factory.get('/', HTTP_IF_MODIFIED_SINCE=timezone.now().strftime('%a, %d %b %Y %H:%M:%S GMT'))
+        self.assertEqual(not_modified(request, last_modified=as_of).status_code, 304)
+        self.assertIsNone(not_modified(self.factory.get('/'), self.etag, as_of))
+    
+    def test_unsafe_method_never_not_modified(self):
+        request = self.factory.post('/', HTTP_IF_NONE_MATCH=self.etag)
+        self.assertIsNone(not_modified(request, self.etag))
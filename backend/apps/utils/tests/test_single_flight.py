@@ -0,0 +1,51 @@
+"""
+Unit tests for the single-flight stale-while-revalidate cache.
+"""
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.utils.single_flight import cached_compute
+
+
+@override_settings(BACKGROUND_TASK_RUNNER='sync')
+class TestCachedCompute(TestCase):
+    """Test cached_compute freshness, versions and locking."""
+    
+    def setUp(self):
+        cache.clear()
+    
+    def test_fresh_value_not_recomputed(self):
+        compute = Mock(return_value={'total': 1})
+        self.assertEqual(cached_compute('k', compute, soft_ttl=60), {'total': 1})
+        self.assertEqual(cached_compute('k', compute, soft_ttl=60), {'total': 1})
+        compute.assert_called_once()
+    
+    def test_soft_expired_value_served_while_refreshing(self):
+        cached_compute('k', lambda: 'old', soft_ttl=60)
+        entry = cache.get('k')
+        cache.set('k', dict(entry, fresh_until=0), 240)  # past its soft TTL
+        self.assertEqual(cached_compute('k', lambda: 'new', soft_ttl=60), 'old')
+        # The background refresh stored the new value
+        self.assertEqual(cached_compute('k', lambda: 'unused', soft_ttl=60), 'new')
+    
+    def test_new_version_recomputed_by_lock_winner(self):
+        cached_compute('k', lambda: 'v1', soft_ttl=60, version='1')
+        self.assertEqual(cached_compute('k', lambda: 'v2', soft_ttl=60, version='2'), 'v2')
+    
+    def test_other_callers_get_previous_value_while_locked(self):
+        cached_compute('k', lambda: 'v1', soft_ttl=60, version='1')
+        cache.add('k:lock', 'someone-else', 60)
+        compute = Mock(return_value='v2')
+        self.assertEqual(cached_compute('k', compute, soft_ttl=60, version='2'), 'v1')
+        compute.assert_not_called()
+    
+    @patch('apps.utils.single_flight.LOCK_WAIT', 0.1)
+    def test_missing_value_computed_after_waiting_for_lock(self):
+        cache.add('k:lock', 'someone-else', 60)
+        self.assertEqual(cached_compute('k', lambda: 'computed', soft_ttl=60), 'computed')
+    
+    def test_refresh_recomputes(self):
+        cached_compute('k', lambda: 'old', soft_ttl=60)
+        self.assertEqual(cached_compute('k', lambda: 'new', soft_ttl=60, refresh=True), 'new')
@@ -0,0 +1,38 @@
+"""
+Tests for transaction helpers.
+"""
+import pytest
+from django.db import transaction
+
+from apps.utils.transactions import on_commit_once
+
+
+def _noop():
+    pass
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestOnCommitOnce:
+    """Test on_commit_once registration."""
+
+    def test_registers_once_per_transaction(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            assert on_commit_once(_noop)
+            assert not on_commit_once(_noop)
+        assert len(callbacks) == 1
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            assert on_commit_once(_noop)
+        assert len(callbacks) == 1
+
+    def test_registers_again_after_rollback(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    assert on_commit_once(_noop)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            assert on_commit_once(_noop)
+        assert len(callbacks) == 1
@@ -127,7 +127,8 @@ class TestInvalidateDashboardCache(TestCase):
     @patch('apps.utils.websocket_utils.broadcast_to_group')
     def test_invalidate_specific_dashboard(self, mock_broadcast):
         """Test invalidating specific dashboard cache."""
-        invalidate_dashboard_cache('personal')
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_dashboard_cache('personal')
         
         mock_broadcast.assert_called_once()
         call_args = mock_broadcast.call_args
@@ -135,6 +136,25 @@ class TestInvalidateDashboardCache(TestCase):
         self.assertEqual(call_args[0][1], 'dashboard_update')
 
 
+    @patch('apps.utils.websocket_utils.broadcast_to_group')
+    def test_invalidate_user_bumps_user_namespace(self, mock_broadcast):
+        """Test a user-scoped invalidation changes that user's keys only."""
+        from apps.utils.cache_namespaces import versioned_key
+        
+        mine = versioned_key('dashboard:personal:user:1', ['dashboard:personal', 'user:1'])
+        theirs = versioned_key('dashboard:personal:user:2', ['dashboard:personal', 'user:2'])
+        admin = versioned_key('dashboard:admin', ['dashboard:admin'])
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_dashboard_cache(user_id=1)
+            # Readers keep the old generation until the write commits
+            self.assertEqual(mine, versioned_key('dashboard:personal:user:1', ['dashboard:personal', 'user:1']))
+        
+        self.assertNotEqual(mine, versioned_key('dashboard:personal:user:1', ['dashboard:personal', 'user:1']))
+        self.assertEqual(theirs, versioned_key('dashboard:personal:user:2', ['dashboard:personal', 'user:2']))
+        self.assertNotEqual(admin, versioned_key('dashboard:admin', ['dashboard:admin']))
+
+
 class TestGetConnectionCount(TestCase):
     """Test get_connection_count function."""
     
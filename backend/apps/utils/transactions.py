@@ -0,0 +1,47 @@
+"""
+Transaction helpers.
+"""
+import functools
+import threading
+import weakref
+from typing import Callable
+
+from django.db import transaction
+
+_registered = threading.local()
+
+
+class _OnCommitOnce:
+    """``func`` as registered by ``on_commit_once``; remembers whether it ran."""
+
+    def __init__(self, func: Callable[[], None]):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.ran = False
+
+    def __call__(self):
+        self.ran = True
+        self.func()
+
+
+def on_commit_once(func: Callable[[], None]) -> bool:
+    """
+    Run ``func`` when the current transaction commits, registering it only
+    once per transaction however often this is called. Returns True if this
+    call registered it.
+
+    The registration is tracked through a weak reference: a rollback makes
+    Django drop the pending callback, so the next call registers again.
+    """
+    callbacks = getattr(_registered, 'callbacks', None)
+    if callbacks is None:
+        callbacks = _registered.callbacks = {}
+    reference = callbacks.get(func)
+    pending = reference() if reference is not None else None
+    if pending is not None and not pending.ran:
+        return False
+
+    callback = _OnCommitOnce(func)
+    callbacks[func] = weakref.ref(callback)
+    transaction.on_commit(callback)
+    return True
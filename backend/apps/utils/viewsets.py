@@ -9,6 +9,7 @@ from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated
 from django.db import transaction
 
+from .conditional import request_etag, tables_version
 from .responses import APIResponse
 
 
@@ -23,6 +24,9 @@ class StandardResponseMixin:
     - Transaction handling
     - User-friendly messages
     - Automatic created_by/updated_by tracking
+    - Conditional GET for viewsets that declare conditional_models: list and
+      retrieve send an ETag and answer a matching If-None-Match with 304
+      without serializing (see apps.utils.conditional)
     
     Usage:
         class MyViewSet(StandardResponseMixin, viewsets.ModelViewSet):
@@ -39,6 +43,18 @@ class StandardResponseMixin:
     update_message = "Updated successfully"
     delete_message = "Deleted successfully"
     
+    # Conditional GET is opt-in: a viewset lists every table its list/retrieve
+    # payload reads (its own model, related rows, tables counted or looked up
+    # by serializer fields) and the ETag derives from their version counters.
+    # Leave empty when the payload depends on anything that cannot be listed.
+    conditional_models = ()
+    
+    def get_conditional_etag(self):
+        """ETag of the list/retrieve payload for this request, or None."""
+        if not self.conditional_models:
+            return None
+        return request_etag(self.request, tables_version(self.conditional_models))
+    
     def get_queryset(self):
         """
         Get base queryset. Override this method to add filtering logic.
@@ -95,6 +111,11 @@ class StandardResponseMixin:
         """
         List response with consistent {data: [...], message?, meta?} format
         """
+        etag = self.get_conditional_etag()
+        cached = APIResponse.not_modified(request, etag)
+        if cached is not None:
+            return cached
+        
         queryset = self.filter_queryset(self.get_queryset())
         
         page = self.paginate_queryset(queryset)
@@ -112,24 +133,34 @@ class StandardResponseMixin:
                         "next": paginated_data.get('next'),
                         "previous": paginated_data.get('previous')
                     }
-                }
+                },
+                etag=etag
             )
         
         serializer = self.get_serializer(queryset, many=True)
         return APIResponse.success(
             data=serializer.data,
-            message=self.list_message
+            message=self.list_message,
+            etag=etag
         )
     
     def retrieve(self, request, *args, **kwargs):
         """
         Retrieve response with consistent {data: {...}, message?} format
         """
+        # get_object() runs the lookup and the object permission checks, so a
+        # 304 never confirms an object the user may not see
         instance = self.get_object()
+        etag = self.get_conditional_etag()
+        cached = APIResponse.not_modified(request, etag)
+        if cached is not None:
+            return cached
+        
         serializer = self.get_serializer(instance)
         return APIResponse.success(
             data=serializer.data,
-            message=self.retrieve_message
+            message=self.retrieve_message,
+            etag=etag
         )
     
     @transaction.atomic
@@ -4,6 +4,7 @@ Utility functions for WebSocket operations.
 import logging
 from typing import Optional, Dict, Any
 from django.core.cache import cache
+from django.db import transaction
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 from django.utils import timezone
@@ -71,31 +72,77 @@ def broadcast_to_group(
         return False
 
 
-def invalidate_dashboard_cache(dashboard_type: str = None):
+DASHBOARD_TYPES = ('personal', 'supervisor', 'admin')
+# Cache namespace of the organisation-wide reports
+REPORTS_NAMESPACE = 'reports'
+
+
+def dashboard_namespace(dashboard_type: str) -> str:
+    """Cache namespace of one dashboard type."""
+    from apps.utils.cache_namespaces import namespace
+    
+    return namespace('dashboard', dashboard_type)
+
+
+def user_namespace(user_id: int) -> str:
+    """Cache namespace of data derived from one user's records."""
+    from apps.utils.cache_namespaces import namespace
+    
+    return namespace('user', user_id)
+
+
+def election_namespace(election_id: int) -> str:
+    """Cache namespace of data derived from one election."""
+    from apps.utils.cache_namespaces import namespace
+    
+    return namespace('election', election_id)
+
+
+def invalidate_dashboard_cache(dashboard_type: str = None, user_id: int = None, election_id: int = None):
     """
     Invalidate dashboard cache and optionally broadcast update.
     
+    Cached payloads are keyed by generation-counter namespaces (see
+    apps.utils.cache_namespaces); bumping a namespace invalidates every key
+    derived from it. The bump runs once the current transaction commits
+    (immediately outside one): bumping earlier would let a concurrent reader
+    cache the not yet committed state under the new generation.
+    
     Args:
         dashboard_type: Type of dashboard ('personal', 'supervisor', 'admin') or None for all
+        user_id: Invalidate only this user's personal view (supervisor and
+            admin dashboards, which aggregate users, are invalidated too)
+        election_id: Also invalidate data cached for this election
     """
-    from django.core.cache import cache
-    
-    cache_patterns = []
     if dashboard_type:
-        cache_patterns.append(f"dashboard:{dashboard_type}:*")
+        namespaces = [dashboard_namespace(dashboard_type)]
+    elif user_id is not None:
+        namespaces = [
+            user_namespace(user_id),
+            dashboard_namespace('supervisor'),
+            dashboard_namespace('admin'),
+            REPORTS_NAMESPACE,
+        ]
     else:
-        cache_patterns.extend([
-            "dashboard:personal:*",
-            "dashboard:supervisor:*",
-            "dashboard:admin:*"
-        ])
+        namespaces = [dashboard_namespace(name) for name in DASHBOARD_TYPES] + [REPORTS_NAMESPACE]
+    if election_id is not None:
+        namespaces.append(election_namespace(election_id))
     
-    # Note: Django cache doesn't support pattern deletion directly
-    # This would need Redis-specific implementation or manual key tracking
-    logger.info(f"Dashboard cache invalidation requested for: {dashboard_type or 'all'}")
+    transaction.on_commit(lambda: _bump_dashboard_namespaces(namespaces, broadcast=bool(dashboard_type)))
+
+
+def _bump_dashboard_namespaces(namespaces, broadcast: bool):
+    from apps.utils.cache_namespaces import bump
+    
+    try:
+        bump(*namespaces)
+    except Exception as e:
+        logger.error(f"Error invalidating dashboard cache: {e}", exc_info=True)
+        return
+    logger.debug(f"Dashboard cache invalidated: {', '.join(namespaces)}")
     
     # Broadcast cache invalidation
-    if dashboard_type:
+    if broadcast:
         broadcast_to_group(
             'election_updates',
             'dashboard_update',
@@ -6,3 +6,7 @@ class VotingConfig(AppConfig):
     name = 'apps.voting'
     verbose_name = 'Voting Operations'
 
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import apps.voting.signals  # noqa
@@ -0,0 +1,138 @@
+"""
+Set-based vote entry for one committee.
+
+When polls close every committee submits all its candidate counts at once.
+A submission is written with a fixed number of statements whatever the
+number of candidates: the candidates and the committee's current vote
+counts are each read with one query (the vote counts locked, so a verify
+cannot change them under the submission), all vote counts are upserted with one
+``INSERT ... ON CONFLICT (committee, candidate) DO UPDATE``, the audit rows
+are written with one ``bulk_create`` and one voting update is broadcast for
+the committee. The committee's vote entry row is locked for the duration,
+so concurrent submissions for the same committee apply one after the other
+while other committees proceed.
+"""
+import logging
+from typing import Dict, List
+
+from django.db import transaction
+
+from apps.candidates.models import Candidate
+from apps.utils.conditional import bump_tables
+
+from .models import CommitteeVoteEntry, VoteCount, VoteCountAudit
+from .tally import apply_tally_deltas, tally_deltas
+
+logger = logging.getLogger(__name__)
+
+# Fields an existing vote count takes from a new submission
+UPSERT_FIELDS = ['election', 'vote_count', 'status', 'entered_by', 'updated_at']
+
+
+class UnknownCandidates(Exception):
+    """Raised when a submission names candidates not in the committee's election."""
+
+    def __init__(self, candidate_ids: List[int]):
+        self.candidate_ids = candidate_ids
+        super().__init__(f"Unknown candidates: {', '.join(str(pk) for pk in candidate_ids)}")
+
+
+def submit_committee_votes(entry: CommitteeVoteEntry, counts: Dict[int, int], user, ip_address=None) -> Dict[str, int]:
+    """
+    Write ``counts`` (``{candidate_id: votes}``) for the entry's committee.
+
+    Must run inside a transaction. Returns ``{'created': n, 'updated': n}``.
+    """
+    # Serialize submissions of the same committee
+    CommitteeVoteEntry.objects.select_for_update().get(pk=entry.pk)
+
+    candidate_ids = sorted(counts)
+    known = set(
+        Candidate.objects.filter(election_id=entry.election_id, id__in=candidate_ids).values_list('id', flat=True)
+    )
+    unknown = [candidate_id for candidate_id in candidate_ids if candidate_id not in known]
+    if unknown:
+        raise UnknownCandidates(unknown)
+
+    # Locked until commit: a verify landing between this read and the upsert
+    # would leave the tally deltas below computed from stale rows
+    existing = {
+        vote_count.candidate_id: vote_count
+        for vote_count in VoteCount.objects.select_for_update()
+        .filter(committee_id=entry.committee_id, candidate_id__in=candidate_ids)
+        .order_by('candidate_id')
+    }
+    submitted = [
+        VoteCount(
+            election_id=entry.election_id,
+            committee_id=entry.committee_id,
+            candidate_id=candidate_id,
+            vote_count=counts[candidate_id],
+            status='SUBMITTED',
+            entered_by=user,
+            # Not in UPSERT_FIELDS: an existing row keeps its own
+            is_verified=candidate_id in existing and existing[candidate_id].is_verified,
+        )
+        for candidate_id in candidate_ids
+    ]
+
+    VoteCount.objects.bulk_create(
+        submitted,
+        update_conflicts=True,
+        unique_fields=['committee', 'candidate'],
+        update_fields=UPSERT_FIELDS,
+    )
+    # bulk_create skips signals: update the tallies here
+    deltas = tally_deltas(submitted)
+    tally_deltas(existing.values(), sign=-1, deltas=deltas)
+    apply_tally_deltas(deltas)
+
+    ids = dict(
+        VoteCount.objects.filter(committee_id=entry.committee_id, candidate_id__in=candidate_ids)
+        .values_list('candidate_id', 'id')
+    )
+    audits = []
+    for vote_count in submitted:
+        previous = existing.get(vote_count.candidate_id)
+        audits.append(VoteCountAudit(
+            vote_count_id=ids[vote_count.candidate_id],
+            user=user,
+            action='CREATED' if previous is None else 'UPDATED',
+            old_value=None if previous is None else previous.vote_count,
+            new_value=vote_count.vote_count,
+            notes='Bulk entry' if previous is None else 'Bulk entry update',
+            ip_address=ip_address,
+        ))
+    VoteCountAudit.objects.bulk_create(audits)
+    bump_tables(VoteCount, VoteCountAudit)
+
+    created = len(submitted) - len(existing)
+    _broadcast(entry, counts, created)
+    return {'created': created, 'updated': len(existing)}
+
+
+def _broadcast(entry: CommitteeVoteEntry, counts: Dict[int, int], created: int):
+    """One voting update and one cache invalidation for the submission."""
+    from apps.utils.signals import broadcast_update
+    from apps.utils.websocket_utils import invalidate_dashboard_cache
+
+    payload = {
+        'election_id': entry.election_id,
+        'committee_id': entry.committee_id,
+        'committee_entry_id': entry.id,
+        'created': created,
+        'updated': len(counts) - created,
+        'vote_counts': [
+            {'candidate_id': candidate_id, 'vote_count': votes}
+            for candidate_id, votes in sorted(counts.items())
+        ],
+    }
+
+    def send():
+        try:
+            broadcast_update('voting_update', 'bulk_entry', payload)
+            invalidate_dashboard_cache(election_id=entry.election_id)
+        except Exception as e:
+            logger.error(f"Error broadcasting vote entry: {e}", exc_info=True)
+
+    transaction.on_commit(send)
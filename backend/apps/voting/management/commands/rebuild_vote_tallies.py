@@ -0,0 +1,26 @@
+"""
+Management command to recompute the running vote tallies from the vote
+counts (see apps.voting.tally).
+
+Usage:
+    python manage.py rebuild_vote_tallies               # all elections
+    python manage.py rebuild_vote_tallies --election 3  # one election
+"""
+from django.core.management.base import BaseCommand
+
+from apps.voting.tally import rebuild_tallies
+
+
+class Command(BaseCommand):
+    help = 'Recompute the running vote tallies from the vote counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--election',
+            type=int,
+            help='Limit the rebuild to one election',
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_tallies(options['election'])
+        self.stdout.write(f'Rebuilt vote tallies: {written} row(s)')
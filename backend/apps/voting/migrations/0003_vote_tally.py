@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:34
+
+from django.db import migrations, models
+from django.db.models import Q, Sum
+import django.db.models.deletion
+
+
+def populate_tallies(apps, schema_editor):
+    VoteCount = apps.get_model('voting', 'VoteCount')
+    VoteTally = apps.get_model('voting', 'VoteTally')
+    sums = dict(
+        votes=Sum('vote_count', filter=~Q(status='REJECTED'), default=0),
+        verified_votes=Sum('vote_count', filter=Q(is_verified=True), default=0),
+    )
+    rows = list(
+        VoteCount.objects.values('election_id', 'committee_id', 'candidate_id').annotate(**sums).order_by()
+    )
+    rows += [
+        dict(row, committee_id=None)
+        for row in VoteCount.objects.values('election_id', 'candidate_id').annotate(**sums).order_by()
+    ]
+    VoteTally.objects.bulk_create([VoteTally(**row) for row in rows], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0009_fix_committee_code_unique_and_gender_default'),
+        ('candidates', '0007_remove_candidate_party_affiliation'),
+        ('voting', '0002_alter_party_unique_together_remove_party_election_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VoteTally',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('votes', models.IntegerField(default=0, help_text='Entered votes (all vote counts except rejected ones)')),
+                ('verified_votes', models.IntegerField(default=0, help_text='Votes of verified vote counts')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vote_tallies', to='candidates.candidate')),
+                ('committee', models.ForeignKey(blank=True, help_text='Committee, or empty for the election total', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='vote_tallies', to='elections.committee')),
+                ('election', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vote_tallies', to='elections.election')),
+            ],
+            options={
+                'verbose_name': 'Vote Tally',
+                'verbose_name_plural': 'Vote Tallies',
+                'db_table': 'vote_tallies',
+                'indexes': [models.Index(fields=['election', 'committee'], name='vote_tallie_electio_0241a8_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='votetally',
+            constraint=models.UniqueConstraint(fields=('committee', 'candidate'), name='unique_committee_vote_tally'),
+        ),
+        migrations.AddConstraint(
+            model_name='votetally',
+            constraint=models.UniqueConstraint(condition=models.Q(('committee__isnull', True)), fields=('election', 'candidate'), name='unique_election_vote_tally'),
+        ),
+        migrations.RunPython(populate_tallies, migrations.RunPython.noop),
+    ]
@@ -131,6 +131,79 @@ class VoteCount(models.Model):
         self.verified_by = user
         self.verified_at = timezone.now()
         self.save(update_fields=['is_verified', 'status', 'verified_by', 'verified_at'])
+    
+    TALLY_FIELDS = ('election_id', 'committee_id', 'candidate_id', 'vote_count', 'status', 'is_verified')
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # What this row contributes to VoteTally, to diff on save
+        loaded = instance.__dict__
+        if all(field in loaded for field in cls.TALLY_FIELDS):
+            instance._counted_as = tuple(loaded[field] for field in cls.TALLY_FIELDS)
+        return instance
+
+
+class VoteTally(models.Model):
+    """
+    Running vote totals per candidate, kept current as vote counts are
+    written (see apps.voting.tally).
+    
+    A row with a committee holds that committee's votes for the candidate;
+    the row without one holds the candidate's total in the election. Live
+    results read these rows instead of summing the vote counts.
+    """
+    
+    election = models.ForeignKey(
+        'elections.Election',
+        on_delete=models.CASCADE,
+        related_name='vote_tallies'
+    )
+    committee = models.ForeignKey(
+        'elections.Committee',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='vote_tallies',
+        help_text='Committee, or empty for the election total'
+    )
+    candidate = models.ForeignKey(
+        Candidate,
+        on_delete=models.CASCADE,
+        related_name='vote_tallies'
+    )
+    votes = models.IntegerField(
+        default=0,
+        help_text='Entered votes (all vote counts except rejected ones)'
+    )
+    verified_votes = models.IntegerField(
+        default=0,
+        help_text='Votes of verified vote counts'
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'vote_tallies'
+        verbose_name = 'Vote Tally'
+        verbose_name_plural = 'Vote Tallies'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['committee', 'candidate'],
+                name='unique_committee_vote_tally'
+            ),
+            models.UniqueConstraint(
+                fields=['election', 'candidate'],
+                condition=models.Q(committee__isnull=True),
+                name='unique_election_vote_tally'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['election', 'committee']),
+        ]
+    
+    def __str__(self):
+        scope = self.committee_id or 'total'
+        return f"{self.candidate_id} @ {scope}: {self.votes} ({self.verified_votes} verified)"
 
 
 class CommitteeVoteEntry(models.Model):
@@ -372,23 +445,40 @@ class ElectionResults(models.Model):
         """
         Generate complete election results.
         Aggregates all verified vote counts.
+        
+        Everything is scoped to this election and computed with a fixed
+        number of queries, whatever the number of candidates and
+        committees: candidate totals and the per-committee breakdown come
+        from the committee rows of the running ``VoteTally``.
         """
-        from apps.electors.models import Elector
         from apps.attendees.models import Attendance
+        from apps.electors.models import Elector
+        
+        election_id = self.election_id
         
         # Get totals
-        self.total_registered_electors = Elector.objects.filter(is_active=True).count()
-        self.total_attendance = Attendance.objects.count()
+        self.total_registered_electors = Elector.objects.filter(
+            committee__election_id=election_id,
+            is_active=True
+        ).count()
+        self.total_attendance = Attendance.objects.filter(
+            committee__election_id=election_id,
+            status=Attendance.Status.ATTENDED
+        ).count()
         
         # Get ballot totals
         committee_entries = CommitteeVoteEntry.objects.filter(
-            election=self.election,
+            election_id=election_id,
             status='VERIFIED'
         )
-        
-        self.total_ballots_cast = sum(e.total_ballots_cast for e in committee_entries)
-        self.total_valid_ballots = sum(e.valid_ballots for e in committee_entries)
-        self.total_invalid_ballots = sum(e.invalid_ballots for e in committee_entries)
+        ballots = committee_entries.aggregate(
+            cast=models.Sum('total_ballots_cast'),
+            valid=models.Sum('valid_ballots'),
+            invalid=models.Sum('invalid_ballots'),
+        )
+        self.total_ballots_cast = ballots['cast'] or 0
+        self.total_valid_ballots = ballots['valid'] or 0
+        self.total_invalid_ballots = ballots['invalid'] or 0
         
         # Calculate turnout
         if self.total_registered_electors > 0:
@@ -397,20 +487,49 @@ class ElectionResults(models.Model):
                 2
             )
         
-        # Aggregate candidate results
-        candidates = Candidate.objects.filter(
-            election=self.election,
-            is_active=True
-        ).order_by('candidate_number')
+        candidates = list(
+            Candidate.objects.filter(
+                election_id=election_id,
+                is_active=True
+            ).select_related('party').order_by('candidate_number')
+        )
+        numbers = {candidate.id: candidate.candidate_number for candidate in candidates}
+        
+        # Per committee per candidate verified votes, from the running tally
+        vote_rows = VoteTally.objects.filter(
+            election_id=election_id,
+            committee__isnull=False,
+            candidate_id__in=list(numbers),
+            verified_votes__gt=0
+        ).values(
+            'committee_id', 'committee__code', 'committee__name', 'candidate_id', 'verified_votes'
+        )
+        
+        candidate_votes = dict.fromkeys(numbers, 0)
+        committees = {}
+        for entry in committee_entries.values(
+            'committee_id', 'committee__code', 'committee__name',
+            'total_ballots_cast', 'valid_ballots', 'invalid_ballots'
+        ):
+            committee = committees[entry['committee_id']] = self._committee_result(entry)
+            committee.update(
+                total_ballots_cast=entry['total_ballots_cast'],
+                valid_ballots=entry['valid_ballots'],
+                invalid_ballots=entry['invalid_ballots'],
+            )
+        for row in vote_rows:
+            votes = row['verified_votes']
+            candidate_votes[row['candidate_id']] += votes
+            committee = committees.get(row['committee_id'])
+            if committee is None:
+                committee = committees[row['committee_id']] = self._committee_result(row)
+            committee['total_votes'] += votes
+            committee['candidates'][str(numbers[row['candidate_id']])] = votes
         
+        # Aggregate candidate results
         candidate_results = []
         for candidate in candidates:
-            total_votes = VoteCount.objects.filter(
-                candidate=candidate,
-                is_verified=True
-            ).aggregate(
-                total=models.Sum('vote_count')
-            )['total'] or 0
+            total_votes = candidate_votes[candidate.id]
             
             vote_percentage = round(
                 (total_votes / self.total_valid_ballots * 100) if self.total_valid_ballots > 0 else 0,
@@ -436,6 +555,7 @@ class ElectionResults(models.Model):
         # Store in results_data
         self.results_data = {
             'candidates': candidate_results,
+            'committees': sorted(committees.values(), key=lambda x: x['committee_code'] or ''),
             'summary': {
                 'total_candidates': len(candidate_results),
                 'total_votes_cast': sum(r['total_votes'] for r in candidate_results),
@@ -447,6 +567,20 @@ class ElectionResults(models.Model):
         self.status = 'PRELIMINARY'
         self.save()
     
+    @staticmethod
+    def _committee_result(row):
+        """Empty per-committee breakdown entry for a grouped row."""
+        return {
+            'committee_id': row['committee_id'],
+            'committee_code': row['committee__code'],
+            'committee_name': row['committee__name'],
+            'total_ballots_cast': 0,
+            'valid_ballots': 0,
+            'invalid_ballots': 0,
+            'total_votes': 0,
+            'candidates': {},  # candidate number -> verified votes
+        }
+    
     def publish(self, user):
         """Publish final results."""
         self.status = 'PUBLISHED'
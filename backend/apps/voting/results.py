@@ -0,0 +1,132 @@
+"""
+Per-committee results pivot.
+
+The counting-night screens (entry progress, results by committee) need, for
+every committee of an election, its vote entry, how many candidates it has
+counts for and its verified votes per candidate. ``load_committee_pivot``
+fetches the committees, the entries, the active candidates and the vote
+counts of the election with one query each and assembles the per-committee
+rows in memory, so the cost does not grow with the number of committees.
+"""
+from collections import defaultdict
+from typing import Dict, List
+
+from apps.candidates.models import Candidate
+
+from .models import CommitteeVoteEntry, VoteCount
+
+
+def load_committee_pivot(election_id: int) -> Dict:
+    """
+    ``{'candidates': {id: {...}}, 'active_candidates': n, 'committees': [...]}``
+    for the election, committees in code order. Each committee row holds
+    ``entry`` (a dict, or None before any entry), ``entered`` (number of
+    vote counts) and ``verified_votes`` (``{candidate_id: votes}``).
+    """
+    from apps.elections.models import Committee
+
+    committees = list(Committee.objects.filter(election_id=election_id).values('id', 'code', 'name'))
+    entries = {
+        entry['committee_id']: entry
+        for entry in CommitteeVoteEntry.objects.filter(election_id=election_id).values(
+            'committee_id', 'status', 'total_ballots_cast', 'valid_ballots', 'invalid_ballots'
+        )
+    }
+    candidates = {
+        candidate['id']: candidate
+        for candidate in Candidate.objects.filter(election_id=election_id).values(
+            'id', 'candidate_number', 'name', 'is_active'
+        )
+    }
+
+    entered: Dict[int, int] = defaultdict(int)
+    verified_votes: Dict[int, Dict[int, int]] = defaultdict(dict)
+    vote_counts = VoteCount.objects.filter(election_id=election_id).values_list(
+        'committee_id', 'candidate_id', 'vote_count', 'is_verified'
+    ).order_by()
+    for committee_id, candidate_id, vote_count, is_verified in vote_counts:
+        entered[committee_id] += 1
+        if is_verified:
+            verified_votes[committee_id][candidate_id] = vote_count
+
+    for committee in committees:
+        committee['entry'] = entries.get(committee['id'])
+        committee['entered'] = entered[committee['id']]
+        committee['verified_votes'] = verified_votes[committee['id']]
+
+    return {
+        'candidates': candidates,
+        'active_candidates': sum(1 for candidate in candidates.values() if candidate['is_active']),
+        'committees': committees,
+    }
+
+
+def completion_percentage(entered: int, active_candidates: int) -> float:
+    """Share of the active candidates a committee has vote counts for."""
+    if active_candidates == 0:
+        return 0
+    return round((entered / active_candidates) * 100, 1)
+
+
+def voting_progress(election_id: int) -> Dict:
+    """Counting progress of the election, overall and per committee."""
+    pivot = load_committee_pivot(election_id)
+    committees = pivot['committees']
+    statuses = [committee['entry']['status'] for committee in committees if committee['entry']]
+    total_committees = len(committees)
+    verified = statuses.count('VERIFIED')
+
+    committee_progress = []
+    for committee in committees:
+        entry = committee['entry']
+        committee_progress.append({
+            'committee_code': committee['code'],
+            'committee_name': committee['name'],
+            'status': entry['status'] if entry else 'NOT_STARTED',
+            'completion_percentage': (
+                completion_percentage(committee['entered'], pivot['active_candidates']) if entry else 0
+            ),
+            'verified': bool(entry) and entry['status'] == 'VERIFIED',
+        })
+
+    return {
+        'total_committees': total_committees,
+        'entries_created': len(statuses),
+        'in_progress': statuses.count('IN_PROGRESS'),
+        'completed': statuses.count('COMPLETED'),
+        'verified': verified,
+        'not_started': total_committees - len(statuses),
+        'completion_percentage': round((verified / total_committees * 100) if total_committees > 0 else 0, 1),
+        'committees': committee_progress,
+    }
+
+
+def results_by_committee(election_id: int) -> List[Dict]:
+    """Verified votes and ballot totals of each committee of the election."""
+    pivot = load_committee_pivot(election_id)
+    candidates = pivot['candidates']
+
+    committee_results = []
+    for committee in pivot['committees']:
+        entry = committee['entry']
+        candidate_votes = [
+            {
+                'candidate_number': candidates[candidate_id]['candidate_number'],
+                'candidate_name': candidates[candidate_id]['name'],
+                'vote_count': votes,
+            }
+            for candidate_id, votes in committee['verified_votes'].items()
+        ]
+        # Sort by votes descending
+        candidate_votes.sort(key=lambda x: x['vote_count'], reverse=True)
+
+        committee_results.append({
+            'committee_code': committee['code'],
+            'committee_name': committee['name'],
+            'total_ballots': entry['total_ballots_cast'] if entry else 0,
+            'valid_ballots': entry['valid_ballots'] if entry else 0,
+            'invalid_ballots': entry['invalid_ballots'] if entry else 0,
+            'candidate_votes': candidate_votes,
+            'status': entry['status'] if entry else 'NOT_STARTED',
+        })
+    return committee_results
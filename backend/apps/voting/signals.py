@@ -0,0 +1,68 @@
+"""
+Signal handlers keeping VoteTally current.
+"""
+import threading
+from collections import namedtuple
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.utils.transactions import on_commit_once
+
+from .models import VoteCount
+from .tally import apply_tally_deltas, rebuild_tallies, tally_deltas
+
+CountedAs = namedtuple('CountedAs', VoteCount.TALLY_FIELDS)
+
+_pending = threading.local()
+
+
+def _flush_tally_rebuilds():
+    election_ids, _pending.election_ids = getattr(_pending, 'election_ids', None), None
+    for election_id in election_ids or ():
+        rebuild_tallies(election_id)
+
+
+def _queue_tally_rebuild(election_id):
+    """
+    Rebuild the election's tallies once the current transaction commits.
+    Rebuilding inside the writer's transaction would hold the tally rows'
+    write lock for the rest of it and could miss concurrent writers' counts.
+    """
+    pending = getattr(_pending, 'election_ids', None)
+    if pending is None:
+        pending = _pending.election_ids = set()
+    pending.add(election_id)
+    # Outside a transaction this rebuilds right away
+    on_commit_once(_flush_tally_rebuilds)
+
+
+@receiver(post_save, sender=VoteCount)
+def vote_count_tallied(sender, instance, created, **kwargs):
+    """Apply the vote count's change to its tallies."""
+    if kwargs.get('raw', False):
+        return
+
+    current = tuple(getattr(instance, field) for field in VoteCount.TALLY_FIELDS)
+    previous = None if created else getattr(instance, '_counted_as', False)
+    instance._counted_as = current
+    if previous is False:
+        # Saved without being loaded first: its old contribution is unknown
+        _queue_tally_rebuild(instance.election_id)
+        return
+    if previous == current:
+        return
+
+    removed = [CountedAs(*previous)] if previous is not None else []
+    _apply(added=[instance], removed=removed)
+
+
+@receiver(post_delete, sender=VoteCount)
+def vote_count_untallied(sender, instance, **kwargs):
+    _apply(removed=[instance])
+
+
+def _apply(added=(), removed=()):
+    deltas = tally_deltas(added)
+    tally_deltas(removed, sign=-1, deltas=deltas)
+    apply_tally_deltas(deltas)
@@ -0,0 +1,180 @@
+"""
+Running vote tallies.
+
+``VoteTally`` holds each candidate's votes per committee and in total per
+election. Every save / delete of a ``VoteCount`` applies the difference it
+makes with ``UPDATE ... SET votes = votes + delta`` inside the writer's
+transaction (a row is created the first time a candidate gets votes), so
+live results read a few rows by key instead of summing the vote counts.
+
+- ``votes``: all entered votes except rejected vote counts
+- ``verified_votes``: votes of verified vote counts (what results report)
+
+Writes that bypass model signals (``bulk_create``, ``QuerySet.update``) call
+``apply_tally_deltas`` themselves. ``rebuild_tallies`` recomputes the table
+from the vote counts; it is run by the ``rebuild_vote_tallies`` command.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Now
+
+from apps.utils.conditional import bump_tables
+
+from .models import VoteCount, VoteTally
+
+TallyKey = Tuple[int, int, int]  # (election_id, committee_id, candidate_id)
+
+
+def contribution(vote_count) -> Tuple[int, int]:
+    """``(votes, verified_votes)`` a vote count adds to its tallies."""
+    votes = 0 if vote_count.status == 'REJECTED' else vote_count.vote_count
+    verified = vote_count.vote_count if vote_count.is_verified else 0
+    return votes, verified
+
+
+def tally_deltas(
+    vote_counts: Iterable,
+    sign: int = 1,
+    deltas: Optional[Dict[TallyKey, List[int]]] = None,
+) -> Dict[TallyKey, List[int]]:
+    """
+    ``{(election_id, committee_id, candidate_id): [votes, verified_votes]}``
+    for ``vote_counts``, added to ``deltas`` when given.
+    """
+    deltas = defaultdict(lambda: [0, 0]) if deltas is None else deltas
+    for vote_count in vote_counts:
+        votes, verified = contribution(vote_count)
+        delta = deltas[(vote_count.election_id, vote_count.committee_id, vote_count.candidate_id)]
+        delta[0] += sign * votes
+        delta[1] += sign * verified
+    return deltas
+
+
+def apply_tally_deltas(deltas: Dict[TallyKey, List[int]]):
+    """
+    Add deltas to the committee tallies and the election totals.
+
+    Each committee, then each election total, takes one ``UPDATE`` for all
+    its candidates. Rows are locked in a fixed order (committee rows first,
+    by candidate), so concurrent writers touching the same candidates
+    cannot deadlock.
+    """
+    scopes: Dict[Tuple[int, Optional[int]], Dict[int, List[int]]] = defaultdict(dict)
+    for (election_id, committee_id, candidate_id), (votes, verified) in deltas.items():
+        if not (votes or verified):
+            continue
+        scopes[(election_id, committee_id)][candidate_id] = [votes, verified]
+        total = scopes[(election_id, None)].setdefault(candidate_id, [0, 0])
+        total[0] += votes
+        total[1] += verified
+
+    for (election_id, committee_id) in sorted(scopes, key=lambda scope: (scope[1] is None, scope[0], scope[1] or 0)):
+        changes = {
+            candidate_id: change
+            for candidate_id, change in scopes[(election_id, committee_id)].items()
+            if change[0] or change[1]
+        }
+        if changes:
+            _apply_scope(election_id, committee_id, changes)
+
+
+def _rows(election_id: int, committee_id: Optional[int]):
+    if committee_id is None:
+        return VoteTally.objects.filter(election_id=election_id, committee__isnull=True)
+    return VoteTally.objects.filter(committee_id=committee_id)
+
+
+def _by_candidate(changes: Dict[int, List[int]], index: int) -> Case:
+    return Case(
+        *[When(candidate_id=candidate_id, then=Value(change[index])) for candidate_id, change in changes.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def _apply_scope(election_id: int, committee_id: Optional[int], changes: Dict[int, List[int]]):
+    rows = _rows(election_id, committee_id).filter(candidate_id__in=list(changes))
+    # Rows are never deleted outside rebuilds: the locked ones all take the UPDATE
+    present = set(rows.select_for_update().order_by('candidate_id').values_list('candidate_id', flat=True))
+    if present:
+        rows.filter(candidate_id__in=present).update(
+            votes=F('votes') + _by_candidate(changes, 0),
+            verified_votes=F('verified_votes') + _by_candidate(changes, 1),
+            updated_at=Now(),
+        )
+    for candidate_id in sorted(set(changes) - present):
+        _create(election_id, committee_id, candidate_id, *changes[candidate_id])
+
+
+def _add(election_id: int, committee_id: Optional[int], candidate_id: int, votes: int, verified: int) -> bool:
+    return bool(
+        _rows(election_id, committee_id).filter(candidate_id=candidate_id).update(
+            votes=F('votes') + votes,
+            verified_votes=F('verified_votes') + verified,
+            updated_at=Now(),
+        )
+    )
+
+
+def _create(election_id: int, committee_id: Optional[int], candidate_id: int, votes: int, verified: int):
+    try:
+        with transaction.atomic():
+            VoteTally.objects.create(
+                election_id=election_id,
+                committee_id=committee_id,
+                candidate_id=candidate_id,
+                votes=votes,
+                verified_votes=verified,
+            )
+    except IntegrityError:
+        # Created concurrently by another vote count of the candidate
+        _add(election_id, committee_id, candidate_id, votes, verified)
+
+
+def rebuild_tallies(election_id: Optional[int] = None) -> int:
+    """
+    Recompute the tallies of ``election_id`` (default: all elections) from
+    the vote counts. Returns the number of rows written.
+    """
+    vote_counts = VoteCount.objects.all()
+    tallies = VoteTally.objects.all()
+    if election_id is not None:
+        vote_counts = vote_counts.filter(election_id=election_id)
+        tallies = tallies.filter(election_id=election_id)
+
+    sums = dict(
+        votes=Sum('vote_count', filter=~Q(status='REJECTED'), default=0),
+        verified_votes=Sum('vote_count', filter=Q(is_verified=True), default=0),
+    )
+    with transaction.atomic():
+        # Lock the tally rows before summing, in the order apply_tally_deltas
+        # locks them (committee rows, then totals, by candidate): a writer
+        # holding one commits first and is summed; one arriving later waits
+        # and applies its delta to the rebuilt rows.
+        list(
+            tallies.select_for_update()
+            .order_by(F('committee_id').asc(nulls_last=True), 'candidate_id')
+            .values_list('pk', flat=True)
+        )
+        rows = list(vote_counts.values('election_id', 'committee_id', 'candidate_id').annotate(**sums).order_by())
+        rows += [
+            dict(row, committee_id=None)
+            for row in vote_counts.values('election_id', 'candidate_id').annotate(**sums).order_by()
+        ]
+        tallies.delete()
+        created = VoteTally.objects.bulk_create([VoteTally(**row) for row in rows], batch_size=1000)
+    bump_tables(VoteTally)
+    return len(created)
+
+
+def candidate_tally(election_id: int, candidate_id: int) -> dict:
+    """Election totals of one candidate (zero before any votes)."""
+    row = (
+        VoteTally.objects.filter(election_id=election_id, committee__isnull=True, candidate_id=candidate_id)
+        .values('votes', 'verified_votes', 'updated_at')
+        .first()
+    )
+    return row or {'votes': 0, 'verified_votes': 0, 'updated_at': None}
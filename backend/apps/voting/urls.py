@@ -26,4 +26,5 @@ urlpatterns = [
     path('results/publish/', ElectionResultsViewSet.as_view({'post': 'publish'}), name='results-publish'),
     path('results/summary/', ElectionResultsViewSet.as_view({'get': 'summary'}), name='results-summary'),
     path('results/by-committee/', ElectionResultsViewSet.as_view({'get': 'by_committee'}), name='results-by-committee'),
+    path('results/live/', ElectionResultsViewSet.as_view({'get': 'live'}), name='results-live'),
 ]
@@ -14,8 +14,11 @@ from .models import (
     VoteCount,
     CommitteeVoteEntry,
     ElectionResults,
-    VoteCountAudit
+    VoteCountAudit,
+    VoteTally
 )
+from .bulk_entry import UnknownCandidates, submit_committee_votes
+from .results import results_by_committee, voting_progress
 from .serializers import (
     VoteCountSerializer,
     VoteCountCreateSerializer,
@@ -27,6 +30,7 @@ from .serializers import (
 )
 from apps.candidates.models import Candidate
 from apps.candidates.serializers import CandidateSerializer
+from apps.utils.conditional import request_etag, tables_version
 from apps.utils.permissions import IsAdminOrAbove, IsSupervisorOrAbove
 from apps.utils.viewsets import StandardResponseMixin
 
@@ -192,9 +196,10 @@ class VoteCountViewSet(StandardResponseMixin, viewsets.ModelViewSet):
         notes = serializer.validated_data.get('notes', '')
         
         # Get or create committee vote entry
-        from apps.elections.models import Committee, Election
-        committee = Committee.objects.get(id=committee_id)
-        election = Election.objects.first()  # Assuming single election
+        from apps.elections.models import Committee
+        from apps.utils.responses import APIResponse
+        committee = Committee.objects.select_related('election').get(id=committee_id)
+        election = committee.election
         
         entry, created = CommitteeVoteEntry.objects.get_or_create(
             election=election,
@@ -216,55 +221,25 @@ class VoteCountViewSet(StandardResponseMixin, viewsets.ModelViewSet):
             entry.notes = notes
             entry.save()
         
-        # Create or update vote counts
-        created_count = 0
-        updated_count = 0
-        
-        for vote_data in vote_counts_data:
-            candidate_id = vote_data['candidate_id']
-            vote_count_value = vote_data['vote_count']
-            
-            candidate = Candidate.objects.get(id=candidate_id)
-            
-            vote_count, created = VoteCount.objects.update_or_create(
-                election=election,
-                committee=committee,
-                candidate=candidate,
-                defaults={
-                    'vote_count': vote_count_value,
-                    'status': 'SUBMITTED',
-                    'entered_by': request.user,
-                }
+        # Create or update all vote counts in one batch
+        counts = {int(vote_data['candidate_id']): vote_data['vote_count'] for vote_data in vote_counts_data}
+        try:
+            written = submit_committee_votes(
+                entry, counts, request.user, ip_address=request.META.get('REMOTE_ADDR')
             )
-            
-            if created:
-                created_count += 1
-                # Log creation
-                VoteCountAudit.log_action(
-                    vote_count=vote_count,
-                    user=request.user,
-                    action='CREATED',
-                    new_value=vote_count_value,
-                    notes='Bulk entry',
-                    ip_address=request.META.get('REMOTE_ADDR')
-                )
-            else:
-                updated_count += 1
-                # Log update
-                VoteCountAudit.log_action(
-                    vote_count=vote_count,
-                    user=request.user,
-                    action='UPDATED',
-                    old_value=vote_count.vote_count,
-                    new_value=vote_count_value,
-                    notes='Bulk entry update',
-                    ip_address=request.META.get('REMOTE_ADDR')
-                )
+        except UnknownCandidates as e:
+            transaction.set_rollback(True)
+            return APIResponse.error(
+                message='Unknown candidates for this election',
+                errors={'vote_counts': e.candidate_ids},
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        created_count = written['created']
+        updated_count = written['updated']
         
         # Mark entry as completed
         entry.complete()
         
-        from apps.utils.responses import APIResponse
         return APIResponse.created(
             data={
                 'committee_entry_id': entry.id,
@@ -347,7 +322,7 @@ class CommitteeVoteEntryViewSet(StandardResponseMixin, viewsets.ModelViewSet):
         
         GET /api/voting/committee-entries/progress/
         """
-        from apps.elections.models import Committee, Election
+        from apps.elections.models import Election
         
         from apps.utils.responses import APIResponse
         election = Election.objects.first()  # Assuming single election
@@ -357,47 +332,7 @@ class CommitteeVoteEntryViewSet(StandardResponseMixin, viewsets.ModelViewSet):
                 status_code=status.HTTP_404_NOT_FOUND
             )
         
-        committees = Committee.objects.all()
-        total_committees = committees.count()
-        
-        entries = CommitteeVoteEntry.objects.filter(election=election)
-        
-        completed = entries.filter(status='COMPLETED').count()
-        verified = entries.filter(status='VERIFIED').count()
-        in_progress = entries.filter(status='IN_PROGRESS').count()
-        
-        progress_data = {
-            'total_committees': total_committees,
-            'entries_created': entries.count(),
-            'in_progress': in_progress,
-            'completed': completed,
-            'verified': verified,
-            'not_started': total_committees - entries.count(),
-            'completion_percentage': round((verified / total_committees * 100) if total_committees > 0 else 0, 1),
-        }
-        
-        # Committee details
-        committee_progress = []
-        for committee in committees:
-            entry = entries.filter(committee=committee).first()
-            if entry:
-                committee_progress.append({
-                    'committee_code': committee.code,
-                    'committee_name': committee.name,
-                    'status': entry.status,
-                    'completion_percentage': entry.completion_percentage,
-                    'verified': entry.status == 'VERIFIED',
-                })
-            else:
-                committee_progress.append({
-                    'committee_code': committee.code,
-                    'committee_name': committee.name,
-                    'status': 'NOT_STARTED',
-                    'completion_percentage': 0,
-                    'verified': False,
-                })
-        
-        progress_data['committees'] = committee_progress
+        progress_data = voting_progress(election.id)
         
         return APIResponse.success(data=progress_data)
 
@@ -412,10 +347,14 @@ class ElectionResultsViewSet(viewsets.ViewSet):
     - POST   /api/voting/results/publish/        - Publish results (admin)
     - GET    /api/voting/results/summary/        - Get results summary
     - GET    /api/voting/results/by-committee/   - Results by committee
+    - GET    /api/voting/results/live/           - Running totals while counting
     """
     
     permission_classes = [IsAuthenticated]
     
+    # Tables the live results read (conditional GET)
+    LIVE_RESULTS_MODELS = (VoteCount, VoteTally, Candidate, 'candidates.Party')
+    
     @action(detail=False, methods=['get'])
     def current(self, request):
         """
@@ -597,7 +536,7 @@ class ElectionResultsViewSet(viewsets.ViewSet):
         
         GET /api/voting/results/by-committee/
         """
-        from apps.elections.models import Election, Committee
+        from apps.elections.models import Election
         
         from apps.utils.responses import APIResponse
         election = Election.objects.first()
@@ -607,43 +546,94 @@ class ElectionResultsViewSet(viewsets.ViewSet):
                 status_code=status.HTTP_404_NOT_FOUND
             )
         
-        committees = Committee.objects.all()
-        committee_results = []
-        
-        for committee in committees:
-            vote_counts = VoteCount.objects.filter(
-                election=election,
-                committee=committee,
-                is_verified=True
-            ).select_related('candidate')
-            
-            candidate_votes = []
-            for vc in vote_counts:
-                candidate_votes.append({
-                    'candidate_number': vc.candidate.candidate_number,
-                    'candidate_name': vc.candidate.name,
-                    'vote_count': vc.vote_count,
-                })
-            
-            # Sort by votes descending
-            candidate_votes.sort(key=lambda x: x['vote_count'], reverse=True)
-            
-            entry = CommitteeVoteEntry.objects.filter(
-                election=election,
-                committee=committee
-            ).first()
-            
-            committee_results.append({
-                'committee_code': committee.code,
-                'committee_name': committee.name,
-                'total_ballots': entry.total_ballots_cast if entry else 0,
-                'valid_ballots': entry.valid_ballots if entry else 0,
-                'invalid_ballots': entry.invalid_ballots if entry else 0,
-                'candidate_votes': candidate_votes,
-                'status': entry.status if entry else 'NOT_STARTED',
-            })
+        committee_results = results_by_committee(election.id)
         
         return APIResponse.success(data=committee_results)
+    
+    @action(detail=False, methods=['get'])
+    def live(self, request):
+        """
+        Running candidate totals from the vote tally, available while
+        committees are still submitting (no generate step).
+        
+        GET /api/voting/results/live/?election=<id>&committee=<id>
+        
+        ``votes`` counts every entered vote count that is not rejected,
+        ``verified_votes`` only verified ones. ``committee`` limits the
+        totals to one committee.
+        """
+        from apps.elections.models import Election
+        
+        from apps.utils.responses import APIResponse
+        etag = request_etag(request, tables_version(self.LIVE_RESULTS_MODELS))
+        cached = APIResponse.not_modified(request, etag)
+        if cached is not None:
+            return cached
+        
+        try:
+            election_id, committee_id = (
+                int(value) if value else None
+                for value in (request.query_params.get('election'), request.query_params.get('committee'))
+            )
+        except ValueError:
+            return APIResponse.error(
+                message='election and committee must be ids',
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        if election_id is None:
+            election_id = Election.objects.order_by('id').values_list('id', flat=True).first()
+            if election_id is None:
+                return APIResponse.error(
+                    message='No election found',
+                    status_code=status.HTTP_404_NOT_FOUND
+                )
+        
+        tallies = VoteTally.objects.filter(election_id=election_id)
+        if committee_id is not None:
+            tallies = tallies.filter(committee_id=committee_id)
+        else:
+            tallies = tallies.filter(committee__isnull=True)
+        totals = {
+            row['candidate_id']: row
+            for row in tallies.values('candidate_id', 'votes', 'verified_votes', 'updated_at')
+        }
+        
+        total_votes = sum(row['votes'] for row in totals.values())
+        total_verified = sum(row['verified_votes'] for row in totals.values())
+        candidates = []
+        for candidate in Candidate.objects.filter(
+            election_id=election_id,
+            is_active=True
+        ).select_related('party').order_by('candidate_number'):
+            row = totals.get(candidate.id, {})
+            votes = row.get('votes', 0)
+            verified_votes = row.get('verified_votes', 0)
+            candidates.append({
+                'candidate_id': candidate.id,
+                'candidate_number': candidate.candidate_number,
+                'candidate_name': candidate.name,
+                'party': candidate.party.name if candidate.party else 'Independent',
+                'votes': votes,
+                'verified_votes': verified_votes,
+                'vote_percentage': round(votes / total_votes * 100, 2) if total_votes else 0.0,
+            })
+        
+        candidates.sort(key=lambda x: x['votes'], reverse=True)
+        for idx, result in enumerate(candidates, 1):
+            result['rank'] = idx
+        
+        as_of = max((row['updated_at'] for row in totals.values()), default=None)
+        return APIResponse.success(
+            data={
+                'election_id': election_id,
+                'committee_id': committee_id,
+                'candidates': candidates,
+                'total_votes': total_votes,
+                'total_verified_votes': total_verified,
+                'as_of': as_of,
+            },
+            etag=etag
+        )
 
 
 # Simple list view
@@ -16,6 +16,16 @@ django_asgi_app = get_asgi_application()
 
 # Import routing after Django is initialized
 from core.routing import websocket_urlpatterns
+from apps.elections.precompute import start_precompute_worker
+from apps.electors.jobs import start_import_recovery_worker
+from apps.reports.snapshots import start_snapshot_scheduler
+
+# Dashboard precompute worker (apps.elections.precompute), analytics
+# snapshot scheduler (apps.reports.snapshots) and import job recovery
+# (apps.electors.jobs)
+start_precompute_worker()
+start_snapshot_scheduler()
+start_import_recovery_worker()
 
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
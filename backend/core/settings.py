@@ -151,7 +151,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'apps.utils.pagination.StandardPagination',
     'PAGE_SIZE': 50,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -285,28 +285,33 @@ else:
     }
 
 # Caching
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+# Cache namespaces, table versions (ETags) and the elector name index
+# invalidate across worker processes only through a shared cache: use
+# CACHE_BACKEND=redis whenever more than one process serves requests
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': config('CACHE_REDIS_URL', default=REDIS_URL),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+        }
     }
-}
 
-# Attendance Statistics Cache Duration (in minutes)
-# Statistics are cached to reduce database load
-# Default: 5 minutes (can be overridden via environment variable)
+# Attendance statistics are maintained incrementally on every mark; this is
+# the interval (in minutes) of the drift reconciliation job
+# (python manage.py reconcile_attendance_statistics --loop)
 ATTENDANCE_STATISTICS_CACHE_MINUTES = config('ATTENDANCE_STATISTICS_CACHE_MINUTES', default=5, cast=int)
 
-# For production with Redis, use:
-# CACHES = {
-#     'default': {
-#         'BACKEND': 'django_redis.cache.RedisCache',
-#         'LOCATION': REDIS_URL,
-#         'OPTIONS': {
-#             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
-#         }
-#     }
-# }
+# Attendance time-series rollup keeps minute buckets this many hours, then
+# compacts them into hour buckets (python manage.py attendance_rollup --compact)
+ATTENDANCE_ROLLUP_MINUTE_HOURS = config('ATTENDANCE_ROLLUP_MINUTE_HOURS', default=48, cast=int)
 
 # Celery Configuration
 CELERY_BROKER_URL = REDIS_URL
@@ -315,6 +320,43 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'precompute-dashboards': {
+        'task': 'elections.precompute_dashboards',
+        'schedule': config('DASHBOARD_PRECOMPUTE_TICK_SECONDS', default=5, cast=int),
+    },
+    'analytics-snapshots': {
+        'task': 'reports.capture_analytics_snapshots',
+        'schedule': config('ANALYTICS_SNAPSHOT_TICK_SECONDS', default=60, cast=int),
+    },
+}
+
+# Precomputed election dashboards (apps.elections.precompute). Runner:
+# 'thread' (worker thread in each web process), 'external' (run by
+# `python manage.py precompute_dashboards --loop` or Celery beat) or 'off'
+DASHBOARD_PRECOMPUTE_RUNNER = config('DASHBOARD_PRECOMPUTE_RUNNER', default='thread')
+# Seconds between checks for written-to elections
+DASHBOARD_PRECOMPUTE_TICK_SECONDS = config('DASHBOARD_PRECOMPUTE_TICK_SECONDS', default=5, cast=int)
+# Open elections are rebuilt at least this often (time-relative figures)
+DASHBOARD_PRECOMPUTE_INTERVAL_SECONDS = config('DASHBOARD_PRECOMPUTE_INTERVAL_SECONDS', default=300, cast=int)
+
+# Scheduled analytics snapshots (apps.reports.snapshots): hourly, daily and
+# weekly. Runner: 'thread', 'external' (`python manage.py analytics_snapshots
+# --loop` or Celery beat) or 'off'
+ANALYTICS_SNAPSHOT_RUNNER = config('ANALYTICS_SNAPSHOT_RUNNER', default='thread')
+ANALYTICS_SNAPSHOT_TICK_SECONDS = config('ANALYTICS_SNAPSHOT_TICK_SECONDS', default=60, cast=int)
+# Hourly snapshots older than this many days are downsampled into daily ones
+ANALYTICS_HOURLY_RETENTION_DAYS = config('ANALYTICS_HOURLY_RETENTION_DAYS', default=7, cast=int)
+
+# In-process background tasks (elector imports, ...): 'thread' or 'sync'
+BACKGROUND_TASK_RUNNER = config('BACKGROUND_TASK_RUNNER', default='thread')
+BACKGROUND_TASK_WORKERS = config('BACKGROUND_TASK_WORKERS', default=2, cast=int)
+# Seconds between checks for import jobs orphaned by a restart (apps.electors.jobs)
+ELECTOR_IMPORT_RECOVERY_TICK_SECONDS = config('ELECTOR_IMPORT_RECOVERY_TICK_SECONDS', default=60, cast=int)
+
+# Memory-mapped elector snapshot for attendance lookups (empty = disabled).
+# Build it with: python manage.py build_elector_snapshot
+ELECTOR_SNAPSHOT_PATH = config('ELECTOR_SNAPSHOT_PATH', default='')
 
 # Logging
 LOGGING = {
@@ -9,3 +9,14 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_wsgi_application()
+
+# Dashboard precompute worker (apps.elections.precompute), analytics
+# snapshot scheduler (apps.reports.snapshots) and import job recovery
+# (apps.electors.jobs)
+from apps.elections.precompute import start_precompute_worker  # noqa: E402
+from apps.electors.jobs import start_import_recovery_worker  # noqa: E402
+from apps.reports.snapshots import start_snapshot_scheduler  # noqa: E402
+
+start_precompute_worker()
+start_snapshot_scheduler()
+start_import_recovery_worker()
@@ -122,3 +122,29 @@ def party_factory(election):
     
     return _create
 
+
+
+@pytest.fixture(autouse=True)
+def reset_elector_name_index():
+    """
+    The elector name index lives in process memory and outlives the
+    per-test transaction rollback, so start every test from an empty copy.
+    """
+    from apps.electors.search_index import name_index
+
+    name_index.clear()
+    yield
+    name_index.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Cached dashboard and report payloads outlive the per-test transaction
+    rollback, so start every test from an empty cache.
+    """
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
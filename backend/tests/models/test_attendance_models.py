@@ -206,3 +206,107 @@ def test_attendance_statistics_update_optimized(committee, admin_user, elector_f
     assert len(stats.hourly_breakdown) > 0
 
 
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_attendance_statistics_counted_incrementally(committee, admin_user, elector_factory):
+    """Marking and removing attendance adjusts an existing statistics row in place."""
+    from apps.attendees.counters import hour_bucket
+
+    electors = [elector_factory(committee=committee) for _ in range(3)]
+    stats = AttendanceStatistics.objects.create(committee=committee)
+    stats.update_statistics()
+
+    first = Attendance.objects.create(elector=electors[0], committee=committee, marked_by=admin_user)
+    Attendance.objects.create(elector=electors[1], committee=committee, marked_by=admin_user)
+    stats.refresh_from_db()
+    hour = hour_bucket(first.attended_at)
+    assert stats.total_attended == 2
+    assert stats.hourly_breakdown[hour] == 2
+
+    first.delete()
+    stats.refresh_from_db()
+    assert stats.total_attended == 1
+    assert stats.hourly_breakdown[hour] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_unloaded_attendance_save_applies_delta(committee, admin_user, elector_factory):
+    """Saving a record that was not loaded first applies its difference without a recount."""
+    electors = [elector_factory(committee=committee) for _ in range(2)]
+    stats = AttendanceStatistics.objects.create(committee=committee)
+    stats.update_statistics()
+    record = Attendance.objects.create(elector=electors[0], committee=committee, marked_by=admin_user)
+    Attendance.objects.create(elector=electors[1], committee=committee, marked_by=admin_user)
+
+    unloaded = Attendance.objects.only('id').get(pk=record.pk)
+    unloaded.status = Attendance.Status.PENDING
+    unloaded.save(update_fields=['status'])
+
+    stats.refresh_from_db()
+    assert stats.total_attended == 1
+    assert sum(stats.hourly_breakdown.values()) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_reconcile_statistics_corrects_drift(committee, admin_user, elector_factory):
+    """reconcile_statistics recounts rows that drifted from the attendance table."""
+    from apps.attendees.counters import reconcile_statistics
+
+    electors = [elector_factory(committee=committee) for _ in range(2)]
+    stats = AttendanceStatistics.objects.create(committee=committee)
+    stats.update_statistics()
+    Attendance.objects.create(elector=electors[0], committee=committee, marked_by=admin_user)
+
+    AttendanceStatistics.objects.filter(pk=committee.pk).update(total_attended=7, hourly_breakdown={})
+    assert reconcile_statistics() == 1
+    stats.refresh_from_db()
+    assert stats.total_electors == 2
+    assert stats.total_attended == 1
+    assert sum(stats.hourly_breakdown.values()) == 1
+
+    assert reconcile_statistics([committee.pk]) == 0
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_attendance_rollup_buckets(committee, admin_user, elector_factory):
+    """Marks land in minute buckets that compact into hour buckets."""
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from apps.attendees.models import AttendanceRollup
+    from apps.attendees.rollup import compact_rollup, minute_bucket
+
+    marked_at = timezone.localtime().replace(hour=9, minute=14, second=5) - timedelta(days=3)
+    records = [
+        Attendance.objects.create(
+            elector=elector_factory(committee=committee),
+            committee=committee,
+            marked_by=admin_user,
+            attended_at=marked_at + timedelta(minutes=offset),
+        )
+        for offset in (0, 0, 20)
+    ]
+    minutes = AttendanceRollup.objects.filter(resolution=AttendanceRollup.Resolution.MINUTE)
+    assert dict(minutes.values_list('bucket_start', 'attended')) == {
+        minute_bucket(marked_at): 2,
+        minute_bucket(marked_at + timedelta(minutes=20)): 1,
+    }
+    assert minutes.first().election_id == committee.election_id
+
+    records[0].delete()
+    assert compact_rollup() == 2
+    hour = AttendanceRollup.objects.get()
+    assert hour.resolution == AttendanceRollup.Resolution.HOUR
+    assert timezone.localtime(hour.bucket_start).hour == 9
+    assert hour.attended == 2
+
+    # Removing a mark from a compacted minute takes it off the hour
+    records[1].delete()
+    hour.refresh_from_db()
+    assert hour.attended == 1
@@ -206,3 +206,54 @@ class TestCommittee:
         assert committee1.code == committee2.code == 'C001'
         assert committee1.election != committee2.election
 
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestCommitteeMetrics:
+    """Batch committee metrics match the per-committee properties."""
+    
+    def test_metrics_match_properties(self, election, committee, committee_factory, elector_factory, admin_user,
+                                      django_assert_num_queries):
+        from apps.attendees.models import Attendance
+        from apps.elections.utils.committee_metrics import attach_committee_metrics, get_committee_metrics
+        from apps.guarantees.models import Guarantee
+        
+        committees = [committee, committee_factory(), committee_factory()]
+        for index, committee in enumerate(committees):
+            electors = [elector_factory(committee=committee) for _ in range(index + 2)]
+            for elector in electors[:index + 1]:
+                Guarantee.objects.create(user=admin_user, elector=elector, mobile='12345678')
+            for elector in electors[index:]:
+                Attendance.objects.create(elector=elector, committee=committee, marked_by=admin_user)
+        
+        expected = {
+            committee.id: (
+                committee.elector_count,
+                committee.attendance_count,
+                committee.guarantee_count,
+                committee.guarantee_attendance_count,
+                committee.vote_count,
+            )
+            for committee in committees
+        }
+        
+        with django_assert_num_queries(6):
+            metrics = get_committee_metrics(election_id=election.id)
+        assert {
+            committee_id: (
+                entry['elector_count'],
+                entry['attendance_count'],
+                entry['guarantee_count'],
+                entry['guarantee_attendance_count'],
+                entry['vote_count'],
+            )
+            for committee_id, entry in metrics.items()
+        } == expected
+        
+        with django_assert_num_queries(6):
+            loaded = attach_committee_metrics(Committee.objects.filter(election=election))
+            assert [committee.elector_count for committee in loaded] == [
+                expected[committee.id][0] for committee in loaded
+            ]
+            assert loaded[0].attendance_percentage == metrics[loaded[0].id]['attendance_percentage']
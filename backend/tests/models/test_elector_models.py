@@ -4,7 +4,8 @@ Unit tests for Elector models.
 import pytest
 from django.core.exceptions import ValidationError
 
-from apps.electors.models import Elector
+from apps.electors.kinship import rebuild_relations, refresh_relations
+from apps.electors.models import Elector, ElectorRelation
 
 
 @pytest.mark.unit
@@ -195,3 +196,298 @@ class TestElector:
         assert elector.team == ''
         assert elector.mobile == ''
 
+    
+    def test_elector_search_keys_on_save(self, committee):
+        """Test normalized/phonetic search keys are derived on save."""
+        elector = Elector.objects.create(
+            koc_id='12345',
+            name_first='أحمد',
+            sub_family_name='الصالح',
+            family_name='فاطمة',
+            gender='MALE',
+            committee=committee
+        )
+        
+        assert elector.normalized_first == 'احمد'
+        assert elector.normalized_family == 'فاطمه'
+        assert elector.normalized_name == 'احمد الصالح فاطمه'
+        assert elector.phonetic_first == Elector.parse_full_name('إحمد')['phonetic_first']
+        
+        elector.name_first = 'مُصطفى'
+        elector.save(update_fields=['name_first'])
+        elector.refresh_from_db()
+        assert elector.normalized_first == 'مصطفي'
+    
+    def test_parse_full_name_includes_search_keys(self):
+        """Test parse_full_name returns normalized keys with the name parts."""
+        parts = Elector.parse_full_name('محمد علي ابراهيم')
+        
+        assert parts['name_first'] == 'محمد'
+        assert parts['family_name'] == 'ابراهيم'
+        assert parts['normalized_name'] == 'محمد علي ابراهيم'
+        assert parts['phonetic_family'] == Elector.parse_full_name('إبراهيم')['phonetic_first']
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestElectorRelation:
+    """Test the materialized kinship graph."""
+    
+    @pytest.fixture
+    def family(self, elector_factory):
+        """Father, two brothers and a cousin of the Saleh family."""
+        return {
+            'father': elector_factory(
+                koc_id='10001', name_first='Ali', name_second='Hassan',
+                name_third='Omar', name_fourth='', family_name='Saleh'
+            ),
+            'brother_a': elector_factory(
+                koc_id='10002', name_first='Ahmad', name_second='Ali',
+                name_third='Hassan', name_fourth='', family_name='Saleh'
+            ),
+            'brother_b': elector_factory(
+                koc_id='10003', name_first='Badr', name_second='Ali',
+                name_third='Hassan', name_fourth='', family_name='Saleh'
+            ),
+            'stranger': elector_factory(
+                koc_id='10004', name_first='Ahmad', name_second='Khalid',
+                name_third='Nasser', name_fourth='', family_name='Mutairi'
+            ),
+        }
+    
+    @staticmethod
+    def _edges(koc_id):
+        return set(
+            ElectorRelation.objects.filter(elector_id=koc_id)
+            .values_list('relative_id', 'relationship')
+        )
+    
+    def test_rebuild_relations(self, family):
+        """Test the bulk rebuild infers brothers, fathers and sons."""
+        rebuild_relations()
+        
+        assert self._edges('10002') == {
+            ('10003', ElectorRelation.BROTHER),
+            ('10001', ElectorRelation.FATHER),
+        }
+        assert self._edges('10001') == {
+            ('10002', ElectorRelation.SON),
+            ('10003', ElectorRelation.SON),
+        }
+        assert self._edges('10004') == set()
+    
+    def test_refresh_relations_updates_neighbours(self, family):
+        """Test an incremental refresh rewires both sides of changed edges."""
+        rebuild_relations()
+        stranger = family['stranger']
+        stranger.name_second = 'Ali'
+        stranger.name_third = 'Hassan'
+        stranger.family_name = 'Saleh'
+        stranger.save()
+        
+        refresh_relations(['10004'])
+        
+        assert ('10004', ElectorRelation.BROTHER) in self._edges('10002')
+        assert ('10004', ElectorRelation.SON) in self._edges('10001')
+        assert ('10001', ElectorRelation.FATHER) in self._edges('10004')
+    
+    def test_name_change_refreshes_on_commit(
+        self, family, django_capture_on_commit_callbacks
+    ):
+        """Test saving a name change refreshes kinship edges after commit."""
+        brother = family['brother_b']
+        with django_capture_on_commit_callbacks(execute=True):
+            brother.name_second = 'Yousef'
+            brother.save()
+        
+        assert ('10003', ElectorRelation.BROTHER) not in self._edges('10002')
+        assert self._edges('10003') == set()
+    
+    def test_deferred_name_parts_are_not_loaded(self, family, django_assert_num_queries):
+        """Test loading electors without their name fields does not fetch them."""
+        with django_assert_num_queries(1):
+            electors = list(Elector.objects.only('koc_id'))
+            assert not any(elector.name_parts_changed() for elector in electors)
+        
+        elector = Elector.objects.only('koc_id').get(koc_id='10003')
+        elector.name_second = 'Yousef'
+        assert elector.name_parts_changed()
+    
+    def test_rebuild_matches_incremental(self, family):
+        """Test bulk and incremental paths agree on the same data."""
+        refresh_relations(e.koc_id for e in family.values())
+        incremental = set(ElectorRelation.objects.values_list('elector_id', 'relative_id', 'relationship'))
+        
+        rebuild_relations()
+        rebuilt = set(ElectorRelation.objects.values_list('elector_id', 'relative_id', 'relationship'))
+        
+        assert incremental == rebuilt
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestElectorSync:
+    """Test change-hash based roster sync."""
+    
+    def test_content_hash_tracks_roster_columns(self, elector_factory):
+        """Test the content hash changes with roster columns only."""
+        elector = elector_factory(koc_id='30001', mobile='111')
+        original = elector.content_hash
+        assert original == elector.compute_content_hash()
+        
+        elector.is_approved = not elector.is_approved
+        elector.save(update_fields=['is_approved'])
+        assert elector.content_hash == original
+        
+        elector.mobile = '222'
+        elector.save(update_fields=['mobile'])
+        elector.refresh_from_db()
+        assert elector.content_hash != original
+    
+    def test_unchanged_rows_are_not_written(self, elector_factory):
+        """Test rows matching the stored hash are left untouched."""
+        from apps.electors.sync import ElectorSync
+        
+        elector = elector_factory(koc_id='30001', mobile='111')
+        updated_at = elector.updated_at
+        
+        stats = ElectorSync().run([
+            {'koc_id': '30001', 'mobile': '111'},
+            {'koc_id': '30002', 'name_first': 'Ali', 'family_name': 'Saleh',
+             'gender': 'MALE', 'committee': elector.committee},
+        ])
+        
+        assert stats['unchanged'] == 1
+        assert stats['inserted'] == 1
+        elector.refresh_from_db()
+        assert elector.updated_at == updated_at
+        new_elector = Elector.objects.get(koc_id='30002')
+        assert new_elector.content_hash == new_elector.compute_content_hash()
+        assert new_elector.normalized_family == 'saleh'
+    
+    def test_insert_lost_to_concurrent_writer_not_counted(self, elector_factory, committee, monkeypatch):
+        """Test a row inserted concurrently is diffed against the winner, not counted as inserted."""
+        from apps.electors.sync import CHANGED, INSERTED, ElectorSync
+        
+        bulk_create = Elector.objects.bulk_create
+        
+        def racing_bulk_create(objs, **kwargs):
+            # The concurrent import commits 30001 between our read and our insert
+            elector_factory(koc_id='30001', mobile='111')
+            return bulk_create(objs, **kwargs)
+        
+        monkeypatch.setattr(Elector.objects, 'bulk_create', racing_bulk_create)
+        sync = ElectorSync()
+        outcomes = sync.sync_chunk({
+            '30001': {'mobile': '999', 'committee': committee},
+            '30002': {'name_first': 'Ali', 'family_name': 'Saleh', 'gender': 'MALE', 'committee': committee},
+        })
+        
+        assert outcomes == {'30001': CHANGED, '30002': INSERTED}
+        assert (sync.stats['inserted'], sync.stats['changed']) == (1, 1)
+        assert Elector.objects.get(koc_id='30001').mobile == '999'
+        assert sync.tracker.changed_ids == {'30001', '30002'}
+    
+    def test_update_command_reports_diff(self, elector_factory, tmp_path):
+        """Test update_electors_from_csv writes changed rows and deactivates missing ones."""
+        from io import StringIO
+        from django.core.management import call_command
+        
+        elector_factory(koc_id='30001', mobile='111')
+        elector_factory(koc_id='30002', mobile='222')
+        elector_factory(koc_id='30003', mobile='333')
+        csv_file = tmp_path / 'roster.csv'
+        csv_file.write_text(
+            'KOC,Mobile\n'
+            '30001,111\n'
+            '30002,999\n'
+            '39999,555\n',
+            encoding='utf-8'
+        )
+        
+        out = StringIO()
+        call_command(
+            'update_electors_from_csv', file=str(csv_file), deactivate_missing=True, stdout=out
+        )
+        
+        output = out.getvalue()
+        assert 'Records changed: 1' in output
+        assert 'Records unchanged: 1' in output
+        assert 'Records not found in DB: 1' in output
+        assert 'Records deactivated: 1' in output
+        assert Elector.objects.get(koc_id='30002').mobile == '999'
+        assert Elector.objects.get(koc_id='30003').is_active is False
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestElectorSnapshot:
+    """Test the memory-mapped elector snapshot."""
+    
+    @pytest.fixture
+    def snapshot_path(self, settings, tmp_path):
+        from apps.electors.snapshot import elector_snapshot
+        
+        settings.ELECTOR_SNAPSHOT_PATH = str(tmp_path / 'electors.snap')
+        settings.BACKGROUND_TASK_RUNNER = 'sync'
+        elector_snapshot.reset()
+        yield settings.ELECTOR_SNAPSHOT_PATH
+        elector_snapshot.reset()
+    
+    def test_build_and_lookup(self, snapshot_path, elector_factory, django_assert_num_queries):
+        """Test every active elector is found without a query, others are not."""
+        from apps.electors.snapshot import build_snapshot, elector_snapshot
+        
+        electors = [elector_factory(koc_id=f'4{i:04d}') for i in range(50)]
+        elector_factory(koc_id='49999', is_active=False)
+        
+        assert build_snapshot() == 50
+        
+        with django_assert_num_queries(0):
+            for elector in electors:
+                entry = elector_snapshot.get(elector.koc_id)
+                assert entry.full_name == elector.full_name
+                assert entry.committee_id == elector.committee_id
+                assert entry.committee.code == elector.committee.code
+                assert entry.gender == elector.gender
+                assert entry.location == elector.committee.location
+            assert elector_snapshot.get('49999') is None
+            assert elector_snapshot.get('missing') is None
+    
+    def test_old_format_rebuilt(self, snapshot_path, elector_factory):
+        """Test a file of an older format is replaced instead of read."""
+        from apps.electors.snapshot import build_snapshot, elector_snapshot
+        
+        elector = elector_factory(koc_id='42000')
+        build_snapshot()
+        with open(snapshot_path, 'r+b') as handle:
+            handle.write(b'ELSNAP01')
+        
+        assert elector_snapshot.get('42000') is None  # rebuilt in the background
+        assert elector_snapshot.get('42000').committee.code == elector.committee.code
+    
+    def test_disabled_without_path(self, settings, elector_factory):
+        """Test lookups return None when no snapshot is configured."""
+        from apps.electors.snapshot import elector_snapshot
+        
+        settings.ELECTOR_SNAPSHOT_PATH = ''
+        elector = elector_factory()
+        assert elector_snapshot.get(elector.koc_id) is None
+    
+    def test_rebuilt_after_commit(self, snapshot_path, elector_factory, django_capture_on_commit_callbacks):
+        """Test elector changes rebuild the snapshot once per transaction."""
+        from apps.electors.snapshot import elector_snapshot
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            elector = elector_factory(koc_id='41000', name_first='Ali')
+        assert elector_snapshot.get('41000').name_first == 'Ali'
+        
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            elector.name_first = 'Omar'
+            elector.save()
+            elector_factory(koc_id='41001')
+        
+        rebuilds = [c for c in callbacks if getattr(c, '__name__', '') == '_rebuild_after_commit']
+        assert len(rebuilds) == 1
+        assert elector_snapshot.get('41000').name_first == 'Omar'
+        assert elector_snapshot.get('41001') is not None
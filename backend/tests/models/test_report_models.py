@@ -1,12 +1,13 @@
 """
 Model coverage for reporting/analytics domain.
 """
-from datetime import timedelta, date
+from datetime import datetime, timedelta
 
 import pytest
 from django.utils import timezone
 
 from apps.reports.models import ReportTemplate, GeneratedReport, AnalyticsSnapshot
+from apps.reports.snapshots import capture_due, downsample_hourly, period_start
 from apps.attendees.models import Attendance
 from apps.guarantees.models import Guarantee
 
@@ -93,7 +94,7 @@ def test_analytics_snapshot_create_snapshot(user, committee, elector_factory):
     snapshot = AnalyticsSnapshot.create_snapshot(snapshot_type='DAILY')
 
     assert snapshot.snapshot_type == 'DAILY'
-    assert snapshot.snapshot_date == date.today()
+    assert snapshot.snapshot_date == timezone.localdate()
     metrics = snapshot.metrics
     assert metrics['total_users'] >= 1
     assert metrics['total_electors'] == 2
@@ -101,3 +102,50 @@ def test_analytics_snapshot_create_snapshot(user, committee, elector_factory):
     assert metrics['total_attendance'] == 1
     assert metrics['elector_coverage'] == 50.0
 
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_capture_due_takes_each_period_once(django_assert_max_num_queries):
+    """capture_due snapshots the current hour, day and week once."""
+    now = timezone.make_aware(datetime(2026, 10, 14, 10, 30))
+
+    assert sorted(capture_due(now)) == ['DAILY', 'HOURLY', 'WEEKLY']
+    with django_assert_max_num_queries(1):
+        assert capture_due(now + timedelta(minutes=20)) == []
+    assert capture_due(now + timedelta(hours=1)) == ['HOURLY']
+
+    weekly = AnalyticsSnapshot.objects.get(snapshot_type='WEEKLY')
+    assert weekly.period_start == timezone.make_aware(datetime(2026, 10, 12))
+    assert AnalyticsSnapshot.objects.filter(snapshot_type='HOURLY').count() == 2
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_downsample_hourly_keeps_last_snapshot_of_day(settings):
+    """Hourly snapshots past the retention fold into one daily snapshot per day."""
+    settings.ANALYTICS_HOURLY_RETENTION_DAYS = 7
+    now = timezone.make_aware(datetime(2026, 10, 14, 10, 30))
+    old = now - timedelta(days=10)
+    for hour, guarantees in ((8, 10), (9, 20), (22, 30)):
+        moment = old.replace(hour=hour)
+        AnalyticsSnapshot.objects.create(
+            snapshot_type='HOURLY',
+            snapshot_date=moment.date(),
+            period_start=period_start('HOURLY', moment),
+            metrics={'total_guarantees': guarantees},
+        )
+    recent = now - timedelta(days=1)
+    AnalyticsSnapshot.objects.create(
+        snapshot_type='HOURLY',
+        snapshot_date=recent.date(),
+        period_start=period_start('HOURLY', recent),
+        metrics={'total_guarantees': 40},
+    )
+
+    assert downsample_hourly(now) == 3
+
+    daily = AnalyticsSnapshot.objects.get(snapshot_type='DAILY')
+    assert daily.snapshot_date == old.date()
+    assert daily.metrics == {'total_guarantees': 30}
+    assert AnalyticsSnapshot.objects.filter(snapshot_type='HOURLY').count() == 1
+    assert downsample_hourly(now) == 0
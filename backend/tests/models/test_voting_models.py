@@ -4,7 +4,8 @@ Model tests for voting-related aggregates.
 import pytest
 from django.core.exceptions import ValidationError
 
-from apps.voting.models import VoteCount, CommitteeVoteEntry, ElectionResults
+from apps.voting.models import VoteCount, CommitteeVoteEntry, ElectionResults, VoteTally
+from apps.voting.tally import rebuild_tallies
 from apps.candidates.models import Candidate
 from apps.attendees.models import Attendance
 
@@ -200,3 +201,124 @@ def test_election_results_generate_results(admin_user, election, committee, cand
     assert results.results_data['summary']['total_candidates'] == 2
     assert results.results_data['candidates'][0]['candidate_name'] == 'Alice'
 
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_election_results_committee_breakdown_in_constant_queries(
+    admin_user, election, committee, committee_factory, candidate_factory, elector_factory,
+    django_assert_max_num_queries,
+):
+    """Results are scoped to the election and do not query per candidate or committee."""
+    from tests.factories import ElectionFactory
+
+    other_election = ElectionFactory(created_by=admin_user)
+    other_committee = committee_factory(election=other_election)
+    Attendance.objects.create(
+        elector=elector_factory(committee=other_committee), committee=other_committee, marked_by=admin_user
+    )
+
+    committees = [committee, committee_factory()]
+    candidates = [candidate_factory(number) for number in range(1, 6)]
+    for index, current in enumerate(committees):
+        Attendance.objects.create(elector=elector_factory(committee=current), committee=current, marked_by=admin_user)
+        CommitteeVoteEntry.objects.create(
+            election=election, committee=current, status='VERIFIED',
+            total_ballots_cast=20, valid_ballots=18, invalid_ballots=2, entered_by=admin_user,
+        )
+        for candidate in candidates:
+            VoteCount.objects.create(
+                election=election, committee=current, candidate=candidate,
+                vote_count=candidate.candidate_number + index, status='VERIFIED', is_verified=True,
+            )
+
+    results = ElectionResults.objects.create(election=election, generated_by=admin_user)
+    with django_assert_max_num_queries(8):
+        results.generate_results()
+
+    assert results.total_registered_electors == 2
+    assert results.total_attendance == 2
+    assert results.total_valid_ballots == 36
+    top = results.results_data['candidates'][0]
+    assert (top['candidate_number'], top['total_votes'], top['rank']) == (5, 11, 1)
+    breakdown = {row['committee_id']: row for row in results.results_data['committees']}
+    assert breakdown[committees[1].id]['candidates']['5'] == 6
+    assert breakdown[committees[1].id]['total_votes'] == sum(number + 1 for number in range(1, 6))
+    assert breakdown[committees[0].id]['valid_ballots'] == 18
+
+
+def _tallies(election):
+    return {
+        (row.committee_id, row.candidate_id): (row.votes, row.verified_votes)
+        for row in VoteTally.objects.filter(election=election)
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_vote_tally_follows_vote_count_writes(admin_user, election, committee, committee_factory, candidate_factory):
+    """Saving, verifying, rejecting and deleting vote counts keep the tallies current."""
+    other_committee = committee_factory()
+    candidate = candidate_factory(1, 'Alice')
+    first = VoteCount.objects.create(election=election, committee=committee, candidate=candidate, vote_count=10)
+    second = VoteCount.objects.create(election=election, committee=other_committee, candidate=candidate, vote_count=5)
+    assert _tallies(election) == {
+        (committee.id, candidate.id): (10, 0),
+        (other_committee.id, candidate.id): (5, 0),
+        (None, candidate.id): (15, 0),
+    }
+
+    VoteCount.objects.get(pk=first.pk).verify(admin_user)
+    loaded = VoteCount.objects.get(pk=second.pk)
+    loaded.vote_count = 7
+    loaded.save()
+    assert _tallies(election)[(None, candidate.id)] == (17, 10)
+    assert candidate.total_votes == 10
+
+    loaded.status = 'REJECTED'
+    loaded.save()
+    assert _tallies(election)[(None, candidate.id)] == (10, 10)
+
+    VoteCount.objects.get(pk=first.pk).delete()
+    assert _tallies(election)[(None, candidate.id)] == (0, 0)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_rebuild_tallies_matches_incremental_tallies(
+    admin_user, election, committee, candidate_factory, django_capture_on_commit_callbacks
+):
+    """Rebuilding from the vote counts gives the incrementally maintained rows."""
+    alice, bob = candidate_factory(1, 'Alice'), candidate_factory(2, 'Bob')
+    VoteCount.objects.create(election=election, committee=committee, candidate=alice, vote_count=30)
+    VoteCount.objects.create(election=election, committee=committee, candidate=bob, vote_count=10).verify(admin_user)
+    # Written without the old contribution known: falls back to a rebuild,
+    # once the writer's transaction commits
+    stale = VoteCount.objects.get(candidate=alice)
+    del stale._counted_as
+    stale.vote_count = 20
+    with django_capture_on_commit_callbacks(execute=True):
+        stale.save()
+        assert _tallies(election)[(None, alice.id)] == (30, 0)
+
+    incremental = _tallies(election)
+    assert incremental[(None, alice.id)] == (20, 0)
+    rebuild_tallies(election.id)
+    assert _tallies(election) == incremental
+    assert bob.vote_percentage == 100.0
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_rebuild_tallies_locks_rows_before_summing(election, committee, candidate_factory, django_assert_max_num_queries):
+    """The tally rows are taken before the vote counts are summed, in one transaction."""
+    VoteCount.objects.create(election=election, committee=committee, candidate=candidate_factory(1, 'Alice'), vote_count=5)
+
+    with django_assert_max_num_queries(20) as queries:
+        rebuild_tallies(election.id)
+    statements = [query['sql'] for query in queries.captured_queries]
+    first_tally = next(i for i, sql in enumerate(statements) if 'FROM "vote_tallies"' in sql)
+    first_sum = next(i for i, sql in enumerate(statements) if 'SUM(' in sql)
+    assert first_tally < first_sum
+    assert any(sql.startswith('SAVEPOINT') or sql == 'BEGIN' for sql in statements[:first_tally])
+    assert _tallies(election)[(None, VoteTally.objects.get(committee__isnull=True).candidate_id)] == (5, 0)
@@ -0,0 +1,141 @@
+"""
+Query-count benchmarks for dashboard aggregations.
+
+Each benchmark runs the same aggregation over a small and a large spread of
+dimension values and checks that the number of queries stays the same;
+timings are printed for comparison (run with ``-s``).
+"""
+import os
+import time
+
+import pytest
+from django.db import connection
+from django.db.models import Count, Q
+from django.test.utils import CaptureQueriesContext
+
+from apps.attendees.models import Attendance
+from apps.elections.models import Committee
+from apps.electors.models import Elector
+from apps.guarantees.models import Guarantee
+
+# Electors of the committee performance fixture; guarantees and attendances
+# keep the ratio of a real campaign (100k / 40k / 60k). Set
+# REPORT_BENCHMARK_ELECTORS=100000 for the full size.
+REPORT_BENCHMARK_ELECTORS = int(os.environ.get('REPORT_BENCHMARK_ELECTORS', 2000))
+
+
+def _measure(func, *args):
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        result = func(*args)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    return result, len(queries), elapsed_ms
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_elector_demographics_query_count_independent_of_cardinality(election, committee, elector_factory, admin_user):
+    """get_elector_demographics issues the same queries for 2 or 25 values per dimension."""
+    from apps.elections.utils.dashboard_queries import get_elector_demographics
+
+    measurements = {}
+    for spread in (2, 25):
+        prefix = f'S{spread}'
+        for index in range(50):
+            value = f'{prefix}-{index % spread}'
+            elector = elector_factory(
+                koc_id=f'{prefix}{index:04d}', area=value, department=value, team=value,
+                gender='MALE' if index % 2 else 'FEMALE',
+            )
+            if index % 3 == 0:
+                Attendance.objects.create(elector=elector, committee=committee, marked_by=admin_user)
+
+        data, query_count, elapsed_ms = _measure(get_elector_demographics, election.id)
+        measurements[spread] = query_count
+        print(f'\nget_elector_demographics: {len(data["by_area"])} areas, {query_count} queries, {elapsed_ms:.1f} ms')
+
+    assert measurements[2] == measurements[25]
+    area = next(item for item in data['by_area'] if item['name'] == 'S2-0')
+    assert area['total_electors'] == 25
+    assert area['attended'] == 9  # indexes 0, 6, 12, ... 48
+    assert area['male'] + area['female'] == 25
+
+
+@pytest.fixture
+def campaign_data(election, committee_factory, admin_user, supervisor_user):
+    """Electors spread over 20 committees with 40% guaranteed and 60% attending."""
+    committees = [committee_factory(code=f'BENCH{index:02d}', name=f'Bench {index}') for index in range(20)]
+    electors = Elector.objects.bulk_create(
+        [
+            Elector(
+                koc_id=f'B{index:06d}',
+                name_first='Bench',
+                family_name=str(index),
+                committee=committees[index % len(committees)],
+                gender='MALE' if index % 2 else 'FEMALE',
+            )
+            for index in range(REPORT_BENCHMARK_ELECTORS)
+        ],
+        batch_size=2000,
+    )
+    guarantees = []
+    for index, elector in enumerate(electors):
+        if index % 5 < 2:
+            guarantees.append(Guarantee(
+                user=admin_user,
+                elector=elector,
+                guarantee_status='PENDING' if index % 3 == 0 else 'GUARANTEED',
+                confirmation_status='CONFIRMED' if index % 4 == 0 else 'PENDING',
+            ))
+        if index % 10 == 0:
+            # A second guarantee: multiplies the joined rows in the old query
+            guarantees.append(Guarantee(user=supervisor_user, elector=elector))
+    Guarantee.objects.bulk_create(guarantees, batch_size=2000)
+    Attendance.objects.bulk_create(
+        [
+            Attendance(elector=elector, committee=elector.committee, marked_by=admin_user)
+            for index, elector in enumerate(electors)
+            if index % 5 < 3
+        ],
+        batch_size=2000,
+    )
+    return committees
+
+
+def _joined_committee_counts():
+    """The committee performance counts as one query joining electors, attendances and guarantees."""
+    return {
+        row['code']: row
+        for row in Committee.objects.annotate(
+            total_electors=Count('electors', filter=Q(electors__is_active=True), distinct=True),
+            total_attendance=Count('attendances', distinct=True),
+            total_guarantees=Count('electors__guarantees', distinct=True),
+            pending=Count(
+                'electors__guarantees', filter=Q(electors__guarantees__guarantee_status='PENDING'), distinct=True
+            ),
+        ).values('code', 'total_electors', 'total_attendance', 'total_guarantees', 'pending')
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_committee_performance_avoids_joined_counts(campaign_data):
+    """committee_performance counts each relation on its own, in two queries, with the same results."""
+    from apps.reports.views.reports import ReportsViewSet
+
+    joined, joined_queries, joined_ms = _measure(_joined_committee_counts)
+    data, query_count, elapsed_ms = _measure(ReportsViewSet()._build_committee_performance)
+    print(
+        f'\ncommittee_performance over {REPORT_BENCHMARK_ELECTORS} electors: '
+        f'joined counts {joined_ms:.1f} ms, subquery counts {elapsed_ms:.1f} ms ({query_count} queries)'
+    )
+
+    assert query_count == 2
+    stats = {row['code']: row for row in data['committee_stats']}
+    assert set(stats) == {committee.code for committee in campaign_data}
+    for code, row in stats.items():
+        assert row['total_electors'] == joined[code]['total_electors']
+        assert row['total_attendance'] == joined[code]['total_attendance']
+        assert row['total_guarantees'] == joined[code]['total_guarantees']
+        assert row['pending'] == joined[code]['pending']
+    assert sum(row['total_guarantees'] for row in stats.values()) == Guarantee.objects.count()
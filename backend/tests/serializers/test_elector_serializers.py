@@ -195,6 +195,33 @@ class TestElectorListSerializer:
         assert data['guaranteeGroup'] is not None
         assert data['guaranteeGroup']['id'] == group.id
         assert data['guaranteeGroup']['name'] == 'Test Group'
+    
+    def test_many_loads_guarantees_in_one_query(self, elector, user, committee, django_assert_num_queries):
+        """Test a page of electors loads all guarantee fields with one query."""
+        from apps.guarantees.models import Guarantee
+        from rest_framework.test import APIRequestFactory
+        
+        others = [
+            Elector.objects.create(
+                koc_id=f'2000{i}',
+                name_first='Jane',
+                family_name='Doe',
+                gender='FEMALE',
+                committee=committee
+            )
+            for i in range(3)
+        ]
+        Guarantee.objects.create(user=user, elector=others[0], guarantee_status='PENDING')
+        
+        request = APIRequestFactory().get('/')
+        request.user = user
+        electors = list(Elector.objects.select_related('committee').order_by('koc_id'))
+        
+        with django_assert_num_queries(1):
+            data = ElectorListSerializer(electors, many=True, context={'request': request}).data
+        
+        statuses = {row['kocId']: row['guaranteeStatus'] for row in data}
+        assert statuses == {'12345': None, '20000': 'PENDING', '20001': None, '20002': None}
 
 
 @pytest.mark.unit
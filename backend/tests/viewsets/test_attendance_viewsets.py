@@ -119,6 +119,87 @@ class TestAttendanceViewSet:
         })
         assert response.status_code == status.HTTP_400_BAD_REQUEST
     
+    def test_sync_offline_marks(
+        self, user_client, elector, elector_factory, committee, other_committee,
+        django_assert_max_num_queries, django_capture_on_commit_callbacks, monkeypatch
+    ):
+        """Offline marks sync in one batch and replays are idempotent."""
+        from apps.attendees import offline_sync
+        
+        broadcasts = []
+        monkeypatch.setattr(
+            'apps.utils.signals.broadcast_update',
+            lambda *args, **kwargs: broadcasts.append(args)
+        )
+        electors = [elector] + [
+            elector_factory(committee=committee, koc_id=f'SYN{i:03d}', is_active=True)
+            for i in range(20)
+        ]
+        stranger = elector_factory(committee=other_committee, koc_id='SYN999', is_active=True)
+        marks = [
+            {'client_key': f'key-{e.koc_id}', 'koc_id': e.koc_id, 'committee_code': committee.code}
+            for e in electors
+        ]
+        marks += [
+            {'client_key': 'key-again', 'koc_id': elector.koc_id, 'committee_code': committee.code},
+            {'client_key': 'key-other', 'koc_id': stranger.koc_id, 'committee_code': other_committee.code},
+            {'client_key': 'key-bad', 'committee_code': committee.code},
+        ]
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            # Includes creating the batch's rollup bucket (lookup + insert in a savepoint)
+            with django_assert_max_num_queries(13):
+                response = user_client.post('/api/attendees/sync/', {'marks': marks}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        summary = response.data['data']['summary']
+        assert summary == {'created': 21, 'duplicate': 0, 'already_attended': 1, 'rejected': 2}
+        results = response.data['data']['results']
+        assert [r['status'] for r in results[-3:]] == [
+            offline_sync.ALREADY_ATTENDED, offline_sync.REJECTED, offline_sync.REJECTED
+        ]
+        assert Attendance.objects.filter(client_key__startswith='key-').count() == 21
+        assert len(broadcasts) == 1
+        
+        # Replaying the batch writes nothing new
+        response = user_client.post('/api/attendees/sync/', {'marks': marks[:21]}, format='json')
+        assert response.data['data']['summary']['duplicate'] == 21
+        assert response.data['data']['results'][0]['attendance_id'] == results[0]['attendance_id']
+        assert Attendance.objects.count() == 21
+    
+    def test_sync_offline_marks_concurrent_replay(
+        self, admin_user, elector, elector_factory, committee, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        """Marks a concurrent replay inserted first are duplicates and are not counted again."""
+        from apps.attendees.models import AttendanceStatistics
+        from apps.attendees.offline_sync import CREATED, DUPLICATE, OfflineAttendanceSync
+        
+        AttendanceStatistics.objects.create(committee=committee)
+        other = elector_factory(committee=committee, koc_id='SYN500', is_active=True)
+        marks = [
+            {'client_key': 'key-race', 'koc_id': elector.koc_id, 'committee_code': committee.code},
+            {'client_key': 'key-mine', 'koc_id': other.koc_id, 'committee_code': committee.code},
+        ]
+        bulk_create = Attendance.objects.bulk_create
+        
+        def racing_bulk_create(objs, **kwargs):
+            # The concurrent replay commits key-race between our checks and our insert
+            Attendance.objects.create(
+                elector=elector, committee=committee, marked_by=admin_user, client_key='key-race'
+            )
+            return bulk_create(objs, **kwargs)
+        
+        monkeypatch.setattr(Attendance.objects, 'bulk_create', racing_bulk_create)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = OfflineAttendanceSync(admin_user).sync(marks)
+        
+        winner = Attendance.objects.get(client_key='key-race')
+        results = response['results']
+        assert [r['status'] for r in results] == [DUPLICATE, CREATED]
+        assert results[0]['attendance_id'] == winner.id
+        assert results[1]['attendance_id'] == Attendance.objects.get(client_key='key-mine').id
+        assert Attendance.objects.count() == 2
+        assert AttendanceStatistics.objects.get(committee=committee).total_attended == 2
+    
     def test_mark_attendance_wrong_committee(self, admin_client, elector, other_committee):
         """Cannot mark attendance if elector not assigned to committee."""
         response = admin_client.post('/api/attendees/mark/', {
@@ -170,6 +251,47 @@ class TestAttendanceViewSet:
         assert response.data['data']['kocId'] == elector.koc_id
         assert response.data['data']['hasAttended'] is False
     
+    def test_search_elector_from_snapshot(
+        self, admin_client, elector, settings, tmp_path, django_assert_max_num_queries
+    ):
+        """Search and mark read the elector from the snapshot when one is built."""
+        from apps.electors.snapshot import build_snapshot, elector_snapshot
+        
+        settings.ELECTOR_SNAPSHOT_PATH = str(tmp_path / 'electors.snap')
+        build_snapshot()
+        elector_snapshot.reset()
+        try:
+            with django_assert_max_num_queries(1):
+                response = admin_client.get(f'/api/attendees/search-elector/?koc_id={elector.koc_id}')
+            assert response.status_code == status.HTTP_200_OK
+            assert response.data['data']['fullName'] == elector.full_name
+            assert response.data['data']['committeeCode'] == elector.committee.code
+            assert response.data['data']['location'] == elector.committee.location
+            assert response.data['data']['hasAttended'] is False
+        finally:
+            settings.ELECTOR_SNAPSHOT_PATH = ''
+            elector_snapshot.reset()
+    
+    def test_mark_attendance_rechecks_snapshot_elector(self, admin_client, elector, committee, settings, tmp_path):
+        """An elector deactivated after the snapshot was built cannot be marked."""
+        from apps.electors.snapshot import build_snapshot, elector_snapshot
+        
+        settings.ELECTOR_SNAPSHOT_PATH = str(tmp_path / 'electors.snap')
+        build_snapshot()
+        elector_snapshot.reset()
+        try:
+            Elector.objects.filter(pk=elector.pk).update(is_active=False)
+            assert elector_snapshot.get(elector.koc_id) is not None
+            response = admin_client.post('/api/attendees/mark/', {
+                'koc_id': elector.koc_id,
+                'committee_code': committee.code,
+            })
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+            assert not Attendance.objects.filter(elector=elector).exists()
+        finally:
+            settings.ELECTOR_SNAPSHOT_PATH = ''
+            elector_snapshot.reset()
+    
     def test_search_elector_not_found(self, admin_client):
         """Search returns 404 for non-existent elector."""
         response = admin_client.get('/api/attendees/search-elector/?koc_id=INVALID')
@@ -272,6 +394,18 @@ class TestAttendanceViewSet:
         assert response.data['data']['total_attended'] == 3
         assert 'attendance_percentage' in response.data['data']
     
+    def test_statistics_count_electors_live(self, admin_client, committee, elector_factory):
+        """Elector writes show in the statistics without a reconciliation."""
+        elector_factory(committee=committee)
+        response = admin_client.get(f'/api/attendees/statistics/{committee.code}/')
+        assert response.data['data']['total_electors'] == 1
+        
+        elector_factory(committee=committee)
+        elector_factory(committee=committee, is_active=False)
+        response = admin_client.get(f'/api/attendees/statistics/{committee.code}/')
+        assert response.data['data']['total_electors'] == 2
+        assert response.data['data']['pending_count'] == 2
+    
     def test_refresh_statistics_as_admin(self, admin_client, committee):
         """Admin can manually refresh statistics."""
         response = admin_client.post(f'/api/attendees/statistics/{committee.code}/refresh/')
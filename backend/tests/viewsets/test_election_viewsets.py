@@ -94,6 +94,22 @@ class TestElectionViewSet:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['data']['name'] == 'Test Election'
     
+    def test_retrieve_election_conditional_get(self, admin_client, election, django_capture_on_commit_callbacks,
+                                               django_assert_max_num_queries):
+        """An unchanged election is answered with 304 after the lookup, without serializing it."""
+        url = f'/api/elections/{election.id}/'
+        etag = admin_client.get(url)['ETag']
+        with django_assert_max_num_queries(1):
+            response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            admin_client.patch(url, {'name': 'Renamed Election'})
+        response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+        assert response.data['data']['name'] == 'Renamed Election'
+    
     def test_update_election_admin(self, admin_client, election):
         """Test admin can update election."""
         data = {
@@ -128,6 +144,19 @@ class TestElectionViewSet:
         assert 'election' in response.data['data']
         assert response.data['data']['election']['name'] == 'Test Election'
     
+    def test_current_election_conditional_get(self, admin_client, election, committee_factory,
+                                              django_capture_on_commit_callbacks):
+        """The current election payload is revalidated against its tables."""
+        etag = admin_client.get('/api/elections/current/')['ETag']
+        response = admin_client.get('/api/elections/current/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            committee_factory(election=election)
+        response = admin_client.get('/api/elections/current/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['data']['committees']) == 1
+    
     def test_current_election_not_found(self, admin_client):
         """Test current election when none exists."""
         response = admin_client.get('/api/elections/current/')
@@ -261,3 +290,160 @@ class TestCommitteeViewSet:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['data']) == 1
 
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestAttendanceTimeSeriesViews:
+    """Hourly attendance and turnout curve read the attendance rollup."""
+    
+    @pytest.fixture
+    def client(self, admin_user):
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        return client
+    
+    @pytest.fixture
+    def marked_day(self, committee, elector_factory, admin_user):
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.attendees.models import Attendance
+        
+        day = timezone.localtime().replace(hour=10, minute=0, second=0, microsecond=0) - timedelta(days=1)
+        for offset in (5, 20, 50, 70):
+            Attendance.objects.create(
+                elector=elector_factory(committee=committee),
+                committee=committee,
+                marked_by=admin_user,
+                attended_at=day + timedelta(minutes=offset),
+            )
+        elector_factory(committee=committee)  # not attended
+        return day
+    
+    def test_hourly_attendance(self, client, election, marked_day, django_assert_max_num_queries):
+        with django_assert_max_num_queries(6):
+            response = client.get(
+                f'/api/elections/{election.id}/dashboard/attendance/hourly/',
+                {'date': marked_day.date().isoformat()}
+            )
+        assert response.status_code == status.HTTP_200_OK
+        hours = {item['hour']: item['attendance'] for item in response.data['data']}
+        assert hours['10:00'] == 3
+        assert hours['11:00'] == 1
+        assert response.data['meta']['total_attendance'] == 4
+    
+    def test_turnout_curve(self, client, election, marked_day):
+        response = client.get(
+            f'/api/elections/{election.id}/dashboard/attendance/turnout/',
+            {'date': marked_day.date().isoformat(), 'interval': 30}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data['data']
+        assert data['total_electors'] == 5
+        points = {point['time']: point for point in data['points']}
+        assert points['10:00']['attendance'] == 2
+        assert points['10:30']['cumulative'] == 3
+        assert points['11:00']['cumulative'] == 4
+        assert points['11:00']['turnout_percentage'] == 80.0
+        assert data['points'][-1]['time'] == '17:30'
+    
+    def test_turnout_curve_invalid_interval(self, client, election):
+        response = client.get(
+            f'/api/elections/{election.id}/dashboard/attendance/turnout/',
+            {'interval': 7}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_attendance_dashboard_query_count(admin_user, election, committee, committee_factory, elector_factory,
+                                          django_assert_max_num_queries):
+    """The committee breakdown does not issue queries per committee."""
+    for committee in [committee] + [committee_factory() for _ in range(5)]:
+        elector_factory(committee=committee)
+    client = APIClient()
+    client.force_authenticate(user=admin_user)
+    
+    with django_assert_max_num_queries(15):
+        response = client.get(f'/api/elections/{election.id}/dashboard/attendance/summary/')
+    assert response.status_code == status.HTTP_200_OK
+    committees = response.data['data']['committees']
+    assert len(committees) == 6
+    assert all(committee['elector_count'] == 1 for committee in committees)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestPrecomputedDashboards:
+    """Dashboard endpoints serve payloads built by the precompute worker."""
+    
+    @pytest.fixture
+    def client(self, admin_user):
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        return client
+    
+    def test_served_from_store_with_as_of(self, client, election, committee, elector_factory, admin_user,
+                                          django_assert_max_num_queries, django_capture_on_commit_callbacks):
+        from apps.attendees.models import Attendance
+        from apps.elections.precompute import refresh_election, refresh_due
+        
+        elector = elector_factory(committee=committee)
+        assert refresh_election(election.id)
+        
+        url = f'/api/elections/{election.id}/dashboard/overview/'
+        with django_assert_max_num_queries(3):  # auth and the election lookup only
+            response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        as_of = response.data['meta']['as_of']
+        assert response.data['data']['summary']['total_attendance'] == 0
+        
+        # A write is picked up by the next worker tick, not by the request
+        with django_capture_on_commit_callbacks(execute=True):
+            Attendance.objects.create(elector=elector, committee=committee, marked_by=admin_user)
+        assert client.get(url).data['meta']['as_of'] == as_of
+        assert refresh_due() == [election.id]
+        assert refresh_due() == []  # nothing changed since
+        
+        response = client.get(url)
+        assert response.data['meta']['as_of'] > as_of
+        assert response.data['data']['summary']['total_attendance'] == 1
+        for path in ('attendance/summary', 'electors/demographics'):
+            response = client.get(f'/api/elections/{election.id}/dashboard/{path}/')
+            assert response.status_code == status.HTTP_200_OK
+            assert response.data['meta']['as_of'] == response.data['meta']['last_updated']
+    
+    def test_unchanged_payload_not_modified(self, client, election, committee, elector_factory):
+        from apps.elections.precompute import refresh_election
+        
+        elector_factory(committee=committee)
+        url = f'/api/elections/{election.id}/dashboard/electors/demographics/'
+        first = client.get(url)
+        assert first['Last-Modified']
+        response = client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        
+        refresh_election(election.id)
+        response = client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert response.status_code == status.HTTP_200_OK
+    
+    def test_built_on_first_request(self, client, election, committee, elector_factory):
+        elector_factory(committee=committee)
+        response = client.get(f'/api/elections/{election.id}/dashboard/attendance/summary/')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['meta']['as_of']
+        assert response.data['data']['summary']['total_electors'] == 1
+    
+    def test_writes_invalidate_without_worker(self, client, settings, election, committee, elector_factory,
+                                              admin_user, django_capture_on_commit_callbacks):
+        from apps.attendees.models import Attendance
+        
+        settings.DASHBOARD_PRECOMPUTE_RUNNER = 'off'
+        elector = elector_factory(committee=committee)
+        url = f'/api/elections/{election.id}/dashboard/overview/'
+        assert client.get(url).data['data']['summary']['total_attendance'] == 0
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            Attendance.objects.create(elector=elector, committee=committee, marked_by=admin_user)
+        assert client.get(url).data['data']['summary']['total_attendance'] == 1
@@ -5,10 +5,15 @@ import pytest
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from datetime import timedelta
 
 from apps.electors.models import Elector
+from apps.electors.search_index import ElectorNameIndex, name_index
 from apps.elections.models import Election, Committee
 from apps.utils.permissions import IsAdminOrAbove
+from apps.utils.pagination import KeysetPaginator
 
 User = get_user_model()
 
@@ -126,7 +131,31 @@ class TestElectorViewSet:
         response = admin_client.get(f'/api/electors/{elector.koc_id}/')
         assert response.status_code == status.HTTP_200_OK
         assert response.data['data']['koc_id'] == '12345'
-    
+
+    def test_retrieve_elector_conditional_get_follows_attendance(
+        self, admin_client, admin_user, elector, committee, django_capture_on_commit_callbacks
+    ):
+        """has_attended reads the attendance table, so marking one changes the ETag."""
+        from apps.attendees.models import Attendance
+
+        url = f'/api/electors/{elector.koc_id}/'
+        etag = admin_client.get(url)['ETag']
+        assert admin_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Attendance.objects.create(elector=elector, committee=committee, marked_by=admin_user)
+        response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['data']['has_attended'] is True
+
+    def test_retrieve_elector_conditional_get_checks_object_first(self, admin_client, elector):
+        """A stale ETag is no answer for an elector that left the queryset."""
+        url = f'/api/electors/{elector.koc_id}/'
+        etag = admin_client.get(url)['ETag']
+        Elector.objects.filter(pk=elector.pk).update(is_active=False)  # no version bump
+        response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     def test_update_elector_admin(self, admin_client, elector):
         """Test admin can update elector."""
         data = {
@@ -193,9 +222,323 @@ class TestElectorViewSet:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['data']['electors']) == 2
     
+    def test_cursor_pagination(self, admin_client, elector):
+        """Test keyset pagination walks pages forward and back."""
+        for koc_id, first in (('20001', 'Alice'), ('20002', 'Bob'), ('20003', 'Zed')):
+            Elector.objects.create(
+                koc_id=koc_id,
+                name_first=first,
+                family_name='Brown',
+                gender='MALE',
+                committee=elector.committee
+            )
+        
+        response = admin_client.get('/api/electors/?cursor=&page_size=2')
+        assert response.status_code == status.HTTP_200_OK
+        pagination = response.data['meta']['pagination']
+        assert pagination['count'] is None
+        assert pagination['previous'] is None
+        assert [e['kocId'] for e in response.data['data']['electors']] == ['20001', '20002']
+        
+        response = admin_client.get(pagination['next'] + '&count=exact')
+        pagination = response.data['meta']['pagination']
+        assert [e['kocId'] for e in response.data['data']['electors']] == ['12345', '20003']
+        assert pagination['count'] == 4
+        assert pagination['next'] is None
+        
+        response = admin_client.get(pagination['previous'])
+        assert [e['kocId'] for e in response.data['data']['electors']] == ['20001', '20002']
+        
+        response = admin_client.get('/api/electors/?cursor=garbage')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_cursor_predicate_bounds_first_column(self):
+        """Test the keyset predicate carries an index range bound on the leading column."""
+        paginator = KeysetPaginator(['-name_first', 'koc_id'], page_size=10)
+        
+        forward = str(Elector.objects.filter(paginator._after(['John', '12345'], reverse=False)).query)
+        assert '"name_first" <= John' in forward
+        backward = str(Elector.objects.filter(paginator._after(['John', '12345'], reverse=True)).query)
+        assert '"name_first" >= John' in backward
+    
     def test_unauthorized_access(self):
         """Test unauthorized access is rejected."""
         client = APIClient()
         response = client.get('/api/electors/')
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
+
+    def test_search_action_by_name_part(self, admin_client, elector):
+        """Test name search matches any name part via the n-gram index."""
+        Elector.objects.create(
+            koc_id='99999',
+            name_first='Alice',
+            family_name='Brown',
+            gender='FEMALE',
+            committee=elector.committee
+        )
+        
+        response = admin_client.get('/api/electors/search/?name=chae')
+        assert response.status_code == status.HTTP_200_OK
+        assert [e['koc_id'] for e in response.data['data']] == ['12345']
+        assert response.data['meta']['pagination']['count'] == 1
+    
+    def test_search_action_short_query(self, admin_client, elector):
+        """Test one- and two-character queries are served from the index."""
+        response = admin_client.get('/api/electors/search/?name=oe')
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['data']) == 1
+    
+    def test_search_action_name_with_other_filters(self, admin_client, elector):
+        """Test name search combined with DB-side filters."""
+        response = admin_client.get('/api/electors/search/?name=john&gender=FEMALE')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['data'] == []
+        
+        response = admin_client.get('/api/electors/search/?name=john&gender=MALE')
+        assert len(response.data['data']) == 1
+    
+    def test_search_action_many_name_matches_use_key_lookup(
+        self, admin_client, elector, monkeypatch, django_assert_max_num_queries
+    ):
+        """Test past the IN-list limit the name narrows through the indexed key columns."""
+        from apps.electors.views import ElectorViewSet
+        
+        monkeypatch.setattr(ElectorViewSet, 'NAME_INDEX_MAX_IN', 0)
+        response = admin_client.get('/api/electors/search/?name=jo&gender=MALE')
+        assert [e['koc_id'] for e in response.data['data']] == [elector.koc_id]
+        
+        with django_assert_max_num_queries(10) as queries:
+            admin_client.get('/api/electors/search/?name=jo&gender=MALE')
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        assert 'normalized_first" LIKE' in sql
+        assert '%jo%' not in sql
+    
+    def test_search_index_follows_saves(
+        self, admin_client, elector, django_capture_on_commit_callbacks
+    ):
+        """Test saved electors are re-indexed after commit."""
+        admin_client.get('/api/electors/search/?name=john')
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            elector.name_first = 'Jonathan'
+            elector.save()
+        
+        response = admin_client.get('/api/electors/search/?name=jonathan')
+        assert len(response.data['data']) == 1
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            elector.delete()
+        
+        response = admin_client.get('/api/electors/search/?name=jonathan')
+        assert response.data['data'] == []
+    
+    def test_search_index_follows_bulk_invalidation(
+        self, admin_client, elector, committee, django_capture_on_commit_callbacks
+    ):
+        """Test bulk writes, which bypass the signals, rebuild the index once invalidated."""
+        admin_client.get('/api/electors/search/?name=john')
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            Elector.objects.bulk_create([
+                Elector(koc_id='88888', name_first='Johnny', family_name='Bulk', gender='MALE', committee=committee)
+            ])
+            transaction.on_commit(name_index.invalidate)
+        
+        response = admin_client.get('/api/electors/search/?name=johnny')
+        assert [row['koc_id'] for row in response.data['data']] == ['88888']
+    
+    def test_search_index_replays_changes_without_rebuild(
+        self, elector, committee, django_capture_on_commit_callbacks, monkeypatch
+    ):
+        """Test another process's copy applies single-elector writes from the change log."""
+        other = ElectorNameIndex()
+        assert other.search('john') == [elector.koc_id]
+        monkeypatch.setattr(other, 'build', lambda: pytest.fail('rebuilt for a single write'))
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            Elector.objects.create(
+                koc_id='88889', name_first='Johnny', family_name='Saved', gender='MALE', committee=committee
+            )
+            elector.name_first = 'Jack'
+            elector.save()
+        
+        assert other.search('john') == ['88889']
+        assert other.search('jack') == [elector.koc_id]
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            elector.delete()
+        assert other.search('jack') == []
+    
+    def test_search_action_arabic_variants(self, admin_client, committee):
+        """Test name search folds alef/hamza and taa-marbuta variants."""
+        Elector.objects.create(
+            koc_id='77777',
+            name_first='إبراهيم',
+            family_name='العلي',
+            sub_family_name='فاطمة',
+            gender='MALE',
+            committee=committee
+        )
+        
+        response = admin_client.get('/api/electors/search/?name=ابراهيم')
+        assert [e['koc_id'] for e in response.data['data']] == ['77777']
+        
+        response = admin_client.get('/api/electors/search/?name=فاطمه')
+        assert [e['koc_id'] for e in response.data['data']] == ['77777']
+    
+    def test_search_action_phonetic_fallback(self, admin_client, committee):
+        """Test names with no normalized match fall back to phonetic keys."""
+        Elector.objects.create(
+            koc_id='88888',
+            name_first='Mohammed',
+            family_name='Saleh',
+            gender='MALE',
+            committee=committee
+        )
+        
+        response = admin_client.get('/api/electors/search/?name=Muhamad')
+        assert [e['koc_id'] for e in response.data['data']] == ['88888']
+    
+    def test_relatives_from_kinship_graph(self, admin_client, elector, committee):
+        """Test the relatives endpoint reads the materialized kinship graph."""
+        from apps.electors.kinship import rebuild_relations
+        
+        elector.name_third = 'Henry'
+        elector.save()
+        Elector.objects.create(
+            koc_id='55555',
+            name_first='Jack',
+            name_second='Michael',
+            name_third='Henry',
+            family_name='Doe',
+            gender='MALE',
+            committee=committee
+        )
+        rebuild_relations()
+        
+        response = admin_client.get(f'/api/electors/{elector.koc_id}/relatives/')
+        assert response.status_code == status.HTTP_200_OK
+        assert [(r['kocId'], r['relationship']) for r in response.data['data']] == [('55555', 'BROTHER')]
+    
+    def test_import_csv_runs_background_job(
+        self, admin_client, elector, committee, monkeypatch, settings, tmp_path,
+        django_capture_on_commit_callbacks
+    ):
+        """Test CSV import is queued as a job that streams rows in chunks."""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from apps.electors import jobs
+        from apps.electors.import_service import ElectorImportService
+        
+        settings.BACKGROUND_TASK_RUNNER = 'sync'
+        settings.MEDIA_ROOT = str(tmp_path)
+        monkeypatch.setattr(ElectorImportService, 'CHUNK_SIZE', 2)
+        events = []
+        monkeypatch.setattr(
+            jobs, 'broadcast_to_group',
+            lambda group, message_type, event_data, action=None: events.append((message_type, action))
+        )
+        content = (
+            '\ufeffKOC,Name,Code,Mobile\n'
+            '12345,John Michael Henry Doe,C001,99990000\n'
+            '20001,Ali Hassan Omar Saleh,C001,\n'
+            '20002,Badr Hassan Omar Saleh,C999,\n'
+            '20001,Ali Hassan Omar Saleh,C001,\n'
+            '20003,Omar Hassan Omar Saleh,C001,\n'
+        ).encode('utf-8')
+        upload = SimpleUploadedFile('electors.csv', content, content_type='text/csv')
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            response = admin_client.post(
+                '/api/electors/import_csv/',
+                {'file': upload, 'update_existing': 'true'},
+                format='multipart'
+            )
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['data']['status'] == 'queued'
+        
+        job_id = response.data['data']['id']
+        response = admin_client.get(f'/api/electors/import_jobs/{job_id}/')
+        job = response.data['data']
+        assert job['status'] == 'completed'
+        assert job['progress']['processed_rows'] == 5
+        
+        results = job['result']
+        assert results['total_rows'] == 5
+        assert results['created'] == 2
+        # The repeated 20001 lands in a later chunk and matches the stored hash
+        assert results['updated'] == 1
+        assert results['unchanged'] == 1
+        assert results['skipped'] == 1
+        assert "Committee 'C999' not found" in results['errors'][0]
+        assert events == [
+            ('import_progress', 'started'),
+            ('import_progress', 'progress'),
+            ('import_progress', 'progress'),
+            ('import_progress', 'progress'),
+            ('import_progress', 'completed'),
+        ]
+        
+        elector.refresh_from_db()
+        assert elector.mobile == '99990000'
+        assert elector.normalized_name == 'john michael henry doe'
+        assert Elector.objects.get(koc_id='20003').normalized_first == 'omar'
+    
+    @pytest.fixture
+    def import_job(self, admin_user, settings, tmp_path, monkeypatch):
+        """A queued import job; the import itself is recorded, not run."""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from apps.electors import jobs
+        from apps.electors.import_service import ElectorImportService
+        from apps.electors.models import ElectorImportJob
+        
+        settings.BACKGROUND_TASK_RUNNER = 'sync'
+        settings.MEDIA_ROOT = str(tmp_path)
+        monkeypatch.setattr(jobs, 'broadcast_to_group', lambda *args, **kwargs: None)
+        runs = []
+        
+        def import_electors(service, csv_file, update_existing, on_progress=None):
+            runs.append(csv_file.read())
+            return {'success': True}
+        
+        monkeypatch.setattr(ElectorImportService, 'import_electors', import_electors)
+        job = ElectorImportJob.objects.create(
+            file=SimpleUploadedFile('electors.csv', b'KOC,Name\n'),
+            original_filename='electors.csv',
+            created_by=admin_user,
+        )
+        job.runs = runs
+        return job
+    
+    def test_import_job_claimed_once(self, import_job):
+        """Test a job handed to the runner twice is imported once."""
+        from apps.electors.jobs import run_import_job
+        
+        run_import_job(import_job.pk)
+        run_import_job(import_job.pk)
+        assert len(import_job.runs) == 1
+        import_job.refresh_from_db()
+        assert import_job.status == 'completed'
+        assert import_job.started_at is not None
+    
+    def test_orphaned_import_jobs_recovered(self, import_job, admin_user):
+        """Test jobs left behind by a dead process are re-queued or failed."""
+        from apps.electors.jobs import STALE_AFTER, recover_import_jobs
+        from apps.electors.models import ElectorImportJob
+        
+        long_ago = timezone.now() - STALE_AFTER - timedelta(minutes=1)
+        running = ElectorImportJob.objects.create(
+            file=import_job.file.name, original_filename='other.csv', created_by=admin_user,
+        )
+        ElectorImportJob.objects.filter(pk=running.pk).update(status='running', updated_at=long_ago)
+        ElectorImportJob.objects.filter(pk=import_job.pk).update(created_at=long_ago)
+        
+        assert recover_import_jobs() == {'requeued': 1, 'failed': 1}
+        running.refresh_from_db()
+        assert running.status == 'failed'
+        assert running.errors[-1]['message'].startswith('Import interrupted')
+        import_job.refresh_from_db()
+        assert import_job.status == 'completed'
+        assert len(import_job.runs) == 1
+        
+        assert recover_import_jobs() == {'requeued': 0, 'failed': 0}
@@ -196,6 +196,30 @@ class TestGuaranteeViewSet:
         assert 'groups' in response.data['data']
         assert len(response.data['data']['guarantees']) == 1
     
+    def test_list_guarantees_cursor(self, client, user, guarantee, committee):
+        """Test keyset pagination of guarantees, newest first."""
+        second = Guarantee.objects.create(
+            user=user,
+            elector=Elector.objects.create(
+                koc_id='67890',
+                name_first='Jane',
+                family_name='Doe',
+                gender='FEMALE',
+                committee=committee
+            ),
+            guarantee_status='PENDING'
+        )
+        
+        response = client.get('/api/guarantees/?cursor=&page_size=1')
+        assert response.status_code == status.HTTP_200_OK
+        assert [g['id'] for g in response.data['data']['guarantees']] == [second.id]
+        pagination = response.data['meta']['pagination']
+        assert pagination['count'] is None
+        
+        response = client.get(pagination['next'])
+        assert [g['id'] for g in response.data['data']['guarantees']] == [guarantee.id]
+        assert response.data['meta']['pagination']['next'] is None
+    
     def test_create_guarantee(self, client, elector, group):
         """Test creating a guarantee."""
         data = {
@@ -325,6 +349,44 @@ class TestGuaranteeViewSet:
         assert response.status_code == status.HTTP_200_OK
         assert 'data' in response.data
     
+    def test_search_elector_matches_arabic_variants(self, client, elector):
+        """Test search elector folds hamza/taa-marbuta spelling variants."""
+        Elector.objects.create(
+            koc_id='55555',
+            name_first='أسامة',
+            family_name='الصالح',
+            gender='MALE',
+            committee=elector.committee
+        )
+        
+        response = client.get('/api/guarantees/search-elector/', {'q': 'اسامه'})
+        assert response.status_code == status.HTTP_200_OK
+        assert [e['kocId'] for e in response.data['data']] == ['55555']
+        
+        # Phonetic match: ص typed as س
+        response = client.get('/api/guarantees/search-elector/', {'q': 'اسامه السالح'})
+        assert [e['kocId'] for e in response.data['data']] == ['55555']
+    
+    def test_search_elector_by_prefixes(self, client, elector):
+        """Test search elector matches KOC ID, mobile and section prefixes, not substrings."""
+        Elector.objects.create(
+            koc_id='66601',
+            name_first='Sara',
+            family_name='Ahmad',
+            mobile='55512345',
+            section='Drilling Operations',
+            gender='FEMALE',
+            committee=elector.committee
+        )
+        
+        for query in ('666', '5551', '55512345', 'Drilling'):
+            response = client.get('/api/guarantees/search-elector/', {'q': query})
+            assert [e['kocId'] for e in response.data['data']] == ['66601'], query
+        
+        for query in ('601', '2345', 'Operations'):
+            response = client.get('/api/guarantees/search-elector/', {'q': query})
+            assert response.data['data'] == [], query
+    
     def test_filter_by_status(self, client, guarantee):
         """Test filtering guarantees by status."""
         response = client.get('/api/guarantees/?guarantee_status=GUARANTEED')
@@ -7,8 +7,11 @@ from rest_framework import status
 from django.utils import timezone
 from datetime import timedelta
 
+from apps.electors.models import Elector
 from apps.guarantees.models import Guarantee
 from apps.reports.models import AnalyticsSnapshot
+from apps.reports.snapshots import period_start
+from apps.utils.conditional import bump_tables
 
 
 @pytest.mark.unit
@@ -50,6 +53,49 @@ class TestDashboardViewSet:
         assert 'data' in response.data
         assert 'my_guarantees' in response.data['data']
 
+    def test_personal_dashboard_cache_invalidated_by_write(
+        self, user_client, regular_user, guarantee, elector_factory, django_capture_on_commit_callbacks
+    ):
+        first = user_client.get('/api/reports/dashboard/personal/')
+        assert first.data['data']['my_guarantees']['total'] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Guarantee.objects.create(user=regular_user, elector=elector_factory())
+        second = user_client.get('/api/reports/dashboard/personal/')
+        assert second.data['data']['my_guarantees']['total'] == 2
+
+    def test_personal_dashboard_cache_invalidated_by_bulk_update(
+        self, user_client, guarantee, django_capture_on_commit_callbacks
+    ):
+        first = user_client.get('/api/reports/dashboard/personal/')
+        assert first.data['data']['my_guarantees']['guaranteed'] == 0
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = user_client.post(
+                '/api/guarantees/bulk-update/',
+                {'guarantee_ids': [guarantee.id], 'guarantee_status': 'GUARANTEED'},
+                format='json',
+            )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = user_client.get('/api/reports/dashboard/personal/')
+        assert response.data['data']['my_guarantees']['guaranteed'] == 1
+
+    def test_personal_dashboard_conditional_get(
+        self, user_client, regular_user, guarantee, elector_factory, django_capture_on_commit_callbacks
+    ):
+        first = user_client.get('/api/reports/dashboard/personal/')
+        assert 'no-cache' in first['Cache-Control']
+        response = user_client.get('/api/reports/dashboard/personal/', HTTP_IF_NONE_MATCH=first['ETag'])
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not response.content
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Guarantee.objects.create(user=regular_user, elector=elector_factory())
+        response = user_client.get('/api/reports/dashboard/personal/', HTTP_IF_NONE_MATCH=first['ETag'])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['data']['my_guarantees']['total'] == 2
+
     def test_supervisor_dashboard(self, supervisor_client, supervisor_user, regular_user, guarantee):
         regular_user.supervisor = supervisor_user
         regular_user.save()
@@ -102,6 +148,19 @@ class TestReportsViewSet:
         assert response.status_code == status.HTTP_200_OK
         assert 'summary' in response.data['data']
 
+    def test_coverage_counts_each_elector_once(self, admin_client, admin_user, committee, elector_factory, guarantee):
+        elector_factory(committee=committee)
+        Guarantee.objects.create(user=admin_user, elector=guarantee.elector)
+
+        response = admin_client.get('/api/reports/coverage/')
+        row = next(
+            item for item in response.data['data']['by_committee']
+            if item['committee_code'] == committee.code
+        )
+        assert row['total_electors'] == 2
+        assert row['covered'] == 1
+        assert row['coverage_percentage'] == 50.0
+
     def test_coverage_report_regular_forbidden(self, user_client):
         response = user_client.get('/api/reports/coverage/')
         assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -121,8 +180,91 @@ class TestReportsViewSet:
             'filters': {},
         }
         response = admin_client.post('/api/reports/export/', data, format='json')
-        assert response.status_code == status.HTTP_200_OK
-        assert 'data' in response.data
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['data']['status'] == 'PENDING'
+
+    def test_export_renders_artifact_and_reuses_it(
+        self, admin_client, guarantee, settings, tmp_path, django_capture_on_commit_callbacks
+    ):
+        """The worker writes the file; an identical export reuses it until the data changes."""
+        settings.BACKGROUND_TASK_RUNNER = 'sync'
+        settings.MEDIA_ROOT = str(tmp_path)
+        data = {'report_type': 'COMMITTEE_PERFORMANCE', 'format': 'CSV'}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = admin_client.post('/api/reports/export/', data, format='json')
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        report_id = response.data['data']['report_id']
+
+        report = admin_client.get(f'/api/reports/exports/{report_id}/').data['data']
+        assert report['status'] == 'COMPLETED'
+        download = admin_client.get(report['download_url'])
+        assert download.status_code == status.HTTP_200_OK
+        content = b''.join(download.streaming_content).decode('utf-8-sig')
+        assert content.splitlines()[0] == 'summary'
+        assert 'committee_stats' in content
+
+        again = admin_client.post('/api/reports/export/', data, format='json')
+        assert again.status_code == status.HTTP_200_OK
+        assert (again.data['data']['report_id'], again.data['data']['reused']) == (report_id, True)
+
+        # A bulk import sends no signals and leaves the reports cache alone
+        with django_capture_on_commit_callbacks(execute=True):
+            committee = guarantee.elector.committee
+            Elector.objects.bulk_create([Elector(koc_id='99001', name_first='Bulk', committee=committee)])
+            bump_tables(Elector)
+        with django_capture_on_commit_callbacks(execute=True):
+            changed = admin_client.post('/api/reports/export/', data, format='json')
+        assert changed.status_code == status.HTTP_202_ACCEPTED
+        assert changed.data['data']['report_id'] != report_id
+
+    def test_export_does_not_reuse_stalled_render(self, admin_client, guarantee):
+        """A report left queued or rendering past the timeout is failed, not handed out."""
+        from apps.reports.exports import RENDER_TIMEOUT
+        from apps.reports.models import GeneratedReport
+
+        data = {'report_type': 'COMMITTEE_PERFORMANCE', 'format': 'CSV'}
+        first = admin_client.post('/api/reports/export/', data, format='json').data['data']['report_id']
+        again = admin_client.post('/api/reports/export/', data, format='json')
+        assert (again.data['data']['report_id'], again.data['data']['reused']) == (first, True)
+
+        long_ago = timezone.now() - RENDER_TIMEOUT - timedelta(minutes=1)
+        GeneratedReport.objects.filter(pk=first).update(status='GENERATING', claimed_at=long_ago)
+        response = admin_client.post('/api/reports/export/', data, format='json')
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        second = response.data['data']['report_id']
+        assert second != first
+        assert GeneratedReport.objects.get(pk=first).status == 'FAILED'
+
+        GeneratedReport.objects.filter(pk=second).update(created_at=long_ago)
+        response = admin_client.post('/api/reports/export/', data, format='json')
+        assert response.data['data']['report_id'] not in (first, second)
+        assert GeneratedReport.objects.get(pk=second).status == 'FAILED'
+
+    def test_export_renders_excel_workbook(self, admin_client, guarantee, settings, tmp_path, django_capture_on_commit_callbacks):
+        from openpyxl import load_workbook
+
+        from apps.reports.models import GeneratedReport
+
+        settings.BACKGROUND_TASK_RUNNER = 'sync'
+        settings.MEDIA_ROOT = str(tmp_path)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = admin_client.post(
+                '/api/reports/export/', {'report_type': 'COVERAGE', 'format': 'EXCEL'}, format='json'
+            )
+
+        report = GeneratedReport.objects.get(pk=response.data['data']['report_id'])
+        assert report.status == 'COMPLETED'
+        assert report.data == {}
+        with report.file.open('rb') as handle:
+            workbook = load_workbook(handle, read_only=True)
+            assert workbook.sheetnames[0] == 'summary'
+            assert 'by_committee' in workbook.sheetnames
+
+    def test_download_before_completion_conflicts(self, admin_client):
+        response = admin_client.post('/api/reports/export/', {'report_type': 'ACCURACY', 'format': 'JSON'}, format='json')
+        report_id = response.data['data']['report_id']
+        assert admin_client.get(f'/api/reports/download/{report_id}/').status_code == status.HTTP_409_CONFLICT
 
     def test_campaign_performance_admin(self, admin_client):
         response = admin_client.get('/api/reports/analytics/campaign-performance/')
@@ -172,6 +314,31 @@ class TestAnalyticsViewSet:
         response = admin_client.get('/api/reports/analytics/trends/?days=7')
         assert response.status_code == status.HTTP_200_OK
 
+    def test_trends_resolution(self, admin_client):
+        now = timezone.now()
+        for snapshot_type, guarantees in (('HOURLY', 5), ('DAILY', 50)):
+            AnalyticsSnapshot.objects.create(
+                snapshot_date=timezone.localdate(),
+                snapshot_type=snapshot_type,
+                period_start=period_start(snapshot_type, now),
+                metrics={'total_guarantees': guarantees, 'elector_coverage': 12.5},
+            )
+
+        response = admin_client.get('/api/reports/analytics/trends/?days=1')
+        data = response.data['data']
+        assert data['resolution'] == 'hourly'
+        assert data['guarantees'] == [5]
+        assert data['attendance'] == [0]
+
+        response = admin_client.get('/api/reports/analytics/trends/?days=7&resolution=daily')
+        data = response.data['data']
+        assert data['dates'] == [str(timezone.localdate())]
+        assert data['guarantees'] == [50]
+        assert data['coverage'] == [12.5]
+
+        response = admin_client.get('/api/reports/analytics/trends/?resolution=monthly')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_create_snapshot_admin(self, admin_client):
         response = admin_client.post('/api/reports/analytics/create-snapshot/')
         assert response.status_code == status.HTTP_201_CREATED
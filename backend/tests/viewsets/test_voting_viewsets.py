@@ -201,6 +201,83 @@ class TestVoteCountViewSet:
         assert entry.invalid_ballots == 30
         assert entry.status == 'COMPLETED'
     
+    def test_bulk_entry_resubmission_is_set_based(
+        self, supervisor_client, election, committee, candidate, django_assert_max_num_queries
+    ):
+        """Resubmitting updates in place, audits old values and keeps the tally in step."""
+        from apps.voting.models import VoteCountAudit, VoteTally
+        
+        candidates = [candidate] + [
+            Candidate.objects.create(election=election, name=f'Candidate {number}', candidate_number=number)
+            for number in range(2, 21)
+        ]
+        
+        def submit(votes):
+            data = {
+                'committee_id': committee.id,
+                'vote_counts': [{'candidate_id': c.id, 'vote_count': votes} for c in candidates],
+                'total_ballots_cast': 500,
+                'invalid_ballots': 0,
+            }
+            return supervisor_client.post('/api/voting/vote-counts/bulk_entry/', data, format='json')
+        
+        assert submit(10).data['data']['created'] == 20
+        with django_assert_max_num_queries(16):
+            response = submit(12)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert (response.data['data']['created'], response.data['data']['updated']) == (0, 20)
+        
+        assert VoteCount.objects.filter(committee=committee, vote_count=12).count() == 20
+        audit = VoteCountAudit.objects.filter(vote_count__candidate=candidate, action='UPDATED').get()
+        assert (audit.old_value, audit.new_value) == (10, 12)
+        total = VoteTally.objects.get(candidate=candidate, committee__isnull=True)
+        assert (total.votes, total.verified_votes) == (12, 0)
+    
+    def test_bulk_entry_locks_existing_counts(
+        self, supervisor_client, admin_user, election, committee, candidate, monkeypatch
+    ):
+        """The current counts are read locked, so a verify cannot slip in before the upsert."""
+        from django.db.models import QuerySet
+        from apps.voting.models import VoteTally
+        
+        data = {
+            'committee_id': committee.id,
+            'vote_counts': [{'candidate_id': candidate.id, 'vote_count': 10}],
+            'total_ballots_cast': 100,
+        }
+        supervisor_client.post('/api/voting/vote-counts/bulk_entry/', data, format='json')
+        VoteCount.objects.get(committee=committee, candidate=candidate).verify(admin_user)
+        
+        locked = []
+        select_for_update = QuerySet.select_for_update
+        
+        def spy(queryset, *args, **kwargs):
+            locked.append(queryset.model)
+            return select_for_update(queryset, *args, **kwargs)
+        
+        monkeypatch.setattr(QuerySet, 'select_for_update', spy)
+        data['vote_counts'][0]['vote_count'] = 12
+        response = supervisor_client.post('/api/voting/vote-counts/bulk_entry/', data, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert VoteCount in locked
+        total = VoteTally.objects.get(candidate=candidate, committee__isnull=True)
+        assert (total.votes, total.verified_votes) == (12, 12)
+    
+    def test_bulk_entry_rejects_unknown_candidates(self, supervisor_client, committee, candidate):
+        """Candidates outside the committee's election fail the whole submission."""
+        data = {
+            'committee_id': committee.id,
+            'vote_counts': [
+                {'candidate_id': candidate.id, 'vote_count': 5},
+                {'candidate_id': candidate.id + 1000, 'vote_count': 5},
+            ],
+            'total_ballots_cast': 10,
+        }
+        response = supervisor_client.post('/api/voting/vote-counts/bulk_entry/', data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not VoteCount.objects.filter(committee=committee).exists()
+        assert not CommitteeVoteEntry.objects.filter(committee=committee).exists()
+    
     def test_filter_by_committee(self, admin_client, vote_count, committee, election, candidate, supervisor_user):
         """Test filtering vote counts by committee."""
         # Create another committee and vote count with different candidate
@@ -396,6 +473,43 @@ class TestCommitteeVoteEntryViewSet:
         assert data['completed'] == 1
         assert 'committees' in data
         assert len(data['committees']) == 2
+    
+    def test_progress_and_by_committee_in_constant_queries(
+        self, admin_client, election, supervisor_user, django_assert_max_num_queries
+    ):
+        """Both counting-night screens cost the same queries for 2 or 12 committees."""
+        candidates = [
+            Candidate.objects.create(election=election, name=f'Candidate {number}', candidate_number=number)
+            for number in (1, 2)
+        ]
+        
+        def add_committees(count, start):
+            for index in range(start, start + count):
+                committee = Committee.objects.create(election=election, code=f'PIV-{index:03d}', name=f'Committee {index}')
+                CommitteeVoteEntry.objects.create(
+                    election=election, committee=committee, entered_by=supervisor_user,
+                    total_ballots_cast=100, valid_ballots=100, status='VERIFIED'
+                )
+                VoteCount.objects.create(
+                    election=election, committee=committee, candidate=candidates[0],
+                    vote_count=index, status='VERIFIED', is_verified=True
+                )
+        
+        counts = {}
+        for count, start in ((2, 0), (10, 2)):
+            add_committees(count, start)
+            with django_assert_max_num_queries(12) as captured:
+                progress = admin_client.get('/api/voting/committee-entries/progress/')
+                by_committee = admin_client.get('/api/voting/results/by-committee/')
+            counts[count] = len(captured)
+        
+        assert counts[2] == counts[10]
+        committees = progress.data['data']['committees']
+        assert len(committees) == 12
+        assert committees[0]['completion_percentage'] == 50.0
+        row = next(r for r in by_committee.data['data'] if r['committee_code'] == 'PIV-003')
+        assert row['candidate_votes'] == [{'candidate_number': 1, 'candidate_name': 'Candidate 1', 'vote_count': 3}]
+        assert row['total_ballots'] == 100
 
 
 @pytest.mark.unit
@@ -570,6 +684,31 @@ class TestElectionResultsViewSet:
         # Should have committee breakdown
         assert len(response.data['data']) >= 1
     
+    def test_live_results_read_running_tally(self, admin_client, election, committee, candidate, supervisor_user, verified_committee_entry):
+        """Live results include entered votes before any results are generated."""
+        other = Candidate.objects.create(election=election, name='Other Candidate', candidate_number=2)
+        VoteCount.objects.create(
+            election=election,
+            committee=committee,
+            candidate=other,
+            vote_count=250,
+            entered_by=supervisor_user,
+            status='SUBMITTED'
+        )
+        
+        response = admin_client.get(f'/api/voting/results/live/?election={election.id}')
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data['data']
+        assert [row['candidate_number'] for row in data['candidates']] == [2, 1]
+        assert data['candidates'][0]['verified_votes'] == 0
+        assert data['candidates'][1]['verified_votes'] == 200
+        assert data['total_votes'] == 450
+        
+        cached = admin_client.get(
+            f'/api/voting/results/live/?election={election.id}', HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+    
     def test_generate_results_regular_user_forbidden(self, election, verified_committee_entry, django_user_model):
         """Test regular user cannot generate results."""
         # Check if permission is actually enforced - may need to verify actual permission setup